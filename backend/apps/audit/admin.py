@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import AuditLog, FormRevision
+from .models import AuditLog, FormRevision, AuditArchive
 
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
@@ -19,13 +19,21 @@ class AuditLogAdmin(admin.ModelAdmin):
 
 @admin.register(FormRevision)
 class FormRevisionAdmin(admin.ModelAdmin):
-    list_display = ('inspection', 'revision_number', 'revised_by', 'created_at')
+    list_display = ('inspection', 'revision_number', 'is_checkpoint', 'revised_by', 'created_at')
     list_filter = ('revised_by', 'created_at')
     search_fields = ('inspection__form_number', 'inspection__broadcaster__name', 'revision_reason')
-    readonly_fields = ('inspection', 'revision_number', 'revised_by', 'form_data', 'created_at')
+    readonly_fields = ('inspection', 'revision_number', 'revised_by', 'is_checkpoint', 'form_data', 'created_at')
     
     def has_add_permission(self, request):
         return False
     
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+@admin.register(AuditArchive)
+class AuditArchiveAdmin(admin.ModelAdmin):
+    list_display = ('month', 'row_count', 'size_bytes', 'first_id', 'last_id', 'created_at')
+    readonly_fields = ('month', 'file_path', 'row_count', 'size_bytes', 'first_id', 'last_id', 'created_at')
+
+    def has_add_permission(self, request):
+        return False
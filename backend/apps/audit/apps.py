@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class AuditConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.audit'
\ No newline at end of file
+    name = 'apps.audit'
+
+    def ready(self):
+        import apps.audit.signals
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.audit.services import (
+    AuditArchiveService, AuditPartitionService, audit_settings, zstandard
+)
+
+class Command(BaseCommand):
+    help = 'Archive audit log months older than the retention window to compressed files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-months', type=int, default=None, help='Months kept in the database')
+        parser.add_argument('--months-ahead', type=int, default=3, help='Future monthly partitions to create')
+        parser.add_argument('--dry-run', action='store_true', help='List the months that would be archived')
+
+    def handle(self, *args, **options):
+        retention = options['retention_months']
+        if retention is None:
+            retention = audit_settings().get('RETENTION_MONTHS', 12)
+        if retention < 1:
+            raise CommandError('--retention-months must be at least 1')
+
+        created = AuditPartitionService.ensure_partitions(options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'Created partition {name}')
+
+        cutoff = AuditArchiveService.cutoff(retention)
+        months = AuditArchiveService.months_before(cutoff)
+        if not months:
+            self.stdout.write(f'Nothing to archive before {cutoff:%Y-%m}')
+            return
+        if options['dry_run']:
+            for month in months:
+                self.stdout.write(f'Would archive {month:%Y-%m}')
+            return
+        if zstandard is None:
+            raise CommandError('zstandard is not installed; run pip install zstandard')
+
+        total = 0
+        for month in months:
+            archive = AuditArchiveService.archive_month(month)
+            if archive:
+                total += archive.row_count
+                self.stdout.write(f'{month:%Y-%m}: {archive.row_count} rows -> {archive.file_path} ({archive.size_bytes} bytes)')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {total} audit log rows from {len(months)} months'))
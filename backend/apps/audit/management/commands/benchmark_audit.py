@@ -0,0 +1,100 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.audit.models import AuditLog
+from apps.audit.services import AuditService, audit_settings
+from apps.inspections.models import Inspection
+
+MODES = ['off', 'sync', 'request', 'thread']
+
+class Command(BaseCommand):
+    help = 'Benchmark inspection autosave latency with auditing off and in each buffering mode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Autosaves per mode')
+        parser.add_argument('--fields', type=int, default=20, help='Fields changed per autosave')
+        parser.add_argument('--modes', default=','.join(MODES), help=f'Comma separated subset of {",".join(MODES)}')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            self.stderr.write(self.style.ERROR(f'Unknown modes: {", ".join(sorted(unknown))}'))
+            return
+
+        user, _ = get_user_model().objects.get_or_create(
+            username='audit-benchmark', defaults={'email': 'audit-benchmark@example.com', 'employee_id': 'BENCH-AUDIT'}
+        )
+        fields = self._text_fields(options['fields'])
+        with AuditService.disabled():
+            inspection = Inspection.objects.create(
+                form_number=f'BENCH-{int(time.time()) % 10 ** 8}',
+                inspection_date=timezone.localdate(),
+                inspector=user,
+            )
+        content_type = ContentType.objects.get_for_model(Inspection)
+        self.stdout.write(
+            f'Inspection {inspection.pk}: {options["iterations"]} autosaves x {len(fields)} changed fields per mode'
+        )
+
+        try:
+            for mode in modes:
+                self._run_mode(mode, inspection.pk, fields, options['iterations'], content_type)
+        finally:
+            AuditService.reset_buffer()
+            with AuditService.disabled():
+                Inspection.objects.filter(pk=inspection.pk).delete()
+            AuditLog.objects.filter(content_type=content_type, object_id=inspection.pk).delete()
+
+    def _text_fields(self, count):
+        ignored = set(audit_settings().get('IGNORED_FIELDS', []))
+        fields = [
+            field.name for field in Inspection._meta.concrete_fields
+            if isinstance(field, (models.CharField, models.TextField))
+            and not field.choices and not field.unique and field.name not in ignored
+            and (field.max_length is None or field.max_length >= 12)
+        ]
+        return fields[:count]
+
+    def _run_mode(self, mode, inspection_id, fields, iterations, content_type):
+        config = {**audit_settings(), 'ENABLED': mode != 'off', 'MODE': 'sync' if mode == 'off' else mode}
+        rows_before = AuditLog.objects.filter(content_type=content_type, object_id=inspection_id).count()
+        save_times, flush_times = [], []
+
+        with override_settings(AUDIT_SETTINGS=config):
+            AuditService.reset_buffer()
+            for iteration in range(iterations):
+                started = time.perf_counter()
+                inspection = Inspection.objects.get(pk=inspection_id)
+                for name in fields:
+                    setattr(inspection, name, f'{mode} {iteration}')
+                inspection.is_auto_saved = True
+                inspection.save()
+                save_times.append(time.perf_counter() - started)
+
+                if mode == 'request':
+                    # What request_finished does after the response is sent
+                    started = time.perf_counter()
+                    AuditService.flush()
+                    flush_times.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            AuditService.shutdown()
+            drain_time = time.perf_counter() - started
+
+        rows = AuditLog.objects.filter(content_type=content_type, object_id=inspection_id).count() - rows_before
+        save_ms = sorted(value * 1000 for value in save_times)
+        line = (
+            f'{mode:>8}: mean {statistics.mean(save_ms):7.2f} ms  p50 {save_ms[len(save_ms) // 2]:7.2f} ms  '
+            f'p95 {save_ms[int(len(save_ms) * 0.95) - 1]:7.2f} ms  rows {rows:6d}  final drain {drain_time * 1000:7.2f} ms'
+        )
+        if flush_times:
+            line += f'  post-response flush {statistics.mean(flush_times) * 1000:.2f} ms/request'
+        self.stdout.write(line)
@@ -0,0 +1,78 @@
+import json
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import models
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.audit.models import FormRevision
+from apps.audit.services import AuditService, FormRevisionService, audit_settings
+from apps.inspections.models import Inspection
+
+class Command(BaseCommand):
+    help = 'Benchmark form revision storage size and reconstruction latency per checkpoint interval'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--revisions', type=int, default=500, help='Revisions written per interval')
+        parser.add_argument('--fields', type=int, default=5, help='Fields changed per revision')
+        parser.add_argument('--intervals', default='1,10,20,50', help='Comma separated checkpoint intervals (1 = full snapshots)')
+        parser.add_argument('--samples', type=int, default=200, help='Random reconstructions timed per interval')
+
+    def handle(self, *args, **options):
+        user, _ = get_user_model().objects.get_or_create(
+            username='audit-benchmark', defaults={'email': 'audit-benchmark@example.com', 'employee_id': 'BENCH-AUDIT'}
+        )
+        fields = [
+            field.name for field in Inspection._meta.concrete_fields
+            if isinstance(field, (models.CharField, models.TextField))
+            and not field.choices and not field.unique and (field.max_length is None or field.max_length >= 12)
+        ]
+        random.seed(42)
+
+        for interval in [int(value) for value in options['intervals'].split(',') if value.strip()]:
+            with AuditService.disabled():
+                inspection = Inspection.objects.create(
+                    form_number=f'REV-{int(time.time() * 1000) % 10 ** 9}',
+                    inspection_date=timezone.localdate(),
+                    inspector=user,
+                )
+            try:
+                self._run_interval(inspection, interval, fields, options)
+            finally:
+                with AuditService.disabled():
+                    inspection.delete()
+
+    def _run_interval(self, inspection, interval, fields, options):
+        config = {**audit_settings(), 'REVISION_CHECKPOINT_INTERVAL': interval}
+        with override_settings(AUDIT_SETTINGS=config):
+            started = time.perf_counter()
+            for number in range(options['revisions']):
+                for name in random.sample(fields, min(options['fields'], len(fields))):
+                    setattr(inspection, name, f'rev {number}')
+                FormRevisionService.create_revision(inspection)
+            write_ms = (time.perf_counter() - started) * 1000 / options['revisions']
+
+            stored = FormRevision.objects.filter(inspection=inspection).values_list('form_data', flat=True)
+            stored_bytes = sum(len(json.dumps(data)) for data in stored)
+            snapshot_bytes = len(json.dumps(FormRevisionService.form_data(inspection))) * options['revisions']
+
+            cache.delete(FormRevisionService.STATE_CACHE_KEY.format(inspection_id=inspection.pk))
+            timings = []
+            for _ in range(options['samples']):
+                number = random.randint(1, options['revisions'])
+                started = time.perf_counter()
+                FormRevisionService.reconstruct(inspection.pk, number)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+
+        self.stdout.write(
+            f'interval {interval:3d}: stored {stored_bytes / 1024:9.1f} KiB '
+            f'({stored_bytes / snapshot_bytes * 100:5.1f}% of full snapshots)  '
+            f'write {write_ms:6.2f} ms/rev  reconstruct p50 {timings[len(timings) // 2]:6.2f} ms  '
+            f'p95 {timings[int(len(timings) * 0.95) - 1]:6.2f} ms'
+        )
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.audit.models import FormRevision
+from apps.audit.services import FormRevisionService
+
+class Command(BaseCommand):
+    help = 'Squash old form revisions into a single checkpoint per inspection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=50, help='Newest revisions kept per inspection')
+        parser.add_argument('--older-than-days', type=int, default=None, help='Also keep revisions newer than this many days')
+        parser.add_argument('--inspection', type=int, default=None, help='Only compact this inspection')
+
+    def handle(self, *args, **options):
+        keep = max(1, options['keep'])
+        before = None
+        if options['older_than_days'] is not None:
+            before = timezone.now() - timedelta(days=options['older_than_days'])
+
+        candidates = FormRevision.objects.values('inspection_id').annotate(total=Count('id')).filter(total__gt=keep)
+        if options['inspection']:
+            candidates = candidates.filter(inspection_id=options['inspection'])
+
+        inspections = 0
+        deleted = 0
+        for row in candidates.order_by('inspection_id').iterator():
+            removed = FormRevisionService.compact(row['inspection_id'], keep=keep, before=before)
+            if removed:
+                inspections += 1
+                deleted += removed
+
+        self.stdout.write(self.style.SUCCESS(f'Compacted {inspections} inspections, deleted {deleted} revisions'))
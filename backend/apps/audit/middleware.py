@@ -0,0 +1,15 @@
+# apps/audit/middleware.py
+from .services import AuditContext
+
+class AuditContextMiddleware:
+    """Makes the current request (user, client) available to audit records"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        AuditContext.bind(request)
+        try:
+            return self.get_response(request)
+        finally:
+            AuditContext.clear()
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('audit', '0002_buffered_audit_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formrevision',
+            name='is_checkpoint',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='formrevision',
+            name='revised_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='formrevision',
+            index=models.Index(fields=['inspection', 'is_checkpoint', 'revision_number'], name='form_revisi_inspect_05c3f9_idx'),
+        ),
+    ]
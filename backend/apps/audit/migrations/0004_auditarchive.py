@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0003_delta_form_revisions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(db_index=True, help_text='First day of the archived month')),
+                ('file_path', models.CharField(help_text='Path relative to MEDIA_ROOT', max_length=500, unique=True)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('size_bytes', models.PositiveBigIntegerField(default=0)),
+                ('first_id', models.BigIntegerField(blank=True, null=True)),
+                ('last_id', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'audit_log_archives',
+                'ordering': ['-month', '-first_id'],
+            },
+        ),
+    ]
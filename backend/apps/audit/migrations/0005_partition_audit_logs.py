@@ -0,0 +1,97 @@
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+# Monthly partitions created beyond the newest existing row
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _add_months(month, count):
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+
+def _month_start(month):
+    # Local midnight, as audit.services.month_bounds: partitions must hold exactly the months archived
+    return timezone.make_aware(datetime.combine(month, time.min))
+
+
+def partition_audit_logs(apps, schema_editor):
+    """Rebuild audit_logs as a table range-partitioned by month (PostgreSQL only)
+
+    Other databases keep the plain table; archive_audit_logs deletes archived
+    months by timestamp range there instead of dropping partitions.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    user_table = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT min("timestamp"), max("timestamp") FROM audit_logs')
+        first, last = cursor.fetchone()
+
+        cursor.execute('ALTER TABLE audit_logs RENAME TO audit_logs_legacy')
+        cursor.execute('ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey')
+        cursor.execute('ALTER INDEX IF EXISTS audit_logs_content_b0ef47_idx RENAME TO audit_logs_legacy_content_idx')
+        cursor.execute('ALTER INDEX IF EXISTS audit_logs_user_id_88267f_idx RENAME TO audit_logs_legacy_user_idx')
+        cursor.execute('CREATE SEQUENCE audit_logs_partitioned_id_seq')
+        cursor.execute(f'''
+            CREATE TABLE audit_logs (
+                id bigint NOT NULL DEFAULT nextval('audit_logs_partitioned_id_seq'),
+                user_id bigint NULL REFERENCES {user_table} (id) DEFERRABLE INITIALLY DEFERRED,
+                content_type_id integer NOT NULL REFERENCES django_content_type (id) DEFERRABLE INITIALLY DEFERRED,
+                object_id integer NOT NULL CHECK (object_id >= 0),
+                action varchar(20) NOT NULL,
+                field_name varchar(100) NOT NULL,
+                old_value text NOT NULL,
+                new_value text NOT NULL,
+                ip_address inet NULL,
+                user_agent text NOT NULL,
+                "timestamp" timestamp with time zone NOT NULL,
+                PRIMARY KEY (id, "timestamp")
+            ) PARTITION BY RANGE ("timestamp")
+        ''')
+        cursor.execute('ALTER SEQUENCE audit_logs_partitioned_id_seq OWNED BY audit_logs.id')
+        # Same names as the model's Meta.indexes so Django's state still matches
+        cursor.execute('CREATE INDEX audit_logs_content_b0ef47_idx ON audit_logs (content_type_id, object_id)')
+        cursor.execute('CREATE INDEX audit_logs_user_id_88267f_idx ON audit_logs (user_id, "timestamp")')
+        cursor.execute('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT')
+
+        start = (timezone.localdate(first) if first else timezone.localdate()).replace(day=1)
+        end = _add_months((timezone.localdate(last) if last else timezone.localdate()).replace(day=1),
+                          PARTITION_MONTHS_AHEAD)
+        month = start
+        while month <= end:
+            following = _add_months(month, 1)
+            cursor.execute(
+                f'CREATE TABLE audit_logs_p{month:%Y%m} PARTITION OF audit_logs FOR VALUES FROM (%s) TO (%s)',
+                [_month_start(month), _month_start(following)]
+            )
+            month = following
+
+        cursor.execute('''
+            INSERT INTO audit_logs (id, user_id, content_type_id, object_id, action, field_name,
+                                    old_value, new_value, ip_address, user_agent, "timestamp")
+            SELECT id, user_id, content_type_id, object_id, action, field_name,
+                   old_value, new_value, ip_address, user_agent, "timestamp"
+            FROM audit_logs_legacy
+        ''')
+        cursor.execute("SELECT setval('audit_logs_partitioned_id_seq', COALESCE((SELECT max(id) FROM audit_logs), 0) + 1, false)")
+        cursor.execute('DROP TABLE audit_logs_legacy')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0004_auditarchive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        # Not reversible: moving rows back into a plain table is left to a manual restore
+        migrations.RunPython(partition_audit_logs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0005_partition_audit_logs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditarchive',
+            name='newest_first',
+            field=models.BooleanField(default=False, help_text='Rows are stored in descending id order'),
+        ),
+    ]
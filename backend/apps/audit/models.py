@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -14,8 +15,8 @@ class AuditLog(models.Model):
         ('auto_save', 'Auto Saved'),
     ]
     
-    # Who made the change
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Who made the change (empty for anonymous form saves and background jobs)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     
     # What was changed
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
@@ -32,11 +33,12 @@ class AuditLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     
-    # Timestamp
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Timestamp (set when the change is captured, not when the batch is written)
+    timestamp = models.DateTimeField(default=timezone.now)
     
     def __str__(self):
-        return f"{self.user.username} {self.get_action_display()} {self.content_type.model} at {self.timestamp}"
+        username = self.user.username if self.user else 'anonymous'
+        return f"{username} {self.get_action_display()} {self.content_type.model} at {self.timestamp}"
     
     class Meta:
         db_table = 'audit_logs'
@@ -52,10 +54,11 @@ class FormRevision(models.Model):
     
     inspection = models.ForeignKey(Inspection, on_delete=models.CASCADE, related_name='revisions')
     revision_number = models.PositiveIntegerField(default=1)
-    revised_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    revised_by = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     revision_reason = models.TextField(blank=True)
     
-    # Snapshot of form data at this revision
+    # Full snapshot on checkpoints, otherwise a JSON patch against the previous revision
+    is_checkpoint = models.BooleanField(default=True)
     form_data = models.JSONField()
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -66,4 +69,26 @@ class FormRevision(models.Model):
     class Meta:
         db_table = 'form_revisions'
         ordering = ['-revision_number']
-        unique_together = ['inspection', 'revision_number']
\ No newline at end of file
+        unique_together = ['inspection', 'revision_number']
+        indexes = [
+            models.Index(fields=['inspection', 'is_checkpoint', 'revision_number']),
+        ]
+
+class AuditArchive(models.Model):
+    """A month of audit logs moved out of the database into a zstd-compressed JSONL file"""
+    month = models.DateField(db_index=True, help_text="First day of the archived month")
+    file_path = models.CharField(max_length=500, unique=True, help_text="Path relative to MEDIA_ROOT")
+    row_count = models.PositiveIntegerField(default=0)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    first_id = models.BigIntegerField(null=True, blank=True)
+    last_id = models.BigIntegerField(null=True, blank=True)
+    newest_first = models.BooleanField(default=False, help_text="Rows are stored in descending id order")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"{self.month:%Y-%m} ({self.row_count} rows)"
+    
+    class Meta:
+        db_table = 'audit_log_archives'
+        ordering = ['-month', '-first_id']
@@ -0,0 +1,771 @@
+# apps/audit/services.py
+import atexit
+import copy
+import hashlib
+import io
+import logging
+import json
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, time as dt_time, timedelta
+from itertools import islice
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Only needed to write or read audit archives
+    zstandard = None
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog, FormRevision, AuditArchive
+
+_context = threading.local()
+logger = logging.getLogger(__name__)
+
+def audit_settings() -> Dict[str, Any]:
+    return getattr(settings, 'AUDIT_SETTINGS', {})
+
+class AuditContext:
+    """Per-thread request details attached to every change record"""
+
+    @staticmethod
+    def bind(request):
+        _context.request = request
+
+    @staticmethod
+    def clear():
+        _context.request = None
+        _context.action = None
+
+    @staticmethod
+    @contextmanager
+    def action(name: str):
+        """Record saves inside the block under a specific action (e.g. 'auto_save')"""
+        previous = getattr(_context, 'action', None)
+        _context.action = name
+        try:
+            yield
+        finally:
+            _context.action = previous
+
+    @staticmethod
+    def current() -> Dict[str, Any]:
+        """User, client and action for the current thread, resolved at record time"""
+        request = getattr(_context, 'request', None)
+        details = {'user_id': None, 'ip_address': None, 'user_agent': '', 'action': getattr(_context, 'action', None)}
+        if request is None:
+            return details
+
+        # DRF authenticates inside the view and copies the user back onto the request
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            details['user_id'] = user.pk
+
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        details['ip_address'] = forwarded.split(',')[0].strip() if forwarded else request.META.get('REMOTE_ADDR')
+        details['user_agent'] = request.META.get('HTTP_USER_AGENT', '')
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        if details['action'] is None and resolver_match and resolver_match.url_name == 'auto-save':
+            details['action'] = 'auto_save'
+        return details
+
+class AuditBuffer:
+    """Bounded in-process queue of AuditLog rows written with bulk_create"""
+
+    def __init__(self, maxsize: int = 10000, batch_size: int = 500, flush_interval: float = 2.0, background: bool = True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.background = background
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def put_many(self, records: List[AuditLog]):
+        """Enqueue records; when the queue is full the caller flushes instead of dropping"""
+        for record in records:
+            while True:
+                try:
+                    self._queue.put_nowait(record)
+                    break
+                except queue.Full:
+                    self.flush()
+        if self.background:
+            self._ensure_thread()
+            if self._queue.qsize() >= self.batch_size:
+                self._wakeup.set()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = []
+                try:
+                    while len(batch) < self.batch_size:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if not batch:
+                    return written
+                try:
+                    AuditLog.objects.bulk_create(batch, batch_size=self.batch_size)
+                    written += len(batch)
+                except Exception as e:
+                    logger.error("Audit flush failed, %d records lost: %s", len(batch), e)
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name='audit-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # The flusher owns a connection of its own; don't let it go stale
+                close_old_connections()
+
+    def stop(self, timeout: float = 10.0) -> int:
+        """Stop the flusher thread and write what is left"""
+        if self._thread is not None and self._thread.is_alive():
+            self._stopping.set()
+            self._wakeup.set()
+            self._thread.join(timeout)
+        self._thread = None
+        return self.flush()
+
+class AuditService:
+    """Diffs model state on save and hands AuditLog rows to the buffer"""
+
+    _buffer: Optional[AuditBuffer] = None
+    _buffer_lock = threading.Lock()
+    _exit_hook_registered = False
+    _tracked_fields: Dict[type, List[Tuple[str, Any]]] = {}
+    _disabled = threading.local()
+
+    # ---------- configuration ----------
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return audit_settings().get('ENABLED', True) and not getattr(cls._disabled, 'value', False)
+
+    @classmethod
+    def mode(cls) -> str:
+        return audit_settings().get('MODE', 'thread')
+
+    @classmethod
+    @contextmanager
+    def disabled(cls):
+        """Skip change capture for saves in this thread"""
+        previous = getattr(cls._disabled, 'value', False)
+        cls._disabled.value = True
+        try:
+            yield
+        finally:
+            cls._disabled.value = previous
+
+    @classmethod
+    def buffer(cls) -> AuditBuffer:
+        if cls._buffer is None:
+            with cls._buffer_lock:
+                if cls._buffer is None:
+                    config = audit_settings()
+                    cls._buffer = AuditBuffer(
+                        maxsize=config.get('QUEUE_SIZE', 10000),
+                        batch_size=config.get('BATCH_SIZE', 500),
+                        flush_interval=config.get('FLUSH_INTERVAL', 2.0),
+                        background=cls.mode() == 'thread',
+                    )
+                    if config.get('FLUSH_ON_EXIT', True) and not cls._exit_hook_registered:
+                        atexit.register(cls.shutdown)
+                        cls._exit_hook_registered = True
+        return cls._buffer
+
+    @classmethod
+    def reset_buffer(cls) -> int:
+        """Flush and drop the current buffer so the next one picks up new settings"""
+        written = cls.shutdown()
+        cls._buffer = None
+        return written
+
+    @classmethod
+    def flush(cls) -> int:
+        return cls._buffer.flush() if cls._buffer is not None else 0
+
+    @classmethod
+    def shutdown(cls) -> int:
+        """Durable shutdown: stop the flusher and write everything still queued"""
+        return cls._buffer.stop() if cls._buffer is not None else 0
+
+    # ---------- state capture ----------
+
+    @classmethod
+    def tracked_fields(cls, model) -> List[Tuple[str, Any]]:
+        """(attname, field) pairs worth auditing for a model, computed once"""
+        if model not in cls._tracked_fields:
+            ignored = set(audit_settings().get('IGNORED_FIELDS', []))
+            cls._tracked_fields[model] = [
+                (field.attname, field) for field in model._meta.concrete_fields
+                if not field.primary_key and field.name not in ignored
+            ]
+        return cls._tracked_fields[model]
+
+    @classmethod
+    def snapshot(cls, instance) -> Dict[str, Any]:
+        """Loaded field values only, so deferred fields never trigger queries"""
+        loaded = instance.__dict__
+        return {attname: loaded[attname] for attname, _ in cls.tracked_fields(type(instance)) if attname in loaded}
+
+    @staticmethod
+    def _normalize(field, value):
+        try:
+            return field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            return value
+
+    @classmethod
+    def diff(cls, instance, before: Dict[str, Any]) -> List[Tuple[str, Any, Any]]:
+        """(field_name, old, new) for every tracked field whose value changed"""
+        changes = []
+        loaded = instance.__dict__
+        for attname, field in cls.tracked_fields(type(instance)):
+            if attname not in before or attname not in loaded:
+                continue
+            old, new = before[attname], loaded[attname]
+            if old is new or old == new:
+                continue
+            if cls._normalize(field, old) != cls._normalize(field, new):
+                changes.append((field.name, old, new))
+        return changes
+
+    # ---------- recording ----------
+
+    @staticmethod
+    def _as_text(value) -> str:
+        return '' if value is None else str(value)
+
+    @classmethod
+    def build_records(cls, instance, action: str, changes: List[Tuple[str, Any, Any]] = None) -> List[AuditLog]:
+        context = AuditContext.current()
+        common = {
+            'user_id': context['user_id'],
+            'content_type_id': ContentType.objects.get_for_model(type(instance)).pk,
+            'object_id': instance.pk,
+            'action': context['action'] if action == 'update' and context['action'] else action,
+            'ip_address': context['ip_address'],
+            'user_agent': context['user_agent'],
+        }
+        if not changes:
+            return [AuditLog(**common)]
+        return [
+            AuditLog(field_name=name[:100], old_value=cls._as_text(old), new_value=cls._as_text(new), **common)
+            for name, old, new in changes
+        ]
+
+    @classmethod
+    def record(cls, records: List[AuditLog]):
+        """Queue records once the surrounding transaction commits"""
+        if not records:
+            return
+        mode = cls.mode()
+        if mode == 'sync':
+            transaction.on_commit(lambda: AuditLog.objects.bulk_create(records))
+        else:
+            transaction.on_commit(lambda: cls.buffer().put_many(records))
+
+# ---------- JSON patches (RFC 6902 add/replace/remove) ----------
+
+def _escape_pointer(key) -> str:
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+def _unescape_pointer(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+def make_patch(old: Dict[str, Any], new: Dict[str, Any], prefix: str = '') -> List[Dict[str, Any]]:
+    """Operations turning old into new; nested dicts are diffed, lists are replaced whole"""
+    patch = []
+    for key in old:
+        if key not in new:
+            patch.append({'op': 'remove', 'path': f'{prefix}/{_escape_pointer(key)}'})
+    for key, value in new.items():
+        path = f'{prefix}/{_escape_pointer(key)}'
+        if key not in old:
+            patch.append({'op': 'add', 'path': path, 'value': value})
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            patch.extend(make_patch(old[key], value, path))
+        elif old[key] != value:
+            patch.append({'op': 'replace', 'path': path, 'value': value})
+    return patch
+
+def apply_patch(document: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply operations in place; callers pass a copy they own"""
+    for operation in patch:
+        tokens = [_unescape_pointer(token) for token in operation['path'].split('/')[1:]]
+        target = document
+        for token in tokens[:-1]:
+            target = target[token]
+        if operation['op'] == 'remove':
+            target.pop(tokens[-1], None)
+        else:
+            target[tokens[-1]] = operation['value']
+    return document
+
+class FormRevisionService:
+    """Delta-encoded inspection revisions with periodic full-snapshot checkpoints"""
+
+    STATE_CACHE_KEY = 'form_revision_state:{inspection_id}'
+    STATE_CACHE_TTL = 60 * 60
+
+    @staticmethod
+    def checkpoint_interval() -> int:
+        return max(1, audit_settings().get('REVISION_CHECKPOINT_INTERVAL', 20))
+
+    @classmethod
+    def form_data(cls, inspection) -> Dict[str, Any]:
+        """JSON-safe snapshot of the inspection's tracked fields"""
+        values = {
+            field.name: getattr(inspection, attname)
+            for attname, field in AuditService.tracked_fields(type(inspection))
+        }
+        return json.loads(json.dumps(values, cls=DjangoJSONEncoder))
+
+    @classmethod
+    def _cached_state(cls, inspection_id) -> Optional[Tuple[int, Dict[str, Any]]]:
+        return cache.get(cls.STATE_CACHE_KEY.format(inspection_id=inspection_id))
+
+    @classmethod
+    def _cache_state(cls, inspection_id, revision_number: int, data: Dict[str, Any]):
+        cache.set(cls.STATE_CACHE_KEY.format(inspection_id=inspection_id), (revision_number, data), cls.STATE_CACHE_TTL)
+
+    @classmethod
+    def latest_state(cls, inspection_id) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """(revision_number, data) of the newest revision, 0 when there is none"""
+        latest = FormRevision.objects.filter(inspection_id=inspection_id).order_by('-revision_number').values_list(
+            'revision_number', flat=True
+        ).first()
+        if latest is None:
+            return 0, None
+        cached = cls._cached_state(inspection_id)
+        if cached and cached[0] == latest:
+            return cached
+        return latest, cls.reconstruct(inspection_id, latest)
+
+    @classmethod
+    def reconstruct(cls, inspection_id, revision_number: int) -> Optional[Dict[str, Any]]:
+        """Full form data at a revision: nearest checkpoint plus the patches after it (two queries)"""
+        checkpoint = FormRevision.objects.filter(
+            inspection_id=inspection_id, is_checkpoint=True, revision_number__lte=revision_number
+        ).order_by('-revision_number').values_list('revision_number', 'form_data').first()
+        if checkpoint is None:
+            return None
+
+        checkpoint_number, data = checkpoint
+        patches = FormRevision.objects.filter(
+            inspection_id=inspection_id,
+            revision_number__gt=checkpoint_number,
+            revision_number__lte=revision_number
+        ).order_by('revision_number').values_list('form_data', flat=True)
+        for patch in patches:
+            apply_patch(data, patch)
+        return data
+
+    @classmethod
+    def snapshots(cls, revisions) -> Dict[Tuple[Any, int], Dict[str, Any]]:
+        """Full form data of each revision, keyed by (inspection_id, revision_number)
+
+        The revisions of one inspection are rebuilt in a single forward
+        pass from the checkpoint before the oldest of them: two queries per
+        inspection however many of its revisions are asked for.
+        """
+        wanted: Dict[Any, set] = {}
+        for revision in revisions:
+            wanted.setdefault(revision.inspection_id, set()).add(revision.revision_number)
+
+        snapshots = {}
+        for inspection_id, numbers in wanted.items():
+            checkpoint = FormRevision.objects.filter(
+                inspection_id=inspection_id, is_checkpoint=True, revision_number__lte=min(numbers)
+            ).order_by('-revision_number').values_list('revision_number', 'form_data').first()
+            if checkpoint is None:
+                continue
+            number, data = checkpoint
+            if number in numbers:
+                snapshots[inspection_id, number] = copy.deepcopy(data)
+            later = FormRevision.objects.filter(
+                inspection_id=inspection_id, revision_number__gt=number, revision_number__lte=max(numbers)
+            ).order_by('revision_number').values_list('revision_number', 'is_checkpoint', 'form_data')
+            for number, is_checkpoint, payload in later:
+                data = payload if is_checkpoint else apply_patch(data, payload)
+                if number in numbers:
+                    snapshots[inspection_id, number] = copy.deepcopy(data)
+        return snapshots
+
+    @classmethod
+    def create_revision(cls, inspection, user_id=None, reason: str = '') -> Optional[FormRevision]:
+        """Store the inspection's current state; returns None when nothing changed"""
+        data = cls.form_data(inspection)
+        for _ in range(3):
+            number, previous = cls._cached_state(inspection.pk) or cls.latest_state(inspection.pk)
+            revision = cls._build_revision(inspection, number + 1, previous, data, user_id, reason)
+            if revision is None:
+                return None
+            try:
+                with transaction.atomic():
+                    revision.save()
+            except IntegrityError:
+                # Another writer took this number; rebuild from the database
+                cache.delete(cls.STATE_CACHE_KEY.format(inspection_id=inspection.pk))
+                continue
+            cls._cache_state(inspection.pk, revision.revision_number, data)
+            return revision
+        return None
+
+    @classmethod
+    def _build_revision(cls, inspection, number, previous, data, user_id, reason) -> Optional[FormRevision]:
+        checkpoint = previous is None or (number - 1) % cls.checkpoint_interval() == 0
+        payload = data
+        if not checkpoint:
+            patch = make_patch(previous, data)
+            if not patch:
+                return None
+            # A patch bigger than the snapshot buys nothing
+            if len(json.dumps(patch)) < len(json.dumps(data)):
+                payload = patch
+            else:
+                checkpoint = True
+        return FormRevision(
+            inspection_id=inspection.pk,
+            revision_number=number,
+            revised_by_id=user_id,
+            revision_reason=reason,
+            is_checkpoint=checkpoint,
+            form_data=payload,
+        )
+
+    @classmethod
+    def compact(cls, inspection_id, keep: int = 50, before=None) -> int:
+        """Squash revisions older than the newest `keep` (and older than `before`, if given)
+
+        The oldest surviving revision is rewritten as a checkpoint so every
+        remaining revision still reconstructs. Returns the number deleted.
+        """
+        revisions = FormRevision.objects.filter(inspection_id=inspection_id)
+        numbers = list(revisions.order_by('-revision_number').values_list('revision_number', 'created_at'))
+        if len(numbers) <= keep:
+            return 0
+
+        # Oldest revision that must survive
+        boundary = numbers[keep - 1][0] if keep > 0 else numbers[0][0]
+        if before is not None:
+            boundary = min(boundary, next((number for number, created in reversed(numbers) if created >= before), numbers[0][0]))
+
+        with transaction.atomic():
+            data = cls.reconstruct(inspection_id, boundary)
+            revisions.filter(revision_number=boundary).update(is_checkpoint=True, form_data=data)
+            deleted, _ = revisions.filter(revision_number__lt=boundary).delete()
+        return deleted
+
+# ---------- monthly partitions and archives ----------
+
+def add_months(month: date, count: int) -> date:
+    years, month_index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, month_index + 1, 1)
+
+def month_bounds(month: date) -> Tuple[datetime, datetime]:
+    """Aware [start, end) datetimes of a month"""
+    start = timezone.make_aware(datetime.combine(month, dt_time.min))
+    return start, timezone.make_aware(datetime.combine(add_months(month, 1), dt_time.min))
+
+class AuditPartitionService:
+    """Monthly range partitions of audit_logs on PostgreSQL; a no-op elsewhere"""
+
+    @staticmethod
+    def supported() -> bool:
+        return connection.vendor == 'postgresql'
+
+    @staticmethod
+    def partition_name(month: date) -> str:
+        return f'audit_logs_p{month:%Y%m}'
+
+    @classmethod
+    def existing(cls) -> List[str]:
+        if not cls.supported():
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT child.relname FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'audit_logs'
+            """)
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def ensure_partitions(cls, months_ahead: int = 3) -> List[str]:
+        """Create partitions from this month up to `months_ahead` months out"""
+        if not cls.supported():
+            return []
+        existing = set(cls.existing())
+        created = []
+        month = timezone.localdate().replace(day=1)
+        with connection.cursor() as cursor:
+            for _ in range(months_ahead + 1):
+                name = cls.partition_name(month)
+                if name not in existing:
+                    start, end = month_bounds(month)
+                    cursor.execute(
+                        f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF audit_logs FOR VALUES FROM (%s) TO (%s)',
+                        [start, end]
+                    )
+                    created.append(name)
+                month = add_months(month, 1)
+        return created
+
+    @classmethod
+    def drop_month(cls, month: date) -> int:
+        """Remove exactly the rows of month_bounds(month), the range archive_month streamed
+
+        On PostgreSQL the month's partition is dropped when it holds nothing
+        outside that range; a partition with other bounds (e.g. created in
+        UTC) is emptied by a range delete instead, so no unarchived row goes.
+        """
+        start, end = month_bounds(month)
+        name = cls.partition_name(month)
+        if cls.supported() and name in cls.existing():
+            with transaction.atomic(), connection.cursor() as cursor:
+                # Nothing can land in the partition between the check and the drop
+                cursor.execute(f'LOCK TABLE {name} IN ACCESS EXCLUSIVE MODE')
+                cursor.execute(
+                    f'SELECT count(*) FILTER (WHERE "timestamp" >= %s AND "timestamp" < %s), count(*) FROM {name}',
+                    [start, end]
+                )
+                inside, total = cursor.fetchone()
+                if inside == total:
+                    cursor.execute(f'ALTER TABLE audit_logs DETACH PARTITION {name}')
+                    cursor.execute(f'DROP TABLE {name}')
+                else:
+                    inside = 0
+                # Late rows for the month may sit in the default or a neighbouring partition
+                deleted, _ = AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end).delete()
+            return inside + deleted
+        deleted, _ = AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end).delete()
+        return deleted
+
+class AuditArchiveService:
+    """Streams old months of audit logs to zstd-compressed JSONL under MEDIA_ROOT"""
+
+    FIELDS = [
+        'id', 'user_id', 'content_type_id', 'object_id', 'action', 'field_name',
+        'old_value', 'new_value', 'ip_address', 'user_agent', 'timestamp',
+    ]
+
+    @staticmethod
+    def require_zstandard():
+        if zstandard is None:
+            raise ImportError('zstandard is required for audit log archives (pip install zstandard)')
+
+    @staticmethod
+    def archive_dir() -> str:
+        return audit_settings().get('ARCHIVE_DIR', 'audit_archive')
+
+    @staticmethod
+    def cutoff(retention_months: int) -> date:
+        """First month that is kept in the database"""
+        return add_months(timezone.localdate().replace(day=1), -retention_months)
+
+    @staticmethod
+    def months_before(cutoff: date) -> List[date]:
+        start, _ = month_bounds(cutoff)
+        return [
+            value.date() if isinstance(value, datetime) else value
+            for value in AuditLog.objects.filter(timestamp__lt=start).dates('timestamp', 'month')
+        ]
+
+    @classmethod
+    def archive_month(cls, month: date, chunk_size: int = 2000, level: int = 10) -> Optional[AuditArchive]:
+        """Write one month to disk, record it, then drop it from the database"""
+        cls.require_zstandard()
+        start, end = month_bounds(month)
+        rows = AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end).order_by('-id')
+        bounds = rows.values_list('id', flat=True)
+        first_id, last_id = bounds.last(), bounds.first()
+        if first_id is None:
+            return None
+
+        relative_path = os.path.join(cls.archive_dir(), f'{month:%Y}', f'audit_logs_{month:%Y_%m}_{first_id}-{last_id}.jsonl.zst')
+        full_path = os.path.join(settings.MEDIA_ROOT, relative_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        temp_path = f'{full_path}.tmp'
+
+        count = 0
+        with open(temp_path, 'wb') as raw:
+            with zstandard.ZstdCompressor(level=level).stream_writer(raw, closefd=False) as writer:
+                for row in rows.filter(id__lte=last_id).values(*cls.FIELDS).iterator(chunk_size=chunk_size):
+                    writer.write(json.dumps(row, cls=DjangoJSONEncoder).encode('utf-8') + b'\n')
+                    count += 1
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_path, full_path)
+
+        with transaction.atomic():
+            archive = AuditArchive.objects.create(
+                month=month,
+                file_path=relative_path,
+                row_count=count,
+                size_bytes=os.path.getsize(full_path),
+                first_id=first_id,
+                last_id=last_id,
+                newest_first=True,
+            )
+            if AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end, id__gt=last_id).exists():
+                # Rows arrived while streaming; leave them for the next run
+                AuditLog.objects.filter(timestamp__gte=start, timestamp__lt=end, id__lte=last_id).delete()
+            else:
+                AuditPartitionService.drop_month(month)
+        return archive
+
+class ArchivedAuditLogReader:
+    """Lazily streams archived rows matching filters, newest month first"""
+
+    def __init__(self, filters: Dict[str, Any] = None, date_from: date = None, date_to: date = None):
+        self.filters = {key: str(value) for key, value in (filters or {}).items() if value not in (None, '')}
+        self.date_from = date_from
+        self.date_to = date_to
+
+    def archives(self):
+        archives = AuditArchive.objects.all().order_by('-month', '-first_id')
+        if self.date_from:
+            archives = archives.filter(month__gte=self.date_from.replace(day=1))
+        if self.date_to:
+            archives = archives.filter(month__lte=self.date_to)
+        return archives
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        for key, value in self.filters.items():
+            if str(row.get(key)) != value:
+                return False
+        if self.date_from or self.date_to:
+            day = timezone.localdate(parse_datetime(row['timestamp']))
+            if self.date_from and day < self.date_from:
+                return False
+            if self.date_to and day > self.date_to:
+                return False
+        return True
+
+    def _read(self, archive: AuditArchive) -> Iterator[Dict[str, Any]]:
+        AuditArchiveService.require_zstandard()
+        full_path = os.path.join(settings.MEDIA_ROOT, archive.file_path)
+        with open(full_path, 'rb') as raw:
+            lines = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw), encoding='utf-8')
+            if not archive.newest_first:
+                # Archives written oldest first before newest_first existed; only these are buffered
+                lines = reversed(list(lines))
+            for line in lines:
+                if line.strip():
+                    row = json.loads(line)
+                    if self._matches(row):
+                        yield row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for archive in self.archives():
+            yield from self._read(archive)
+
+    def _covers(self, month: date) -> bool:
+        """Whether every row of the month passes the date range"""
+        return (not self.date_from or month >= self.date_from) and \
+            (not self.date_to or add_months(month, 1) <= self.date_to + timedelta(days=1))
+
+    def count(self) -> int:
+        """Matching rows; archives are immutable, so a filtered count is cached per set of archives"""
+        archives = list(self.archives().values_list('id', 'month', 'row_count'))
+        if not self.filters:
+            # Whole months in the date range count from their row_count without being read
+            partial = [archive for archive in archives if not self._covers(archive[1])]
+            total = sum(row_count for _, month, row_count in archives if self._covers(month))
+        else:
+            partial, total = archives, 0
+        if not partial:
+            return total
+        key = 'audit_archive_count:' + hashlib.sha1(json.dumps(
+            [sorted(self.filters.items()), str(self.date_from), str(self.date_to), [pk for pk, _, _ in partial]]
+        ).encode('utf-8')).hexdigest()
+        counted = cache.get(key)
+        if counted is None:
+            reads = AuditArchive.objects.filter(pk__in=[pk for pk, _, _ in partial]).order_by('-month', '-first_id')
+            counted = sum(1 for archive in reads for _ in self._read(archive))
+            cache.set(key, counted, audit_settings().get('ARCHIVE_COUNT_CACHE_TIMEOUT', 24 * 60 * 60))
+        return total + counted
+
+    @staticmethod
+    def to_instance(row: Dict[str, Any]) -> AuditLog:
+        values = dict(row)
+        values['timestamp'] = parse_datetime(values['timestamp'])
+        return AuditLog(**values)
+
+class CombinedAuditLogSequence:
+    """Live rows followed by archived ones, sliceable for DRF pagination without loading either"""
+
+    def __init__(self, queryset, reader: Optional[ArchivedAuditLogReader]):
+        self.queryset = queryset
+        self.reader = reader
+        self._live_count = None
+        self._archived_count = None
+
+    def live_count(self) -> int:
+        if self._live_count is None:
+            self._live_count = self.queryset.count()
+        return self._live_count
+
+    def count(self) -> int:
+        if self.reader is None:
+            return self.live_count()
+        if self._archived_count is None:
+            self._archived_count = self.reader.count()
+        return self.live_count() + self._archived_count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __iter__(self):
+        return iter(self[0:self.count()])
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop if index.stop is not None else self.count()
+        live_count = self.live_count()
+        results = list(self.queryset[start:min(stop, live_count)]) if start < live_count else []
+        if self.reader is not None and stop > live_count:
+            skip = max(start - live_count, 0)
+            archived = [
+                ArchivedAuditLogReader.to_instance(row)
+                for row in islice(self.reader, skip, stop - live_count)
+            ]
+            prefetch_related_objects(archived, 'user')
+            results.extend(archived)
+        return results
@@ -0,0 +1,52 @@
+# apps/audit/signals.py
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+
+from apps.inspections.models import Inspection
+from apps.transmitters.models import Exciter, Amplifier, Filter, StudioTransmitterLink
+from apps.antennas.models import AntennaSystem
+from .services import AuditService, AuditContext, FormRevisionService, audit_settings
+
+AUDITED_MODELS = [Inspection, Exciter, Amplifier, Filter, StudioTransmitterLink, AntennaSystem]
+
+# Inspection keeps its own as-loaded values (Inspection.from_db), shared with the stats and dashboard signals
+SELF_SNAPSHOTTING_MODELS = {Inspection}
+
+def audit_post_init(sender, instance, **kwargs):
+    """Remember loaded state so saves can be diffed without re-reading the row"""
+    instance._audit_state = AuditService.snapshot(instance)
+
+def audit_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not AuditService.enabled():
+        return
+    if created:
+        records = AuditService.build_records(instance, 'create')
+    else:
+        before = getattr(instance, '_loaded_values' if sender in SELF_SNAPSHOTTING_MODELS else '_audit_state', None)
+        changes = AuditService.diff(instance, before or {})
+        records = AuditService.build_records(instance, 'update', changes) if changes else []
+    if sender not in SELF_SNAPSHOTTING_MODELS:
+        instance._audit_state = AuditService.snapshot(instance)
+    AuditService.record(records)
+
+    if sender is Inspection and records and audit_settings().get('REVISIONS_ENABLED', True):
+        user_id = AuditContext.current()['user_id']
+        transaction.on_commit(lambda: FormRevisionService.create_revision(instance, user_id=user_id))
+
+def audit_post_delete(sender, instance, **kwargs):
+    if AuditService.enabled():
+        AuditService.record(AuditService.build_records(instance, 'delete'))
+
+def flush_after_request(sender, **kwargs):
+    """In 'request' mode, write buffered records once the response has been sent"""
+    if AuditService.mode() == 'request':
+        AuditService.flush()
+
+for audited_model in AUDITED_MODELS:
+    if audited_model not in SELF_SNAPSHOTTING_MODELS:
+        post_init.connect(audit_post_init, sender=audited_model, dispatch_uid=f'audit_{audited_model.__name__}_init')
+    post_save.connect(audit_post_save, sender=audited_model, dispatch_uid=f'audit_{audited_model.__name__}_save')
+    post_delete.connect(audit_post_delete, sender=audited_model, dispatch_uid=f'audit_{audited_model.__name__}_delete')
+
+request_finished.connect(flush_after_request, dispatch_uid='audit_flush_after_request')
@@ -1,3 +1,221 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models.signals import post_init
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.inspections.models import Inspection
+from .models import AuditArchive, AuditLog, FormRevision
+from .services import (
+    ArchivedAuditLogReader, AuditArchiveService, AuditBuffer, AuditContext, AuditService, FormRevisionService,
+    month_bounds,
+)
+
+class AuditArchiveTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='audit_archive_tests_')
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.content_type = ContentType.objects.get_for_model(AuditArchive)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def log(self, object_id, when):
+        return AuditLog.objects.create(content_type=self.content_type, object_id=object_id, action='update',
+                                       field_name='status', new_value=str(object_id), timestamp=when)
+
+    def test_month_round_trips_through_archive_newest_first(self):
+        month = date(2025, 1, 1)
+        start, end = month_bounds(month)
+        for object_id in range(1, 6):
+            self.log(object_id, start + timedelta(days=object_id * 5))
+        # Local midnight opens February: UTC still says January, yet the row is not January's to archive
+        february = self.log(99, timezone.make_aware(datetime.combine(date(2025, 2, 1), time(0, 30))))
+
+        archive = AuditArchiveService.archive_month(month)
+        self.assertEqual(archive.row_count, 5)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, archive.file_path)))
+        self.assertEqual(list(AuditLog.objects.filter(content_type=self.content_type)), [february])
+
+        rows = list(ArchivedAuditLogReader())
+        self.assertEqual([row['object_id'] for row in rows], [5, 4, 3, 2, 1])
+        self.assertEqual(ArchivedAuditLogReader.to_instance(rows[0]).timestamp, start + timedelta(days=25))
+
+        reader = ArchivedAuditLogReader({'object_id': 3})
+        self.assertEqual(reader.count(), 1)
+        # Filtered counts are cached per set of archives; whole months in range count without reading
+        os.remove(os.path.join(self.media_root, archive.file_path))
+        self.assertEqual(ArchivedAuditLogReader({'object_id': 3}).count(), 1)
+        self.assertEqual(ArchivedAuditLogReader(date_from=date(2024, 12, 15), date_to=date(2025, 1, 31)).count(), 5)
+
+@override_settings(AUDIT_SETTINGS={**settings.AUDIT_SETTINGS, 'REVISION_CHECKPOINT_INTERVAL': 4})
+class FormRevisionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='revision-tests', password='unused', employee_id='REVISION-1', department='Testing'
+        )
+        cls.inspection = Inspection.objects.create(
+            form_number='REVISION-0001', inspection_date=timezone.localdate(), inspector=cls.user, station_type='FM'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def record(self, count):
+        """Edit and record the inspection `count` times; returns the form data of each new revision"""
+        recorded = {}
+        for _ in range(count):
+            self.inspection.program_name = f'Programme {len(recorded)}'
+            self.inspection.status = ('draft', 'completed')[len(recorded) % 3 == 2]
+            revision = FormRevisionService.create_revision(self.inspection)
+            recorded[revision.revision_number] = FormRevisionService.form_data(self.inspection)
+        return recorded
+
+    def test_every_revision_reconstructs_before_and_after_compaction(self):
+        recorded = self.record(10)
+        revisions = FormRevision.objects.filter(inspection=self.inspection)
+        checkpoints = revisions.filter(is_checkpoint=True).values_list('revision_number', flat=True)
+        self.assertEqual(sorted(checkpoints), [1, 5, 9])
+        for number, data in recorded.items():
+            self.assertEqual(FormRevisionService.reconstruct(self.inspection.pk, number), data)
+        cache.clear()
+        self.assertEqual(FormRevisionService.latest_state(self.inspection.pk), (10, recorded[10]))
+
+        self.assertEqual(FormRevisionService.compact(self.inspection.pk, keep=4), 6)
+        self.assertEqual(sorted(revisions.values_list('revision_number', flat=True)), [7, 8, 9, 10])
+        self.assertTrue(revisions.get(revision_number=7).is_checkpoint)
+        for number in range(7, 11):
+            self.assertEqual(FormRevisionService.reconstruct(self.inspection.pk, number), recorded[number])
+
+        self.inspection.program_name = 'After compaction'
+        revision = FormRevisionService.create_revision(self.inspection)
+        self.assertEqual(revision.revision_number, 11)
+        self.assertEqual(FormRevisionService.reconstruct(self.inspection.pk, 11),
+                         FormRevisionService.form_data(self.inspection))
+
+    def test_api_returns_full_form_data_for_patch_revisions(self):
+        recorded = self.record(6)
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.user)
+        response = client.get('/api/audit/revisions/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual({row['revision_number']: row['form_data'] for row in results}, recorded)
+
+        detail = client.get(f"/api/audit/revisions/{results[0]['id']}/", secure=True).json()
+        self.assertEqual(detail['form_data'], recorded[6])
+
+class AuditBufferTests(TestCase):
+
+    def setUp(self):
+        self.content_type = ContentType.objects.get_for_model(Inspection)
+        self.written = []
+        bulk_create = mock.patch.object(AuditLog.objects, 'bulk_create',
+                                        side_effect=lambda batch, **kwargs: self.written.append(list(batch)))
+        bulk_create.start()
+        self.addCleanup(bulk_create.stop)
+
+    def records(self, count):
+        return [AuditLog(content_type=self.content_type, object_id=number, action='update') for number in range(count)]
+
+    def test_flush_writes_in_batches(self):
+        buffer = AuditBuffer(batch_size=2, background=False)
+        buffer.put_many(self.records(5))
+        self.assertEqual((buffer.pending(), self.written), (5, []))
+        self.assertEqual(buffer.flush(), 5)
+        self.assertEqual([len(batch) for batch in self.written], [2, 2, 1])
+        self.assertEqual(buffer.pending(), 0)
+
+    def test_full_queue_flushes_instead_of_dropping(self):
+        buffer = AuditBuffer(maxsize=2, batch_size=10, background=False)
+        buffer.put_many(self.records(3))
+        self.assertEqual([len(batch) for batch in self.written], [2])
+        self.assertEqual(buffer.pending(), 1)
+
+    def test_stop_writes_what_the_flusher_has_not(self):
+        buffer = AuditBuffer(batch_size=100, flush_interval=60, background=True)
+        buffer.put_many(self.records(3))
+        self.assertTrue(buffer._thread.is_alive())
+        buffer.stop()
+        self.assertIsNone(buffer._thread)
+        self.assertEqual(sum(len(batch) for batch in self.written), 3)
+        self.assertEqual(buffer.pending(), 0)
+
+    @override_settings(AUDIT_SETTINGS={**settings.AUDIT_SETTINGS, 'MODE': 'request', 'FLUSH_ON_EXIT': True})
+    def test_buffer_is_flushed_on_exit(self):
+        previous = AuditService._buffer, AuditService._exit_hook_registered
+        self.addCleanup(lambda: setattr(AuditService, '_buffer', previous[0]))
+        self.addCleanup(lambda: setattr(AuditService, '_exit_hook_registered', previous[1]))
+        AuditService._buffer, AuditService._exit_hook_registered = None, False
+        with mock.patch('apps.audit.services.atexit.register') as register:
+            AuditService.buffer().put_many(self.records(2))
+            AuditService.buffer()
+        register.assert_called_once_with(AuditService.shutdown)
+        self.assertEqual(AuditService.shutdown(), 2)
+        self.assertEqual(sum(len(batch) for batch in self.written), 2)
+
+@override_settings(AUDIT_SETTINGS={**settings.AUDIT_SETTINGS, 'MODE': 'sync', 'REVISIONS_ENABLED': False})
+class AuditCaptureTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='audit-tests', password='unused', employee_id='AUDIT-1', department='Testing'
+        )
+        cls.inspection = Inspection.objects.create(
+            form_number='AUDIT-0001', inspection_date=timezone.localdate(), inspector=cls.user, station_type='FM'
+        )
+
+    def logs(self):
+        return AuditLog.objects.filter(object_id=self.inspection.pk).exclude(action='create').order_by('id')
+
+    def test_middleware_records_the_user_and_client_address(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f'/api/inspections/inspections/{self.inspection.pk}/', {'program_name': 'News'},
+                                    format='json', secure=True, HTTP_X_FORWARDED_FOR='203.0.113.7, 10.0.0.1',
+                                    HTTP_USER_AGENT='audit-tests')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(log.action, log.field_name, log.new_value, log.user_id, log.ip_address, log.user_agent) for log in self.logs()],
+            [('update', 'program_name', 'News', self.user.pk, '203.0.113.7', 'audit-tests')]
+        )
+        # The request's details do not leak into later saves on this thread
+        self.assertEqual(AuditContext.current()['user_id'], None)
+
+    def test_auto_save_requests_are_recorded_as_auto_saves(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = APIClient(SERVER_NAME='localhost').post(
+                f'/api/inspections/inspections/{self.inspection.pk}/auto-save/', {}, format='json', secure=True
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(log.action, log.field_name, log.user_id, log.ip_address) for log in self.logs()],
+                         [('auto_save', 'is_auto_saved', None, '127.0.0.1')])
+
+    def test_saves_diff_against_the_shared_loaded_state(self):
+        # Inspection keeps its own as-loaded values; no post_init receiver runs on every load
+        self.assertFalse(post_init.has_listeners(Inspection))
+        inspection = Inspection.objects.only('status', 'program_name').get(pk=self.inspection.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            inspection.status = 'completed'
+            inspection.save(update_fields=['status'])
+        with self.captureOnCommitCallbacks(execute=True):
+            inspection.program_name = 'News'
+            inspection.save(update_fields=['program_name'])
+        self.assertEqual([(log.field_name, log.old_value, log.new_value) for log in self.logs()],
+                         [('status', 'draft', 'completed'), ('program_name', '', 'News')])
@@ -1,7 +1,11 @@
 # apps/audit/views.py
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.utils.dateparse import parse_date
 from .models import AuditLog, FormRevision
+from .services import FormRevisionService, ArchivedAuditLogReader, CombinedAuditLogSequence
 from rest_framework import serializers
 
 class AuditLogSerializer(serializers.ModelSerializer):
@@ -13,17 +17,86 @@ class AuditLogSerializer(serializers.ModelSerializer):
 
 class FormRevisionSerializer(serializers.ModelSerializer):
     revised_by_name = serializers.CharField(source='revised_by.get_full_name', read_only=True)
+    # Rows between checkpoints store JSON patches; clients always get the full form
+    form_data = serializers.SerializerMethodField()
     
     class Meta:
         model = FormRevision
         fields = '__all__'
 
+    def get_form_data(self, obj):
+        if obj.is_checkpoint:
+            return obj.form_data
+        snapshot = getattr(obj, 'snapshot', None)
+        if snapshot is None:
+            snapshot = FormRevisionService.reconstruct(obj.inspection_id, obj.revision_number)
+        return snapshot
+
 class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AuditLog.objects.select_related('user')
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
 
+    # Query param -> AuditLog column, shared with the archive reader
+    FILTER_FIELDS = {
+        'content_type': 'content_type_id',
+        'object_id': 'object_id',
+        'user': 'user_id',
+        'action': 'action',
+    }
+
+    def _filters(self):
+        params = self.request.query_params
+        return {column: params[param] for param, column in self.FILTER_FIELDS.items() if params.get(param)}
+
+    def _date_range(self):
+        params = self.request.query_params
+        return parse_date(params.get('date_from') or ''), parse_date(params.get('date_to') or '')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(**self._filters())
+        date_from, date_to = self._date_range()
+        if date_from:
+            queryset = queryset.filter(timestamp__date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(timestamp__date__lte=date_to)
+        return queryset.order_by('-timestamp', '-id')
+
+    def list(self, request, *args, **kwargs):
+        """Live rows first, then archived months when include_archived=true"""
+        reader = None
+        if request.query_params.get('include_archived') == 'true':
+            date_from, date_to = self._date_range()
+            reader = ArchivedAuditLogReader(self._filters(), date_from, date_to)
+        sequence = CombinedAuditLogSequence(self.get_queryset(), reader)
+
+        page = self.paginate_queryset(sequence)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(list(sequence), many=True).data)
+
 class FormRevisionViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = FormRevision.objects.select_related('inspection', 'revised_by')
     serializer_class = FormRevisionSerializer
-    permission_classes = [IsAuthenticated]
\ No newline at end of file
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        """Revisions with their full form data, rebuilt in one pass per inspection on the page"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        revisions = list(queryset) if page is None else page
+        snapshots = FormRevisionService.snapshots(revisions)
+        for revision in revisions:
+            revision.snapshot = snapshots.get((revision.inspection_id, revision.revision_number))
+        data = self.get_serializer(revisions, many=True).data
+        return Response(data) if page is None else self.get_paginated_response(data)
+    
+    @action(detail=True, methods=['get'])
+    def snapshot(self, request, pk=None):
+        """Full form data at this revision, rebuilt from the nearest checkpoint"""
+        revision = self.get_object()
+        return Response({
+            'inspection': revision.inspection_id,
+            'revision_number': revision.revision_number,
+            'form_data': FormRevisionService.reconstruct(revision.inspection_id, revision.revision_number),
+        })
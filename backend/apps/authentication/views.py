@@ -9,6 +9,9 @@ from django.contrib.auth import login, logout, authenticate
 from django.http import JsonResponse
 from .models import CAUser
 from .serializers import CAUserSerializer, LoginSerializer, CurrentUserSerializer
+import logging
+
+logger = logging.getLogger(__name__)
 
 # SIMPLE TEST VIEWS - NO AUTHENTICATION REQUIRED
 @api_view(['GET'])
@@ -30,7 +33,8 @@ class LoginView(APIView):
     permission_classes = [AllowAny]
     
     def post(self, request):
-        print(f"🔐 Login attempt with data: {request.data}")
+        # Never log the payload: it carries the password
+        logger.debug("Login attempt for %s", request.data.get('username'))
         
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
@@ -39,8 +43,7 @@ class LoginView(APIView):
             # Create or get token for the user
             token, created = Token.objects.get_or_create(user=user)
             
-            print(f"✅ Login successful for user: {user.username}")
-            print(f"🎯 Generated token: {token.key[:10]}...")
+            logger.debug("Login successful for %s (new token: %s)", user.username, created)
             
             # Also login for session-based endpoints
             login(request, user)
@@ -53,7 +56,7 @@ class LoginView(APIView):
                 'key': token.key  # Another alternative name
             })
         
-        print(f"❌ Login failed: {serializer.errors}")
+        logger.debug("Login failed for %s: %s", request.data.get('username'), serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class LogoutView(APIView):
@@ -65,7 +68,7 @@ class LogoutView(APIView):
             try:
                 token = Token.objects.get(user=request.user)
                 token.delete()
-                print(f"🔓 Deleted token for user: {request.user.username}")
+                logger.debug("Deleted token for %s", request.user.username)
             except Token.DoesNotExist:
                 pass
         
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from .models import Manufacturer, EquipmentModel, EquipmentSighting, TypeApproval
+
+@admin.register(Manufacturer)
+class ManufacturerAdmin(admin.ModelAdmin):
+    list_display = ('name', 'canonical_name', 'created_at')
+    search_fields = ('name', 'canonical_name')
+
+@admin.register(EquipmentModel)
+class EquipmentModelAdmin(admin.ModelAdmin):
+    list_display = ('manufacturer', 'model_number', 'canonical_model', 'created_at')
+    list_filter = ('manufacturer',)
+    search_fields = ('manufacturer__canonical_name', 'canonical_model', 'model_number')
+
+@admin.register(EquipmentSighting)
+class EquipmentSightingAdmin(admin.ModelAdmin):
+    list_display = ('category', 'equipment_model', 'serial_number', 'site_name', 'broadcaster', 'seen_on', 'source_type')
+    list_filter = ('category', 'source_type', 'seen_on')
+    search_fields = ('canonical_serial', 'site_name', 'equipment_model__canonical_model', 'broadcaster__name')
+    readonly_fields = ('source_type', 'source_id', 'created_at', 'updated_at')
+
+@admin.register(TypeApproval)
+class TypeApprovalAdmin(admin.ModelAdmin):
+    list_display = ('manufacturer', 'model_number', 'status', 'certificate_number', 'valid_until', 'updated_at')
+    list_filter = ('status', 'valid_until')
+    search_fields = ('approval_key', 'manufacturer', 'model_number', 'certificate_number')
+    readonly_fields = ('canonical_manufacturer', 'canonical_model', 'approval_key', 'created_at', 'updated_at')
@@ -0,0 +1,11 @@
+# apps/equipment/apps.py
+from django.apps import AppConfig
+
+class EquipmentConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.equipment'
+    verbose_name = 'Equipment Registry'
+    
+    def ready(self):
+        """Connect catalog sync signals"""
+        import apps.equipment.signals  # noqa: F401
@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand
+
+from apps.inspections.models import Inspection
+from apps.equipment.models import EquipmentSighting
+from apps.equipment.services import EquipmentRegistryService, INSPECTION_EQUIPMENT_FIELDS
+from apps.equipment.signals import RECORD_SOURCES
+
+class Command(BaseCommand):
+    help = 'Backfill the equipment registry from inspections and equipment records'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows fetched and inserted per batch')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Delete existing sightings before backfilling; without it they are not refreshed')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        service = EquipmentRegistryService()
+
+        if options['rebuild']:
+            deleted, _ = EquipmentSighting.objects.all().delete()
+            self.stdout.write(f'Deleted {deleted} existing sightings')
+
+        # Inspections: only load the columns the registry reads
+        inspection_fields = ['id', 'broadcaster_id', 'transmitting_site_name', 'inspection_date']
+        for fields in INSPECTION_EQUIPMENT_FIELDS.values():
+            inspection_fields.extend(f for f in fields if f)
+
+        inspections = Inspection.objects.only(*inspection_fields).order_by('pk').iterator(chunk_size=batch_size)
+        inserted, present = self._stream(
+            service,
+            (service.entries_from_inspection(inspection) for inspection in inspections),
+            batch_size
+        )
+        self.stdout.write(f'Inspections: {inserted} sightings inserted, {present} already present')
+
+        for record_model, (source_type, category) in RECORD_SOURCES.items():
+            records = record_model.objects.select_related('general_data').order_by('pk').iterator(chunk_size=batch_size)
+            inserted, present = self._stream(
+                service,
+                (service.entries_from_record(source_type, category, record, record.general_data) for record in records),
+                batch_size
+            )
+            self.stdout.write(f'{record_model.__name__}: {inserted} sightings inserted, {present} already present')
+
+        self.stdout.write(self.style.SUCCESS('Equipment registry backfill complete'))
+
+    def _stream(self, service, entry_lists, batch_size):
+        """Insert sightings in batches; returns (rows inserted, rows already present)
+
+        Only missing (source, category) rows are added. Sightings that
+        already exist are left as they are, so after changing how names are
+        canonicalized run with --rebuild to refresh them.
+        """
+        inserted = present = 0
+        batch = []
+        for entries in entry_lists:
+            batch.extend(entries)
+            if len(batch) >= batch_size:
+                counts = self._insert(service, batch)
+                inserted, present = inserted + counts[0], present + counts[1]
+                batch = []
+        if batch:
+            counts = self._insert(service, batch)
+            inserted, present = inserted + counts[0], present + counts[1]
+        return inserted, present
+
+    @staticmethod
+    def _existing_keys(entries):
+        keys = {(entry['source_type'], entry['source_id'], entry['category']) for entry in entries}
+        rows = EquipmentSighting.objects.filter(
+            source_type__in={key[0] for key in keys}, source_id__in={key[1] for key in keys}
+        ).values_list('source_type', 'source_id', 'category')
+        return keys.intersection(rows)
+
+    def _insert(self, service, entries):
+        """Insert the entries without a sighting yet; ignore_conflicts covers rows saved meanwhile"""
+        existing = self._existing_keys(entries)
+        missing = [
+            entry for entry in entries
+            if (entry['source_type'], entry['source_id'], entry['category']) not in existing
+        ]
+        if missing:
+            EquipmentSighting.objects.bulk_create([service.build_sighting(entry) for entry in missing],
+                                                  ignore_conflicts=True)
+        # bulk_create cannot say which rows ignore_conflicts dropped; count the missing keys that exist now
+        inserted = len(self._existing_keys(missing)) if missing else 0
+        return inserted, len(existing)
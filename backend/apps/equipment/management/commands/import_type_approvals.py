@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.equipment.services import TypeApprovalRegistry
+
+class Command(BaseCommand):
+    help = 'Bulk import the type-approval register from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', type=str, help='CSV with manufacturer, model_number, status, certificate_number, valid_until, notes columns')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as csv_file:
+                result = TypeApprovalRegistry.import_csv(csv_file)
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(f'Cannot read {options["csv_path"]}: {e}')
+
+        for error in result['errors']:
+            self.stdout.write(self.style.WARNING(f"Line {error['line']}: {error['error']}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Type approvals imported: {result['created']} created, {result['updated']} updated"
+        ))
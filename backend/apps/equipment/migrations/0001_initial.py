@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('broadcasters', '0003_generaldata_air_status_generaldata_off_air_reason_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Manufacturer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display name as first seen', max_length=255)),
+                ('canonical_name', models.CharField(help_text='Normalized name used for matching', max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'equipment_manufacturers',
+                'ordering': ['canonical_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EquipmentModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_number', models.CharField(help_text='Display model number as first seen', max_length=255)),
+                ('canonical_model', models.CharField(help_text='Normalized model number used for matching', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('manufacturer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='models', to='equipment.manufacturer')),
+            ],
+            options={
+                'db_table': 'equipment_models',
+                'ordering': ['manufacturer__canonical_name', 'canonical_model'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EquipmentSighting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('exciter', 'Exciter'), ('amplifier', 'Amplifier'), ('filter', 'Filter'), ('antenna', 'Antenna'), ('stl', 'Studio to Transmitter Link')], max_length=20)),
+                ('serial_number', models.CharField(blank=True, max_length=255)),
+                ('canonical_serial', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('source_type', models.CharField(choices=[('inspection', 'Inspection Form'), ('exciter', 'Exciter Record'), ('amplifier', 'Amplifier Record'), ('filter', 'Filter Record'), ('antenna_system', 'Antenna System Record'), ('studio_link', 'Studio Link Record')], max_length=20)),
+                ('source_id', models.PositiveIntegerField()),
+                ('site_name', models.CharField(blank=True, max_length=255)),
+                ('seen_on', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('broadcaster', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='equipment_sightings', to='broadcasters.broadcaster')),
+                ('equipment_model', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sightings', to='equipment.equipmentmodel')),
+            ],
+            options={
+                'db_table': 'equipment_sightings',
+                'ordering': ['-seen_on', '-id'],
+                'indexes': [models.Index(fields=['equipment_model', 'seen_on'], name='equipment_s_equipme_264cb5_idx')],
+                'unique_together': {('source_type', 'source_id', 'category')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='equipmentmodel',
+            index=models.Index(fields=['canonical_model'], name='equipment_m_canonic_748f71_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='equipmentmodel',
+            unique_together={('manufacturer', 'canonical_model')},
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TypeApproval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('manufacturer', models.CharField(max_length=255)),
+                ('model_number', models.CharField(max_length=255)),
+                ('canonical_manufacturer', models.CharField(editable=False, max_length=255)),
+                ('canonical_model', models.CharField(editable=False, max_length=255)),
+                ('approval_key', models.CharField(editable=False, help_text="Normalized 'MANUFACTURER MODEL' key", max_length=511, unique=True)),
+                ('status', models.CharField(choices=[('approved', 'Type Approved'), ('not_approved', 'Not Type Approved'), ('revoked', 'Approval Revoked')], default='approved', max_length=20)),
+                ('certificate_number', models.CharField(blank=True, max_length=100)),
+                ('valid_until', models.DateField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'type_approvals',
+                'ordering': ['approval_key'],
+                'indexes': [models.Index(fields=['canonical_manufacturer', 'canonical_model'], name='type_approv_canonic_3f5610_idx')],
+            },
+        ),
+    ]
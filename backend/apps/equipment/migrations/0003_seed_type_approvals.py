@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Equipment previously hardcoded as non-approved in violation detection
+NON_APPROVED_EQUIPMENT = [
+    ('MAXIVA GATEAIR', 'XTE'),
+    ('NEC', 'HPB-1210'),
+]
+
+
+def seed_type_approvals(apps, schema_editor):
+    TypeApproval = apps.get_model('equipment', 'TypeApproval')
+    for manufacturer, model_number in NON_APPROVED_EQUIPMENT:
+        TypeApproval.objects.get_or_create(
+            approval_key=f'{manufacturer} {model_number}',
+            defaults={
+                'manufacturer': manufacturer,
+                'model_number': model_number,
+                'canonical_manufacturer': manufacturer,
+                'canonical_model': model_number,
+                'status': 'not_approved',
+            }
+        )
+
+
+def unseed_type_approvals(apps, schema_editor):
+    TypeApproval = apps.get_model('equipment', 'TypeApproval')
+    TypeApproval.objects.filter(
+        approval_key__in=[f'{manufacturer} {model_number}' for manufacturer, model_number in NON_APPROVED_EQUIPMENT]
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0002_typeapproval'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_type_approvals, unseed_type_approvals),
+    ]
@@ -0,0 +1,144 @@
+# apps/equipment/models.py
+from django.db import models
+from apps.broadcasters.models import Broadcaster
+
+class Manufacturer(models.Model):
+    """Deduplicated equipment manufacturer"""
+    name = models.CharField(max_length=255, help_text="Display name as first seen")
+    canonical_name = models.CharField(max_length=255, unique=True, help_text="Normalized name used for matching")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name or 'Unknown Manufacturer'
+
+    class Meta:
+        db_table = 'equipment_manufacturers'
+        ordering = ['canonical_name']
+
+class EquipmentModel(models.Model):
+    """Deduplicated manufacturer/model pair"""
+    manufacturer = models.ForeignKey(Manufacturer, on_delete=models.CASCADE, related_name='models')
+    model_number = models.CharField(max_length=255, help_text="Display model number as first seen")
+    canonical_model = models.CharField(max_length=255, help_text="Normalized model number used for matching")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.manufacturer} {self.model_number}".strip()
+
+    @property
+    def catalog_key(self):
+        """Normalized 'MANUFACTURER MODEL' key"""
+        return f"{self.manufacturer.canonical_name} {self.canonical_model}".strip()
+
+    class Meta:
+        db_table = 'equipment_models'
+        ordering = ['manufacturer__canonical_name', 'canonical_model']
+        unique_together = ['manufacturer', 'canonical_model']
+        indexes = [
+            models.Index(fields=['canonical_model']),
+        ]
+
+class EquipmentSighting(models.Model):
+    """A piece of equipment seen at a site, from an inspection or an equipment record"""
+    CATEGORY_CHOICES = [
+        ('exciter', 'Exciter'),
+        ('amplifier', 'Amplifier'),
+        ('filter', 'Filter'),
+        ('antenna', 'Antenna'),
+        ('stl', 'Studio to Transmitter Link'),
+    ]
+
+    SOURCE_CHOICES = [
+        ('inspection', 'Inspection Form'),
+        ('exciter', 'Exciter Record'),
+        ('amplifier', 'Amplifier Record'),
+        ('filter', 'Filter Record'),
+        ('antenna_system', 'Antenna System Record'),
+        ('studio_link', 'Studio Link Record'),
+    ]
+
+    equipment_model = models.ForeignKey(
+        EquipmentModel,
+        on_delete=models.CASCADE,
+        related_name='sightings',
+        null=True,
+        blank=True
+    )
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    serial_number = models.CharField(max_length=255, blank=True)
+    canonical_serial = models.CharField(max_length=255, blank=True, db_index=True)
+
+    # Where the row came from (one sighting per source row and category)
+    source_type = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    source_id = models.PositiveIntegerField()
+
+    # Site snapshot so lookups never touch the source tables
+    broadcaster = models.ForeignKey(
+        Broadcaster,
+        on_delete=models.SET_NULL,
+        related_name='equipment_sightings',
+        null=True,
+        blank=True
+    )
+    site_name = models.CharField(max_length=255, blank=True)
+    seen_on = models.DateField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        equipment = self.equipment_model or self.serial_number or 'Unknown equipment'
+        return f"{self.get_category_display()} {equipment} @ {self.site_name or 'Unknown site'}"
+
+    class Meta:
+        db_table = 'equipment_sightings'
+        ordering = ['-seen_on', '-id']
+        unique_together = ['source_type', 'source_id', 'category']
+        indexes = [
+            models.Index(fields=['equipment_model', 'seen_on']),
+        ]
+
+class TypeApproval(models.Model):
+    """Type-approval register entry keyed by normalized manufacturer/model"""
+    STATUS_CHOICES = [
+        ('approved', 'Type Approved'),
+        ('not_approved', 'Not Type Approved'),
+        ('revoked', 'Approval Revoked'),
+    ]
+
+    manufacturer = models.CharField(max_length=255)
+    model_number = models.CharField(max_length=255)
+    canonical_manufacturer = models.CharField(max_length=255, editable=False)
+    canonical_model = models.CharField(max_length=255, editable=False)
+    approval_key = models.CharField(max_length=511, unique=True, editable=False, help_text="Normalized 'MANUFACTURER MODEL' key")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='approved')
+    certificate_number = models.CharField(max_length=100, blank=True)
+    valid_until = models.DateField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        from .services import canonicalize
+        self.canonical_manufacturer = canonicalize(self.manufacturer)
+        self.canonical_model = canonicalize(self.model_number)
+        self.approval_key = f"{self.canonical_manufacturer} {self.canonical_model}".strip()
+        super().save(*args, **kwargs)
+
+    @property
+    def is_approved(self):
+        return self.status == 'approved'
+
+    def __str__(self):
+        return f"{self.manufacturer} {self.model_number} ({self.get_status_display()})"
+
+    class Meta:
+        db_table = 'type_approvals'
+        ordering = ['approval_key']
+        indexes = [
+            models.Index(fields=['canonical_manufacturer', 'canonical_model']),
+        ]
@@ -0,0 +1,31 @@
+# apps/equipment/serializers.py
+from rest_framework import serializers
+from .models import Manufacturer, EquipmentModel, EquipmentSighting, TypeApproval
+
+class ManufacturerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Manufacturer
+        fields = '__all__'
+
+class EquipmentModelSerializer(serializers.ModelSerializer):
+    manufacturer_name = serializers.CharField(source='manufacturer.name', read_only=True)
+    catalog_key = serializers.CharField(read_only=True)
+    
+    class Meta:
+        model = EquipmentModel
+        fields = '__all__'
+
+class EquipmentSightingSerializer(serializers.ModelSerializer):
+    manufacturer = serializers.CharField(source='equipment_model.manufacturer.name', read_only=True, allow_null=True)
+    model_number = serializers.CharField(source='equipment_model.model_number', read_only=True, allow_null=True)
+    broadcaster_name = serializers.CharField(source='broadcaster.name', read_only=True, allow_null=True)
+    
+    class Meta:
+        model = EquipmentSighting
+        fields = '__all__'
+
+class TypeApprovalSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TypeApproval
+        fields = '__all__'
+        read_only_fields = ('canonical_manufacturer', 'canonical_model', 'approval_key', 'created_at', 'updated_at')
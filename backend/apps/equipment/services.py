@@ -0,0 +1,355 @@
+# apps/equipment/services.py
+import csv
+import io
+import re
+import threading
+import uuid
+from typing import Dict, List, Any, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Manufacturer, EquipmentModel, EquipmentSighting, TypeApproval
+
+# Free-text values inspectors type when a field could not be read on site
+PLACEHOLDER_VALUES = {
+    'NOT SEEN', 'NOT SPECIFIED', 'NOT AVAILABLE', 'UNKNOWN', 'NONE', 'NIL',
+    'N/A', 'NA', 'TBD', '-', '--',
+}
+
+_NON_CATALOG_CHARS = re.compile(r'[^A-Z0-9/\-\.\+ ]')
+_WHITESPACE = re.compile(r'\s+')
+_NON_SERIAL_CHARS = re.compile(r'[^A-Z0-9]')
+
+# Inspection form columns per equipment category: (manufacturer, model, serial)
+INSPECTION_EQUIPMENT_FIELDS = {
+    'exciter': ('exciter_manufacturer', 'exciter_model_number', 'exciter_serial_number'),
+    'amplifier': ('amplifier_manufacturer', 'amplifier_model_number', 'amplifier_serial_number'),
+    'filter': ('filter_manufacturer', 'filter_model_number', 'filter_serial_number'),
+    'antenna': ('antenna_manufacturer', 'antenna_model_number', None),
+    'stl': ('studio_manufacturer', 'studio_model_number', 'studio_serial_number'),
+}
+
+SIGHTING_SYNC_FIELDS = (
+    'equipment_model_id', 'serial_number', 'canonical_serial',
+    'broadcaster_id', 'site_name', 'seen_on',
+)
+
+def canonicalize(value) -> str:
+    """Normalize a manufacturer or model string for matching ('Maxiva  gatesair' -> 'MAXIVA GATESAIR')"""
+    if not value:
+        return ''
+    cleaned = _NON_CATALOG_CHARS.sub(' ', str(value).upper())
+    cleaned = _WHITESPACE.sub(' ', cleaned).strip()
+    return '' if cleaned in PLACEHOLDER_VALUES else cleaned
+
+def canonicalize_serial(value) -> str:
+    """Normalize a serial number by dropping case, spaces and separators"""
+    if not value:
+        return ''
+    upper = _WHITESPACE.sub(' ', str(value).upper()).strip()
+    if upper in PLACEHOLDER_VALUES:
+        return ''
+    return _NON_SERIAL_CHARS.sub('', upper)
+
+def catalog_key(manufacturer, model_number) -> str:
+    """Normalized 'MANUFACTURER MODEL' key shared with type-approval checks"""
+    return f"{canonicalize(manufacturer)} {canonicalize(model_number)}".strip()
+
+class EquipmentRegistryService:
+    """Keeps the equipment catalog and serial index in sync with source rows"""
+
+    def __init__(self):
+        # Per-instance memo so backfills resolve each model once
+        self._model_ids: Dict[Tuple[str, str], int] = {}
+
+    # ---------- extraction ----------
+
+    @staticmethod
+    def entries_from_inspection(inspection) -> List[Dict[str, Any]]:
+        """Equipment entries typed into an inspection form"""
+        entries = []
+        for category, (mfr_field, model_field, serial_field) in INSPECTION_EQUIPMENT_FIELDS.items():
+            entry = EquipmentRegistryService._build_entry(
+                category,
+                getattr(inspection, mfr_field, None),
+                getattr(inspection, model_field, None),
+                getattr(inspection, serial_field, None) if serial_field else None,
+            )
+            if entry:
+                entry.update({
+                    'source_type': 'inspection',
+                    'source_id': inspection.pk,
+                    'broadcaster_id': inspection.broadcaster_id,
+                    'site_name': inspection.transmitting_site_name or '',
+                    'seen_on': inspection.inspection_date,
+                })
+                entries.append(entry)
+        return entries
+
+    @staticmethod
+    def entries_from_record(source_type, category, record, general_data) -> List[Dict[str, Any]]:
+        """Equipment entry for an Exciter/Amplifier/Filter/AntennaSystem/StudioTransmitterLink row"""
+        entry = EquipmentRegistryService._build_entry(
+            category,
+            record.manufacturer,
+            record.model_number,
+            getattr(record, 'serial_number', None),
+        )
+        if not entry:
+            return []
+        entry.update({
+            'source_type': source_type,
+            'source_id': record.pk,
+            'broadcaster_id': general_data.broadcaster_id if general_data else None,
+            'site_name': general_data.transmitting_site_name if general_data else '',
+            'seen_on': record.created_at.date() if record.created_at else None,
+        })
+        return [entry]
+
+    @staticmethod
+    def _build_entry(category, manufacturer, model_number, serial_number) -> Optional[Dict[str, Any]]:
+        canonical_mfr = canonicalize(manufacturer)
+        canonical_model = canonicalize(model_number)
+        canonical_serial = canonicalize_serial(serial_number)
+
+        if not (canonical_mfr or canonical_model or canonical_serial):
+            return None
+
+        return {
+            'category': category,
+            'manufacturer': (manufacturer or '').strip(),
+            'model_number': (model_number or '').strip(),
+            'canonical_manufacturer': canonical_mfr,
+            'canonical_model': canonical_model,
+            'serial_number': (serial_number or '').strip() if canonical_serial else '',
+            'canonical_serial': canonical_serial,
+        }
+
+    # ---------- catalog ----------
+
+    def resolve_model_id(self, entry) -> Optional[int]:
+        """Get or create the catalog row for an entry's manufacturer/model"""
+        if not (entry['canonical_manufacturer'] or entry['canonical_model']):
+            return None
+
+        key = (entry['canonical_manufacturer'], entry['canonical_model'])
+        if key in self._model_ids:
+            return self._model_ids[key]
+
+        manufacturer, _ = Manufacturer.objects.get_or_create(
+            canonical_name=entry['canonical_manufacturer'],
+            defaults={'name': entry['manufacturer'] or 'Unknown'}
+        )
+        equipment_model, _ = EquipmentModel.objects.get_or_create(
+            manufacturer=manufacturer,
+            canonical_model=entry['canonical_model'],
+            defaults={'model_number': entry['model_number']}
+        )
+        self._model_ids[key] = equipment_model.id
+        return equipment_model.id
+
+    def build_sighting(self, entry) -> EquipmentSighting:
+        return EquipmentSighting(
+            equipment_model_id=self.resolve_model_id(entry),
+            category=entry['category'],
+            serial_number=entry['serial_number'],
+            canonical_serial=entry['canonical_serial'],
+            source_type=entry['source_type'],
+            source_id=entry['source_id'],
+            broadcaster_id=entry['broadcaster_id'],
+            site_name=entry['site_name'],
+            seen_on=entry['seen_on'],
+        )
+
+    # ---------- sync ----------
+
+    @transaction.atomic
+    def sync_source(self, source_type, source_id, entries: List[Dict[str, Any]]):
+        """Make the sightings of one source row match its current entries"""
+        existing = {
+            sighting.category: sighting
+            for sighting in EquipmentSighting.objects.filter(
+                source_type=source_type, source_id=source_id
+            ).select_related('equipment_model__manufacturer')
+        }
+
+        for entry in entries:
+            sighting = existing.pop(entry['category'], None)
+            if sighting and self._is_unchanged(sighting, entry):
+                continue
+
+            fresh = self.build_sighting(entry)
+            if sighting:
+                for field in SIGHTING_SYNC_FIELDS:
+                    setattr(sighting, field, getattr(fresh, field))
+                sighting.save()
+            else:
+                fresh.save()
+
+        if existing:
+            EquipmentSighting.objects.filter(pk__in=[s.pk for s in existing.values()]).delete()
+
+    @staticmethod
+    def _is_unchanged(sighting, entry) -> bool:
+        model = sighting.equipment_model
+        model_key = (model.manufacturer.canonical_name, model.canonical_model) if model else ('', '')
+        return (
+            model_key == (entry['canonical_manufacturer'], entry['canonical_model'])
+            and sighting.canonical_serial == entry['canonical_serial']
+            and sighting.broadcaster_id == entry['broadcaster_id']
+            and sighting.site_name == entry['site_name']
+            and sighting.seen_on == entry['seen_on']
+        )
+
+    def sync_inspection(self, inspection):
+        self.sync_source('inspection', inspection.pk, self.entries_from_inspection(inspection))
+
+    @staticmethod
+    def remove_source(source_type, source_id):
+        EquipmentSighting.objects.filter(source_type=source_type, source_id=source_id).delete()
+
+    # ---------- lookups ----------
+
+    @staticmethod
+    def sightings_for(serial=None, manufacturer=None, model=None):
+        """Indexed lookup of sightings by serial and/or manufacturer/model"""
+        queryset = EquipmentSighting.objects.select_related(
+            'equipment_model__manufacturer', 'broadcaster'
+        )
+        if serial:
+            queryset = queryset.filter(canonical_serial=canonicalize_serial(serial))
+        if model:
+            queryset = queryset.filter(equipment_model__canonical_model=canonicalize(model))
+        if manufacturer:
+            queryset = queryset.filter(equipment_model__manufacturer__canonical_name=canonicalize(manufacturer))
+        return queryset
+
+
+class TypeApprovalRegistry:
+    """Process-wide hash map of approval_key -> status, reloaded when the cached version stamp changes"""
+
+    CACHE_VERSION_KEY = 'equipment:type_approval_registry_version'
+
+    _lock = threading.Lock()
+    _statuses: Dict[str, str] = {}
+    _version: Optional[str] = None
+
+    @classmethod
+    def bump_version(cls):
+        """Invalidate every process's copy of the registry"""
+        cache.set(cls.CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+    @classmethod
+    def statuses(cls) -> Dict[str, str]:
+        """Current registry map; costs one cache read and reloads from the DB only on version change"""
+        version = cache.get(cls.CACHE_VERSION_KEY)
+        if version is not None and version == cls._version:
+            return cls._statuses
+
+        with cls._lock:
+            if version is None:
+                version = uuid.uuid4().hex
+                cache.add(cls.CACHE_VERSION_KEY, version, None)
+                version = cache.get(cls.CACHE_VERSION_KEY, version)
+            if version != cls._version:
+                cls._statuses = dict(TypeApproval.objects.values_list('approval_key', 'status'))
+                cls._version = version
+        return cls._statuses
+
+    @classmethod
+    def status_for(cls, manufacturer, model_number, statuses=None) -> Optional[str]:
+        """Registry status for a manufacturer/model, or None if not registered"""
+        key = catalog_key(manufacturer, model_number)
+        if not key:
+            return None
+        return (statuses if statuses is not None else cls.statuses()).get(key)
+
+    @classmethod
+    def is_non_approved(cls, manufacturer, model_number, statuses=None) -> bool:
+        """True when the register explicitly lists the equipment as not (or no longer) approved"""
+        status = cls.status_for(manufacturer, model_number, statuses)
+        return status is not None and status != 'approved'
+
+    @classmethod
+    @transaction.atomic
+    def import_csv(cls, csv_file) -> Dict[str, Any]:
+        """Bulk upsert register entries from CSV (manufacturer, model_number, status, certificate_number, valid_until, notes)"""
+        if isinstance(csv_file, (bytes, bytearray)):
+            csv_file = io.StringIO(csv_file.decode('utf-8-sig'))
+
+        valid_statuses = {choice for choice, _ in TypeApproval.STATUS_CHOICES}
+        rows: Dict[str, TypeApproval] = {}
+        errors = []
+
+        for line_number, row in enumerate(csv.DictReader(csv_file), start=2):
+            row = {(k or '').strip().lower(): (v or '').strip() for k, v in row.items()}
+            manufacturer = row.get('manufacturer', '')
+            model_number = row.get('model_number') or row.get('model', '')
+            status = (row.get('status') or 'approved').lower()
+
+            canonical_mfr = canonicalize(manufacturer)
+            canonical_model = canonicalize(model_number)
+            if not (canonical_mfr or canonical_model):
+                errors.append({'line': line_number, 'error': 'manufacturer or model_number is required'})
+                continue
+            if status not in valid_statuses:
+                errors.append({'line': line_number, 'error': f'Invalid status: {status}'})
+                continue
+
+            valid_until = None
+            if row.get('valid_until'):
+                try:
+                    valid_until = parse_date(row['valid_until'])
+                except ValueError:
+                    # Well formed but impossible, e.g. 2025-02-30
+                    pass
+                if valid_until is None:
+                    errors.append({
+                        'line': line_number,
+                        'error': f"Invalid valid_until: {row['valid_until']}, expected YYYY-MM-DD",
+                    })
+                    continue
+
+            key = f"{canonical_mfr} {canonical_model}".strip()
+            rows[key] = TypeApproval(
+                manufacturer=manufacturer,
+                model_number=model_number,
+                canonical_manufacturer=canonical_mfr,
+                canonical_model=canonical_model,
+                approval_key=key,
+                status=status,
+                certificate_number=row.get('certificate_number', ''),
+                valid_until=valid_until,
+                notes=row.get('notes', ''),
+            )
+
+        existing = TypeApproval.objects.in_bulk(list(rows), field_name='approval_key')
+        to_create = []
+        to_update = []
+        now = timezone.now()
+        for key, entry in rows.items():
+            current = existing.get(key)
+            if current is None:
+                to_create.append(entry)
+                continue
+            for field in ('manufacturer', 'model_number', 'status', 'certificate_number', 'valid_until', 'notes'):
+                setattr(current, field, getattr(entry, field))
+            current.updated_at = now
+            to_update.append(current)
+
+        TypeApproval.objects.bulk_create(to_create, batch_size=500)
+        TypeApproval.objects.bulk_update(
+            to_update,
+            ['manufacturer', 'model_number', 'status', 'certificate_number', 'valid_until', 'notes', 'updated_at'],
+            batch_size=500
+        )
+        transaction.on_commit(cls.bump_version)
+
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'errors': errors,
+        }
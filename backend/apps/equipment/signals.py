@@ -0,0 +1,54 @@
+# apps/equipment/signals.py
+from django.db.models.signals import post_save, post_delete
+
+from apps.inspections.models import Inspection
+from apps.transmitters.models import Exciter, Amplifier, Filter, StudioTransmitterLink
+from apps.antennas.models import AntennaSystem
+from .models import TypeApproval
+from .services import EquipmentRegistryService, TypeApprovalRegistry
+
+# Equipment tables feeding the registry: model -> (source_type, category)
+RECORD_SOURCES = {
+    Exciter: ('exciter', 'exciter'),
+    Amplifier: ('amplifier', 'amplifier'),
+    Filter: ('filter', 'filter'),
+    AntennaSystem: ('antenna_system', 'antenna'),
+    StudioTransmitterLink: ('studio_link', 'stl'),
+}
+
+def inspection_post_save(sender, instance, raw=False, **kwargs):
+    """Refresh the sightings typed into an inspection form"""
+    if raw:
+        return
+    EquipmentRegistryService().sync_inspection(instance)
+
+def inspection_post_delete(sender, instance, **kwargs):
+    EquipmentRegistryService.remove_source('inspection', instance.pk)
+
+def record_post_save(sender, instance, raw=False, **kwargs):
+    """Refresh the sighting for a standalone equipment record"""
+    if raw:
+        return
+    source_type, category = RECORD_SOURCES[sender]
+    entries = EquipmentRegistryService.entries_from_record(
+        source_type, category, instance, instance.general_data
+    )
+    EquipmentRegistryService().sync_source(source_type, instance.pk, entries)
+
+def record_post_delete(sender, instance, **kwargs):
+    source_type, _ = RECORD_SOURCES[sender]
+    EquipmentRegistryService.remove_source(source_type, instance.pk)
+
+def type_approval_changed(sender, **kwargs):
+    """Stamp a new registry version so every process reloads its map"""
+    TypeApprovalRegistry.bump_version()
+
+post_save.connect(inspection_post_save, sender=Inspection, dispatch_uid='equipment_inspection_sync')
+post_delete.connect(inspection_post_delete, sender=Inspection, dispatch_uid='equipment_inspection_delete')
+
+for record_model in RECORD_SOURCES:
+    post_save.connect(record_post_save, sender=record_model, dispatch_uid=f'equipment_{record_model.__name__}_sync')
+    post_delete.connect(record_post_delete, sender=record_model, dispatch_uid=f'equipment_{record_model.__name__}_delete')
+
+post_save.connect(type_approval_changed, sender=TypeApproval, dispatch_uid='equipment_type_approval_saved')
+post_delete.connect(type_approval_changed, sender=TypeApproval, dispatch_uid='equipment_type_approval_deleted')
@@ -0,0 +1,166 @@
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.inspections.models import Inspection
+from .models import EquipmentModel, EquipmentSighting, TypeApproval
+from .services import TypeApprovalRegistry, canonicalize, canonicalize_serial, catalog_key
+
+class TypeApprovalPermissionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.inspector = User.objects.create_user(
+            username='register-inspector', password='unused', employee_id='REGISTER-1', department='Testing'
+        )
+        cls.admin = User.objects.create_user(
+            username='register-admin', password='unused', employee_id='REGISTER-2', department='Testing',
+            is_staff=True,
+        )
+        cls.approval = TypeApproval.objects.create(manufacturer='Acme', model_number='TX-1')
+
+    def client_for(self, user):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(user)
+        return client
+
+    def test_inspectors_read_but_only_admins_change_the_register(self):
+        inspector = self.client_for(self.inspector)
+        self.assertEqual(inspector.get('/api/equipment/type-approvals/', secure=True).status_code, 200)
+        self.assertEqual(inspector.get('/api/equipment/type-approvals/check/', {'manufacturer': 'acme', 'model': 'tx-1'},
+                                       secure=True).json()['status'], 'approved')
+        new = {'manufacturer': 'Acme', 'model_number': 'TX-2', 'status': 'approved'}
+        self.assertEqual(inspector.post('/api/equipment/type-approvals/', new, format='json', secure=True).status_code, 403)
+        self.assertEqual(inspector.delete(f'/api/equipment/type-approvals/{self.approval.pk}/', secure=True).status_code, 403)
+        self.assertTrue(TypeApproval.objects.filter(pk=self.approval.pk).exists())
+
+        admin = self.client_for(self.admin)
+        self.assertEqual(admin.post('/api/equipment/type-approvals/', new, format='json', secure=True).status_code, 201)
+
+class TypeApprovalRegistryTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_keys_ignore_case_spacing_punctuation_and_placeholders(self):
+        self.assertEqual(catalog_key(' gatesair ', 'Maxiva  uaxte-10'), 'GATESAIR MAXIVA UAXTE-10')
+        self.assertEqual(catalog_key('R&S', 'sr8000'), 'R S SR8000')
+        self.assertEqual(canonicalize('Not seen'), '')
+        self.assertEqual(canonicalize_serial(' sn 12-34/a '), 'SN1234A')
+        self.assertEqual(canonicalize_serial('N/A'), '')
+
+    def test_csv_upserts_by_key_and_reports_bad_lines(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = TypeApprovalRegistry.import_csv(
+                b'Manufacturer,Model_Number,Status,Valid_Until\n'
+                b'GatesAir,Maxiva UAXTE,approved,2027-06-30\n'
+                b'Acme,TX-1,banned,\n'
+                b',,approved,\n'
+                b'Acme,TX-2,approved,2025-02-30\n'
+                b'Acme,TX-3,approved,31/12/2025\n'
+            )
+        self.assertEqual((result['created'], result['updated']), (1, 0))
+        self.assertEqual([error['line'] for error in result['errors']], [3, 4, 5, 6])
+        self.assertIn('valid_until', result['errors'][2]['error'])
+        self.assertEqual(TypeApproval.objects.get(approval_key='GATESAIR MAXIVA UAXTE').valid_until, date(2027, 6, 30))
+        self.assertIsNone(TypeApprovalRegistry.status_for('acme', 'tx-3'))
+
+        # Same equipment spelled differently updates the row, and every reader sees the new status
+        self.assertFalse(TypeApprovalRegistry.is_non_approved('GATESAIR', 'maxiva uaxte'))
+        with self.captureOnCommitCallbacks(execute=True):
+            result = TypeApprovalRegistry.import_csv(b'manufacturer,model,status\ngatesair ,MAXIVA  uaxte,revoked\n')
+        self.assertEqual((result['created'], result['updated']), (0, 1))
+        self.assertEqual(TypeApproval.objects.get(approval_key='GATESAIR MAXIVA UAXTE').status, 'revoked')
+        self.assertTrue(TypeApprovalRegistry.is_non_approved('GATESAIR', 'maxiva uaxte'))
+
+    def test_statuses_reload_only_when_the_version_changes(self):
+        TypeApproval.objects.create(manufacturer='Acme', model_number='TX-1')
+        TypeApprovalRegistry.bump_version()
+        self.assertEqual(TypeApprovalRegistry.statuses()['ACME TX-1'], 'approved')
+        TypeApproval.objects.filter(approval_key='ACME TX-1').update(status='revoked')
+        with self.assertNumQueries(0):
+            self.assertEqual(TypeApprovalRegistry.status_for('acme', 'tx-1'), 'approved')
+        TypeApprovalRegistry.bump_version()
+        self.assertEqual(TypeApprovalRegistry.status_for('acme', 'tx-1'), 'revoked')
+
+    def test_command_rejects_a_file_that_is_not_utf8(self):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, 'wb') as csv_file:
+            csv_file.write('manufacturer,model_number\nSoci\xe9t\xe9,TX\n'.encode('latin-1'))
+        with self.assertRaises(CommandError):
+            call_command('import_type_approvals', path)
+
+class EquipmentRegistryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='registry-tests', password='unused', employee_id='REGISTRY-1', department='Testing'
+        )
+
+    def inspect(self, number, **equipment):
+        return Inspection.objects.create(
+            form_number=f'REGISTRY-{number:04d}', inspection_date=date(2025, 3, number), inspector=self.user,
+            station_type='FM', transmitting_site_name=f'Site {number}', **equipment
+        )
+
+    def sightings(self):
+        return sorted(EquipmentSighting.objects.filter(source_type='inspection').values_list(
+            'source_id', 'category', 'equipment_model__manufacturer__canonical_name',
+            'equipment_model__canonical_model', 'canonical_serial',
+        ))
+
+    def test_spellings_of_one_model_share_a_catalog_row(self):
+        first = self.inspect(1, exciter_manufacturer='GatesAir', exciter_model_number='Maxiva  UAXTE',
+                             exciter_serial_number='sn-12 34')
+        second = self.inspect(2, exciter_manufacturer=' gatesair', exciter_model_number='maxiva uaxte',
+                              amplifier_manufacturer='Not seen', amplifier_model_number='N/A')
+        self.assertEqual(self.sightings(), [
+            (first.pk, 'exciter', 'GATESAIR', 'MAXIVA UAXTE', 'SN1234'),
+            (second.pk, 'exciter', 'GATESAIR', 'MAXIVA UAXTE', ''),
+        ])
+        self.assertEqual(EquipmentModel.objects.filter(canonical_model='MAXIVA UAXTE').count(), 1)
+
+    def test_sightings_follow_the_inspection(self):
+        inspection = self.inspect(1, exciter_manufacturer='Acme', exciter_model_number='TX-1',
+                                  filter_manufacturer='Kathrein', filter_model_number='F-9')
+        inspection.exciter_serial_number = 'A1'
+        inspection.filter_manufacturer = ''
+        inspection.filter_model_number = ''
+        inspection.save()
+        self.assertEqual(self.sightings(), [(inspection.pk, 'exciter', 'ACME', 'TX-1', 'A1')])
+        inspection.delete()
+        self.assertEqual(self.sightings(), [])
+
+    def test_backfill_inserts_missing_sightings_and_counts_only_those(self):
+        first = self.inspect(1, exciter_manufacturer='Acme', exciter_model_number='TX-1')
+        second = self.inspect(2, exciter_manufacturer='Acme', exciter_model_number='TX-2',
+                              amplifier_manufacturer='Acme', amplifier_model_number='PA-1')
+        expected = self.sightings()
+        # Lost without signals, e.g. rows written before the registry existed
+        EquipmentSighting.objects.filter(source_id=second.pk).delete()
+
+        out = StringIO()
+        call_command('backfill_equipment', batch_size=1, stdout=out)
+        self.assertIn('Inspections: 2 sightings inserted, 1 already present', out.getvalue())
+        self.assertEqual(self.sightings(), expected)
+
+        # Existing rows are not refreshed without --rebuild
+        EquipmentSighting.objects.filter(source_id=first.pk).update(site_name='Stale')
+        out = StringIO()
+        call_command('backfill_equipment', stdout=out)
+        self.assertIn('Inspections: 0 sightings inserted, 3 already present', out.getvalue())
+        self.assertEqual(EquipmentSighting.objects.get(source_id=first.pk).site_name, 'Stale')
+
+        call_command('backfill_equipment', rebuild=True, stdout=StringIO())
+        self.assertEqual(EquipmentSighting.objects.get(source_id=first.pk).site_name, 'Site 1')
+        self.assertEqual(self.sightings(), expected)
@@ -0,0 +1,14 @@
+# apps/equipment/urls.py
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+router = DefaultRouter()
+router.register(r'manufacturers', views.ManufacturerViewSet)
+router.register(r'models', views.EquipmentModelViewSet)
+router.register(r'sightings', views.EquipmentSightingViewSet)
+router.register(r'type-approvals', views.TypeApprovalViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,128 @@
+# apps/equipment/views.py
+from django.db.models import Count, Min, Max
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from .models import Manufacturer, EquipmentModel, EquipmentSighting, TypeApproval
+from .serializers import (
+    ManufacturerSerializer, EquipmentModelSerializer, EquipmentSightingSerializer, TypeApprovalSerializer,
+)
+from .services import EquipmentRegistryService, TypeApprovalRegistry
+
+class ManufacturerViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Manufacturer.objects.all()
+    serializer_class = ManufacturerSerializer
+    permission_classes = [IsAuthenticated]
+
+class EquipmentModelViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = EquipmentModel.objects.select_related('manufacturer')
+    serializer_class = EquipmentModelSerializer
+    permission_classes = [IsAuthenticated]
+
+class EquipmentSightingViewSet(viewsets.ReadOnlyModelViewSet):
+    """Sightings filterable by ?serial=, ?manufacturer= and ?model="""
+    queryset = EquipmentSighting.objects.all()
+    serializer_class = EquipmentSightingSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        return EquipmentRegistryService.sightings_for(
+            serial=params.get('serial'),
+            manufacturer=params.get('manufacturer'),
+            model=params.get('model'),
+        )
+    
+    @action(detail=False, methods=['get'])
+    def sites(self, request):
+        """Every site where a serial or model has been seen"""
+        params = request.query_params
+        if not (params.get('serial') or params.get('model')):
+            return Response({
+                'error': 'serial or model is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        sites = self.get_queryset().order_by().values(
+            'site_name', 'broadcaster_id', 'broadcaster__name'
+        ).annotate(
+            sightings=Count('id'),
+            first_seen=Min('seen_on'),
+            last_seen=Max('seen_on'),
+        ).order_by('-last_seen')
+        
+        return Response({
+            'query': {
+                'serial': params.get('serial'),
+                'manufacturer': params.get('manufacturer'),
+                'model': params.get('model'),
+            },
+            'total_sites': len(sites),
+            'sites': [
+                {
+                    'site_name': site['site_name'],
+                    'broadcaster_id': site['broadcaster_id'],
+                    'broadcaster_name': site['broadcaster__name'],
+                    'sightings': site['sightings'],
+                    'first_seen': site['first_seen'],
+                    'last_seen': site['last_seen'],
+                }
+                for site in sites
+            ]
+        })
+
+class TypeApprovalViewSet(viewsets.ModelViewSet):
+    """Type-approval register: inspectors read it, only admins change it"""
+    queryset = TypeApproval.objects.all()
+    serializer_class = TypeApprovalSerializer
+    permission_classes = [IsAuthenticated]
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+    
+    def get_permissions(self):
+        if self.request.method not in SAFE_METHODS:
+            # Same rule as import_csv for create, update and delete
+            return [IsAdminUser()]
+        return super().get_permissions()
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        return queryset
+    
+    @action(detail=False, methods=['get'])
+    def check(self, request):
+        """Registry status for ?manufacturer=&model="""
+        manufacturer = request.query_params.get('manufacturer', '')
+        model_number = request.query_params.get('model', '')
+        registry_status = TypeApprovalRegistry.status_for(manufacturer, model_number)
+        
+        return Response({
+            'manufacturer': manufacturer,
+            'model': model_number,
+            'registered': registry_status is not None,
+            'status': registry_status,
+            'non_approved': registry_status is not None and registry_status != 'approved',
+        })
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser])
+    def import_csv(self, request):
+        """Bulk upsert the register from an uploaded CSV file"""
+        csv_file = request.FILES.get('file')
+        if not csv_file:
+            return Response({
+                'error': 'CSV file required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            result = TypeApprovalRegistry.import_csv(csv_file.read())
+        except UnicodeDecodeError:
+            return Response({
+                'error': 'CSV file must be UTF-8 encoded'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'success': True,
+            **result
+        })
@@ -1,5 +1,10 @@
 from django.contrib import admin
-from .models import Inspection
+from .models import Inspection, TransmitterChannel
+
+class TransmitterChannelInline(admin.TabularInline):
+    model = TransmitterChannel
+    extra = 0
+
 
 @admin.register(Inspection)
 class InspectionAdmin(admin.ModelAdmin):
@@ -7,6 +12,7 @@ class InspectionAdmin(admin.ModelAdmin):
     list_filter = ['status', 'inspection_date', 'station_type', 'tower_type']
     search_fields = ['form_number', 'broadcaster__name', 'broadcaster_name']
     readonly_fields = ['form_number', 'created_at', 'updated_at', 'last_saved']
+    inlines = [TransmitterChannelInline]
     
     fieldsets = (
         ('Basic Information', {
@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class InspectionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.inspections'
\ No newline at end of file
+    name = 'apps.inspections'
+    
+    def ready(self):
+        """Connect dashboard counter invalidation signals"""
+        import apps.inspections.signals  # noqa: F401
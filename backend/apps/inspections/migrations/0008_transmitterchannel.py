@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0007_alter_inspection_filter_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransmitterChannel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel_number', models.CharField(max_length=20, verbose_name='Channel (e.g. CH.22)')),
+                ('frequency_mhz', models.DecimalField(blank=True, decimal_places=3, max_digits=9, null=True, verbose_name='Frequency (MHz)')),
+                ('order', models.PositiveIntegerField(default=0, help_text='Display order within the inspection')),
+                ('exciter_manufacturer', models.CharField(blank=True, max_length=255)),
+                ('exciter_model_number', models.CharField(blank=True, max_length=255)),
+                ('exciter_serial_number', models.CharField(blank=True, max_length=255)),
+                ('amplifier_manufacturer', models.CharField(blank=True, max_length=255)),
+                ('amplifier_model_number', models.CharField(blank=True, max_length=255)),
+                ('amplifier_serial_number', models.CharField(blank=True, max_length=255)),
+                ('nominal_power_w', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Nominal Power (W)')),
+                ('forward_power_w', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Measured Forward Power (W)')),
+                ('antenna_gain_dbd', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Antenna Gain (dBd)')),
+                ('losses_db', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='System Losses (dB)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('inspection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='channels', to='inspections.inspection')),
+            ],
+            options={
+                'db_table': 'inspection_transmitter_channels',
+                'ordering': ['inspection', 'order', 'id'],
+                'unique_together': {('inspection', 'channel_number')},
+            },
+        ),
+    ]
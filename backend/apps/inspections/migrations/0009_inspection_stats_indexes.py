@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0008_transmitterchannel'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(fields=['inspector', 'station_type', 'status'], name='inspections_inspect_6d7afa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(fields=['inspection_date'], name='inspections_inspect_a864aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(fields=['created_at'], name='inspections_created_3c05b5_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inspections', '0009_inspection_stats_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transmitterchannel',
+            name='authorized_erp_kw',
+            field=models.DecimalField(blank=True, decimal_places=3, help_text="From the channel's licence; empty uses the standard limit", max_digits=8, null=True, verbose_name='Authorized ERP (kW)'),
+        ),
+    ]
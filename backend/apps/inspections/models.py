@@ -240,6 +240,25 @@ class Inspection(models.Model):
             self.form_number = f'CA/F/PSM/{year:02d}/{new_num:04d}'
         
         super().save(*args, **kwargs)
+        # After every post_save receiver has compared against the previous values
+        loaded = self.__dict__
+        self._loaded_values = {
+            field.attname: loaded[field.attname] for field in self._meta.concrete_fields if field.attname in loaded
+        }
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # As loaded, by attname: the one snapshot the audit, dashboard and stats signals diff saves against
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def loaded_values(self, attnames):
+        """Values of attnames as last loaded or saved, or None if any was deferred or never loaded"""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None or not all(name in loaded for name in attnames):
+            return None
+        return tuple(loaded[name] for name in attnames)
     
     def __str__(self):
         broadcaster_name = self.broadcaster.name if self.broadcaster else 'Unknown Broadcaster'
@@ -247,4 +266,49 @@ class Inspection(models.Model):
     
     class Meta:
         db_table = 'inspections'
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Covers the grouped dashboard counters (InspectionStatsService)
+            models.Index(fields=['inspector', 'station_type', 'status']),
+            models.Index(fields=['inspection_date']),
+            models.Index(fields=['created_at']),
+        ]
+
+class TransmitterChannel(models.Model):
+    """Per-channel transmitter data for multi-channel (TV/DTT) sites"""
+    inspection = models.ForeignKey(Inspection, on_delete=models.CASCADE, related_name='channels')
+    
+    # Channel identification
+    channel_number = models.CharField(max_length=20, verbose_name="Channel (e.g. CH.22)")
+    frequency_mhz = models.DecimalField(max_digits=9, decimal_places=3, null=True, blank=True, verbose_name="Frequency (MHz)")
+    order = models.PositiveIntegerField(default=0, help_text="Display order within the inspection")
+    
+    # Exciter
+    exciter_manufacturer = models.CharField(max_length=255, blank=True)
+    exciter_model_number = models.CharField(max_length=255, blank=True)
+    exciter_serial_number = models.CharField(max_length=255, blank=True)
+    
+    # Amplifier
+    amplifier_manufacturer = models.CharField(max_length=255, blank=True)
+    amplifier_model_number = models.CharField(max_length=255, blank=True)
+    amplifier_serial_number = models.CharField(max_length=255, blank=True)
+    
+    # Power, gain and losses
+    nominal_power_w = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Nominal Power (W)")
+    forward_power_w = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Measured Forward Power (W)")
+    antenna_gain_dbd = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="Antenna Gain (dBd)")
+    losses_db = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True, verbose_name="System Losses (dB)")
+    authorized_erp_kw = models.DecimalField(max_digits=8, decimal_places=3, null=True, blank=True,
+                                            verbose_name="Authorized ERP (kW)",
+                                            help_text="From the channel's licence; empty uses the standard limit")
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.inspection.form_number} - {self.channel_number}"
+    
+    class Meta:
+        db_table = 'inspection_transmitter_channels'
+        ordering = ['inspection', 'order', 'id']
+        unique_together = ['inspection', 'channel_number']
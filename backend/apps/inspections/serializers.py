@@ -1,12 +1,26 @@
 # apps/inspections/serializers.py - COMPLETE FIXED VERSION
 from rest_framework import serializers
-from .models import Inspection
+from .models import Inspection, TransmitterChannel
 from apps.broadcasters.models import Broadcaster
+import logging
+
+logger = logging.getLogger(__name__)
+
+class TransmitterChannelSerializer(serializers.ModelSerializer):
+    """Per-channel transmitter data; id is writable so bulk updates can match rows"""
+    id = serializers.IntegerField(required=False)
+    
+    class Meta:
+        model = TransmitterChannel
+        exclude = ['inspection']
+        read_only_fields = ('created_at', 'updated_at')
+
 
 class InspectionSerializer(serializers.ModelSerializer):
     """Complete serializer with ALL fields for detailed views"""
     broadcaster_name = serializers.CharField(source='broadcaster.name', read_only=True, allow_null=True)
     inspector_name = serializers.CharField(source='inspector.get_full_name', read_only=True, allow_null=True)
+    channels = TransmitterChannelSerializer(many=True, read_only=True)
     
     class Meta:
         model = Inspection
@@ -15,7 +29,7 @@ class InspectionSerializer(serializers.ModelSerializer):
     
     def validate(self, data):
         """Custom validation"""
-        print(f"🔍 [InspectionSerializer] Validating data: {data}")
+        logger.debug("InspectionSerializer validating: %s", data)
         
         # Validate air status and off_air_reason - BUT ONLY FOR COMPLETE FORMS
         air_status = data.get('air_status')
@@ -28,7 +42,7 @@ class InspectionSerializer(serializers.ModelSerializer):
             if self.instance and hasattr(self.instance, 'off_air_reason') and self.instance.off_air_reason:
                 # Use existing off_air_reason from database
                 data['off_air_reason'] = self.instance.off_air_reason
-                print(f"📝 [InspectionSerializer] Preserving existing off_air_reason: {self.instance.off_air_reason}")
+                logger.debug("InspectionSerializer preserving off_air_reason for inspection %s", self.instance.id)
             else:
                 # Only raise error if this seems like a final submission (has meaningful data)
                 status = data.get('status', '')
@@ -46,12 +60,12 @@ class InspectionSerializer(serializers.ModelSerializer):
                 else:
                     # For drafts/partial updates, just set a placeholder
                     data['off_air_reason'] = 'Pending completion'
-                    print(f"📝 [InspectionSerializer] Setting placeholder off_air_reason for draft")
+                    logger.debug("InspectionSerializer setting placeholder off_air_reason for draft")
         
         return data
     
     def create(self, validated_data):
-        print(f"🆕 [InspectionSerializer] Creating inspection with data: {validated_data}")
+        logger.debug("InspectionSerializer creating inspection: %s", validated_data)
         
         # Handle broadcaster - make it optional for draft inspections
         if 'broadcaster' not in validated_data or not validated_data['broadcaster']:
@@ -68,7 +82,7 @@ class InspectionSerializer(serializers.ModelSerializer):
                 }
             )
             validated_data['broadcaster'] = default_broadcaster
-            print(f"📝 [InspectionSerializer] Using default broadcaster: {default_broadcaster}")
+            logger.debug("InspectionSerializer using default broadcaster %s", default_broadcaster.pk)
         
         # Set default inspector if not provided (for auto-save scenarios)
         if 'inspector' not in validated_data or not validated_data['inspector']:
@@ -78,12 +92,12 @@ class InspectionSerializer(serializers.ModelSerializer):
             inspector = User.objects.filter(is_staff=True).first()
             if inspector:
                 validated_data['inspector'] = inspector
-                print(f"📝 [InspectionSerializer] Using default inspector: {inspector}")
+                logger.debug("InspectionSerializer using default inspector %s", inspector.pk)
         
         return super().create(validated_data)
     
     def update(self, instance, validated_data):
-        print(f"📝 [InspectionSerializer] Updating inspection {instance.id} with data: {validated_data}")
+        logger.debug("InspectionSerializer updating inspection %s: %s", instance.id, validated_data)
         
         # Update only the fields that are provided
         for field, value in validated_data.items():
@@ -91,7 +105,7 @@ class InspectionSerializer(serializers.ModelSerializer):
                 setattr(instance, field, value)
         
         instance.save()
-        print(f"✅ [InspectionSerializer] Inspection {instance.id} updated successfully")
+        logger.debug("InspectionSerializer updated inspection %s", instance.id)
         return instance
 
 
@@ -113,7 +127,7 @@ class SimpleInspectionSerializer(serializers.ModelSerializer):
     
     def validate(self, data):
         """Custom validation"""
-        print(f"🔍 [SimpleInspectionSerializer] Validating data: {data}")
+        logger.debug("SimpleInspectionSerializer validating: %s", data)
         
         # Validate air status and off_air_reason - BUT ONLY FOR COMPLETE FORMS
         air_status = data.get('air_status')
@@ -125,7 +139,7 @@ class SimpleInspectionSerializer(serializers.ModelSerializer):
             if self.instance and hasattr(self.instance, 'off_air_reason') and self.instance.off_air_reason:
                 # Use existing off_air_reason from database
                 data['off_air_reason'] = self.instance.off_air_reason
-                print(f"📝 [SimpleInspectionSerializer] Preserving existing off_air_reason: {self.instance.off_air_reason}")
+                logger.debug("SimpleInspectionSerializer preserving off_air_reason for inspection %s", self.instance.id)
             else:
                 # Only raise error if this seems like a final submission
                 status = data.get('status', '')
@@ -142,24 +156,24 @@ class SimpleInspectionSerializer(serializers.ModelSerializer):
                 else:
                     # For drafts/partial updates, just set a placeholder
                     data['off_air_reason'] = 'Pending completion'
-                    print(f"📝 [SimpleInspectionSerializer] Setting placeholder off_air_reason for draft")
+                    logger.debug("SimpleInspectionSerializer setting placeholder off_air_reason for draft")
         
         # Check if this is an update
         if self.instance:
-            print(f"📝 This is an UPDATE for inspection {self.instance.id}")
+            logger.debug("SimpleInspectionSerializer validating update of inspection %s", self.instance.id)
             # For updates, we can be more flexible with broadcaster
             if 'broadcaster' not in data and self.instance.broadcaster:
                 data['broadcaster'] = self.instance.broadcaster
             if 'inspector' not in data and self.instance.inspector:
                 data['inspector'] = self.instance.inspector
         else:
-            print(f"🆕 This is a CREATE operation")
+            logger.debug("SimpleInspectionSerializer validating create")
             # For creates, we'll handle missing broadcaster in create method
         
         return data
     
     def create(self, validated_data):
-        print(f"🆕 [SimpleInspectionSerializer] Creating inspection with data: {validated_data}")
+        logger.debug("SimpleInspectionSerializer creating inspection: %s", validated_data)
         
         # Handle broadcaster - make it optional for draft inspections  
         if 'broadcaster' not in validated_data or not validated_data['broadcaster']:
@@ -176,7 +190,7 @@ class SimpleInspectionSerializer(serializers.ModelSerializer):
                 }
             )
             validated_data['broadcaster'] = default_broadcaster
-            print(f"📝 [SimpleInspectionSerializer] Using default broadcaster: {default_broadcaster}")
+            logger.debug("SimpleInspectionSerializer using default broadcaster %s", default_broadcaster.pk)
         
         # Set default inspector if not provided
         if 'inspector' not in validated_data or not validated_data['inspector']:
@@ -185,13 +199,13 @@ class SimpleInspectionSerializer(serializers.ModelSerializer):
             inspector = User.objects.filter(is_staff=True).first()
             if inspector:
                 validated_data['inspector'] = inspector
-                print(f"📝 [SimpleInspectionSerializer] Using default inspector: {inspector}")
+                logger.debug("SimpleInspectionSerializer using default inspector %s", inspector.pk)
         
         return super().create(validated_data)
     
     def update(self, instance, validated_data):
         """Custom update method"""
-        print(f"📝 [SimpleInspectionSerializer] Updating inspection {instance.id} with data: {validated_data}")
+        logger.debug("SimpleInspectionSerializer updating inspection %s: %s", instance.id, validated_data)
         
         # Update only the fields that are provided
         for field, value in validated_data.items():
@@ -199,5 +213,5 @@ class SimpleInspectionSerializer(serializers.ModelSerializer):
                 setattr(instance, field, value)
         
         instance.save()
-        print(f"✅ [SimpleInspectionSerializer] Inspection {instance.id} updated successfully")
+        logger.debug("SimpleInspectionSerializer updated inspection %s", instance.id)
         return instance
\ No newline at end of file
@@ -0,0 +1,148 @@
+# apps/inspections/services.py
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Any, Iterable
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.broadcasters.models import Broadcaster
+from .models import Inspection
+
+class ChannelERPService:
+    """Vectorized ERP computation across all channels of an inspection"""
+
+    @staticmethod
+    def compute(channels: Iterable, default_gain_dbd: float = None, default_losses_db: float = None) -> List[Dict[str, Any]]:
+        """Return ERP rows (one per channel) computed in a single numpy pass
+
+        ERP (dBW) = 10log P(W) + G (dBd) - L (dB); channels without a
+        measured forward power get None for the ERP values. Each channel is
+        judged against its own authorized ERP, ERP_AUTHORIZED_LIMIT_KW when
+        it has none.
+        """
+        channels = list(channels)
+        if not channels:
+            return []
+
+        report_settings = getattr(settings, 'REPORT_SETTINGS', {})
+        if default_gain_dbd is None:
+            default_gain_dbd = report_settings.get('DEFAULT_ANTENNA_GAIN_DBD', 11.0)
+        if default_losses_db is None:
+            default_losses_db = report_settings.get('DEFAULT_SYSTEM_LOSSES_DB', 1.5)
+        authorized_kw = report_settings.get('ERP_AUTHORIZED_LIMIT_KW', 10.0)
+
+        def column(attr, default):
+            return np.array(
+                [float(getattr(ch, attr)) if getattr(ch, attr) is not None else default for ch in channels],
+                dtype=float
+            )
+
+        power_w = column('forward_power_w', np.nan)
+        gain_dbd = column('antenna_gain_dbd', default_gain_dbd)
+        losses_db = column('losses_db', default_losses_db)
+        limit_kw = column('authorized_erp_kw', authorized_kw)
+
+        valid = power_w > 0
+        erp_dbw = np.full(power_w.shape, np.nan)
+        erp_dbw[valid] = 10 * np.log10(power_w[valid]) + gain_dbd[valid] - losses_db[valid]
+        erp_kw = np.power(10.0, erp_dbw / 10) / 1000
+
+        rows = []
+        for idx, channel in enumerate(channels):
+            has_erp = bool(valid[idx])
+            rows.append({
+                'channel': channel,
+                'forward_power_w': float(power_w[idx]) if has_erp else None,
+                'antenna_gain_dbd': float(gain_dbd[idx]),
+                'losses_db': float(losses_db[idx]),
+                'erp_dbw': round(float(erp_dbw[idx]), 2) if has_erp else None,
+                'erp_kw': round(float(erp_kw[idx]), 3) if has_erp else None,
+                'authorized_kw': float(limit_kw[idx]),
+                'authorized_dbw': round(float(10 * np.log10(limit_kw[idx] * 1000)), 2),
+                'is_compliant': bool(erp_kw[idx] <= limit_kw[idx]) if has_erp else None,
+                'excess_kw': round(float(erp_kw[idx] - limit_kw[idx]), 3) if has_erp and erp_kw[idx] > limit_kw[idx] else 0,
+            })
+
+        return rows
+
+class InspectionStatsService:
+    """Dashboard counters computed with grouped aggregates and cached for a short time"""
+
+    STATS_CACHE_KEY = 'inspections:stats:{day}'
+    STATS_CACHE_TTL = 30
+
+    @classmethod
+    def cache_key(cls, day=None) -> str:
+        # Keyed by day so "today" rolls over at midnight without waiting for the TTL
+        return cls.STATS_CACHE_KEY.format(day=(day or timezone.localdate()).isoformat())
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached counters once the current transaction commits"""
+        transaction.on_commit(lambda: cache.delete(cls.cache_key()))
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        key = cls.cache_key()
+        stats = cache.get(key)
+        if stats is None:
+            stats = cls.compute()
+            cache.set(key, stats, cls.STATS_CACHE_TTL)
+        return stats
+
+    @classmethod
+    def compute(cls, day=None) -> Dict[str, Any]:
+        """Counters straight from the database
+
+        One grouped aggregate over inspections (an index-only scan of the
+        inspector/station type/status index) feeds every breakdown; the
+        other queries are an indexed count for today, the inspector names
+        and the broadcaster count.
+        """
+        day = day or timezone.localdate()
+        day_start = timezone.make_aware(datetime.combine(day, time.min))
+        inspections = Inspection.objects.order_by()
+
+        by_status = {status: 0 for status, _ in Inspection.STATUS_CHOICES}
+        by_inspector: Dict[Any, Dict[str, Any]] = {}
+        by_station_type: Dict[Any, Dict[str, Any]] = {}
+        for inspector_id, station_type, status, count in inspections.values_list(
+            'inspector_id', 'station_type', 'status'
+        ).annotate(count=Count('*')):
+            by_status[status] = by_status.get(status, 0) + count
+            for groups, key, group in ((by_inspector, 'inspector_id', inspector_id),
+                                       (by_station_type, 'station_type', station_type)):
+                entry = groups.setdefault(group, {key: group, 'total': 0, 'by_status': {}})
+                entry['total'] += count
+                entry['by_status'][status] = entry['by_status'].get(status, 0) + count
+
+        names = {
+            pk: (f'{first_name} {last_name}'.strip() or username)
+            for pk, username, first_name, last_name in get_user_model().objects.filter(
+                pk__in=list(by_inspector)
+            ).values_list('pk', 'username', 'first_name', 'last_name')
+        }
+        for inspector_id, entry in by_inspector.items():
+            entry['inspector_name'] = names.get(inspector_id, 'Unknown')
+
+        today = inspections.filter(
+            Q(inspection_date=day) | Q(created_at__gte=day_start, created_at__lt=day_start + timedelta(days=1))
+        ).count()
+
+        return {
+            'date': day.isoformat(),
+            'total_inspections': sum(by_status.values()),
+            'by_status': by_status,
+            'today': today,
+            'broadcasters': Broadcaster.objects.count(),
+            'by_inspector': sorted(by_inspector.values(), key=lambda entry: -entry['total']),
+            'by_station_type': sorted(
+                by_station_type.values(), key=lambda entry: (-entry['total'], entry['station_type'] or '')
+            ),
+            'generated_at': timezone.now().isoformat(),
+        }
@@ -0,0 +1,35 @@
+# apps/inspections/signals.py
+from django.db.models.signals import post_save, post_delete
+
+from apps.broadcasters.models import Broadcaster
+from .models import Inspection
+from .services import InspectionStatsService
+
+# Inspection fields the dashboard counters group or filter on
+STATS_FIELDS = ('status', 'station_type', 'inspector_id', 'inspection_date')
+
+def _stats_state(instance):
+    """Current values of STATS_FIELDS, or None if any is deferred"""
+    loaded = instance.__dict__
+    if not all(name in loaded for name in STATS_FIELDS):
+        return None
+    return tuple(loaded[name] for name in STATS_FIELDS)
+
+def inspection_post_save(sender, instance, created, **kwargs):
+    """Invalidate the counters on create or when a counted field changed; auto-saves usually change none"""
+    before = instance.loaded_values(STATS_FIELDS)
+    after = _stats_state(instance)
+    if created or before is None or before != after:
+        InspectionStatsService.invalidate()
+
+def broadcaster_post_save(sender, instance, created, **kwargs):
+    if created:
+        InspectionStatsService.invalidate()
+
+def stats_post_delete(sender, instance, **kwargs):
+    InspectionStatsService.invalidate()
+
+post_save.connect(inspection_post_save, sender=Inspection, dispatch_uid='inspection_stats_post_save')
+post_delete.connect(stats_post_delete, sender=Inspection, dispatch_uid='inspection_stats_delete')
+post_save.connect(broadcaster_post_save, sender=Broadcaster, dispatch_uid='inspection_stats_broadcaster_save')
+post_delete.connect(stats_post_delete, sender=Broadcaster, dispatch_uid='inspection_stats_broadcaster_delete')
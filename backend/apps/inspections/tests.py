@@ -1,3 +1,117 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.broadcasters.models import Broadcaster
+from .models import Inspection, TransmitterChannel
+from .services import ChannelERPService, InspectionStatsService
+
+class InspectionTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='inspection-tests', password='unused', employee_id='INSPECT-1', department='Testing'
+        )
+        cls.inspection = Inspection.objects.create(
+            form_number='INSPECT-0001', inspection_date=timezone.localdate(), inspector=cls.user, station_type='TV'
+        )
+
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(self.user)
+
+class TransmitterChannelTests(InspectionTestCase):
+
+    def channels_url(self):
+        return f'/api/inspections/inspections/{self.inspection.pk}/channels/'
+
+    def test_duplicate_channel_numbers_are_rejected(self):
+        response = self.client.post(self.channels_url(), [
+            {'channel_number': 'CH.22'}, {'channel_number': 'CH.22'},
+        ], format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'][0], {})
+        self.assertIn('channel_number', response.json()['errors'][1])
+
+        self.client.post(self.channels_url(), [{'channel_number': 'CH.22'}], format='json', secure=True)
+        response = self.client.post(self.channels_url(), [{'channel_number': 'CH.22'}], format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(TransmitterChannel.objects.filter(inspection=self.inspection).count(), 1)
+
+    def test_replace_can_swap_channel_numbers(self):
+        first = TransmitterChannel.objects.create(inspection=self.inspection, channel_number='CH.22')
+        second = TransmitterChannel.objects.create(inspection=self.inspection, channel_number='CH.23')
+        response = self.client.put(self.channels_url(), [
+            {'id': first.pk, 'channel_number': 'CH.23'}, {'id': second.pk, 'channel_number': 'CH.22'},
+        ], format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.channel_number, second.channel_number), ('CH.23', 'CH.22'))
+
+    def test_each_channel_is_judged_against_its_own_authorized_erp(self):
+        # 1 kW forward, 11 dBd gain, 1.5 dB losses: about 8.9 kW ERP
+        low, standard = ChannelERPService.compute([
+            TransmitterChannel(channel_number='CH.22', forward_power_w=Decimal('1000'),
+                               authorized_erp_kw=Decimal('5')),
+            TransmitterChannel(channel_number='CH.23', forward_power_w=Decimal('1000')),
+        ])
+        self.assertFalse(low['is_compliant'])
+        self.assertEqual(low['authorized_kw'], 5.0)
+        self.assertEqual(low['authorized_dbw'], 36.99)
+        self.assertTrue(standard['is_compliant'])
+        self.assertEqual(standard['authorized_kw'], 10.0)
+
+class InspectionStatsTests(InspectionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def stats(self):
+        response = self.client.get('/api/inspections/stats/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_counters_group_by_status_inspector_and_station_type(self):
+        Inspection.objects.create(form_number='INSPECT-0002', inspection_date=timezone.localdate(),
+                                  inspector=self.user, station_type='FM', status='completed')
+        stats = self.stats()
+        self.assertEqual(stats['total_inspections'], 2)
+        self.assertEqual(stats['by_status'], {'draft': 1, 'completed': 1, 'reviewed': 0})
+        self.assertEqual(stats['today'], 2)
+        self.assertEqual([(entry['inspector_name'], entry['total']) for entry in stats['by_inspector']],
+                         [('inspection-tests', 2)])
+        self.assertEqual({entry['station_type']: entry['total'] for entry in stats['by_station_type']},
+                         {'TV': 1, 'FM': 1})
+
+    def test_counted_changes_invalidate_the_cached_counters(self):
+        self.assertEqual(self.stats()['by_status']['draft'], 1)
+        key = InspectionStatsService.cache_key()
+
+        # An auto-save touching no counted field keeps the cached counters
+        with self.captureOnCommitCallbacks(execute=True):
+            inspection = Inspection.objects.get(pk=self.inspection.pk)
+            inspection.program_name = 'Evening News'
+            inspection.save()
+        self.assertIsNotNone(cache.get(key))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inspection.status = 'completed'
+            inspection.save()
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(self.stats()['by_status'], {'draft': 0, 'completed': 1, 'reviewed': 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Inspection.objects.create(form_number='INSPECT-0003', inspection_date=timezone.localdate(),
+                                      inspector=self.user, station_type='TV')
+        self.assertEqual(self.stats()['total_inspections'], 2)
 
-# Create your tests here.
+        with self.captureOnCommitCallbacks(execute=True):
+            Broadcaster.objects.create(name='Test Broadcaster')
+        self.assertEqual(self.stats()['broadcasters'], 1)
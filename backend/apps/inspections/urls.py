@@ -7,6 +7,7 @@ router.register(r'inspections', views.InspectionViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('stats/', views.inspection_stats, name='inspection-stats'),
     path('test/', views.test_inspections, name='test-inspections'),  # TEST ENDPOINT
     path('inspections/<int:inspection_id>/auto-save/', views.AutoSaveView.as_view(), name='auto-save'),
 ]
\ No newline at end of file
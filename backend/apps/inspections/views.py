@@ -2,17 +2,21 @@
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes, action
+from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from .models import Inspection
-from .serializers import InspectionSerializer, SimpleInspectionSerializer
+from .models import Inspection, TransmitterChannel
+from .serializers import InspectionSerializer, SimpleInspectionSerializer, TransmitterChannelSerializer
+from .services import ChannelERPService, InspectionStatsService
 from apps.broadcasters.models import Broadcaster
 from django.contrib.auth import get_user_model
 import json
+import logging
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -34,11 +38,24 @@ def test_inspections(request):
             'status': 'error'
         }, status=500)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def inspection_stats(request):
+    """Dashboard counters with per-inspector and per-station-type breakdowns"""
+    return Response(InspectionStatsService.stats())
+
 @method_decorator(csrf_exempt, name='dispatch')
 class InspectionViewSet(viewsets.ModelViewSet):
     queryset = Inspection.objects.select_related('broadcaster', 'inspector').all()
     permission_classes = [AllowAny]
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('retrieve', 'update', 'partial_update', 'channels'):
+            # Full serializer nests channels: fetch them in one extra query
+            queryset = queryset.prefetch_related('channels')
+        return queryset
+    
     def get_serializer_class(self):
         """Use different serializers for different actions"""
         if self.action == 'retrieve':
@@ -49,14 +66,14 @@ class InspectionViewSet(viewsets.ModelViewSet):
             return SimpleInspectionSerializer
     
     def create(self, request, *args, **kwargs):
-        print(f"🔍 CREATE request data: {request.data}")
+        logger.debug("Inspection create payload: %s", request.data)
         
         # Prepare data for creation
         data = request.data.copy()
         
         # FIXED: Handle optional broadcaster - let serializer handle defaults
         if not data.get('broadcaster') and not data.get('broadcaster_name'):
-            print("📝 No broadcaster provided, serializer will create default")
+            logger.debug("No broadcaster provided, serializer will create default")
         
         # Get or create a default inspector for development
         inspector = None
@@ -88,15 +105,15 @@ class InspectionViewSet(viewsets.ModelViewSet):
         if not data.get('air_status'):
             data['air_status'] = 'on_air'
         
-        print(f"📝 Prepared CREATE data: {data}")
+        logger.debug("Prepared inspection create data: %s", data)
         
         serializer = self.get_serializer(data=data)
         if serializer.is_valid():
             inspection = serializer.save()
-            print(f"✅ Inspection created: {inspection.id}")
+            logger.debug("Inspection %s created", inspection.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         else:
-            print(f"❌ CREATE Validation errors: {serializer.errors}")
+            logger.debug("Inspection create validation errors: %s", serializer.errors)
             
             # FIXED: Better error handling - show specific field errors
             error_details = {}
@@ -111,32 +128,25 @@ class InspectionViewSet(viewsets.ModelViewSet):
     
     def retrieve(self, request, *args, **kwargs):
         """Get individual inspection with ALL fields"""
-        print(f"🔍 RETRIEVE request for inspection {kwargs.get('pk')}")
-        
         try:
             instance = self.get_object()
             serializer = InspectionSerializer(instance)  # Force use of complete serializer
-            print(f"✅ Retrieved inspection: {instance.form_number}")
-            print(f"📊 Serialized fields count: {len(serializer.data.keys())}")
             return Response(serializer.data)
         except Exception as e:
-            print(f"❌ Failed to retrieve inspection: {e}")
+            logger.debug("Inspection %s not retrieved: %s", kwargs.get('pk'), e)
             return Response({
                 'error': f'Inspection not found: {e}',
                 'pk': kwargs.get('pk')
             }, status=status.HTTP_404_NOT_FOUND)
     
     def update(self, request, *args, **kwargs):
-        print(f"🔍 UPDATE request data: {request.data}")
-        print(f"🔍 UPDATE kwargs: {kwargs}")
-        print(f"🔍 UPDATE pk: {kwargs.get('pk')}")
+        logger.debug("Inspection %s update payload: %s", kwargs.get('pk'), request.data)
         
         # Get the instance
         try:
             instance = self.get_object()
-            print(f"📝 Found inspection to update: {instance.id} - {instance.form_number}")
         except Exception as e:
-            print(f"❌ Failed to get inspection object: {e}")
+            logger.debug("Inspection %s not found for update: %s", kwargs.get('pk'), e)
             return Response({
                 'error': f'Inspection not found: {e}',
                 'pk': kwargs.get('pk')
@@ -167,21 +177,21 @@ class InspectionViewSet(viewsets.ModelViewSet):
         if data.get('air_status') == 'off_air' and not data.get('off_air_reason'):
             if instance.off_air_reason:
                 data['off_air_reason'] = instance.off_air_reason
-                print(f"📝 [Views] Preserving existing off_air_reason: {instance.off_air_reason}")
+                logger.debug("Preserving existing off_air_reason for inspection %s", instance.id)
             else:
                 data['off_air_reason'] = 'Pending completion'
-                print(f"📝 [Views] Setting placeholder off_air_reason")
+                logger.debug("Setting placeholder off_air_reason for inspection %s", instance.id)
         
-        print(f"📝 Prepared update data: {data}")
+        logger.debug("Prepared inspection update data: %s", data)
         
         # Use the complete serializer for updates to handle all fields
         serializer = InspectionSerializer(instance, data=data, partial=True)
         if serializer.is_valid():
             updated_inspection = serializer.save()
-            print(f"✅ Inspection updated: {updated_inspection.id}")
+            logger.debug("Inspection %s updated", updated_inspection.id)
             return Response(serializer.data)
         else:
-            print(f"❌ UPDATE Validation errors: {serializer.errors}")
+            logger.debug("Inspection %s update validation errors: %s", instance.id, serializer.errors)
             
             # FIXED: Better error handling for updates - removed non_field_errors() call
             error_details = {}
@@ -195,40 +205,135 @@ class InspectionViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
     
     def partial_update(self, request, *args, **kwargs):
-        print(f"🔍 PARTIAL UPDATE request")
         kwargs['partial'] = True
         return self.update(request, *args, **kwargs)
     
     def list(self, request, *args, **kwargs):
-        print(f"🔍 LIST request")
         return super().list(request, *args, **kwargs)
+    
+    @action(detail=True, methods=['get', 'post', 'put'])
+    def channels(self, request, pk=None):
+        """List (GET), bulk create (POST) or bulk replace (PUT) transmitter channels"""
+        inspection = self.get_object()
+        
+        if request.method == 'GET':
+            return self._channels_response(inspection)
+        
+        payload = request.data if isinstance(request.data, list) else request.data.get('channels', [])
+        serializer = TransmitterChannelSerializer(data=payload, many=True)
+        if not serializer.is_valid():
+            return Response({
+                'errors': serializer.errors,
+                'message': 'Channel validation failed'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        rows = serializer.validated_data
+        duplicates = self._duplicate_channel_errors(inspection, rows, replace=request.method == 'PUT')
+        if duplicates:
+            return Response({
+                'errors': duplicates,
+                'message': 'Channel validation failed'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            if request.method == 'POST':
+                TransmitterChannel.objects.bulk_create([
+                    TransmitterChannel(inspection=inspection, **{k: v for k, v in row.items() if k != 'id'})
+                    for row in rows
+                ])
+            else:
+                existing = {channel.id: channel for channel in TransmitterChannel.objects.filter(inspection=inspection)}
+                keep_ids = {row['id'] for row in rows if row.get('id') in existing}
+                
+                # Delete first so renumbered channels don't trip the unique constraint
+                TransmitterChannel.objects.filter(inspection=inspection).exclude(id__in=keep_ids).delete()
+                
+                to_update, to_create = [], []
+                update_fields = set()
+                renumbered = []
+                for row in rows:
+                    channel = existing.get(row.get('id'))
+                    data = {k: v for k, v in row.items() if k != 'id'}
+                    if channel:
+                        if 'channel_number' in data and data['channel_number'] != channel.channel_number:
+                            renumbered.append(TransmitterChannel(id=channel.id, channel_number=f'~{channel.id}'))
+                        for field, value in data.items():
+                            setattr(channel, field, value)
+                        update_fields.update(data)
+                        to_update.append(channel)
+                    else:
+                        to_create.append(TransmitterChannel(inspection=inspection, **data))
+                
+                if renumbered:
+                    # Park renumbered rows on placeholders first, so swapped numbers never collide mid-update
+                    TransmitterChannel.objects.bulk_update(renumbered, ['channel_number'])
+                if to_update and update_fields:
+                    TransmitterChannel.objects.bulk_update(to_update, sorted(update_fields))
+                TransmitterChannel.objects.bulk_create(to_create)
+        
+        return self._channels_response(inspection, status_code=status.HTTP_201_CREATED if request.method == 'POST' else status.HTTP_200_OK)
+    
+    @staticmethod
+    def _duplicate_channel_errors(inspection, rows, replace=False):
+        """Per-row errors, like serializer.errors, for channel numbers the (inspection, channel_number) constraint would reject
+        
+        A PUT replaces every channel, so only numbers repeated in the payload
+        clash; a POST adds to the existing ones.
+        """
+        taken = set() if replace else set(
+            TransmitterChannel.objects.filter(inspection=inspection).values_list('channel_number', flat=True)
+        )
+        seen = set()
+        errors = []
+        for row in rows:
+            number = row.get('channel_number')
+            if number in taken:
+                errors.append({'channel_number': [f'Channel {number} already exists for this inspection.']})
+            elif number in seen:
+                errors.append({'channel_number': [f'Channel {number} appears more than once.']})
+            else:
+                errors.append({})
+            seen.add(number)
+        return errors if any(errors) else None
+    
+    def _channels_response(self, inspection, status_code=status.HTTP_200_OK):
+        channels = list(TransmitterChannel.objects.filter(inspection=inspection))
+        erp_rows = ChannelERPService.compute(channels)
+        data = TransmitterChannelSerializer(channels, many=True).data
+        for item, erp in zip(data, erp_rows):
+            item['erp_dbw'] = erp['erp_dbw']
+            item['erp_kw'] = erp['erp_kw']
+            item['is_compliant'] = erp['is_compliant']
+        
+        return Response({
+            'inspection_id': inspection.id,
+            'total_channels': len(channels),
+            'channels': data
+        }, status=status_code)
 
 @method_decorator(csrf_exempt, name='dispatch')
 class AutoSaveView(APIView):
     permission_classes = [AllowAny]
     
     def post(self, request, inspection_id):
-        print(f"🔍 AUTO-SAVE request for inspection {inspection_id}")
-        print(f"🔍 AUTO-SAVE data: {request.data}")
+        logger.debug("Auto-save for inspection %s: %s", inspection_id, request.data)
         
         try:
             inspection = Inspection.objects.get(id=inspection_id)
             inspection.is_auto_saved = True
             inspection.save()
-            print(f"✅ Auto-save successful for inspection {inspection_id}")
             return Response({
                 'message': 'Auto-saved successfully',
                 'inspection_id': inspection_id,
                 'last_saved': inspection.last_saved
             })
         except Inspection.DoesNotExist:
-            print(f"❌ Inspection {inspection_id} not found for auto-save")
             return Response({
                 'error': 'Inspection not found',
                 'inspection_id': inspection_id
             }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            print(f"❌ Auto-save failed for inspection {inspection_id}: {e}")
+            logger.exception("Auto-save failed for inspection %s", inspection_id)
             return Response({
                 'error': f'Auto-save failed: {str(e)}',
                 'inspection_id': inspection_id
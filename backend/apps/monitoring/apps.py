@@ -0,0 +1,12 @@
+# apps/monitoring/apps.py
+from django.apps import AppConfig
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoring'
+    verbose_name = 'Request Metrics'
+
+    def ready(self):
+        """Time serializer work for the request metrics"""
+        from .metrics import install_serializer_timing
+        install_serializer_timing()
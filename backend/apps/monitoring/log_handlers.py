@@ -0,0 +1,96 @@
+# apps/monitoring/log_handlers.py
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+class QueueListenerHandler(QueueHandler):
+    """Puts records on a queue; a background listener writes them with the wrapped handlers
+
+    Request threads only pay for building the record and merging its
+    arguments. Formatting, tracebacks included, and stream or file I/O happen
+    on the listener thread. When the queue is full, records below WARNING
+    are dropped and counted; warnings and errors are written on the calling
+    thread instead. Configure it after the handlers it wraps, referenced as
+    cfg://handlers.<name> (dictConfig builds handlers in name order).
+    """
+
+    def __init__(self, handlers, queue_size: int = 10000):
+        # Index access so dictConfig's ConvertingList resolves cfg:// references
+        resolved = [handlers[index] for index in range(len(handlers))]
+        if not all(isinstance(handler, logging.Handler) for handler in resolved):
+            raise ValueError('QueueListenerHandler targets must be configured handlers (cfg://handlers.<name>)')
+        super().__init__(queue.Queue(queue_size))
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = QueueListener(self.queue, *resolved, respect_handler_level=True)
+        self.listener.start()
+        # Drain what is still queued when the process exits
+        atexit.register(self.stop_listener)
+
+    def prepare(self, record):
+        """Merge the arguments into the message and leave formatting to the listener
+
+        QueueHandler.prepare formats the record, traceback and all, on the
+        calling thread. Only the arguments are resolved here, so later changes
+        to a mutable argument cannot alter the message.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                # Never lost: written now, possibly ahead of records still queued
+                self.listener.handle(record)
+            else:
+                # Never block a request on logging chatter; count the drop instead
+                with self._dropped_lock:
+                    self.dropped += 1
+            return
+        if self.dropped > self._reported_dropped:
+            self._report_dropped()
+
+    def _report_dropped(self):
+        """Queue a warning with the number of records dropped since the last one"""
+        with self._dropped_lock:
+            count = self.dropped - self._reported_dropped
+            if count <= 0:
+                return
+            self._reported_dropped = self.dropped
+        warning = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            '%d log records dropped while the log queue was full (%d in total)', (count, self.dropped), None,
+        )
+        try:
+            self.queue.put_nowait(self.prepare(warning))
+        except queue.Full:
+            self.listener.handle(warning)
+
+    def stop_listener(self):
+        """Flush queued records and stop the listener thread; safe to call twice"""
+        listener = getattr(self, 'listener', None)
+        if listener is not None and listener._thread is not None:
+            # QueueListener.stop() enqueues its sentinel with put_nowait, which fails on a full queue
+            self.queue.put(listener._sentinel)
+            listener._thread.join()
+            listener._thread = None
+
+    def close(self):
+        self.stop_listener()
+        super().close()
+
+class StructuredFormatter(logging.Formatter):
+    """Appends logfmt-style key=value pairs passed as extra={'context': {...}}"""
+
+    def format(self, record):
+        message = super().format(record)
+        context = getattr(record, 'context', None)
+        if not isinstance(context, dict) or not context:
+            return message
+        return message + ' ' + ' '.join(f'{key}={value!r}' for key, value in context.items())
@@ -0,0 +1,95 @@
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.audit.services import AuditService
+from apps.inspections.models import Inspection
+from apps.monitoring.log_handlers import QueueListenerHandler, StructuredFormatter
+
+# print: synchronous DEBUG output on the request thread, as the old print() calls did
+MODES = ['print', 'queue-debug', 'production']
+
+class Command(BaseCommand):
+    help = 'Benchmark inspection update throughput under synchronous and queued logging'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200, help='Updates per mode')
+        parser.add_argument('--payload-fields', type=int, default=40, help='Extra text fields sent with each update')
+        parser.add_argument('--modes', default=','.join(MODES), help=f'Comma separated subset of {",".join(MODES)}')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            self.stderr.write(self.style.ERROR(f'Unknown modes: {", ".join(sorted(unknown))}'))
+            return
+
+        user, _ = get_user_model().objects.get_or_create(
+            username='logging-benchmark',
+            defaults={'email': 'logging-benchmark@example.com', 'employee_id': 'BENCH-LOGGING', 'is_staff': True}
+        )
+        with AuditService.disabled():
+            inspection = Inspection.objects.create(
+                form_number=f'BENCH-LOG-{int(time.time()) % 10 ** 8}',
+                inspection_date=timezone.localdate(),
+                inspector=user,
+            )
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(user)
+        payload = {f'note_{index}': 'x' * 200 for index in range(options['payload_fields'])}
+        url = f'/api/inspections/inspections/{inspection.pk}/'
+
+        app_logger = logging.getLogger('apps')
+        saved = (app_logger.handlers[:], app_logger.level, app_logger.propagate)
+        output = tempfile.NamedTemporaryFile(prefix='benchmark_logging_', suffix='.log', delete=False)
+        output.close()
+        self.stdout.write(f'Inspection {inspection.pk}: {options["iterations"]} PUT updates per mode, log file {output.name}')
+
+        try:
+            with AuditService.disabled():
+                for mode in modes:
+                    self._run_mode(mode, app_logger, client, url, payload, options['iterations'], output.name)
+        finally:
+            app_logger.handlers, app_logger.level, app_logger.propagate = saved
+            with AuditService.disabled():
+                Inspection.objects.filter(pk=inspection.pk).delete()
+            os.unlink(output.name)
+
+    def _run_mode(self, mode, app_logger, client, url, payload, iterations, path):
+        file_handler = logging.FileHandler(path)
+        file_handler.setFormatter(StructuredFormatter('{levelname} {asctime} {name} {message}', style='{'))
+        handler = file_handler if mode == 'print' else QueueListenerHandler([file_handler])
+        app_logger.handlers = [handler]
+        app_logger.setLevel(logging.INFO if mode == 'production' else logging.DEBUG)
+        app_logger.propagate = False
+        size_before = os.path.getsize(path)
+
+        timings = []
+        started_all = time.perf_counter()
+        for iteration in range(iterations):
+            started = time.perf_counter()
+            response = client.put(url, {**payload, 'status': 'draft', 'station_type': 'FM', 'transmitting_site_name': f'{mode} {iteration}'}, format='json', secure=True)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                self.stderr.write(self.style.ERROR(f'{mode}: update failed with {response.status_code}'))
+                break
+        elapsed = time.perf_counter() - started_all
+
+        started = time.perf_counter()
+        handler.close()
+        drain = time.perf_counter() - started
+        file_handler.close()
+
+        timings_ms = sorted(value * 1000 for value in timings)
+        self.stdout.write(
+            f'{mode:>12}: {len(timings) / elapsed:7.1f} updates/s  mean {statistics.mean(timings_ms):6.2f} ms  '
+            f'p95 {timings_ms[int(len(timings_ms) * 0.95) - 1]:6.2f} ms  '
+            f'log {(os.path.getsize(path) - size_before) / 1024:8.1f} KiB  drain {drain * 1000:6.2f} ms'
+        )
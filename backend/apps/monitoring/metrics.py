@@ -0,0 +1,224 @@
+# apps/monitoring/metrics.py
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+_current = threading.local()
+
+def metrics_settings() -> Dict[str, Any]:
+    return getattr(settings, 'METRICS_SETTINGS', {})
+
+class RequestTimer:
+    """Wall, SQL and serializer time collected while one request is handled"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0.0
+        self.query_count = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    @staticmethod
+    def current() -> Optional['RequestTimer']:
+        return getattr(_current, 'timer', None)
+
+    @contextmanager
+    def activate(self):
+        _current.timer = self
+        try:
+            yield self
+        finally:
+            _current.timer = None
+            self.total = time.perf_counter() - self.started
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook counting every query"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - started
+            self.query_count += 1
+
+    @contextmanager
+    def serializer(self):
+        # Nested serializers run inside their parent's timing; only count the outermost
+        self._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._serializer_depth -= 1
+            if self._serializer_depth == 0:
+                self.serializer_time += time.perf_counter() - started
+
+    def server_timing(self) -> str:
+        total = (time.perf_counter() - self.started) * 1000
+        return ', '.join([
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.query_count} queries"',
+            f'serializer;dur={self.serializer_time * 1000:.1f}',
+            f'total;dur={total:.1f}',
+        ])
+
+def _timed(method):
+    def wrapper(self, *args, **kwargs):
+        timer = RequestTimer.current()
+        if timer is None:
+            return method(self, *args, **kwargs)
+        with timer.serializer():
+            return method(self, *args, **kwargs)
+    wrapper.__wrapped__ = method
+    return wrapper
+
+def install_serializer_timing():
+    """Wrap DRF serializer validation, saving and rendering so their time is attributed"""
+    from rest_framework.serializers import BaseSerializer, ListSerializer
+
+    if getattr(BaseSerializer, '_request_timing_installed', False):
+        return
+    # ListSerializer (many=True) overrides is_valid and save without calling up
+    for serializer_class in (BaseSerializer, ListSerializer):
+        for name in ('is_valid', 'save'):
+            if name in vars(serializer_class):
+                setattr(serializer_class, name, _timed(vars(serializer_class)[name]))
+    BaseSerializer.data = property(_timed(BaseSerializer.data.fget))
+    BaseSerializer._request_timing_installed = True
+
+class MetricsRegistry:
+    """Per-process request histograms keyed by (method, route, status class)
+
+    Histograms are cumulative, as Prometheus expects; quantiles come from a
+    rolling window of the most recent requests per endpoint.
+    """
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    DEFAULT_QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, buckets=None, query_buckets=None, window: int = 500):
+        self.buckets = tuple(buckets or self.DEFAULT_BUCKETS)
+        self.query_buckets = tuple(query_buckets or self.DEFAULT_QUERY_BUCKETS)
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._series: Dict[Tuple[str, str, str], Dict[str, Any]] = defaultdict(self._new_series)
+
+    def _new_series(self) -> Dict[str, Any]:
+        return {
+            'count': 0,
+            'duration_sum': 0.0,
+            'duration_buckets': [0] * len(self.buckets),
+            'query_sum': 0,
+            'query_buckets': [0] * len(self.query_buckets),
+            'db_sum': 0.0,
+            'serializer_sum': 0.0,
+            'recent': deque(maxlen=self.window),
+        }
+
+    def observe(self, method: str, route: str, status: int, timer: RequestTimer):
+        key = (method, route, f'{status // 100}xx')
+        with self._lock:
+            series = self._series[key]
+            series['count'] += 1
+            series['duration_sum'] += timer.total
+            series['query_sum'] += timer.query_count
+            series['db_sum'] += timer.query_time
+            series['serializer_sum'] += timer.serializer_time
+            series['recent'].append(timer.total)
+            for index, bound in enumerate(self.buckets):
+                if timer.total <= bound:
+                    series['duration_buckets'][index] += 1
+            for index, bound in enumerate(self.query_buckets):
+                if timer.query_count <= bound:
+                    series['query_buckets'][index] += 1
+
+    @staticmethod
+    def _labels(key: Tuple[str, str, str], **extra) -> str:
+        method, route, status = key
+        values = {'method': method, 'route': route, 'status': status, **extra}
+        return ','.join(
+            '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+            for name, value in values.items()
+        )
+
+    @staticmethod
+    def _quantile(values: List[float], quantile: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            snapshot = {
+                key: dict(series, recent=list(series['recent']),
+                          duration_buckets=list(series['duration_buckets']),
+                          query_buckets=list(series['query_buckets']))
+                for key, series in self._series.items()
+            }
+
+        lines = [
+            '# HELP http_request_duration_seconds Wall time spent handling the request',
+            '# TYPE http_request_duration_seconds histogram',
+        ]
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.buckets, series['duration_buckets']):
+                lines.append(f'http_request_duration_seconds_bucket{{{self._labels(key, le=bound)}}} {count}')
+            lines.append(f'http_request_duration_seconds_bucket{{{self._labels(key, le="+Inf")}}} {series["count"]}')
+            lines.append(f'http_request_duration_seconds_sum{{{self._labels(key)}}} {series["duration_sum"]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{{{self._labels(key)}}} {series["count"]}')
+
+        lines += [
+            '# HELP http_request_duration_recent_seconds Request time quantiles over the most recent requests',
+            '# TYPE http_request_duration_recent_seconds summary',
+        ]
+        for key, series in sorted(snapshot.items()):
+            for quantile in self.QUANTILES:
+                value = self._quantile(series['recent'], quantile)
+                lines.append(f'http_request_duration_recent_seconds{{{self._labels(key, quantile=quantile)}}} {value:.6f}')
+            lines.append(f'http_request_duration_recent_seconds_sum{{{self._labels(key)}}} {sum(series["recent"]):.6f}')
+            lines.append(f'http_request_duration_recent_seconds_count{{{self._labels(key)}}} {len(series["recent"])}')
+
+        lines += [
+            '# HELP http_request_queries SQL queries executed per request',
+            '# TYPE http_request_queries histogram',
+        ]
+        for key, series in sorted(snapshot.items()):
+            for bound, count in zip(self.query_buckets, series['query_buckets']):
+                lines.append(f'http_request_queries_bucket{{{self._labels(key, le=bound)}}} {count}')
+            lines.append(f'http_request_queries_bucket{{{self._labels(key, le="+Inf")}}} {series["count"]}')
+            lines.append(f'http_request_queries_sum{{{self._labels(key)}}} {series["query_sum"]}')
+            lines.append(f'http_request_queries_count{{{self._labels(key)}}} {series["count"]}')
+
+        for name, field, help_text in (
+            ('http_request_db_seconds_total', 'db_sum', 'Time spent executing SQL'),
+            ('http_request_serializer_seconds_total', 'serializer_sum', 'Time spent in DRF serializers'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for key, series in sorted(snapshot.items()):
+                lines.append(f'{name}{{{self._labels(key)}}} {series[field]:.6f}')
+
+        return '\n'.join(lines) + '\n'
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def registry() -> MetricsRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                options = metrics_settings()
+                _registry = MetricsRegistry(
+                    buckets=options.get('BUCKETS'),
+                    query_buckets=options.get('QUERY_BUCKETS'),
+                    window=options.get('WINDOW', 500),
+                )
+    return _registry
@@ -0,0 +1,35 @@
+# apps/monitoring/middleware.py
+from contextlib import ExitStack
+
+from django.db import connections
+
+from .metrics import RequestTimer, metrics_settings, registry
+
+class RequestMetricsMiddleware:
+    """Times each request, counts its SQL and reports both via Server-Timing and /api/metrics/"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        options = metrics_settings()
+        self.enabled = options.get('ENABLED', True)
+        self.server_timing = options.get('SERVER_TIMING', True)
+        self.excluded = tuple(options.get('EXCLUDE_PATHS', ()))
+
+    def __call__(self, request):
+        if not self.enabled or request.path.startswith(self.excluded):
+            return self.get_response(request)
+
+        timer = RequestTimer()
+        with timer.activate(), ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer.execute_wrapper))
+            response = self.get_response(request)
+            # Streaming bodies are produced after this point and are not included
+            if self.server_timing:
+                response['Server-Timing'] = timer.server_timing()
+
+        # The URL pattern, not the path, keeps label cardinality bounded
+        match = getattr(request, 'resolver_match', None)
+        route = match.route.replace('^', '').replace('$', '') if match else 'unmatched'
+        registry().observe(request.method, '/' + route, response.status_code, timer)
+        return response
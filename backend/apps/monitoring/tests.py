@@ -0,0 +1,125 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from .log_handlers import QueueListenerHandler
+from .metrics import RequestTimer, registry
+
+STATS_URL = '/api/inspections/stats/'
+
+class RequestMetricsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username='metrics-user', password='unused', employee_id='METRICS-1', department='Testing'
+        )
+        cls.admin = User.objects.create_user(
+            username='metrics-admin', password='unused', employee_id='METRICS-2', department='Testing', is_staff=True
+        )
+
+    def setUp(self):
+        registry().reset()
+        self.addCleanup(registry().reset)
+
+    def client_for(self, user):
+        # A new client loads the middleware, so it reads the settings in effect
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(user)
+        return client
+
+    @override_settings(METRICS_SETTINGS={**settings.METRICS_SETTINGS, 'SERVER_TIMING': True})
+    def test_server_timing_reports_the_queries_the_request_ran(self):
+        client = self.client_for(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(STATS_URL, secure=True)
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        for metric in ('db;dur=', 'serializer;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+
+        labels = 'method="GET",route="/api/inspections/stats/",status="2xx"'
+        exposition = self.client_for(self.admin).get('/api/metrics/', secure=True).content.decode()
+        self.assertIn(f'http_request_queries_sum{{{labels}}} {len(queries)}', exposition)
+        self.assertIn(f'http_request_duration_seconds_count{{{labels}}} 1', exposition)
+
+    @override_settings(METRICS_SETTINGS={**settings.METRICS_SETTINGS, 'SERVER_TIMING': False})
+    def test_server_timing_header_can_be_turned_off(self):
+        self.assertNotIn('Server-Timing', self.client_for(self.user).get(STATS_URL, secure=True))
+
+    def test_metrics_are_for_admins_only(self):
+        self.assertEqual(self.client_for(self.user).get('/api/metrics/', secure=True).status_code, 403)
+        response = self.client_for(self.admin).get('/api/metrics/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+    def test_many_serializer_validation_is_timed(self):
+        class ChannelSerializer(serializers.Serializer):
+            channel_number = serializers.CharField()
+
+        timer = RequestTimer()
+        with timer.activate():
+            serializer = ChannelSerializer(data=[{'channel_number': 'CH.22'}] * 200, many=True)
+            self.assertTrue(serializer.is_valid())
+        self.assertGreater(timer.serializer_time, 0)
+
+class RecordingHandler(logging.Handler):
+    """Keeps (thread name, formatted message) of every record it writes"""
+
+    def __init__(self):
+        super().__init__()
+        self.written = []
+
+    def emit(self, record):
+        self.written.append((threading.current_thread().name, self.format(record)))
+
+class QueueListenerHandlerTests(TestCase):
+
+    def setUp(self):
+        self.target = RecordingHandler()
+        self.handler = QueueListenerHandler([self.target], queue_size=1)
+        self.addCleanup(self.handler.close)
+
+    def record(self, level, message, *args):
+        return logging.LogRecord('apps.tests', level, __file__, 1, message, args, None)
+
+    def test_records_are_formatted_on_the_listener_thread(self):
+        self.target.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        values = ['before']
+        self.handler.handle(self.record(logging.INFO, 'values %s', values))
+        values.append('after')
+        self.handler.stop_listener()
+        self.assertEqual(len(self.target.written), 1)
+        thread, message = self.target.written[0]
+        self.assertNotEqual(thread, threading.current_thread().name)
+        self.assertEqual(message, "INFO values ['before']")
+
+    def test_full_queue_drops_and_reports_only_records_below_warning(self):
+        # Stopped, so nothing drains the one-record queue
+        self.handler.stop_listener()
+        self.handler.handle(self.record(logging.INFO, 'queued'))
+        self.handler.handle(self.record(logging.INFO, 'dropped'))
+        self.handler.handle(self.record(logging.ERROR, 'kept'))
+        self.assertEqual(self.handler.dropped, 1)
+        self.assertEqual([message for _, message in self.target.written], ['kept'])
+
+        self.handler.listener.start()
+        self.handler.stop_listener()
+        self.handler.listener.start()
+        self.handler.handle(self.record(logging.INFO, 'later'))
+        self.handler.stop_listener()
+        written = [message for _, message in self.target.written]
+        self.assertEqual(written[:2], ['kept', 'queued'])
+        # The report follows the next record that fits; with a one-record queue it may be written first
+        self.assertCountEqual(written[2:], [
+            'later', '1 log records dropped while the log queue was full (1 in total)',
+        ])
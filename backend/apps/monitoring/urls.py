@@ -0,0 +1,7 @@
+# apps/monitoring/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.metrics, name='metrics'),
+]
@@ -0,0 +1,12 @@
+# apps/monitoring/views.py
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from .metrics import registry
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """Request latency and SQL histograms for this process in Prometheus text format"""
+    return HttpResponse(registry().render(), content_type='text/plain; version=0.0.4; charset=utf-8')
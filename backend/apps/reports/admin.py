@@ -1,6 +1,6 @@
 # apps/reports/admin.py
 from django.contrib import admin
-from .models import InspectionReport, ReportImage, ERPCalculation, ReportTemplate
+from .models import InspectionReport, ReportImage, ERPCalculation, ReportTemplate, ComplianceSummary, ReportViolation
 
 @admin.register(InspectionReport)
 class InspectionReportAdmin(admin.ModelAdmin):
@@ -112,4 +112,23 @@ class ReportTemplateAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         })
-    )
\ No newline at end of file
+    )
+
+@admin.register(ReportViolation)
+class ReportViolationAdmin(admin.ModelAdmin):
+    list_display = ['report', 'violation_type', 'severity', 'category', 'channel', 'created_at']
+    list_filter = ['violation_type', 'severity', 'category', 'created_at']
+    search_fields = ['report__reference_number', 'description']
+    raw_id_fields = ['report']
+
+@admin.register(ComplianceSummary)
+class ComplianceSummaryAdmin(admin.ModelAdmin):
+    list_display = [
+        'month', 'broadcaster', 'station_type', 'compliance_status',
+        'violation_type', 'report_count', 'violation_count'
+    ]
+    list_filter = ['station_type', 'compliance_status', 'violation_type', 'month']
+    readonly_fields = [
+        'broadcaster', 'station_type', 'month', 'compliance_status',
+        'violation_type', 'report_count', 'violation_count', 'updated_at'
+    ]
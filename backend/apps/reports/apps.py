@@ -11,4 +11,7 @@ class ReportsConfig(AppConfig):
         try:
             import apps.reports.signals
         except ImportError:
-            pass
\ No newline at end of file
+            pass
+        import apps.reports.dashboard_signals
+        import apps.reports.template_signals
+        import apps.reports.upload_signals
@@ -0,0 +1,204 @@
+# apps/reports/benchmarks.py
+import json
+import math
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.audit.services import AuditService
+from apps.broadcasters.models import Broadcaster
+from apps.inspections.models import Inspection, TransmitterChannel
+from .models import InspectionReport, ReportImage
+
+# Every seeded row carries this marker so cleanup never touches real data
+BENCH_PREFIX = 'BENCH-RPT'
+
+IMAGE_TYPES = [choice for choice, _ in ReportImage.IMAGE_TYPES]
+
+def synthetic_jpeg(index: int, size: int = 1024, quality: int = 85) -> bytes:
+    """A photo-like JPEG (gradient plus noise) so encoders and resizers do real work"""
+    rng = random.Random(index)
+    base = Image.linear_gradient('L').resize((size, size)).convert('RGB')
+    noise = Image.effect_noise((size, size), 40 + index % 30).convert('RGB')
+    tint = Image.new('RGB', (size, size), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    image = Image.blend(Image.blend(base, noise, 0.35), tint, 0.25)
+    buffer = BytesIO()
+    image.save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+class BenchmarkSeeder:
+    """Creates broadcasters, inspections, reports and images tagged with BENCH_PREFIX"""
+
+    def __init__(self, broadcasters: int = 5, reports: int = 20, images_per_report: int = 6,
+                 channels_per_tv: int = 4, image_size: int = 1024, seed: int = 1):
+        self.broadcaster_count = broadcasters
+        self.report_count = reports
+        self.images_per_report = images_per_report
+        self.channels_per_tv = channels_per_tv
+        self.image_size = image_size
+        self.rng = random.Random(seed)
+
+    def user(self):
+        user, _ = get_user_model().objects.get_or_create(
+            username='reports-benchmark',
+            defaults={'email': 'reports-benchmark@example.com', 'employee_id': 'BENCH-REPORTS', 'is_staff': True}
+        )
+        return user
+
+    def seed(self) -> Dict[str, Any]:
+        user = self.user()
+        self.cleanup()
+        with AuditService.disabled():
+            broadcasters = [
+                Broadcaster.objects.create(name=f'{BENCH_PREFIX} Broadcaster {index}')
+                for index in range(self.broadcaster_count)
+            ]
+            reports = [self._seed_report(index, user, broadcasters[index % len(broadcasters)])
+                       for index in range(self.report_count)]
+        return {'user': user, 'broadcasters': broadcasters, 'reports': reports}
+
+    def _seed_report(self, index: int, user, broadcaster) -> InspectionReport:
+        rng = self.rng
+        station_type = 'TV' if index % 3 == 2 else 'FM'
+        inspection = Inspection.objects.create(
+            form_number=f'{BENCH_PREFIX}-{index:05d}',
+            broadcaster=broadcaster,
+            inspection_date=timezone.localdate() - timedelta(days=index * 7),
+            inspector=user,
+            status='completed',
+            station_type=station_type,
+            transmitting_site_name=f'Site {index}',
+            height_above_ground=str(rng.choice([30, 45, 72, 90])),
+            has_lightning_protection=rng.random() > 0.3,
+            is_electrically_grounded=rng.random() > 0.2,
+            has_aviation_warning_light=rng.random() > 0.5,
+            exciter_manufacturer=rng.choice(['Rohde & Schwarz', 'DB Elettronica', 'Elenos']),
+            exciter_model_number=f'EX-{rng.randrange(100, 999)}',
+            amplifier_manufacturer=rng.choice(['Rohde & Schwarz', 'DB Elettronica', 'Elenos']),
+            amplifier_model_number=f'AMP-{rng.randrange(100, 999)}',
+            amplifier_actual_reading=str(rng.choice([500, 1000, 2500, 5000])),
+            antenna_gain=str(rng.choice([6.5, 9.0, 11.0])),
+            transmit_frequency=f'{rng.uniform(88, 108):.1f} MHz',
+            other_observations='Synthetic benchmark inspection. ' * 10,
+        )
+        if station_type == 'TV':
+            TransmitterChannel.objects.bulk_create([
+                TransmitterChannel(
+                    inspection=inspection,
+                    channel_number=f'CH.{22 + channel}',
+                    frequency_mhz=474 + 8 * channel,
+                    order=channel,
+                    forward_power_w=rng.choice([500, 1500, 4000]),
+                    antenna_gain_dbd=rng.choice([8, 11, 13]),
+                    losses_db=1.5,
+                )
+                for channel in range(self.channels_per_tv)
+            ])
+
+        report = InspectionReport.objects.create(
+            inspection=inspection,
+            report_type='tv_broadcast' if station_type == 'TV' else 'fm_radio',
+            reference_number=f'{BENCH_PREFIX}/{index:05d}',
+            findings='Synthetic findings. ' * 20,
+            observations='Synthetic observations. ' * 20,
+            created_by=inspection.inspector,
+            last_modified_by=inspection.inspector,
+        )
+        for position in range(self.images_per_report):
+            image = ReportImage(
+                report=report,
+                image_type=IMAGE_TYPES[position % len(IMAGE_TYPES)],
+                caption=f'Benchmark image {position}',
+                order_in_section=position + 1,
+                uploaded_by=inspection.inspector,
+            )
+            image.image.save(f'bench_{index}_{position}.jpg',
+                             ContentFile(synthetic_jpeg(index * 100 + position, self.image_size)), save=False)
+            image.save()
+        return report
+
+    @staticmethod
+    def cleanup():
+        with AuditService.disabled():
+            Inspection.objects.filter(form_number__startswith=BENCH_PREFIX).delete()
+            Broadcaster.objects.filter(name__startswith=BENCH_PREFIX).delete()
+
+def measure(func: Callable[[], Any], repeat: int = 5, warmup: int = 1,
+            teardown: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    """Latency over `repeat` runs, then one traced run for peak memory and query count"""
+    for _ in range(warmup):
+        func()
+        if teardown:
+            teardown()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+        if teardown:
+            teardown()
+
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if teardown:
+        teardown()
+
+    timings.sort()
+    return {
+        'runs': repeat,
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p95_ms': round(timings[math.ceil(len(timings) * 0.95) - 1], 3),
+        'max_ms': round(timings[-1], 3),
+        'peak_memory_kib': round(peak / 1024, 1),
+        'queries': len(queries),
+    }
+
+# Metrics compared against a baseline; higher is worse for all of them
+COMPARED_METRICS = ('mean_ms', 'p95_ms', 'peak_memory_kib', 'queries')
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Scenarios whose metrics grew by more than `threshold` (a fraction) over the baseline
+
+    Query counts are exact, so any increase is flagged.
+    """
+    regressions = []
+    for name, current in results.get('scenarios', {}).items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = previous.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            limit = before if metric == 'queries' else before * (1 + threshold)
+            if after > limit:
+                regressions.append({
+                    'scenario': name,
+                    'metric': metric,
+                    'baseline': before,
+                    'current': after,
+                    'change': round((after - before) / before, 3) if before else None,
+                })
+    return regressions
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as handle:
+        return json.load(handle)
@@ -0,0 +1,172 @@
+# apps/reports/blobs.py
+import logging
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import ImageBlob, ReportImage
+from .thumbnails import ThumbnailCache
+from .transcoding import TRANSCODE_TYPES, ImageTranscoder
+from .upload_handlers import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# (sha256, storage name, size, mime type) of one reference to take
+BlobRef = Tuple[str, str, int, str]
+
+class ImageBlobStore:
+    """Content-addressed storage for report image files
+
+    A file is written once under `blobs/<sha[:2]>/<sha[2:4]>/<sha>.<ext>`;
+    uploading the same bytes again only takes another reference on its
+    ImageBlob row. References are taken in the transaction that saves the
+    images (`link`) and dropped when an image row is deleted (`release`,
+    from upload_signals); the file goes with the last reference.
+    """
+
+    EXTENSIONS = {
+        'image/jpeg': 'jpg', 'image/png': 'png', 'image/gif': 'gif',
+        'image/webp': 'webp', 'image/bmp': 'bmp', 'image/heic': 'heic', 'image/heif': 'heif',
+    }
+
+    @staticmethod
+    def storage():
+        return ReportImage._meta.get_field('image').storage
+
+    @classmethod
+    def blob_name(cls, sha256: str, mime_type: str = '', filename: str = '') -> str:
+        extension = cls.EXTENSIONS.get(mime_type) or os.path.splitext(filename)[1].lstrip('.').lower() or 'bin'
+        return f'blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}.{extension}'
+
+    @classmethod
+    def write(cls, sha256: str, mime_type: str, file) -> Tuple[str, bool]:
+        """Store the file under its blob name unless those bytes are already there; returns (name, written)"""
+        storage = cls.storage()
+        name = cls.blob_name(sha256, mime_type, getattr(file, 'name', '') or '')
+        if storage.exists(name):
+            return name, False
+        saved = storage.save(name, file)
+        if saved != name:
+            # Another request stored the same contents meanwhile; keep theirs
+            storage.delete(saved)
+            return name, False
+        return name, True
+
+    @staticmethod
+    def _by_count(counts: Counter):
+        """sha256s grouped by how many references they gain or lose, so each group is one UPDATE"""
+        groups = defaultdict(list)
+        for sha256, count in counts.items():
+            groups[count].append(sha256)
+        return groups.items()
+
+    @classmethod
+    def link(cls, refs: Iterable[BlobRef]):
+        """Take one reference per entry; call inside the transaction that saves the images"""
+        refs = list(refs)
+        if not refs:
+            return
+        counts = Counter(sha256 for sha256, _, _, _ in refs)
+        blobs = {
+            sha256: ImageBlob(
+                sha256=sha256, name=name, size=size, mime_type=mime_type, ref_count=0,
+                transcode_status='pending' if mime_type in TRANSCODE_TYPES else '',
+            )
+            for sha256, name, size, mime_type in refs
+        }
+        # Rows another upload created first are kept as they are; the increments below cover both
+        ImageBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+        for count, sha256s in cls._by_count(counts):
+            ImageBlob.objects.filter(pk__in=sha256s).update(ref_count=F('ref_count') + count)
+        transcode = [sha256 for sha256, blob in blobs.items() if blob.transcode_status]
+        if transcode:
+            # Outside the request's critical path: uploads answer before any decoding starts
+            transaction.on_commit(lambda: ImageTranscoder.schedule(transcode))
+
+    @classmethod
+    def release(cls, sha256s: Iterable[str]):
+        """Drop one reference per sha256; blobs left without references are deleted with their files"""
+        counts = Counter(sha256 for sha256 in sha256s if sha256)
+        if not counts:
+            return
+        with transaction.atomic():
+            for count, group in cls._by_count(counts):
+                ImageBlob.objects.filter(pk__in=group).update(ref_count=Greatest(F('ref_count') - count, 0))
+            unreferenced = ImageBlob.objects.filter(pk__in=list(counts), ref_count=0)
+            names = [
+                name for row in unreferenced.values_list('name', 'print_name', 'web_name') for name in row if name
+            ]
+            if names:
+                unreferenced.delete()
+                transaction.on_commit(lambda: cls.discard_unreferenced(names))
+
+    @classmethod
+    def discard_unreferenced(cls, names: Iterable[str]) -> List[str]:
+        """Delete blob files no ImageBlob row refers to; returns the names deleted
+
+        Used after the last reference went and to undo writes whose rows
+        were never inserted. A file whose contents were linked again in
+        the meantime is kept, renditions included. Thumbnails of the
+        deleted blobs go with them.
+        """
+        names = set(names)
+        if not names:
+            return []
+        sha256_of = {name: os.path.basename(name).split('.', 1)[0] for name in names}
+        kept = set(ImageBlob.objects.filter(pk__in=set(sha256_of.values())).values_list('pk', flat=True))
+        storage = cls.storage()
+        deleted = []
+        for name in sorted(names):
+            if sha256_of[name] in kept:
+                continue
+            try:
+                storage.delete(name)
+                deleted.append(name)
+            except OSError:
+                logger.warning("Could not delete unreferenced image blob %s", name, exc_info=True)
+        # Thumbnails are served by hash; they must not outlive their blob
+        ThumbnailCache.discard(sha256_of[name] for name in deleted)
+        return deleted
+
+    @classmethod
+    def adopt(cls, images: Iterable[ReportImage], dry_run: bool = False) -> Dict[str, int]:
+        """Move images stored before deduplication into the blob store, deleting their old files"""
+        storage = cls.storage()
+        counts = {'images': 0, 'missing': 0, 'duplicates': 0, 'bytes_freed': 0}
+        seen = set()
+        for image in images:
+            old_name = image.image.name
+            if not old_name or not storage.exists(old_name):
+                counts['missing'] += 1
+                continue
+            with image.image.open('rb'):
+                sha256, mime_type = fingerprint(image.image)
+                size = image.image.size
+                if dry_run:
+                    written = sha256 not in seen and not ImageBlob.objects.filter(pk=sha256).exists()
+                    name = cls.blob_name(sha256, mime_type, old_name)
+                else:
+                    name, written = cls.write(sha256, mime_type, image.image)
+            seen.add(sha256)
+            counts['images'] += 1
+            if not written:
+                counts['duplicates'] += 1
+                counts['bytes_freed'] += size
+            if dry_run:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.link([(sha256, name, size, mime_type)])
+                    ReportImage.objects.filter(pk=image.pk).update(
+                        image=name, blob_id=sha256, sha256=sha256, mime_type=mime_type
+                    )
+            except Exception:
+                cls.discard_unreferenced([name])
+                raise
+            if old_name != name:
+                storage.delete(old_name)
+        return counts
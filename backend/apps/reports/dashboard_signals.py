@@ -0,0 +1,115 @@
+# apps/reports/dashboard_signals.py
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+
+from apps.inspections.models import Inspection
+from .models import InspectionReport
+from .services import ComplianceDashboardService
+
+# Report fields that feed the compliance summary
+REPORT_SUMMARY_FIELDS = {'inspection', 'inspection_id', 'compliance_status', 'violations_found'}
+
+def _report_state(instance):
+    """(inspection_id, compliance_status, violation counts) from loaded fields, or None if deferred"""
+    loaded = instance.__dict__
+    if not all(name in loaded for name in ('inspection_id', 'compliance_status', 'violations_found')):
+        return None
+    return (
+        loaded['inspection_id'],
+        loaded['compliance_status'],
+        ComplianceDashboardService.violation_counts(loaded['violations_found']),
+    )
+
+def _report_contributions(states):
+    """Turn report states into summary contributions with one inspection lookup"""
+    dims = ComplianceDashboardService.inspection_dims({state[0] for state in states if state})
+    return [
+        ComplianceDashboardService.contribution(dims.get(state[0]), state[1], state[2]) if state else {}
+        for state in states
+    ]
+
+def _stored_report_state(pk):
+    """Report state from the stored row, for instances not loaded (or saved) with every summary field"""
+    stored = InspectionReport.objects.filter(pk=pk).values_list(
+        'inspection_id', 'compliance_status', 'violations_found'
+    ).first()
+    return stored and (stored[0], stored[1], ComplianceDashboardService.violation_counts(stored[2]))
+
+def report_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Read the stored row before a save so only the delta is applied
+
+    Done here rather than on every load: reports are read far more often
+    than saved, and violations_found may be edited in place before saving.
+    An instance saved before keeps the state its last save left.
+    """
+    instance._summary_skip = raw or (
+        update_fields is not None and not REPORT_SUMMARY_FIELDS.intersection(update_fields)
+    )
+    if instance._summary_skip or instance._state.adding:
+        return
+    if getattr(instance, '_summary_state', None) is None:
+        instance._summary_state = _stored_report_state(instance.pk)
+
+def report_post_save(sender, instance, created, **kwargs):
+    if getattr(instance, '_summary_skip', False):
+        return
+    before_state = None if created else getattr(instance, '_summary_state', None)
+    after_state = _report_state(instance) or _stored_report_state(instance.pk)
+    if before_state == after_state:
+        return
+    before, after = _report_contributions([before_state, after_state])
+    ComplianceDashboardService.apply(before, after)
+    instance._summary_state = after_state
+
+def report_pre_delete(sender, instance, **kwargs):
+    # The inspection may be deleted in the same cascade; resolve dims now
+    state = (getattr(instance, '_summary_state', None) or _report_state(instance)
+             or _stored_report_state(instance.pk))
+    instance._summary_removed = _report_contributions([state])[0]
+
+def report_post_delete(sender, instance, **kwargs):
+    ComplianceDashboardService.apply(getattr(instance, '_summary_removed', {}), {})
+
+def _inspection_values(instance):
+    """Loaded values of INSPECTION_DIM_FIELDS, or None if any is deferred"""
+    loaded = instance.__dict__
+    if not all(name in loaded for name in ComplianceDashboardService.INSPECTION_DIM_FIELDS):
+        return None
+    return tuple(loaded[name] for name in ComplianceDashboardService.INSPECTION_DIM_FIELDS)
+
+def inspection_pre_save(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._summary_values = None
+        return
+    fields = ComplianceDashboardService.INSPECTION_DIM_FIELDS
+    instance._summary_values = instance.loaded_values(fields) or Inspection.objects.filter(
+        pk=instance.pk
+    ).values_list(*fields).first()
+
+def inspection_post_save(sender, instance, created, raw=False, **kwargs):
+    """Move the inspection's reports to their new summary rows when broadcaster, type or date change"""
+    before = getattr(instance, '_summary_values', None)
+    after = _inspection_values(instance)
+    if raw or created or before is None or after is None or before == after:
+        return
+    before_dims = ComplianceDashboardService.summary_dims(*before)
+    after_dims = ComplianceDashboardService.summary_dims(*after)
+    if before_dims == after_dims:
+        return
+
+    reports = InspectionReport.objects.filter(inspection_id=instance.pk).values_list(
+        'compliance_status', 'violations_found'
+    )
+    for compliance_status, violations in reports:
+        counts = ComplianceDashboardService.violation_counts(violations)
+        ComplianceDashboardService.apply(
+            ComplianceDashboardService.contribution(before_dims, compliance_status, counts),
+            ComplianceDashboardService.contribution(after_dims, compliance_status, counts)
+        )
+
+pre_save.connect(report_pre_save, sender=InspectionReport, dispatch_uid='dashboard_report_pre_save')
+post_save.connect(report_post_save, sender=InspectionReport, dispatch_uid='dashboard_report_post_save')
+pre_delete.connect(report_pre_delete, sender=InspectionReport, dispatch_uid='dashboard_report_pre_delete')
+post_delete.connect(report_post_delete, sender=InspectionReport, dispatch_uid='dashboard_report_post_delete')
+
+pre_save.connect(inspection_pre_save, sender=Inspection, dispatch_uid='dashboard_inspection_pre_save')
+post_save.connect(inspection_post_save, sender=Inspection, dispatch_uid='dashboard_inspection_post_save')
@@ -1,6 +1,8 @@
 # apps/reports/document_generator.py - COMPLETE IMPLEMENTATION
+import logging
 import os
 import math
+from contextlib import nullcontext
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from io import BytesIO
@@ -15,18 +17,51 @@ from docx.enum.dml import MSO_THEME_COLOR_INDEX
 
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db.models import prefetch_related_objects
 from django.template import Template, Context
+from django.utils.functional import cached_property
 
 from .models import InspectionReport, ReportImage, ERPCalculation
+from apps.equipment.services import TypeApprovalRegistry
+from apps.inspections.services import ChannelERPService
+from . import docx_tables, docx_templates
+from .profiling import GenerationProfiler, profiled
+from .template_engine import CompiledReportTemplate, PlanStep, ReportTemplateRegistry
+
+logger = logging.getLogger(__name__)
+
+# template_structure section kind -> builder method taking the document
+SECTION_BUILDERS = {
+    'header': '_build_docx_header',
+    'findings_heading': '_build_findings_heading',
+    'site': '_build_site_table',
+    'tower': '_build_tower_table',
+    'transmitter': '_build_transmitter_section',
+    'antenna': '_build_antenna_table',
+    'filter': '_build_filter_table',
+    'stl': '_build_stl_table',
+    'erp': '_build_erp_section',
+    'observations': '_build_observations',
+    'conclusions': '_build_conclusions',
+    'recommendations': '_build_recommendations',
+    'signature': '_build_docx_signature',
+}
 
 class ProfessionalDocumentGenerator:
     """Professional DOCX document generator for CA inspection reports"""
     
-    def __init__(self, report: InspectionReport):
+    def __init__(self, report: InspectionReport, profiler: Optional[GenerationProfiler] = None):
         self.report = report
+        # Opt-in per-section timing; see apps/reports/profiling.py
+        self.profiler = profiler
         self.inspection = report.inspection
         self.broadcaster = self.inspection.broadcaster
         
+        # Per-channel transmitter rows (TV/DTT) in one query, ERP computed lazily in one pass
+        prefetch_related_objects([self.inspection], 'channels')
+        self._channel_rows = None
+        self._context = None
+        
         # Image categories mapping to match frontend
         self.image_categories = {
             'site_overview': 'Site Overview',
@@ -48,7 +83,11 @@ class ProfessionalDocumentGenerator:
         try:
             # REMOVED: PDF generation - only DOCX
             if 'docx' in formats:
-                docx_path = self.generate_professional_docx()
+                if self.profiler:
+                    with self.profiler.run():
+                        docx_path = self.generate_professional_docx()
+                else:
+                    docx_path = self.generate_professional_docx()
                 results['docx'] = docx_path
             
             # Update report status
@@ -59,46 +98,105 @@ class ProfessionalDocumentGenerator:
             return results
             
         except Exception as e:
-            print(f"Document generation failed: {str(e)}")
+            logger.exception("Document generation failed for report %s", self.report.pk)
             self.report.status = 'draft'
             self.report.save()
             raise
     
     def generate_professional_docx(self) -> str:
         """Generate professional Word document matching CA templates"""
-        doc = Document()
+        # Copy of the plan's styled skeleton; builders apply its named styles
+        doc = self.plan.new_document()
         
         # Set document properties
         doc.core_properties.title = self.report.title
         doc.core_properties.author = self.inspection.inspector.get_full_name()
         doc.core_properties.created = self.report.created_at
         
-        # Build document content
-        self._build_docx_header(doc)
-        self._build_docx_findings_section(doc)
-        self._build_docx_conclusions_section(doc)
-        self._build_docx_signature(doc)
+        # Build document content in the order the report template lays out; a blank
+        # line separates consecutive headed sections, none follows the last one
+        after_section = False
+        for step in self.plan.steps:
+            if step.optional and not self._section_has_content(step):
+                continue
+            if after_section and step.heading:
+                doc.add_paragraph()
+            self._build_plan_step(doc, step)
+            after_section = bool(step.heading)
         
         # Save document
-        buffer = BytesIO()
-        doc.save(buffer)
-        
-        filename = f"{self.report.reference_number.replace('/', '_')}.docx"
-        self.report.generated_docx.save(
-            filename,
-            ContentFile(buffer.getvalue()),
-            save=True
-        )
+        with self.profiler.section('save') if self.profiler else nullcontext():
+            buffer = BytesIO()
+            doc.save(buffer)
+            if self.profiler:
+                self.profiler.output_bytes = buffer.tell()
+            
+            filename = f"{self.report.reference_number.replace('/', '_')}.docx"
+            self.report.generated_docx.save(
+                filename,
+                ContentFile(buffer.getvalue()),
+                save=True
+            )
         
         return self.report.generated_docx.path
     
+    @cached_property
+    def plan(self) -> CompiledReportTemplate:
+        """Compiled layout of the active ReportTemplate for this report type"""
+        return ReportTemplateRegistry.plan_for(self.report.report_type)
+    
+    @profiled('section', detail_arg=1)
+    def _build_plan_step(self, doc: Document, step: PlanStep):
+        """Build one section of the template plan: heading, content, images"""
+        if step.heading:
+            self._add_section_header(doc, step.heading)
+        if step.kind == 'text':
+            self._add_text_lines(doc, step.template.render(Context(self._template_context())))
+        else:
+            getattr(self, SECTION_BUILDERS[step.kind])(doc)
+        if step.images:
+            self._add_section_images(doc, step.images)
+    
+    def _section_has_content(self, step: PlanStep) -> bool:
+        """Whether an optional section has anything to show"""
+        if step.kind == 'filter':
+            return bool(self.inspection.filter_manufacturer or self._has_images('filter_equipment'))
+        if step.kind == 'stl':
+            return bool(self.inspection.studio_manufacturer or self._has_images('studio_transmitter_link'))
+        if step.kind == 'observations':
+            return bool(self.report.observations or self.inspection.other_observations)
+        if step.images:
+            return self._has_images(step.images)
+        return True
+    
+    def _template_context(self) -> Dict[str, Any]:
+        """Context for ReportTemplate text fields, built once per generation"""
+        if self._context is None:
+            self._context = {
+                'report': self.report,
+                'inspection': self.inspection,
+                'broadcaster': self.broadcaster,
+                'inspector_name': self.inspection.inspector.get_full_name(),
+                'inspection_date': self._format_date_with_suffix(self.inspection.inspection_date),
+                'contact_name': self.inspection.contact_name or 'their representative',
+                # Callables, so the template engine only runs them when referenced
+                'auto_conclusions': self._generate_auto_conclusions,
+                'auto_recommendations': self._generate_auto_recommendations,
+            }
+        return self._context
+    
+    def _add_text_lines(self, doc: Document, text: str, style: Optional[str] = None, skip_blank: bool = False):
+        """One paragraph per line of rendered template text"""
+        for line in text.strip().split('\n'):
+            line = line.strip()
+            if line or not skip_blank:
+                self._add_paragraph(doc, line, style=style)
+    
+    @profiled('header')
     def _build_docx_header(self, doc: Document):
         """Build document header matching CA format"""
         # Reference number - bold, left aligned
-        ref_para = doc.add_paragraph()
-        ref_run = ref_para.add_run(self.report.reference_number)
-        ref_run.bold = True
-        ref_run.font.size = Pt(12)
+        self._add_paragraph(doc, self.report.reference_number, style=docx_templates.REFERENCE)
         
         # Date
         date_str = self._format_date_with_suffix(self.inspection.inspection_date)
@@ -106,104 +204,51 @@ class ProfessionalDocumentGenerator:
         doc.add_paragraph()  # Empty line
         
         # Addressee - bold
-        to_para = doc.add_paragraph()
-        to_run = to_para.add_run("TO: D/MIRC")
-        to_run.bold = True
+        self._add_paragraph(doc, "TO: D/MIRC", style=docx_templates.STRONG)
         
-        thru_para = doc.add_paragraph()
-        thru_run = thru_para.add_run("THRO': PO/NR/MIRC")
-        thru_run.bold = True
+        self._add_paragraph(doc, "THRO': PO/NR/MIRC", style=docx_templates.STRONG)
         
         doc.add_paragraph()  # Empty line
         
         # Subject line - bold and centered
-        title_para = doc.add_paragraph()
-        title_run = title_para.add_run(f"RE: {self.report.title}")
-        title_run.bold = True
-        title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        self._add_paragraph(doc, f"RE: {self.report.title}", style=docx_templates.SUBJECT)
         
         doc.add_paragraph()  # Empty line
         
-        # Reference text
-        ref_text = "The above subject matter refers.\n\nReference is made to the above subject."
-        doc.add_paragraph(ref_text)
-        
-        # Inspection details
-        inspector_name = self.inspection.inspector.get_full_name()
-        inspection_date = self._format_date_with_suffix(self.inspection.inspection_date)
-        contact_name = self.inspection.contact_name or 'their representative'
-        
-        inspection_para = doc.add_paragraph()
-        inspection_text = f"The transmit station was inspected by MIRC officer {inspector_name} on {inspection_date} in the presence of their representative {contact_name}."
-        inspection_para.add_run(inspection_text)
+        # Introduction from the report template, or the standard wording
+        introduction = self.plan.render('header_template', self._template_context())
+        if introduction is not None:
+            self._add_text_lines(doc, introduction)
+        else:
+            # Reference text
+            ref_text = "The above subject matter refers.\n\nReference is made to the above subject."
+            doc.add_paragraph(ref_text)
+            
+            # Inspection details
+            context = self._template_context()
+            inspection_para = doc.add_paragraph()
+            inspection_text = f"The transmit station was inspected by MIRC officer {context['inspector_name']} on {context['inspection_date']} in the presence of their representative {context['contact_name']}."
+            inspection_para.add_run(inspection_text)
         
         doc.add_paragraph()  # Empty line
-        
-        # FINDINGS header - bold
-        findings_para = doc.add_paragraph()
-        findings_run = findings_para.add_run("FINDINGS")
-        findings_run.bold = True
-        findings_run.font.size = Pt(14)
     
-    def _build_docx_findings_section(self, doc: Document):
-        """Build findings section with all technical details"""
-        
-        # A. SITE
-        self._add_section_header(doc, "A. SITE")
-        self._build_site_table(doc)
-        self._add_section_images(doc, 'site_overview')
-        doc.add_paragraph()
-        
-        # B. MAST/TOWER
-        self._add_section_header(doc, "B. MAST")
-        self._build_tower_table(doc)
-        self._add_section_images(doc, 'tower_mast')
-        doc.add_paragraph()
-        
-        # C. TRANSMITTER
-        self._add_section_header(doc, "C. TRANSMITTER")
-        if self.inspection.station_type == 'TV' or self.inspection.station_type == 'DTT':
+    def _build_findings_heading(self, doc: Document):
+        """FINDINGS header plus the template's findings introduction"""
+        self._add_paragraph(doc, "FINDINGS", style=docx_templates.FINDINGS_HEADING)
+        introduction = self.plan.render('findings_template', self._template_context())
+        if introduction:
+            self._add_text_lines(doc, introduction)
+    
+    def _build_transmitter_section(self, doc: Document):
+        """Multi-channel table for TV/DTT, exciter and amplifier tables otherwise"""
+        if self.inspection.station_type == 'TV' or self.inspection.station_type == 'DTT' or self._get_channel_rows():
             self._build_tv_transmitter_table(doc)
         else:
             self._build_fm_transmitter_table(doc)
-        self._add_section_images(doc, 'transmitter_equipment')
-        doc.add_paragraph()
-        
-        # D. ANTENNA SYSTEM
-        self._add_section_header(doc, "D. ANTENNA SYSTEM")
-        self._build_antenna_table(doc)
-        self._add_section_images(doc, 'antenna')
-        doc.add_paragraph()
-        
-        # E. FILTER (if applicable)
-        if self.inspection.filter_manufacturer or self._has_images('filter_equipment'):
-            self._add_section_header(doc, "E. FILTER")
-            self._build_filter_table(doc)
-            self._add_section_images(doc, 'filter_equipment')
-            doc.add_paragraph()
-        
-        # F. STUDIO TO TRANSMITTER LINK (if applicable)
-        if self.inspection.studio_manufacturer or self._has_images('studio_transmitter_link'):
-            self._add_section_header(doc, "F. STUDIO TO TRANSMITTER LINK")
-            self._build_stl_table(doc)
-            self._add_section_images(doc, 'studio_transmitter_link')
-            doc.add_paragraph()
-        
-        # G. ERP CALCULATION - UPDATED TO FETCH FROM INSPECTION
-        self._add_section_header(doc, "G. ERP CALCULATION")
-        self._build_erp_section(doc)
-        doc.add_paragraph()
     
+    @profiled('site_table')
     def _build_site_table(self, doc: Document):
         """Build site information table"""
-        table = doc.add_table(rows=3, cols=2)
-        table.style = 'Table Grid'
-        table.autofit = False
-        
-        # Set column widths
-        table.columns[0].width = Inches(2.5)
-        table.columns[1].width = Inches(4.0)
-        
         # Site data
         site_data = [
             ("Name:", self.inspection.transmitting_site_name or 'Not specified'),
@@ -211,22 +256,11 @@ class ProfessionalDocumentGenerator:
             ("Elevation:", f"{self.inspection.altitude or 'Not specified'} M")
         ]
         
-        for i, (label, value) in enumerate(site_data):
-            # Label cell - bold
-            label_cell = table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, site_data, docx_templates.LABEL_TABLE, widths=(Inches(2.5), Inches(4.0)), fixed=True)
     
+    @profiled('tower_table')
     def _build_tower_table(self, doc: Document):
         """Build tower/mast information table"""
-        table = doc.add_table(rows=2, cols=2)
-        table.style = 'Table Grid'
-        
         # Tower data
         tower_type = self.inspection.get_tower_type_display() if self.inspection.tower_type else 'Not specified'
         height = f"{self.inspection.height_above_ground or 'Not specified'}M"
@@ -236,27 +270,14 @@ class ProfessionalDocumentGenerator:
             ("Height:", height)
         ]
         
-        for i, (label, value) in enumerate(tower_data):
-            # Label cell - bold
-            label_cell = table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, tower_data, docx_templates.LABEL_TABLE)
     
+    @profiled('fm_transmitter_table')
     def _build_fm_transmitter_table(self, doc: Document):
         """Build FM transmitter table with equipment"""
         
         # Exciter section
-        exciter_para = doc.add_paragraph()
-        exciter_run = exciter_para.add_run("EXCITER")
-        exciter_run.bold = True
-        
-        exciter_table = doc.add_table(rows=5, cols=2)
-        exciter_table.style = 'Table Grid'
+        self._add_paragraph(doc, "EXCITER", style=docx_templates.STRONG)
         
         exciter_data = [
             ("Make:", self.inspection.exciter_manufacturer or 'Not Seen'),
@@ -266,26 +287,12 @@ class ProfessionalDocumentGenerator:
             ("Power Output:", f"{self.inspection.exciter_actual_reading or 'Not Seen'} W")
         ]
         
-        for i, (label, value) in enumerate(exciter_data):
-            # Label cell - bold
-            label_cell = exciter_table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = exciter_table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, exciter_data, docx_templates.LABEL_TABLE)
         
         doc.add_paragraph()
         
         # Amplifier section
-        amp_para = doc.add_paragraph()
-        amp_run = amp_para.add_run("AMPLIFIER")
-        amp_run.bold = True
-        
-        amp_table = doc.add_table(rows=5, cols=2)
-        amp_table.style = 'Table Grid'
+        self._add_paragraph(doc, "AMPLIFIER", style=docx_templates.STRONG)
         
         amp_data = [
             ("Make:", self.inspection.amplifier_manufacturer or 'Not Seen'),
@@ -295,33 +302,21 @@ class ProfessionalDocumentGenerator:
             ("Power Output:", f"{self.inspection.amplifier_actual_reading or 'Not Seen'} W")
         ]
         
-        for i, (label, value) in enumerate(amp_data):
-            # Label cell - bold
-            label_cell = amp_table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = amp_table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, amp_data, docx_templates.LABEL_TABLE)
         
         # Frequency
         doc.add_paragraph()
-        freq_para = doc.add_paragraph()
-        freq_run = freq_para.add_run(f"Frequency: {self.inspection.transmit_frequency or 'Not Specified'}")
-        freq_run.bold = True
+        self._add_paragraph(doc, f"Frequency: {self.inspection.transmit_frequency or 'Not Specified'}", style=docx_templates.STRONG)
     
+    @profiled('tv_transmitter_table')
     def _build_tv_transmitter_table(self, doc: Document):
         """Build TV transmitter table for multiple channels - UPDATED"""
         # Use the improved method for better formatting
         self._build_tv_transmitter_table_improved(doc)
     
+    @profiled('antenna_table')
     def _build_antenna_table(self, doc: Document):
         """Build antenna system table"""
-        table = doc.add_table(rows=6, cols=2)
-        table.style = 'Table Grid'
-        
         antenna_data = [
             ("Manufacturer:", self.inspection.antenna_manufacturer or 'Not specified'),
             ("Model No.:", self.inspection.antenna_model_number or 'Not specified'),
@@ -331,22 +326,11 @@ class ProfessionalDocumentGenerator:
             ("Height on the Tower:", f"{self.inspection.height_on_tower or 'Not specified'}M")
         ]
         
-        for i, (label, value) in enumerate(antenna_data):
-            # Label cell - bold
-            label_cell = table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, antenna_data, docx_templates.LABEL_TABLE)
     
+    @profiled('filter_table')
     def _build_filter_table(self, doc: Document):
         """Build filter equipment table"""
-        table = doc.add_table(rows=4, cols=2)
-        table.style = 'Table Grid'
-        
         filter_data = [
             ("Manufacturer:", self.inspection.filter_manufacturer or 'Not specified'),
             ("Model:", self.inspection.filter_model_number or 'Not Seen'),
@@ -354,22 +338,11 @@ class ProfessionalDocumentGenerator:
             ("Frequency:", self.inspection.filter_frequency or 'Not specified')
         ]
         
-        for i, (label, value) in enumerate(filter_data):
-            # Label cell - bold
-            label_cell = table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, filter_data, docx_templates.LABEL_TABLE)
     
+    @profiled('stl_table')
     def _build_stl_table(self, doc: Document):
         """Build Studio to Transmitter Link table"""
-        table = doc.add_table(rows=5, cols=2)
-        table.style = 'Table Grid'
-        
         stl_data = [
             ("Manufacturer:", self.inspection.studio_manufacturer or 'Not specified'),
             ("Model:", self.inspection.studio_model_number or 'Not Seen'),
@@ -378,24 +351,20 @@ class ProfessionalDocumentGenerator:
             ("Description of Signal Reception:", self.inspection.signal_description or 'Not specified')
         ]
         
-        for i, (label, value) in enumerate(stl_data):
-            # Label cell - bold
-            label_cell = table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, stl_data, docx_templates.LABEL_TABLE)
     
+    @profiled('erp_section')
     def _build_erp_section(self, doc: Document):
         """Build ERP calculation section - UPDATED TO HANDLE MULTIPLE CHANNELS"""
         
         # Check if we have multiple channels (TV station)
         erp_calculations = self.report.erp_details.all()
+        channel_rows = self._get_channel_rows()
         
-        if erp_calculations.count() > 1:
+        if channel_rows:
+            # Normalized per-channel records on the inspection
+            self._build_erp_table_from_channels(doc, channel_rows)
+        elif erp_calculations.count() > 1:
             # Use multi-channel table format like SIGNET report
             self._build_erp_table_multi_channel(doc)
         elif erp_calculations.exists():
@@ -413,24 +382,58 @@ class ProfessionalDocumentGenerator:
                 # Last resort: create calculation from inspection data
                 self._build_erp_from_equipment_data(doc)
         
-        # Authorized ERP
-        auth_para = doc.add_paragraph()
-        auth_run = auth_para.add_run("Authorized ERP: 10000 W (10 kW)")
-        auth_run.bold = True
+        # Authorized ERP, per channel where the inspection has channel records
+        if channel_rows:
+            limits = [f"{row['channel'].channel_number} {row['authorized_kw'] * 1000:g} W ({row['authorized_kw']:g} kW)"
+                      for row in channel_rows]
+            self._add_paragraph(doc, f"Authorized ERP: {'; '.join(limits)}", style=docx_templates.STRONG)
+        elif erp_calculations.exists():
+            limits = sorted({float(calc.authorized_erp_kw) for calc in erp_calculations})
+            self._add_paragraph(doc, f"Authorized ERP: {', '.join(f'{kw * 1000:g} W ({kw:g} kW)' for kw in limits)}",
+                                style=docx_templates.STRONG)
+        else:
+            self._add_paragraph(doc, "Authorized ERP: 10000 W (10 kW)", style=docx_templates.STRONG)
+        
+        notes = self.plan.render('calculations_template', self._template_context())
+        if notes:
+            self._add_text_lines(doc, notes)
+    
+    def _build_erp_table_from_channels(self, doc: Document, channel_rows):
+        """Build ERP table with one column per inspection channel"""
+        # One column per channel: build rows label-first, then append each channel's values
+        rows = [["CHANNEL"], ["Forward Power:"], ["Antenna Gain:"], ["Losses:"], ["ERP Calculation"], ["Result"]]
+        for row in channel_rows:
+            power = row['forward_power_w']
+            if row['erp_dbw'] is not None:
+                result_text = (
+                    f"ERP=10log {power:g}(W) + {row['antenna_gain_dbd']:g} dBd - "
+                    f"{row['losses_db']:g} dB = {row['erp_dbw']} dBW ({row['erp_kw']} kW)"
+                )
+            else:
+                result_text = 'Not calculated'
+            
+            column = (
+                row['channel'].channel_number,
+                f"{power:g} W" if power is not None else 'Not measured',
+                f"{row['antenna_gain_dbd']:g} dBd",
+                f"{row['losses_db']:g} dB",
+                "ERP=10log P(W) + G (dBd) – L (dB)",
+                result_text,
+            )
+            for table_row, value in zip(rows, column):
+                table_row.append(value)
+        
+        self._add_table(doc, rows, docx_templates.CHANNEL_TABLE)
+        doc.add_paragraph()
     
     def _build_erp_from_inspection(self, doc: Document, erp_kw, erp_dbw):
         """Build ERP section using data from inspection record"""
         
         # Channel header
-        channel_para = doc.add_paragraph()
         frequency = self.inspection.transmit_frequency or "Unknown"
-        channel_run = channel_para.add_run(f"CH.1 ({frequency} MHz)")
-        channel_run.bold = True
+        self._add_paragraph(doc, f"CH.1 ({frequency} MHz)", style=docx_templates.STRONG)
         
         # ERP data table
-        erp_table = doc.add_table(rows=6, cols=2)
-        erp_table.style = 'Table Grid'
-        
         # Get source data for calculation display
         forward_power = self.inspection.amplifier_actual_reading or self.inspection.exciter_actual_reading or 'Unknown'
         antenna_gain = self.inspection.antenna_gain or 'Unknown'
@@ -451,16 +454,7 @@ class ProfessionalDocumentGenerator:
             ("Result (dBW):", f"{erp_dbw} dBW" if erp_dbw else 'Not calculated')
         ]
         
-        for i, (label, value) in enumerate(erp_data):
-            # Label cell - bold
-            label_cell = erp_table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = erp_table.cell(i, 1)
-            value_cell.text = str(value)
+        self._add_table(doc, erp_data, docx_templates.LABEL_TABLE)
         
         doc.add_paragraph()
     
@@ -469,14 +463,9 @@ class ProfessionalDocumentGenerator:
         
         for calc in erp_calculations:
             # Channel header
-            channel_para = doc.add_paragraph()
-            channel_run = channel_para.add_run(f"{calc.channel_number} ({calc.frequency_mhz} MHz)")
-            channel_run.bold = True
+            self._add_paragraph(doc, f"{calc.channel_number} ({calc.frequency_mhz} MHz)", style=docx_templates.STRONG)
             
             # ERP calculation table
-            erp_table = doc.add_table(rows=5, cols=2)
-            erp_table.style = 'Table Grid'
-            
             erp_data = [
                 ("Forward Power:", f"{calc.forward_power_w} W"),
                 ("Antenna Gain:", f"{calc.antenna_gain_dbd} dBd"),
@@ -485,16 +474,7 @@ class ProfessionalDocumentGenerator:
                 ("Result:", f"ERP = 10log {calc.forward_power_w}(W) + {calc.antenna_gain_dbd} dBd - {calc.losses_db} dB = {calc.erp_dbw} dBW ({calc.erp_kw} kW)")
             ]
             
-            for i, (label, value) in enumerate(erp_data):
-                # Label cell - bold
-                label_cell = erp_table.cell(i, 0)
-                label_para = label_cell.paragraphs[0]
-                label_run = label_para.add_run(label)
-                label_run.bold = True
-                
-                # Value cell
-                value_cell = erp_table.cell(i, 1)
-                value_cell.text = value
+            self._add_table(doc, erp_data, docx_templates.LABEL_TABLE)
             
             doc.add_paragraph()
     
@@ -502,10 +482,8 @@ class ProfessionalDocumentGenerator:
         """Build ERP section using equipment data (fallback)"""
         
         # Channel header
-        channel_para = doc.add_paragraph()
         frequency = self.inspection.transmit_frequency or "Unknown"
-        channel_run = channel_para.add_run(f"CH.1 ({frequency} MHz)")
-        channel_run.bold = True
+        self._add_paragraph(doc, f"CH.1 ({frequency} MHz)", style=docx_templates.STRONG)
         
         # Get equipment data
         forward_power = self.inspection.amplifier_actual_reading or self.inspection.exciter_actual_reading
@@ -523,9 +501,6 @@ class ProfessionalDocumentGenerator:
                 erp_kw = (10 ** (erp_dbw / 10)) / 1000
                 
                 # ERP calculation table
-                erp_table = doc.add_table(rows=5, cols=2)
-                erp_table.style = 'Table Grid'
-                
                 erp_data = [
                     ("Forward Power:", f"{power_w} W"),
                     ("Antenna Gain:", f"{gain_dbi} dBi"),
@@ -534,16 +509,7 @@ class ProfessionalDocumentGenerator:
                     ("Result:", f"ERP = 10log {power_w}(W) + {gain_dbi} dBi - {losses_db} dB = {erp_dbw:.2f} dBW ({erp_kw:.3f} kW)")
                 ]
                 
-                for i, (label, value) in enumerate(erp_data):
-                    # Label cell - bold
-                    label_cell = erp_table.cell(i, 0)
-                    label_para = label_cell.paragraphs[0]
-                    label_run = label_para.add_run(label)
-                    label_run.bold = True
-                    
-                    # Value cell
-                    value_cell = erp_table.cell(i, 1)
-                    value_cell.text = str(value)
+                self._add_table(doc, erp_data, docx_templates.LABEL_TABLE)
                 
             except (ValueError, TypeError):
                 # If calculation fails, show equipment data only
@@ -559,25 +525,13 @@ class ProfessionalDocumentGenerator:
         """Build equipment data table when ERP cannot be calculated"""
         
         # Equipment data table
-        equip_table = doc.add_table(rows=3, cols=2)
-        equip_table.style = 'Table Grid'
-        
         equip_data = [
             ("Forward Power:", f"{forward_power or 'Not specified'} W"),
             ("Antenna Gain:", f"{antenna_gain or 'Not specified'} dBi"),
             ("ERP Calculation:", "Calculation not available")
         ]
         
-        for i, (label, value) in enumerate(equip_data):
-            # Label cell - bold
-            label_cell = equip_table.cell(i, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cell
-            value_cell = equip_table.cell(i, 1)
-            value_cell.text = value
+        self._add_table(doc, equip_data, docx_templates.LABEL_TABLE)
     
     def _calculate_total_losses(self):
         """Calculate total losses from individual loss components"""
@@ -592,45 +546,30 @@ class ProfessionalDocumentGenerator:
         except (ValueError, TypeError, AttributeError):
             return None
     
-    def _build_docx_conclusions_section(self, doc: Document):
-        """Build conclusions section"""
-        
-        # H. OBSERVATION (if any)
-        if self.report.observations or self.inspection.other_observations:
-            self._add_section_header(doc, "H. OBSERVATION")
-            observations = self.report.observations or self.inspection.other_observations or ''
-            if observations:
-                # Split observations into bullet points
-                obs_lines = [line.strip() for line in observations.split('\n') if line.strip()]
-                for obs in obs_lines:
-                    if obs:
-                        obs_para = doc.add_paragraph(style='List Bullet')
-                        obs_para.add_run(obs)
-            doc.add_paragraph()
-        
-        # I. CONCLUSION
-        self._add_section_header(doc, "I. CONCLUSION")
-        conclusions = self.report.conclusions or self._generate_auto_conclusions()
-        if conclusions:
-            # Split conclusions into bullet points
-            conc_lines = [line.strip() for line in conclusions.split('\n') if line.strip()]
-            for conc in conc_lines:
-                if conc:
-                    conc_para = doc.add_paragraph(style='List Bullet')
-                    conc_para.add_run(conc)
-        doc.add_paragraph()
-        
-        # J. RECOMMENDATION
-        self._add_section_header(doc, "J. RECOMMENDATION")
-        recommendations = self.report.recommendations or self._generate_auto_recommendations()
-        if recommendations:
-            # Split recommendations into bullet points
-            rec_lines = [line.strip() for line in recommendations.split('\n') if line.strip()]
-            for rec in rec_lines:
-                if rec:
-                    rec_para = doc.add_paragraph(style='List Bullet')
-                    rec_para.add_run(rec)
+    def _build_observations(self, doc: Document):
+        """Observation bullet points"""
+        observations = self.report.observations or self.inspection.other_observations or ''
+        self._add_text_lines(doc, observations, style=docx_templates.BULLET, skip_blank=True)
+    
+    def _build_conclusions(self, doc: Document):
+        """Conclusion bullet points: the report's own, the template's, or generated ones"""
+        conclusions = (
+            self.report.conclusions
+            or self.plan.render('conclusions_template', self._template_context())
+            or self._generate_auto_conclusions()
+        )
+        self._add_text_lines(doc, conclusions, style=docx_templates.BULLET, skip_blank=True)
     
+    def _build_recommendations(self, doc: Document):
+        """Recommendation bullet points: the report's own, the template's, or generated ones"""
+        recommendations = (
+            self.report.recommendations
+            or self.plan.render('recommendations_template', self._template_context())
+            or self._generate_auto_recommendations()
+        )
+        self._add_text_lines(doc, recommendations, style=docx_templates.BULLET, skip_blank=True)
+    
+    @profiled('signature')
     def _build_docx_signature(self, doc: Document):
         """Build signature section"""
         doc.add_paragraph()
@@ -638,39 +577,48 @@ class ProfessionalDocumentGenerator:
         
         # Inspector name - bold
         inspector_name = self.inspection.inspector.get_full_name()
-        name_para = doc.add_paragraph()
-        name_run = name_para.add_run(inspector_name)
-        name_run.bold = True
+        self._add_paragraph(doc, inspector_name, style=docx_templates.STRONG)
         
         # Title - bold
-        title_para = doc.add_paragraph()
-        title_run = title_para.add_run("AO/MIRC/NR")
-        title_run.bold = True
+        self._add_paragraph(doc, "AO/MIRC/NR", style=docx_templates.STRONG)
+    
+    def _add_paragraph(self, doc: Document, text: str = '', style: Optional[str] = None):
+        """doc.add_paragraph with a template style applied by id"""
+        paragraph = doc.add_paragraph(text)
+        if style:
+            style_id = self.plan.style_ids.get(style)
+            if style_id:
+                paragraph._p.style = style_id
+            else:
+                paragraph.style = style
+        return paragraph
+    
+    def _add_table(self, doc: Document, rows, style: str, widths=None, fixed: bool = False):
+        """Table from rows of cell values in one pass; formatting comes from the template table style"""
+        return docx_tables.add_table(doc, rows, self.plan.style_ids[style], widths=widths, fixed=fixed)
     
     def _add_section_header(self, doc: Document, header_text: str):
         """Add a section header"""
-        header_para = doc.add_paragraph()
-        header_run = header_para.add_run(header_text)
-        header_run.bold = True
-        header_run.font.size = Pt(12)
+        self._add_paragraph(doc, header_text, style=docx_templates.SECTION_HEADING)
     
     # ========== MISSING METHODS - NOW IMPLEMENTED ==========
     
+    @profiled('section_images', detail_arg=1)
     def _add_section_images(self, doc: Document, image_type):
         """Add images for specific sections with proper descriptions"""
-        images = self.report.images.filter(image_type=image_type)
+        images = self.report.images.filter(image_type=image_type).select_related('blob')
         
         if images.exists():
             for image in images:
                 try:
-                    # Add image to document
-                    if image.image and hasattr(image.image, 'path'):
+                    # Add image to document; HEIC originals go in as their print JPEG once transcoded
+                    document_name = image.document_name
+                    if document_name:
                         # Add some spacing before image
                         doc.add_paragraph()
                         
                         # Add image paragraph
-                        img_para = doc.add_paragraph()
-                        img_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                        img_para = self._add_paragraph(doc, style=docx_templates.IMAGE)
                         
                         # Calculate image width (convert percentage to inches)
                         # Assuming 6.5 inches as max page width (letter size with margins)
@@ -679,26 +627,28 @@ class ProfessionalDocumentGenerator:
                         
                         # Add the image
                         run = img_para.add_run()
-                        run.add_picture(image.image.path, width=Inches(img_width))
+                        run.add_picture(image.image.storage.path(document_name), width=Inches(img_width))
                         
                         # Add caption if available
                         if image.caption:
-                            caption_para = doc.add_paragraph()
-                            caption_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            caption_run = caption_para.add_run(image.caption)
-                            caption_run.italic = True
-                            caption_run.font.size = Pt(10)
+                            self._add_paragraph(doc, image.caption, style=docx_templates.CAPTION)
                         
                         # Add spacing after image
                         doc.add_paragraph()
+                    elif image.image:
+                        # Original still waiting for its print JPEG
+                        self._add_paragraph(
+                            doc, f"[Image: {image.caption or image.get_image_type_display()}]",
+                            style=docx_templates.IMAGE_PLACEHOLDER
+                        )
                         
                 except Exception as e:
-                    print(f"Error adding image {image.id}: {str(e)}")
+                    logger.warning("Error adding image %s to report %s: %s", image.id, self.report.pk, e)
                     # Add placeholder text instead
-                    placeholder_para = doc.add_paragraph()
-                    placeholder_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                    placeholder_run = placeholder_para.add_run(f"[Image: {image.caption or image.get_image_type_display()}]")
-                    placeholder_run.italic = True
+                    self._add_paragraph(
+                        doc, f"[Image: {image.caption or image.get_image_type_display()}]",
+                        style=docx_templates.IMAGE_PLACEHOLDER
+                    )
 
     def _has_images(self, image_type):
         """Check if report has images of specified type"""
@@ -721,10 +671,33 @@ class ProfessionalDocumentGenerator:
         
         return f"{day}{suffix} {month} {year}"
 
+    def _get_channel_rows(self):
+        """Inspection transmitter channels with their computed ERP"""
+        if self._channel_rows is None:
+            self._channel_rows = ChannelERPService.compute(self.inspection.channels.all())
+        return self._channel_rows
+
     def _get_tv_channels(self):
         """Get TV channel data from inspection - handles multiple channels"""
         channels = []
         
+        # Prefer the normalized per-channel records
+        channel_rows = self._get_channel_rows()
+        if channel_rows:
+            for row in channel_rows:
+                ch = row['channel']
+                channels.append({
+                    'channel': ch.channel_number,
+                    'frequency': ch.frequency_mhz if ch.frequency_mhz is not None else 'Unknown',
+                    'power': ch.forward_power_w if ch.forward_power_w is not None else 'Unknown',
+                    'nominal_power': ch.nominal_power_w if ch.nominal_power_w is not None else 'Unknown',
+                    'gain': row['antenna_gain_dbd'],
+                    'manufacturer': ch.amplifier_manufacturer or ch.exciter_manufacturer or 'Not Seen',
+                    'model': ch.amplifier_model_number or ch.exciter_model_number or 'Not Seen',
+                    'serial': ch.amplifier_serial_number or ch.exciter_serial_number or 'Not Seen'
+                })
+            return channels
+        
         # Check if we have ERP calculations with multiple channels
         erp_calculations = self.report.erp_details.all()
         if erp_calculations.exists():
@@ -759,30 +732,25 @@ class ProfessionalDocumentGenerator:
         
         # Check ERP compliance
         erp_calculations = self.report.erp_details.all()
-        authorized_limit = 10.0  # 10 kW standard limit
         
         for calc in erp_calculations:
             if not calc.is_compliant:
                 conclusions.append(
                     f"The licensee is operating above the maximum authorized ERP limit of "
-                    f"40 dBW (10 kW) by transmitting at {calc.erp_kw} kW ({calc.channel_number})."
+                    f"{float(calc.authorized_erp_dbw):g} dBW ({float(calc.authorized_erp_kw):g} kW) "
+                    f"by transmitting at {calc.erp_kw} kW ({calc.channel_number})."
                 )
         
-        # Check for non-type approved equipment
-        non_approved_equipment = []
-        
-        # Check exciter
-        if self.inspection.exciter_manufacturer:
-            # Add known non-approved manufacturers (this should be configurable)
-            non_approved_brands = ['MAXIVA GATEAIR', 'NEC HPB']  # Example list
-            if any(brand.lower() in self.inspection.exciter_manufacturer.lower() for brand in non_approved_brands):
-                non_approved_equipment.append(f"exciter {self.inspection.exciter_manufacturer} {self.inspection.exciter_model_number or ''}")
+        for row in self._get_channel_rows():
+            if row['is_compliant'] is False:
+                conclusions.append(
+                    f"The licensee is operating above the maximum authorized ERP limit of "
+                    f"{row['authorized_dbw']:g} dBW ({row['authorized_kw']:g} kW) "
+                    f"by transmitting at {row['erp_kw']} kW ({row['channel'].channel_number})."
+                )
         
-        # Check amplifier
-        if self.inspection.amplifier_manufacturer:
-            non_approved_brands = ['MAXIVA GATEAIR']  # Example list
-            if any(brand.lower() in self.inspection.amplifier_manufacturer.lower() for brand in non_approved_brands):
-                non_approved_equipment.append(f"amplifier {self.inspection.amplifier_manufacturer} {self.inspection.amplifier_model_number or ''}")
+        # Check for non-type approved equipment
+        non_approved_equipment = self._get_non_approved_equipment()
         
         if non_approved_equipment:
             conclusions.append(f"The licensee is operating non-type approved transmitter(s): {', '.join(non_approved_equipment)}.")
@@ -793,6 +761,19 @@ class ProfessionalDocumentGenerator:
         
         return '\n'.join(f"• {conclusion}" for conclusion in conclusions)
 
+    def _get_non_approved_equipment(self):
+        """Exciter/amplifier entries the type-approval register lists as non-approved"""
+        statuses = TypeApprovalRegistry.statuses()
+        non_approved_equipment = []
+        
+        for equipment_type in ('exciter', 'amplifier'):
+            manufacturer = getattr(self.inspection, f'{equipment_type}_manufacturer')
+            model_number = getattr(self.inspection, f'{equipment_type}_model_number')
+            if TypeApprovalRegistry.is_non_approved(manufacturer, model_number, statuses):
+                non_approved_equipment.append(f"{equipment_type} {manufacturer or ''} {model_number or ''}".strip())
+        
+        return non_approved_equipment
+
     def _generate_auto_recommendations(self):
         """Generate automatic recommendations based on findings"""
         recommendations = []
@@ -802,31 +783,28 @@ class ProfessionalDocumentGenerator:
         
         # ERP violations
         erp_violations = [calc for calc in erp_calculations if not calc.is_compliant]
+        channel_violations = [row for row in self._get_channel_rows() if row['is_compliant'] is False]
         
-        if erp_violations:
+        if erp_violations or channel_violations:
             # Check if this is a repeat violation (this would need violation history tracking)
             # For now, assume first-time violation
-            violation_channels = [calc.channel_number for calc in erp_violations]
-            
-            if len(violation_channels) > 1:
-                recommendations.append(
-                    f"The licensee to be issued with notice of violation for exceeding "
-                    f"authorized ERP limit of 10kW for {', '.join(violation_channels)}."
-                )
-            else:
-                recommendations.append(
-                    f"The licensee to be issued with notice of violation for exceeding "
-                    f"authorized ERP limit of 10kW for {violation_channels[0]}."
-                )
+            violation_channels = [
+                f"{calc.channel_number} ({float(calc.authorized_erp_kw):g}kW)" for calc in erp_violations
+            ]
+            violation_channels += [
+                f"{row['channel'].channel_number} ({row['authorized_kw']:g}kW)" for row in channel_violations
+            ]
+            recommendations.append(
+                f"The licensee to be issued with notice of violation for exceeding "
+                f"authorized ERP limit for {', '.join(violation_channels)}."
+            )
         
         # Non-type approved equipment
-        if self.inspection.exciter_manufacturer:
-            non_approved_brands = ['MAXIVA GATEAIR', 'NEC HPB']
-            if any(brand.lower() in self.inspection.exciter_manufacturer.lower() for brand in non_approved_brands):
-                recommendations.append(
-                    "The licensee to be issued with notice of violation for operating "
-                    "non-type approved transmitter equipment."
-                )
+        if self._get_non_approved_equipment():
+            recommendations.append(
+                "The licensee to be issued with notice of violation for operating "
+                "non-type approved transmitter equipment."
+            )
         
         # Equipment maintenance recommendations
         if self.inspection.other_observations:
@@ -851,47 +829,22 @@ class ProfessionalDocumentGenerator:
             self._build_fm_transmitter_table(doc)
             return
         
-        # Create main table with proper structure
-        num_channels = len(channels)
-        table = doc.add_table(rows=8, cols=num_channels + 1)  # +1 for labels column
-        table.style = 'Table Grid'
-        
-        # Headers row
-        label_cell = table.cell(0, 0)
-        label_cell.text = "Channel Freq. (MHz)"
-        label_para = label_cell.paragraphs[0]
-        label_run = label_para.runs[0]
-        label_run.bold = True
-        
-        # Channel headers
-        for i, channel in enumerate(channels, 1):
-            header_cell = table.cell(0, i)
-            header_cell.text = f"{channel['channel']}\n({channel['frequency']} MHz)"
-            header_para = header_cell.paragraphs[0]
-            header_run = header_para.runs[0]
-            header_run.bold = True
+        # Headers row (channel per column); the table style bolds it and the label column
+        header = ["Channel Freq. (MHz)"] + [f"{channel['channel']}\n({channel['frequency']} MHz)" for channel in channels]
         
         # Equipment rows
         equipment_rows = [
             ("Make:", [ch.get('manufacturer', 'Not Seen') for ch in channels]),
             ("Model:", [ch.get('model', 'Not Seen') for ch in channels]),
             ("S/No.:", [ch.get('serial', 'Not Seen') for ch in channels]),
-            ("Nominal Power (W):", [f"{ch.get('power', 'Unknown')} W" for ch in channels]),
+            ("Nominal Power (W):", [f"{ch.get('nominal_power', ch.get('power', 'Unknown'))} W" for ch in channels]),
             ("Power Output (W):", [f"{ch.get('power', 'Unknown')} W" for ch in channels]),
             ("Gain (dBd):", [f"{ch.get('gain', '11.0')} dBd" for ch in channels]),
         ]
         
-        for row_idx, (label, values) in enumerate(equipment_rows, 1):
-            # Label cell
-            label_cell = table.cell(row_idx, 0)
-            label_para = label_cell.paragraphs[0]
-            label_run = label_para.add_run(label)
-            label_run.bold = True
-            
-            # Value cells
-            for col_idx, value in enumerate(values, 1):
-                if col_idx < len(table.columns):
-                    table.cell(row_idx, col_idx).text = str(value)
+        self._add_table(
+            doc, [header] + [[label, *values] for label, values in equipment_rows], docx_templates.CHANNEL_TABLE
+        )
 
     def _build_erp_table_multi_channel(self, doc: Document):
         """Build ERP calculation table for multiple channels like SIGNET report"""
@@ -901,45 +854,22 @@ class ProfessionalDocumentGenerator:
             self._build_erp_from_equipment_data(doc)
             return
         
-        # Create table with channels as columns
-        num_channels = erp_calculations.count()
-        table = doc.add_table(rows=6, cols=num_channels + 1)
-        table.style = 'Table Grid'
-        
-        # Headers
-        table.cell(0, 0).text = "CHANNEL"
-        for i, calc in enumerate(erp_calculations, 1):
-            header_cell = table.cell(0, i)
-            header_run = header_cell.paragraphs[0].add_run(calc.channel_number)
-            header_run.bold = True
-        
-        # Rows
-        row_labels = ["Forward Power:", "Antenna Gain:", "Losses:", "ERP Calculation", "Result"]
-        
-        for row_idx, label in enumerate(row_labels, 1):
-            # Label cell
-            label_cell = table.cell(row_idx, 0)
-            label_run = label_cell.paragraphs[0].add_run(label)
-            label_run.bold = True
-            
-            # Data cells
-            for col_idx, calc in enumerate(erp_calculations, 1):
-                cell = table.cell(row_idx, col_idx)
-                
-                if row_idx == 1:  # Forward Power
-                    cell.text = f"{calc.forward_power_w} W"
-                elif row_idx == 2:  # Antenna Gain
-                    cell.text = f"{calc.antenna_gain_dbd} dBd"
-                elif row_idx == 3:  # Losses
-                    cell.text = f"{calc.losses_db} dB"
-                elif row_idx == 4:  # ERP Calculation
-                    cell.text = "ERP=10log P(W) + G (dBd) – L (dB)"
-                elif row_idx == 5:  # Result
-                    result_text = (
-                        f"ERP=10log {calc.forward_power_w}(W) + "
-                        f"{calc.antenna_gain_dbd} dBd - {calc.losses_db} dB = "
-                        f"{calc.erp_dbw} dBW ({calc.erp_kw} kW)"
-                    )
-                    cell.text = result_text
+        # Channels as columns
+        rows = [["CHANNEL"], ["Forward Power:"], ["Antenna Gain:"], ["Losses:"], ["ERP Calculation"], ["Result"]]
+        for calc in erp_calculations:
+            column = (
+                calc.channel_number,
+                f"{calc.forward_power_w} W",
+                f"{calc.antenna_gain_dbd} dBd",
+                f"{calc.losses_db} dB",
+                "ERP=10log P(W) + G (dBd) – L (dB)",
+                f"ERP=10log {calc.forward_power_w}(W) + "
+                f"{calc.antenna_gain_dbd} dBd - {calc.losses_db} dB = "
+                f"{calc.erp_dbw} dBW ({calc.erp_kw} kW)",
+            )
+            for table_row, value in zip(rows, column):
+                table_row.append(value)
+        
+        self._add_table(doc, rows, docx_templates.CHANNEL_TABLE)
         
         doc.add_paragraph()
\ No newline at end of file
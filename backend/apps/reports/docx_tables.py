@@ -0,0 +1,74 @@
+# apps/reports/docx_tables.py
+import re
+from typing import Any, Optional, Sequence
+from xml.sax.saxutils import escape
+
+from docx.document import Document as DocxDocument
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Length
+from docx.table import Table
+
+# Characters XML 1.0 cannot carry; python-docx would raise on them
+INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+EMU_PER_TWIP = 635
+
+def paragraph_xml(text: str) -> str:
+    """A one-run <w:p>; newlines become <w:br/> and tabs <w:tab/>, as with Cell.text"""
+    if not text:
+        return '<w:p/>'
+    parts = []
+    for line_number, line in enumerate(text.replace('\r\n', '\n').replace('\r', '\n').split('\n')):
+        if line_number:
+            parts.append('<w:br/>')
+        for tab_number, segment in enumerate(line.split('\t')):
+            if tab_number:
+                parts.append('<w:tab/>')
+            if segment:
+                parts.append(f'<w:t xml:space="preserve">{escape(INVALID_XML_CHARS.sub("", segment))}</w:t>')
+    return f'<w:p><w:r>{"".join(parts)}</w:r></w:p>'
+
+def table_xml(rows: Sequence[Sequence[str]], widths: Sequence[int], style_id: Optional[str] = None,
+              fixed: bool = False) -> str:
+    """A complete <w:tbl>; widths are in twips, one per column"""
+    properties = [f'<w:tblStyle w:val="{style_id}"/>' if style_id else '', '<w:tblW w:type="auto" w:w="0"/>']
+    if fixed:
+        properties.append('<w:tblLayout w:type="fixed"/>')
+    # Same tblLook as python-docx, so table styles format the first row and column
+    properties.append(
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" '
+        'w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+    )
+    cell_properties = [f'<w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>' for width in widths]
+    body = ''.join(
+        '<w:tr>' + ''.join(
+            f'<w:tc>{cell_properties[column]}{paragraph_xml(text)}</w:tc>'
+            for column, text in enumerate(row)
+        ) + '</w:tr>'
+        for row in rows
+    )
+    grid = ''.join(f'<w:gridCol w:w="{width}"/>' for width in widths)
+    return f'<w:tbl {nsdecls("w")}><w:tblPr>{"".join(properties)}</w:tblPr><w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>'
+
+def add_table(doc: DocxDocument, rows: Sequence[Sequence[Any]], style_id: Optional[str] = None,
+              widths: Optional[Sequence[Length]] = None, fixed: bool = False) -> Table:
+    """Append a table filled from rows of cell values, parsed from one XML string
+
+    Table.cell() rebuilds the whole cell grid on every call, which makes
+    cell-by-cell filling quadratic; this writes every row in one pass.
+    Formatting comes from the table style (`style_id`, not the style name).
+    Short rows are padded with empty cells and None becomes an empty cell.
+    """
+    column_count = max((len(row) for row in rows), default=0)
+    texts = [
+        ['' if value is None else str(value) for value in row] + [''] * (column_count - len(row))
+        for row in rows
+    ]
+    if widths is None:
+        widths = [doc._block_width // column_count] * column_count if column_count else []
+    twips = [int(width) // EMU_PER_TWIP for width in widths]
+
+    tbl = parse_xml(table_xml(texts, twips, style_id, fixed))
+    doc.element.body._insert_tbl(tbl)
+    return Table(tbl, doc._body)
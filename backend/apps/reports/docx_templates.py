@@ -0,0 +1,151 @@
+# apps/reports/docx_templates.py
+import copy
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from docx import Document
+from docx.document import Document as DocxDocument
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Pt
+
+logger = logging.getLogger(__name__)
+
+# Paragraph styles used by ProfessionalDocumentGenerator
+REFERENCE = 'CA Reference'
+SUBJECT = 'CA Subject'
+FINDINGS_HEADING = 'CA Findings Heading'
+SECTION_HEADING = 'CA Section Heading'
+STRONG = 'CA Strong'
+IMAGE = 'CA Image'
+CAPTION = 'CA Caption'
+IMAGE_PLACEHOLDER = 'CA Image Placeholder'
+BULLET = 'List Bullet'
+
+# Table styles: label/value tables bold the first column, channel tables also the header row
+LABEL_TABLE = 'CA Label Table'
+CHANNEL_TABLE = 'CA Channel Table'
+
+# name: (bold, italic, size in points, alignment)
+PARAGRAPH_STYLES = {
+    REFERENCE: (True, False, 12, None),
+    SUBJECT: (True, False, None, WD_ALIGN_PARAGRAPH.CENTER),
+    FINDINGS_HEADING: (True, False, 14, None),
+    SECTION_HEADING: (True, False, 12, None),
+    STRONG: (True, False, None, None),
+    IMAGE: (False, False, None, WD_ALIGN_PARAGRAPH.CENTER),
+    CAPTION: (False, True, 10, WD_ALIGN_PARAGRAPH.CENTER),
+    IMAGE_PLACEHOLDER: (False, True, None, WD_ALIGN_PARAGRAPH.CENTER),
+}
+
+# name: conditional regions (w:tblStylePr types) whose runs are bold
+TABLE_STYLES = {
+    LABEL_TABLE: ('firstCol',),
+    CHANNEL_TABLE: ('firstRow', 'firstCol'),
+}
+
+class ReportTemplateLibrary:
+    """Base DOCX skeletons per report type, loaded once per process
+
+    A designer-supplied `<TEMPLATE_DIR>/<report_type>.docx` is used when present
+    (missing CA styles are added to it); otherwise the skeleton is built from
+    PARAGRAPH_STYLES and TABLE_STYLES. Callers get a deep copy, so the cached
+    document is never written to.
+    """
+
+    # report_type -> (document, {style name: style id})
+    _templates: Dict[str, Tuple[DocxDocument, Dict[str, str]]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _template(cls, report_type: str) -> Tuple[DocxDocument, Dict[str, str]]:
+        entry = cls._templates.get(report_type)
+        if entry is None:
+            with cls._lock:
+                entry = cls._templates.get(report_type)
+                if entry is None:
+                    doc = cls.load(report_type)
+                    names = {style.name for style in doc.styles}
+                    style_ids = {
+                        name: doc.styles[name].style_id
+                        for name in (*PARAGRAPH_STYLES, *TABLE_STYLES, BULLET) if name in names
+                    }
+                    entry = cls._templates[report_type] = (doc, style_ids)
+        return entry
+
+    @classmethod
+    def new_document(cls, report_type: str) -> DocxDocument:
+        return copy.deepcopy(cls._template(report_type)[0])
+
+    @classmethod
+    def style_ids(cls, report_type: str) -> Dict[str, str]:
+        """Style ids by name; python-docx scans styles.xml on every lookup by name"""
+        return cls._template(report_type)[1]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._templates.clear()
+
+    @staticmethod
+    def template_path(report_type: str) -> Optional[str]:
+        directory = getattr(settings, 'REPORT_SETTINGS', {}).get('TEMPLATE_DIR')
+        return os.path.join(directory, f'{report_type}.docx') if directory else None
+
+    @classmethod
+    def load(cls, report_type: str) -> DocxDocument:
+        path = cls.template_path(report_type)
+        if path and os.path.exists(path):
+            logger.info("Loading %s report template from %s", report_type, path)
+            doc = Document(path)
+            # Designer templates may carry sample content; only the styles and section setup are kept
+            body = doc.element.body
+            for child in list(body):
+                if child.tag != qn('w:sectPr'):
+                    body.remove(child)
+        else:
+            doc = Document()
+        cls.install_styles(doc)
+        return doc
+
+    @staticmethod
+    def install_styles(doc: DocxDocument):
+        """Add any CA paragraph and table styles the document does not define yet"""
+        styles = doc.styles
+        existing = {style.name for style in styles}
+
+        for name, (bold, italic, size, alignment) in PARAGRAPH_STYLES.items():
+            if name in existing:
+                continue
+            style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = styles['Normal']
+            style.quick_style = True
+            style.font.bold = bold or None
+            style.font.italic = italic or None
+            if size:
+                style.font.size = Pt(size)
+            if alignment is not None:
+                style.paragraph_format.alignment = alignment
+
+        for name, bold_regions in TABLE_STYLES.items():
+            if name in existing:
+                continue
+            style = styles.add_style(name, WD_STYLE_TYPE.TABLE)
+            style.base_style = styles['Table Grid']
+            for region in bold_regions:
+                style.element.append(parse_xml(
+                    f'<w:tblStylePr {nsdecls("w")} w:type="{region}"><w:rPr><w:b/><w:bCs/></w:rPr></w:tblStylePr>'
+                ))
+
+    @classmethod
+    def export(cls, report_type: str, path: str):
+        """Write the built-in skeleton for a report type, as a starting point for a designer template"""
+        doc = Document()
+        cls.install_styles(doc)
+        doc.core_properties.title = f'{report_type} report template'
+        doc.save(path)
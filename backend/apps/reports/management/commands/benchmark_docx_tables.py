@@ -0,0 +1,86 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports import docx_templates
+from apps.reports.benchmarks import measure
+from apps.reports.docx_tables import add_table
+from apps.reports.docx_templates import ReportTemplateLibrary
+
+class Command(BaseCommand):
+    help = 'Compare cell-by-cell python-docx table filling with the bulk XML table builder on a TV multiplex table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Data rows below the channel header row')
+        parser.add_argument('--cols', type=int, default=10, help='Columns including the label column')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs of the bulk builder')
+        parser.add_argument('--cell-repeat', type=int, default=1,
+                            help='Timed runs of the cell-by-cell path (tens of seconds each at 100 x 10); 0 skips it')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['cols'] < 2:
+            raise CommandError('Need at least one row and two columns')
+        rows = self._multiplex_rows(options['rows'], options['cols'])
+        report_type = 'tv_broadcast'
+        style_id = ReportTemplateLibrary.style_ids(report_type)[docx_templates.CHANNEL_TABLE]
+
+        def cell_by_cell(table_rows=rows):
+            doc = ReportTemplateLibrary.new_document(report_type)
+            table = doc.add_table(rows=len(table_rows), cols=len(table_rows[0]))
+            table._tbl.tblStyle_val = style_id
+            for row_idx, row in enumerate(table_rows):
+                for col_idx, value in enumerate(row):
+                    table.cell(row_idx, col_idx).text = value
+            return table
+
+        def bulk(table_rows=rows):
+            doc = ReportTemplateLibrary.new_document(report_type)
+            return add_table(doc, table_rows, style_id)
+
+        # Both paths must produce the same cell text; a small table is enough to check
+        sample = self._multiplex_rows(5, options['cols'])
+        expected = [[cell.text for cell in row.cells] for row in cell_by_cell(sample).rows]
+        if [[cell.text for cell in row.cells] for row in bulk(sample).rows] != expected:
+            raise CommandError('Bulk table builder produced different cell text')
+
+        # The document copy is common to both paths; time it on its own so it can be discounted
+        scenarios = {
+            'document_copy': measure(lambda: ReportTemplateLibrary.new_document(report_type), repeat=options['repeat']),
+            'bulk_xml': measure(bulk, repeat=options['repeat']),
+        }
+        if options['cell_repeat'] > 0:
+            scenarios['cell_by_cell'] = measure(cell_by_cell, repeat=options['cell_repeat'], warmup=0)
+        results = {
+            'parameters': {key: options[key] for key in ('rows', 'cols', 'repeat', 'cell_repeat')},
+            'scenarios': scenarios,
+        }
+        for name, result in results['scenarios'].items():
+            self.stdout.write(
+                f'{name:>14}: mean {result["mean_ms"]:9.2f} ms  p95 {result["p95_ms"]:9.2f} ms  '
+                f'peak {result["peak_memory_kib"]:9.1f} KiB'
+            )
+        copy_ms = scenarios['document_copy']['mean_ms']
+        fast = scenarios['bulk_xml']['mean_ms'] - copy_ms
+        slow = scenarios['cell_by_cell']['mean_ms'] - copy_ms if 'cell_by_cell' in scenarios else None
+        if slow is not None and fast > 0:
+            self.stdout.write(self.style.SUCCESS(
+                f'Table filling {slow:.2f} ms -> {fast:.2f} ms ({slow / fast:.1f}x) for '
+                f'a {len(rows)} x {len(rows[0])} table'
+            ))
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+    @staticmethod
+    def _multiplex_rows(rows, cols):
+        """Channel header row, then one labelled row per measurement across the multiplex"""
+        channels = cols - 1
+        header = ['Channel Freq. (MHz)'] + [f'CH.{22 + channel}\n({474 + 8 * channel} MHz)' for channel in range(channels)]
+        body = [
+            [f'Measurement {row}:'] + [f'{(row * 37 + channel * 11) % 5000} W' for channel in range(channels)]
+            for row in range(rows)
+        ]
+        return [header] + body
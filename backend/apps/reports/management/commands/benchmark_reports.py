@@ -0,0 +1,171 @@
+import json
+import platform
+import shutil
+import tempfile
+
+import django
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.inspections.models import Inspection
+from apps.reports.benchmarks import IMAGE_TYPES, BenchmarkSeeder, compare, load_results, measure, synthetic_jpeg
+from apps.reports.document_generator import ProfessionalDocumentGenerator
+from apps.reports.models import InspectionReport, ReportImage
+from apps.reports.services import ViolationDetectionService
+
+SCENARIOS = [
+    'generate_documents_fm', 'generate_documents_tv', 'violation_detection',
+    'preview_data', 'enhanced_preview_data', 'image_requirements', 'bulk_upload',
+    'bulk_upload_duplicates',
+    'list_reports', 'list_images', 'list_violations', 'list_inspections',
+]
+
+class Command(BaseCommand):
+    help = 'Benchmark report generation, violation detection and report endpoints on synthetic data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--broadcasters', type=int, default=5)
+        parser.add_argument('--reports', type=int, default=20, help='Seeded reports, one inspection each')
+        parser.add_argument('--images-per-report', type=int, default=6)
+        parser.add_argument('--image-size', type=int, default=1024, help='Edge of the synthetic JPEGs in pixels')
+        parser.add_argument('--upload-images', type=int, default=50, help='Files per bulk_upload request')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per scenario')
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f'Comma separated subset of {",".join(SCENARIOS)}')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--baseline', help='Compare against a previous --output file')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed growth before a metric is a regression')
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options['scenarios'].split(',') if name.strip()]
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+        baseline = load_results(options['baseline']) if options['baseline'] else None
+
+        seeder = BenchmarkSeeder(
+            broadcasters=options['broadcasters'],
+            reports=options['reports'],
+            images_per_report=options['images_per_report'],
+            image_size=options['image_size'],
+        )
+        media_root = tempfile.mkdtemp(prefix='benchmark_reports_')
+        try:
+            # Uploaded and generated files go to a scratch MEDIA_ROOT
+            with override_settings(MEDIA_ROOT=media_root):
+                seeded = seeder.seed()
+                self.stdout.write(
+                    f'Seeded {len(seeded["reports"])} reports x {options["images_per_report"]} images '
+                    f'across {len(seeded["broadcasters"])} broadcasters'
+                )
+                results = {
+                    'created_at': timezone.now().isoformat(),
+                    'environment': {
+                        'python': platform.python_version(),
+                        'django': django.get_version(),
+                        'database': connection.vendor,
+                    },
+                    'parameters': {key: options[key] for key in (
+                        'broadcasters', 'reports', 'images_per_report', 'image_size', 'upload_images', 'repeat'
+                    )},
+                    'scenarios': {},
+                }
+                for name in scenarios:
+                    func, teardown = self._scenario(name, seeded, options)
+                    results['scenarios'][name] = measure(func, repeat=options['repeat'], teardown=teardown)
+                    self._print(name, results['scenarios'][name])
+        finally:
+            seeder.cleanup()
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options['threshold'])
+            for item in regressions:
+                change = f'{item["change"]:+.0%}' if item['change'] is not None else 'new'
+                self.stdout.write(self.style.ERROR(
+                    f'REGRESSION {item["scenario"]}.{item["metric"]}: {item["baseline"]} -> {item["current"]} ({change})'
+                ))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regressions against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {options["baseline"]}'))
+
+    def _scenario(self, name, seeded, options):
+        """(callable, teardown) for a scenario"""
+        reports = seeded['reports']
+        fm_report = next(report for report in reports if report.report_type == 'fm_radio')
+        tv_report = next((report for report in reports if report.report_type == 'tv_broadcast'), fm_report)
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(seeded['user'])
+
+        def get(url):
+            def call():
+                response = client.get(url, secure=True)
+                if response.status_code != 200:
+                    raise CommandError(f'{name}: GET {url} returned {response.status_code}')
+            return call
+
+        if name in ('generate_documents_fm', 'generate_documents_tv'):
+            report_id = (fm_report if name.endswith('fm') else tv_report).pk
+
+            def generate():
+                # Fresh instance each run, as the generate_documents endpoint loads one
+                report = InspectionReport.objects.select_related('inspection__broadcaster').get(pk=report_id)
+                ProfessionalDocumentGenerator(report).generate_documents(['docx'])
+            return generate, None
+
+        if name == 'violation_detection':
+            inspection_ids = [report.inspection_id for report in reports]
+
+            def detect():
+                for inspection in Inspection.objects.filter(pk__in=inspection_ids):
+                    ViolationDetectionService(inspection).detect_violations()
+            return detect, None
+
+        if name in ('preview_data', 'enhanced_preview_data', 'image_requirements'):
+            return get(f'/api/reports/reports/{fm_report.pk}/{name}/'), None
+
+        if name in ('bulk_upload', 'bulk_upload_duplicates'):
+            payloads = [synthetic_jpeg(10_000 + index, options['image_size']) for index in range(options['upload_images'])]
+            existing = set(ReportImage.objects.filter(report=fm_report).values_list('pk', flat=True))
+
+            def upload():
+                data = {'report_id': str(fm_report.pk)}
+                for index, payload in enumerate(payloads):
+                    data[f'file_{index}'] = SimpleUploadedFile(f'upload_{index}.jpg', payload, content_type='image/jpeg')
+                    data[f'file_{index}_type'] = IMAGE_TYPES[index % len(IMAGE_TYPES)]
+                response = client.post('/api/reports/images/bulk_upload/', data, format='multipart', secure=True)
+                if response.status_code not in (200, 201) or response.data.get('total_errors'):
+                    raise CommandError(f'bulk_upload failed: {response.status_code} {response.data}')
+
+            if name == 'bulk_upload_duplicates':
+                # The same files are stored once up front; timed runs only link to their blobs
+                upload()
+                existing = set(ReportImage.objects.filter(report=fm_report).values_list('pk', flat=True))
+
+            def remove_uploads():
+                # Deleting the rows releases their blobs, which removes the files
+                for image in ReportImage.objects.filter(report=fm_report).exclude(pk__in=existing):
+                    image.delete()
+            return upload, remove_uploads
+
+        urls = {
+            'list_reports': '/api/reports/reports/',
+            'list_images': f'/api/reports/images/?report={fm_report.pk}',
+            'list_violations': '/api/reports/violations/',
+            'list_inspections': '/api/inspections/inspections/',
+        }
+        return get(urls[name]), None
+
+    def _print(self, name, result):
+        self.stdout.write(
+            f'{name:>22}: mean {result["mean_ms"]:9.2f} ms  p95 {result["p95_ms"]:9.2f} ms  '
+            f'peak {result["peak_memory_kib"]:9.1f} KiB  queries {result["queries"]:5d}'
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.uploads import ResumableUploadService, upload_settings
+
+class Command(BaseCommand):
+    help = 'Delete resumable upload sessions idle for longer than REPORT_SETTINGS UPLOAD_SESSION_TTL_HOURS, with their chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Count what would be deleted')
+
+    def handle(self, *args, **options):
+        counts = ResumableUploadService.cleanup(dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {counts["sessions"]} stale sessions and {counts["orphan_dirs"]} orphaned chunk directories '
+            f'under {upload_settings()["dir"]}'
+        ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.models import ReportImage
+from apps.reports.similarity import dhash_file
+
+class Command(BaseCommand):
+    help = 'Compute perceptual hashes for report images uploaded before near-duplicate detection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Only process this many images')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows written per UPDATE batch')
+
+    def handle(self, *args, **options):
+        images = ReportImage.objects.filter(dhash__isnull=True).select_related('blob').order_by('pk')
+        if options['limit']:
+            images = images[:options['limit']]
+        storage = ReportImage._meta.get_field('image').storage
+        # Images sharing a blob share a hash; decode each file once
+        hashes = {}
+        batch = []
+        hashed = skipped = 0
+        for image in images.iterator(chunk_size=options['batch_size']):
+            name = image.document_name
+            if not name:
+                # HEIC still being transcoded; the transcoder hashes it when done
+                skipped += 1
+                continue
+            if name not in hashes:
+                try:
+                    with storage.open(name, 'rb') as handle:
+                        hashes[name] = dhash_file(handle)
+                except OSError as e:
+                    self.stderr.write(f'Image {image.pk}: {e}')
+                    hashes[name] = None
+            image.dhash = hashes[name]
+            if image.dhash is None:
+                skipped += 1
+                continue
+            batch.append(image)
+            if len(batch) >= options['batch_size']:
+                ReportImage.objects.bulk_update(batch, ['dhash'])
+                hashed += len(batch)
+                batch = []
+        if batch:
+            ReportImage.objects.bulk_update(batch, ['dhash'])
+            hashed += len(batch)
+        self.stdout.write(self.style.SUCCESS(f'Hashed {hashed} images, skipped {skipped}'))
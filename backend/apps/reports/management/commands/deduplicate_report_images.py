@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.blobs import ImageBlobStore
+from apps.reports.models import ReportImage
+
+class Command(BaseCommand):
+    help = 'Move report images stored before deduplication into the content-addressed blob store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Hash the files and report the savings without moving anything')
+        parser.add_argument('--limit', type=int, help='Only process this many images')
+
+    def handle(self, *args, **options):
+        images = ReportImage.objects.filter(blob__isnull=True).exclude(image='').order_by('pk')
+        if options['limit']:
+            images = images[:options['limit']]
+        counts = ImageBlobStore.adopt(images.iterator(), dry_run=options['dry_run'])
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {counts["images"]} images into the blob store; {counts["duplicates"]} were duplicates, '
+            f'{counts["bytes_freed"] / (1024 * 1024):.1f} MiB freed; {counts["missing"]} files missing'
+        ))
@@ -0,0 +1,26 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.reports.docx_templates import ReportTemplateLibrary
+from apps.reports.models import InspectionReport
+
+class Command(BaseCommand):
+    help = 'Write the built-in DOCX skeleton for each report type to REPORT_SETTINGS TEMPLATE_DIR'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help='Defaults to REPORT_SETTINGS TEMPLATE_DIR')
+        parser.add_argument('--force', action='store_true', help='Overwrite existing templates')
+
+    def handle(self, *args, **options):
+        directory = options['output_dir'] or settings.REPORT_SETTINGS['TEMPLATE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        for report_type, label in InspectionReport.REPORT_TYPES:
+            path = os.path.join(directory, f'{report_type}.docx')
+            if os.path.exists(path) and not options['force']:
+                self.stdout.write(f'Skipping {path} (exists, use --force)')
+                continue
+            ReportTemplateLibrary.export(report_type, path)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {label} template to {path}'))
+        self.stdout.write('Restart workers to pick up edited templates; they are cached per process.')
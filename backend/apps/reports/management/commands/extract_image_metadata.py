@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.models import ReportImage
+from apps.reports.photo_metadata import METADATA_FIELDS, read_file_metadata
+
+class Command(BaseCommand):
+    help = 'Read EXIF capture time and GPS position for report images uploaded before extraction on upload'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Only process this many images')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows written per UPDATE batch')
+
+    def handle(self, *args, **options):
+        images = ReportImage.objects.filter(exif_extracted=False).only('pk', 'image').order_by('pk')
+        if options['limit']:
+            images = images[:options['limit']]
+        storage = ReportImage._meta.get_field('image').storage
+        # The original keeps the EXIF renditions drop; images sharing a blob are read once
+        metadata = {}
+        batch = []
+        extracted = located = missing = 0
+        for image in images.iterator(chunk_size=options['batch_size']):
+            name = image.image.name
+            if name not in metadata:
+                try:
+                    with storage.open(name, 'rb') as handle:
+                        metadata[name] = read_file_metadata(handle)
+                except OSError as e:
+                    self.stderr.write(f'Image {image.pk}: {e}')
+                    metadata[name] = None
+            if metadata[name] is None:
+                missing += 1
+                continue
+            for field, value in metadata[name].items():
+                setattr(image, field, value)
+            located += image.gps_latitude is not None
+            batch.append(image)
+            if len(batch) >= options['batch_size']:
+                ReportImage.objects.bulk_update(batch, METADATA_FIELDS)
+                extracted += len(batch)
+                batch = []
+        if batch:
+            ReportImage.objects.bulk_update(batch, METADATA_FIELDS)
+            extracted += len(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Read EXIF of {extracted} images ({located} with a GPS fix), {missing} files missing'
+        ))
@@ -0,0 +1,44 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.document_generator import ProfessionalDocumentGenerator
+from apps.reports.models import InspectionReport
+from apps.reports.profiling import GenerationProfiler
+
+class Command(BaseCommand):
+    help = 'Generate a report DOCX with per-section profiling'
+
+    def add_arguments(self, parser):
+        parser.add_argument('report_id', help='InspectionReport id (UUID) or reference number')
+        parser.add_argument('--pstats', help='Write cProfile stats to this path')
+        parser.add_argument('--collapsed', help='Write flamegraph collapsed stacks to this path')
+        parser.add_argument('--no-bytes', action='store_true', help='Skip measuring bytes added per section')
+
+    def handle(self, *args, **options):
+        lookup = options['report_id']
+        reports = InspectionReport.objects.select_related('inspection__broadcaster', 'inspection__inspector')
+        report = reports.filter(reference_number=lookup).first()
+        if report is None:
+            try:
+                report = reports.get(pk=lookup)
+            except (InspectionReport.DoesNotExist, ValidationError):
+                raise CommandError(f'Report {lookup} not found')
+
+        profiler = GenerationProfiler(measure_bytes=not options['no_bytes'], use_cprofile=bool(options['pstats']))
+        ProfessionalDocumentGenerator(report, profiler=profiler).generate_documents(['docx'])
+        summary = profiler.summary()
+
+        self.stdout.write(f'{report.reference_number}: {summary["total_ms"]:.1f} ms, {summary["queries"]} queries, {summary["output_bytes"]} bytes')
+        for entry in summary['sections']:
+            depth = entry['path'].count(';') - 1
+            self.stdout.write(
+                f'{"  " * depth}{entry["section"]:<{40 - 2 * depth}} {entry["time_ms"]:8.2f} ms  self {entry["self_time_ms"]:8.2f} ms  '
+                f'x{entry["calls"]:<3} queries {entry["queries"]:3d}  +{entry["bytes_added"]:>9} B'
+            )
+
+        if options['pstats']:
+            profiler.dump_pstats(options['pstats'])
+            self.stdout.write(f'cProfile stats written to {options["pstats"]}')
+        if options['collapsed']:
+            profiler.dump_collapsed(options['collapsed'])
+            self.stdout.write(f'Collapsed stacks written to {options["collapsed"]}')
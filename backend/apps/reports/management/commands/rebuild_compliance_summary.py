@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.services import ComplianceDashboardService
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized compliance dashboard summary from all inspection reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Reports fetched and rows inserted per batch')
+
+    def handle(self, *args, **options):
+        rows = ComplianceDashboardService.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Compliance summary rebuilt: {rows} rows'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.transcoding import TRANSCODE_TYPES, ImageTranscoder
+
+class Command(BaseCommand):
+    help = 'Write print JPEG and web WebP renditions for HEIC/HEIF images still waiting, e.g. after a restart'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry blobs whose transcoding failed')
+        parser.add_argument('--limit', type=int, help='Only process this many blobs')
+
+    def handle(self, *args, **options):
+        if not TRANSCODE_TYPES:
+            self.stderr.write('pillow-heif is not installed; HEIC/HEIF cannot be decoded')
+            return
+        counts = ImageTranscoder.transcode_pending(limit=options['limit'], retry_failed=options['retry_failed'])
+        self.stdout.write(self.style.SUCCESS(f'Transcoded {counts["transcoded"]} images, {counts["failed"]} failed'))
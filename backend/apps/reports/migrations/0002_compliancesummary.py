@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broadcasters', '0003_generaldata_air_status_generaldata_off_air_reason_and_more'),
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportimage',
+            name='image_type',
+            field=models.CharField(choices=[('site_overview', 'Site Overview'), ('tower_mast', 'Tower/Mast Structure'), ('transmitter_equipment', 'Transmitter Equipment'), ('antenna', 'Antenna System'), ('studio_transmitter_link', 'Studio to Transmitter Link'), ('filter_equipment', 'Filter Equipment'), ('other_equipment', 'Other Equipment')], max_length=30),
+        ),
+        migrations.CreateModel(
+            name='ComplianceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('station_type', models.CharField(blank=True, max_length=10)),
+                ('month', models.DateField(blank=True, help_text='First day of the inspection month', null=True)),
+                ('compliance_status', models.CharField(max_length=20)),
+                ('violation_type', models.CharField(blank=True, max_length=50)),
+                ('report_count', models.PositiveIntegerField(default=0)),
+                ('violation_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('broadcaster', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='compliance_summaries', to='broadcasters.broadcaster')),
+            ],
+            options={
+                'db_table': 'report_compliance_summary',
+                'ordering': ['-month', 'broadcaster_id', 'station_type'],
+                'indexes': [models.Index(fields=['month', 'violation_type'], name='report_comp_month_8bf02f_idx')],
+                'unique_together': {('broadcaster', 'station_type', 'month', 'compliance_status', 'violation_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_compliancesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportViolation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('violation_type', models.CharField(db_index=True, help_text='e.g. ERP_VIOLATION, SAFETY_VIOLATION', max_length=50)),
+                ('severity', models.CharField(choices=[('major', 'Major'), ('minor', 'Minor')], db_index=True, max_length=10)),
+                ('category', models.CharField(blank=True, db_index=True, help_text='Safety category or equipment type', max_length=50)),
+                ('description', models.TextField(blank=True)),
+                ('channel', models.CharField(blank=True, max_length=50)),
+                ('measured_value', models.FloatField(blank=True, null=True)),
+                ('authorized_value', models.FloatField(blank=True, null=True)),
+                ('details', models.JSONField(default=dict)),
+                ('order', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='violations', to='reports.inspectionreport')),
+            ],
+            options={
+                'db_table': 'report_violations',
+                'ordering': ['report', 'order'],
+                'indexes': [models.Index(fields=['violation_type', 'created_at'], name='report_viol_violati_53d46e_idx'), models.Index(fields=['severity', 'created_at'], name='report_viol_severit_34c474_idx')],
+            },
+        ),
+    ]
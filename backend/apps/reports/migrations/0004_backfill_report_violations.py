@@ -0,0 +1,52 @@
+from django.db import migrations
+
+
+def _as_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backfill_report_violations(apps, schema_editor):
+    InspectionReport = apps.get_model('reports', 'InspectionReport')
+    ReportViolation = apps.get_model('reports', 'ReportViolation')
+
+    batch = []
+    reports = InspectionReport.objects.exclude(violations_found=[]).values_list('id', 'violations_found')
+    for report_id, violations in reports.iterator(chunk_size=500):
+        for order, violation in enumerate(violations or []):
+            if not isinstance(violation, dict):
+                continue
+            batch.append(ReportViolation(
+                report_id=report_id,
+                violation_type=str(violation.get('type') or 'UNKNOWN')[:50],
+                severity=str(violation.get('severity') or 'minor')[:10],
+                category=str(violation.get('safety_category') or violation.get('equipment_type') or '')[:50],
+                description=violation.get('description') or '',
+                channel=str(violation.get('channel') or '')[:50],
+                measured_value=_as_float(violation.get('measured_value')),
+                authorized_value=_as_float(violation.get('authorized_value')),
+                details=violation,
+                order=order,
+            ))
+        if len(batch) >= 1000:
+            ReportViolation.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        ReportViolation.objects.bulk_create(batch)
+
+
+def clear_report_violations(apps, schema_editor):
+    apps.get_model('reports', 'ReportViolation').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_reportviolation'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_report_violations, clear_report_violations),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+# Frozen copy of template_engine.DEFAULT_SECTIONS at the time of this migration
+DEFAULT_SECTIONS = [
+    {'kind': 'header'},
+    {'kind': 'findings_heading'},
+    {'kind': 'site', 'heading': 'A. SITE', 'images': 'site_overview'},
+    {'kind': 'tower', 'heading': 'B. MAST', 'images': 'tower_mast'},
+    {'kind': 'transmitter', 'heading': 'C. TRANSMITTER', 'images': 'transmitter_equipment'},
+    {'kind': 'antenna', 'heading': 'D. ANTENNA SYSTEM', 'images': 'antenna'},
+    {'kind': 'filter', 'heading': 'E. FILTER', 'images': 'filter_equipment', 'optional': True},
+    {'kind': 'stl', 'heading': 'F. STUDIO TO TRANSMITTER LINK', 'images': 'studio_transmitter_link', 'optional': True},
+    {'kind': 'erp', 'heading': 'G. ERP CALCULATION'},
+    {'kind': 'observations', 'heading': 'H. OBSERVATION', 'optional': True},
+    {'kind': 'conclusions', 'heading': 'I. CONCLUSION'},
+    {'kind': 'recommendations', 'heading': 'J. RECOMMENDATION'},
+    {'kind': 'signature'},
+]
+
+DEFAULT_TEMPLATES = [
+    ('fm_radio', 'FM Radio Inspection Report', 'Standard template for FM radio station inspections'),
+    ('tv_broadcast', 'TV Broadcast Inspection Report', 'Template for television broadcast station inspections'),
+    ('am_radio', 'AM Radio Inspection Report', 'Template for AM radio station inspections'),
+]
+
+
+def seed_default_templates(apps, schema_editor):
+    """One active template per report type that has none, matching the built-in layout"""
+    ReportTemplate = apps.get_model('reports', 'ReportTemplate')
+    for report_type, name, description in DEFAULT_TEMPLATES:
+        if ReportTemplate.objects.filter(report_type=report_type).exists():
+            continue
+        ReportTemplate.objects.create(
+            name=name,
+            report_type=report_type,
+            template_structure={'description': description, 'sections': DEFAULT_SECTIONS},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_backfill_report_violations'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reporttemplate',
+            name='calculations_template',
+            field=models.TextField(blank=True, help_text='ERP calculations template'),
+        ),
+        migrations.AlterField(
+            model_name='reporttemplate',
+            name='conclusions_template',
+            field=models.TextField(blank=True, help_text='Conclusions template, used when the report has none'),
+        ),
+        migrations.AlterField(
+            model_name='reporttemplate',
+            name='findings_template',
+            field=models.TextField(blank=True, help_text='Findings section template'),
+        ),
+        migrations.AlterField(
+            model_name='reporttemplate',
+            name='header_template',
+            field=models.TextField(blank=True, help_text='Header section template; replaces the standard introduction'),
+        ),
+        migrations.AlterField(
+            model_name='reporttemplate',
+            name='recommendations_template',
+            field=models.TextField(blank=True, help_text='Recommendations template, used when the report has none'),
+        ),
+        migrations.AlterField(
+            model_name='reporttemplate',
+            name='template_structure',
+            field=models.JSONField(help_text='JSON structure defining the report layout: {"sections": [{"kind": "site", "heading": "A. SITE", "images": "site_overview"}, ...]}; see apps/reports/template_engine.py'),
+        ),
+        migrations.RunPython(seed_default_templates, migrations.RunPython.noop),
+    ]
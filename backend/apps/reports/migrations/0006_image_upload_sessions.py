@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reports', '0005_report_template_defaults'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageUploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('total_size', models.PositiveBigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(blank=True, help_text='Hex digest of the whole file, checked on completion', max_length=64)),
+                ('image_type', models.CharField(choices=[('site_overview', 'Site Overview'), ('tower_mast', 'Tower/Mast Structure'), ('transmitter_equipment', 'Transmitter Equipment'), ('antenna', 'Antenna System'), ('studio_transmitter_link', 'Studio to Transmitter Link'), ('filter_equipment', 'Filter Equipment'), ('other_equipment', 'Other Equipment')], max_length=30)),
+                ('caption', models.CharField(blank=True, max_length=300)),
+                ('position_in_report', models.CharField(choices=[('header', 'Header Area'), ('findings_section', 'Findings Section'), ('equipment_section', 'Equipment Section'), ('antenna_section', 'Antenna Section'), ('custom', 'Custom Position')], default='equipment_section', max_length=20)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('completed', 'Completed')], default='open', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reports.reportimage')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='reports.inspectionreport')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'report_image_upload_sessions',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='report_imag_status_107928_idx')],
+            },
+        ),
+    ]
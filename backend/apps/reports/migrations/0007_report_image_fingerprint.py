@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_image_upload_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportimage',
+            name='mime_type',
+            field=models.CharField(blank=True, help_text='Type detected from the file contents', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='reportimage',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, help_text='SHA-256 of the file contents', max_length=64),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_report_image_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Storage name of the file', max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('mime_type', models.CharField(blank=True, max_length=100)),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='ReportImage rows pointing at this file')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'report_image_blobs',
+            },
+        ),
+        migrations.AddField(
+            model_name='reportimage',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Shared file; empty for images stored before deduplication', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='images', to='reports.imageblob'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_image_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageblob',
+            name='print_name',
+            field=models.CharField(blank=True, help_text='Storage name of the print JPEG', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='imageblob',
+            name='transcode_status',
+            field=models.CharField(blank=True, choices=[('', 'Not needed'), ('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='imageblob',
+            name='web_name',
+            field=models.CharField(blank=True, help_text='Storage name of the web WebP', max_length=255),
+        ),
+    ]
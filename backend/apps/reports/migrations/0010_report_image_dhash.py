@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_image_blob_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportimage',
+            name='dhash',
+            field=models.BigIntegerField(blank=True, help_text='64-bit difference hash for near-duplicate search, stored signed', null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_report_image_dhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportimage',
+            name='captured_at',
+            field=models.DateTimeField(blank=True, help_text='When the photo was taken, per EXIF', null=True),
+        ),
+        migrations.AddField(
+            model_name='reportimage',
+            name='exif_extracted',
+            field=models.BooleanField(default=False, help_text='Whether EXIF was read; false for images awaiting backfill'),
+        ),
+        migrations.AddField(
+            model_name='reportimage',
+            name='gps_latitude',
+            field=models.FloatField(blank=True, help_text='EXIF GPS latitude, decimal degrees', null=True),
+        ),
+        migrations.AddField(
+            model_name='reportimage',
+            name='gps_longitude',
+            field=models.FloatField(blank=True, help_text='EXIF GPS longitude, decimal degrees', null=True),
+        ),
+    ]
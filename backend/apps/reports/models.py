@@ -1,11 +1,14 @@
 # apps/reports/models.py - Updated to match frontend categories
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from apps.inspections.models import Inspection
+import logging
 import uuid
 import os
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 def report_image_upload_path(instance, filename):
     """Generate upload path for report images"""
@@ -110,7 +113,7 @@ class InspectionReport(models.Model):
                 else:
                     new_num = 1
             except (ValueError, IndexError) as e:
-                print(f"Error parsing reference number {latest.reference_number}: {e}")
+                logger.warning("Error parsing reference number %s: %s", latest.reference_number, e)
                 new_num = 1
         else:
             new_num = 1
@@ -140,6 +143,32 @@ class InspectionReport(models.Model):
         db_table = 'inspection_reports'
         ordering = ['-created_at']
 
+class ImageBlob(models.Model):
+    """One stored image file, named by its SHA-256 and shared by every ReportImage with the same contents"""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=255, help_text="Storage name of the file")
+    size = models.BigIntegerField()
+    mime_type = models.CharField(max_length=100, blank=True)
+    ref_count = models.PositiveIntegerField(default=0, help_text="ReportImage rows pointing at this file")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Formats python-docx and browsers cannot show (HEIC) get a print JPEG and a web WebP next to the original
+    TRANSCODE_STATUS = [
+        ('', 'Not needed'),
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    transcode_status = models.CharField(max_length=10, choices=TRANSCODE_STATUS, blank=True, default='', db_index=True)
+    print_name = models.CharField(max_length=255, blank=True, help_text="Storage name of the print JPEG")
+    web_name = models.CharField(max_length=255, blank=True, help_text="Storage name of the web WebP")
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
+    
+    class Meta:
+        db_table = 'report_image_blobs'
+
 class ReportImage(models.Model):
     """Images attached to reports - UPDATED TO MATCH FRONTEND CATEGORIES"""
     IMAGE_TYPES = [
@@ -165,6 +194,20 @@ class ReportImage(models.Model):
     image = models.ImageField(upload_to=report_image_upload_path)
     image_type = models.CharField(max_length=30, choices=IMAGE_TYPES)  # Increased max_length
     
+    # Content fingerprint, computed while the upload streams in
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True, help_text="SHA-256 of the file contents")
+    mime_type = models.CharField(max_length=100, blank=True, help_text="Type detected from the file contents")
+    dhash = models.BigIntegerField(null=True, blank=True,
+                                   help_text="64-bit difference hash for near-duplicate search, stored signed")
+
+    # Read from EXIF at upload, for cross-checking against the inspection's site and date
+    captured_at = models.DateTimeField(null=True, blank=True, help_text="When the photo was taken, per EXIF")
+    gps_latitude = models.FloatField(null=True, blank=True, help_text="EXIF GPS latitude, decimal degrees")
+    gps_longitude = models.FloatField(null=True, blank=True, help_text="EXIF GPS longitude, decimal degrees")
+    exif_extracted = models.BooleanField(default=False, help_text="Whether EXIF was read; false for images awaiting backfill")
+    blob = models.ForeignKey(ImageBlob, on_delete=models.PROTECT, null=True, blank=True, editable=False,
+                             related_name='images', help_text="Shared file; empty for images stored before deduplication")
+    
     # Image metadata
     caption = models.CharField(max_length=300, help_text="Image caption for the report")
     description = models.TextField(blank=True, help_text="Detailed description")
@@ -198,6 +241,20 @@ class ReportImage(models.Model):
         """Alias for backwards compatibility"""
         return self.created_at
     
+    @property
+    def document_name(self):
+        """Storage name of the file to embed in documents; None while an original awaits transcoding"""
+        if self.blob_id and self.blob.transcode_status:
+            return self.blob.print_name or None
+        return self.image.name or None
+    
+    @property
+    def web_name(self):
+        """Storage name of the file browsers should display; None while an original awaits transcoding"""
+        if self.blob_id and self.blob.transcode_status:
+            return self.blob.web_name or None
+        return self.image.name or None
+    
     class Meta:
         db_table = 'report_images'
         ordering = ['position_in_report', 'order_in_section']
@@ -209,16 +266,19 @@ class ReportTemplate(models.Model):
     report_type = models.CharField(max_length=20, choices=InspectionReport.REPORT_TYPES)
     
     # Template structure (stored as JSON)
-    template_structure = models.JSONField(help_text="JSON structure defining the report layout")
+    template_structure = models.JSONField(
+        help_text='JSON structure defining the report layout: {"sections": [{"kind": "site", "heading": "A. SITE", '
+                  '"images": "site_overview"}, ...]}; see apps/reports/template_engine.py'
+    )
     
     # Header template
-    header_template = models.TextField(help_text="Header section template")
+    header_template = models.TextField(blank=True, help_text="Header section template; replaces the standard introduction")
     
-    # Section templates
-    findings_template = models.TextField(help_text="Findings section template")
-    calculations_template = models.TextField(help_text="ERP calculations template")
-    conclusions_template = models.TextField(help_text="Conclusions template")
-    recommendations_template = models.TextField(help_text="Recommendations template")
+    # Section templates (Django template syntax, rendered with report, inspection and broadcaster)
+    findings_template = models.TextField(blank=True, help_text="Findings section template")
+    calculations_template = models.TextField(blank=True, help_text="ERP calculations template")
+    conclusions_template = models.TextField(blank=True, help_text="Conclusions template, used when the report has none")
+    recommendations_template = models.TextField(blank=True, help_text="Recommendations template, used when the report has none")
     
     # Styling
     page_margins = models.JSONField(default=dict, help_text="Page margin settings")
@@ -231,6 +291,14 @@ class ReportTemplate(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_report_type_display()})"
     
+    def clean(self):
+        """Reject layouts and text templates the document generator could not compile"""
+        from .template_engine import CompiledReportTemplate, TemplateStructureError
+        try:
+            CompiledReportTemplate.from_model(self)
+        except TemplateStructureError as e:
+            raise ValidationError(str(e))
+    
     class Meta:
         db_table = 'report_templates'
 
@@ -282,4 +350,121 @@ class ERPCalculation(models.Model):
     
     class Meta:
         db_table = 'erp_calculations'
-        ordering = ['channel_number']
\ No newline at end of file
+        ordering = ['channel_number']
+
+class ReportViolation(models.Model):
+    """Violation found for a report; violations_found on the report is a cached projection of these rows"""
+    SEVERITY_CHOICES = [
+        ('major', 'Major'),
+        ('minor', 'Minor'),
+    ]
+
+    report = models.ForeignKey(InspectionReport, on_delete=models.CASCADE, related_name='violations')
+    violation_type = models.CharField(max_length=50, db_index=True, help_text="e.g. ERP_VIOLATION, SAFETY_VIOLATION")
+    severity = models.CharField(max_length=10, choices=SEVERITY_CHOICES, db_index=True)
+    category = models.CharField(max_length=50, blank=True, db_index=True, help_text="Safety category or equipment type")
+    description = models.TextField(blank=True)
+
+    # Measured values for ERP violations
+    channel = models.CharField(max_length=50, blank=True)
+    measured_value = models.FloatField(null=True, blank=True)
+    authorized_value = models.FloatField(null=True, blank=True)
+
+    # Original detection payload, returned unchanged in violations_found
+    details = models.JSONField(default=dict)
+    order = models.PositiveSmallIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.violation_type} ({self.severity}) - {self.report_id}"
+
+    class Meta:
+        db_table = 'report_violations'
+        ordering = ['report', 'order']
+        indexes = [
+            models.Index(fields=['violation_type', 'created_at']),
+            models.Index(fields=['severity', 'created_at']),
+        ]
+
+class ComplianceSummary(models.Model):
+    """Materialized compliance counts per broadcaster, station type, month, status and violation type
+
+    Rows with an empty violation_type count reports; the other rows count the
+    reports carrying that violation type and how many violations they hold.
+    """
+    broadcaster = models.ForeignKey(
+        'broadcasters.Broadcaster',
+        on_delete=models.CASCADE,
+        related_name='compliance_summaries',
+        null=True,
+        blank=True
+    )
+    station_type = models.CharField(max_length=10, blank=True)
+    month = models.DateField(null=True, blank=True, help_text="First day of the inspection month")
+    compliance_status = models.CharField(max_length=20)
+    violation_type = models.CharField(max_length=50, blank=True)
+
+    report_count = models.PositiveIntegerField(default=0)
+    violation_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.month} {self.station_type} {self.compliance_status} {self.violation_type or 'ALL'}: {self.report_count}"
+
+    class Meta:
+        db_table = 'report_compliance_summary'
+        ordering = ['-month', 'broadcaster_id', 'station_type']
+        unique_together = ['broadcaster', 'station_type', 'month', 'compliance_status', 'violation_type']
+        indexes = [
+            models.Index(fields=['month', 'violation_type']),
+        ]
+
+class ImageUploadSession(models.Model):
+    """A resumable, chunked image upload; chunks live on local disk until the upload is completed"""
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('completed', 'Completed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    report = models.ForeignKey(InspectionReport, on_delete=models.CASCADE, related_name='upload_sessions')
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='image_upload_sessions')
+
+    # Declared by the client when the session is created
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Hex digest of the whole file, checked on completion")
+
+    # ReportImage metadata
+    image_type = models.CharField(max_length=30, choices=ReportImage.IMAGE_TYPES)
+    caption = models.CharField(max_length=300, blank=True)
+    position_in_report = models.CharField(max_length=20, choices=ReportImage.POSITIONING, default='equipment_section')
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    image = models.ForeignKey(ReportImage, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every stored chunk; stale sessions are collected from it
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def chunk_length(self, index):
+        """Exact byte length chunk `index` must have"""
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
+
+    def __str__(self):
+        return f"{self.filename} ({self.status}) - {self.report_id}"
+
+    class Meta:
+        db_table = 'report_image_upload_sessions'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
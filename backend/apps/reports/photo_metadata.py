@@ -0,0 +1,118 @@
+# apps/reports/photo_metadata.py
+import logging
+import math
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+from PIL import Image
+
+# Registers the HEIF opener, so HEIC originals give up their EXIF too
+from .transcoding import TRANSCODE_TYPES  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+# ReportImage fields filled from EXIF; images sharing a blob share their values
+METADATA_FIELDS = ('captured_at', 'gps_latitude', 'gps_longitude', 'exif_extracted')
+
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+DATE_TIME = 0x0132
+DATE_TIME_ORIGINAL = 0x9003
+OFFSET_TIME_ORIGINAL = 0x9011
+GPS_LATITUDE_REF, GPS_LATITUDE, GPS_LONGITUDE_REF, GPS_LONGITUDE = 1, 2, 3, 4
+
+EARTH_RADIUS_M = 6371000
+
+def photo_check_settings() -> Dict[str, Any]:
+    report_settings = getattr(settings, 'REPORT_SETTINGS', {})
+    return {
+        'max_distance_m': report_settings.get('PHOTO_MAX_SITE_DISTANCE_M', 1000),
+        'date_tolerance_days': report_settings.get('PHOTO_DATE_TOLERANCE_DAYS', 0),
+    }
+
+def parse_coordinate(value: Optional[str]) -> Optional[float]:
+    """Decimal degrees from an inspection coordinate, None when it cannot be read
+
+    Accepts what inspectors type and the GPS widget writes: decimal
+    degrees ('-1.2921', '36.82 E') or degrees, minutes and seconds with
+    any separators ('01 17 32 S', '36°49\\'12"E'). S and W are negative.
+    """
+    if not value:
+        return None
+    text = str(value).strip().upper()
+    numbers = [float(number) for number in re.findall(r'\d+(?:\.\d+)?', text)]
+    if not 1 <= len(numbers) <= 3:
+        return None
+    degrees = numbers[0] + sum(part / 60 ** power for power, part in enumerate(numbers[1:], 1))
+    negative = text.startswith('-') or bool(re.search(r'[SW]', text))
+    return -degrees if negative else degrees
+
+def site_position(inspection) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) of the inspected site, None unless both read as valid"""
+    latitude, longitude = parse_coordinate(inspection.latitude), parse_coordinate(inspection.longitude)
+    if latitude is None or longitude is None or abs(latitude) > 90 or abs(longitude) > 180:
+        return None
+    return latitude, longitude
+
+def distance_m(first: Tuple[float, float], second: Tuple[float, float]) -> float:
+    """Great-circle distance in metres between two (latitude, longitude) pairs"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*first, *second))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def _gps_degrees(parts, reference) -> Optional[float]:
+    try:
+        degrees, minutes, seconds = (float(part) for part in parts)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return None
+    value = degrees + minutes / 60 + seconds / 3600
+    if math.isnan(value):
+        return None
+    return -value if str(reference).strip().upper() in ('S', 'W') else value
+
+def _capture_time(exif_ifd, exif) -> Optional[datetime]:
+    raw = exif_ifd.get(DATE_TIME_ORIGINAL) or exif.get(DATE_TIME)
+    try:
+        captured = datetime.strptime(str(raw).strip('\x00 '), '%Y:%m:%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+    offset = re.fullmatch(r'([+-])(\d{2}):(\d{2})', str(exif_ifd.get(OFFSET_TIME_ORIGINAL, '')).strip('\x00 '))
+    if offset:
+        sign = -1 if offset.group(1) == '-' else 1
+        delta = timedelta(hours=int(offset.group(2)), minutes=int(offset.group(3)))
+        return captured.replace(tzinfo=dt_timezone(sign * delta))
+    # Cameras without an offset record local time; assume the inspection's time zone
+    return timezone.make_aware(captured, timezone.get_default_timezone())
+
+def read_metadata(image: Image.Image) -> Dict[str, Any]:
+    """Capture time and position from an opened image's EXIF; pixel data is never decoded"""
+    exif = image.getexif()
+    exif_ifd = exif.get_ifd(EXIF_IFD)
+    gps = exif.get_ifd(GPS_IFD)
+    latitude = _gps_degrees(gps.get(GPS_LATITUDE), gps.get(GPS_LATITUDE_REF, 'N'))
+    longitude = _gps_degrees(gps.get(GPS_LONGITUDE), gps.get(GPS_LONGITUDE_REF, 'E'))
+    if latitude is None or longitude is None or abs(latitude) > 90 or abs(longitude) > 180 \
+            or (latitude == 0 and longitude == 0):
+        # A zero fix is what some phones write when they had none
+        latitude = longitude = None
+    return {
+        'captured_at': _capture_time(exif_ifd, exif),
+        'gps_latitude': latitude,
+        'gps_longitude': longitude,
+        'exif_extracted': True,
+    }
+
+def read_file_metadata(file) -> Dict[str, Any]:
+    """METADATA_FIELDS values for an uploaded or stored file; only the headers are read"""
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            return read_metadata(image)
+    except Exception as e:
+        logger.warning("Could not read EXIF of %s: %s", getattr(file, 'name', file), e)
+        return {'captured_at': None, 'gps_latitude': None, 'gps_longitude': None, 'exif_extracted': True}
+    finally:
+        file.seek(0)
@@ -0,0 +1,173 @@
+# apps/reports/profiling.py
+import cProfile
+import functools
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from django.db import connection
+from docx.document import Document as DocxDocument
+from lxml import etree
+
+def document_size(doc: DocxDocument) -> int:
+    """Approximate bytes of a document: body XML plus embedded image data"""
+    body = len(etree.tostring(doc.element.body))
+    images = sum(len(part.blob) for part in doc.part.package.image_parts)
+    return body + images
+
+class GenerationProfiler:
+    """Per-section timings, query counts and document growth for one report generation
+
+    Sections nest: a table built by a template plan step is recorded under
+    "section:site;site_table", which is also the collapsed-stack frame path.
+    Measuring bytes serialises the body around every section and inflates the
+    timings; use measure_bytes=False when only time matters.
+    """
+
+    ROOT = 'generate_docx'
+
+    def __init__(self, measure_bytes: bool = True, use_cprofile: bool = False):
+        self.measure_bytes = measure_bytes
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.output_bytes = 0
+        self._stack: List[str] = []
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.query_count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def run(self):
+        """Wrap the whole generation; sections only record while this is active"""
+        started = time.perf_counter()
+        self._stack = [self.ROOT]
+        with connection.execute_wrapper(self._count_query):
+            if self.cprofile:
+                self.cprofile.enable()
+            try:
+                yield self
+            finally:
+                if self.cprofile:
+                    self.cprofile.disable()
+                self.total_ms = (time.perf_counter() - started) * 1000
+                self._stack = []
+
+    @contextmanager
+    def section(self, name: str, doc: Optional[DocxDocument] = None):
+        if not self._stack:
+            yield
+            return
+        path = ';'.join(self._stack + [name])
+        entry = self.sections.setdefault(path, {
+            'section': name, 'path': path, 'calls': 0, 'time_ms': 0.0,
+            'self_time_ms': 0.0, 'queries': 0, 'bytes_added': 0,
+        })
+        measure = self.measure_bytes and doc is not None
+        size_before = document_size(doc) if measure else 0
+        queries_before = self.query_count
+        self._stack.append(name)
+        child_time_before = self._child_time(path)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self._stack.pop()
+            entry['calls'] += 1
+            entry['time_ms'] += elapsed
+            entry['self_time_ms'] += elapsed - (self._child_time(path) - child_time_before)
+            entry['queries'] += self.query_count - queries_before
+            if measure:
+                entry['bytes_added'] += document_size(doc) - size_before
+
+    def _child_time(self, path: str) -> float:
+        prefix = path + ';'
+        return sum(
+            entry['time_ms'] for key, entry in self.sections.items()
+            if key.startswith(prefix) and ';' not in key[len(prefix):]
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        sections = sorted(self.sections.values(), key=lambda entry: entry['path'])
+        return {
+            'total_ms': round(self.total_ms, 2),
+            'queries': self.query_count,
+            'output_bytes': self.output_bytes,
+            'sections': [
+                {**entry, 'time_ms': round(entry['time_ms'], 2), 'self_time_ms': round(entry['self_time_ms'], 2)}
+                for entry in sections
+            ],
+        }
+
+    def collapsed_stacks(self) -> str:
+        """Brendan Gregg's collapsed format (frame;frame value), weighted by self time in microseconds"""
+        accounted = sum(entry['time_ms'] for key, entry in self.sections.items() if ';' not in key[len(self.ROOT) + 1:])
+        lines = [f'{self.ROOT} {max(0, round((self.total_ms - accounted) * 1000))}']
+        for entry in sorted(self.sections.values(), key=lambda item: item['path']):
+            lines.append(f'{entry["path"]} {max(0, round(entry["self_time_ms"] * 1000))}')
+        return '\n'.join(lines) + '\n'
+
+    def dump_collapsed(self, path: str):
+        with open(path, 'w') as handle:
+            handle.write(self.collapsed_stacks())
+
+    def dump_pstats(self, path: str):
+        if self.cprofile is None:
+            raise ValueError('Profiler was created without use_cprofile=True')
+        self.cprofile.dump_stats(path)
+
+def profiled(name: str, detail_arg: Optional[int] = None):
+    """Record a generator method as a profiling section when the generator has a profiler
+
+    `detail_arg` is the index of a positional argument appended to the section
+    name, e.g. the image type for _add_section_images.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            label = name if detail_arg is None else f'{name}:{args[detail_arg]}'
+            doc = args[0] if args and isinstance(args[0], DocxDocument) else None
+            with profiler.section(label, doc):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def profile_dir() -> str:
+    """Where profile files are written: outside MEDIA_ROOT, as they show server source paths"""
+    from django.conf import settings
+
+    return str(getattr(settings, 'REPORT_SETTINGS', {}).get('PROFILE_DIR') or os.path.join(settings.BASE_DIR, 'profiles'))
+
+# Names dump_profile writes; anything else is refused when serving
+PROFILE_FILENAME = re.compile(r'^[\w.-]+_\d{8}-\d{6}\.(?:prof|folded)$')
+
+def profile_path(filename: str) -> Optional[str]:
+    """Full path of a profile file written by dump_profile, or None"""
+    if not PROFILE_FILENAME.match(filename):
+        return None
+    path = os.path.join(profile_dir(), filename)
+    return path if os.path.isfile(path) else None
+
+def dump_profile(profiler: GenerationProfiler, basename: str, outputs: List[str]) -> Dict[str, str]:
+    """Write the requested profile files under PROFILE_DIR; returns {format: file name}"""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    # Reference numbers carry spaces and slashes; keep names the download URL accepts
+    basename = re.sub(r'[^\w.-]+', '_', basename)
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    written = {}
+    if 'pstats' in outputs and profiler.cprofile is not None:
+        written['pstats'] = f'{basename}_{stamp}.prof'
+        profiler.dump_pstats(os.path.join(directory, written['pstats']))
+    if 'collapsed' in outputs:
+        written['collapsed'] = f'{basename}_{stamp}.folded'
+        profiler.dump_collapsed(os.path.join(directory, written['collapsed']))
+    return written
@@ -1,6 +1,8 @@
 # apps/reports/serializers.py
 from rest_framework import serializers
-from .models import InspectionReport, ReportImage, ERPCalculation, ReportTemplate
+from .models import InspectionReport, ReportImage, ERPCalculation, ReportTemplate, ReportViolation
+from .services import ReportViolationService
+from .thumbnails import ThumbnailCache
 from apps.inspections.models import Inspection
 
 class ERPCalculationSerializer(serializers.ModelSerializer):
@@ -19,6 +21,10 @@ class ERPCalculationSerializer(serializers.ModelSerializer):
 class ReportImageSerializer(serializers.ModelSerializer):
     """Serializer for report images"""
     image_url = serializers.SerializerMethodField()
+    web_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
+    transcode_status = serializers.CharField(source='blob.transcode_status', default='', read_only=True)
     file_size = serializers.SerializerMethodField()
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
     
@@ -29,9 +35,10 @@ class ReportImageSerializer(serializers.ModelSerializer):
             'position_in_report', 'order_in_section', 'width_percentage',
             'alignment', 'equipment_manufacturer', 'equipment_model',
             'equipment_serial', 'uploaded_at', 'uploaded_by', 'uploaded_by_name',
-            'file_size'
+            'file_size', 'sha256', 'mime_type', 'web_url', 'transcode_status',
+            'thumbnail_url', 'thumbnail_srcset'
         ]
-        read_only_fields = ['uploaded_by', 'uploaded_at', 'file_size']
+        read_only_fields = ['uploaded_by', 'uploaded_at', 'file_size', 'sha256', 'mime_type']
     
     def get_image_url(self, obj):
         """Get full URL for image"""
@@ -42,10 +49,34 @@ class ReportImageSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
     
+    def get_web_url(self, obj):
+        """Browser-displayable file: the WebP of transcoded originals, None until it exists"""
+        name = obj.web_name
+        if not name:
+            return None
+        url = obj.image.storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+    
+    def get_thumbnail_url(self, obj):
+        """Grid-sized image; None for images stored before deduplication"""
+        url = ThumbnailCache.url(obj.blob_id)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request and url else url
+    
+    def get_thumbnail_srcset(self, obj):
+        """srcset over every thumbnail width, for <img sizes=...>"""
+        return ThumbnailCache.srcset(obj.blob_id, self.context.get('request'))
+    
     def get_file_size(self, obj):
-        """Get image file size in bytes"""
-        if obj.image and hasattr(obj.image, 'size'):
-            return obj.image.size
+        """Get image file size in bytes; the blob row records it, so storage is only asked for legacy images"""
+        if obj.blob_id:
+            return obj.blob.size
+        if obj.image:
+            try:
+                return obj.image.size
+            except OSError:
+                return None
         return None
 
 class InspectionReportSerializer(serializers.ModelSerializer):
@@ -97,19 +128,12 @@ class InspectionReportSerializer(serializers.ModelSerializer):
         }
     
     def get_total_images(self, obj):
-        """Get total number of images"""
-        return obj.images.count()
+        """Get total number of images; counts the prefetched list when the view prefetched it"""
+        return len(obj.images.all())
     
     def get_violation_summary(self, obj):
-        """Get summary of violations"""
-        violations = obj.violations_found or []
-        
-        return {
-            'total': len(violations),
-            'major': len([v for v in violations if v.get('severity') == 'major']),
-            'minor': len([v for v in violations if v.get('severity') == 'minor']),
-            'types': list(set(v.get('type', 'unknown') for v in violations))
-        }
+        """Get summary of violations, from rows the view prefetched as violation_rows"""
+        return ReportViolationService.summary(obj)
     
     def get_generation_status(self, obj):
         """Get document generation status"""
@@ -146,6 +170,19 @@ class SimpleInspectionReportSerializer(serializers.ModelSerializer):
         """Get total number of violations"""
         return len(obj.violations_found or [])
 
+class ReportViolationSerializer(serializers.ModelSerializer):
+    """Serializer for indexed report violations"""
+    reference_number = serializers.CharField(source='report.reference_number', read_only=True)
+    
+    class Meta:
+        model = ReportViolation
+        fields = [
+            'id', 'report', 'reference_number', 'violation_type', 'severity',
+            'category', 'description', 'channel', 'measured_value',
+            'authorized_value', 'created_at'
+        ]
+        read_only_fields = fields
+
 class ReportGenerationSerializer(serializers.Serializer):
     """Serializer for report generation requests"""
     formats = serializers.ListField(
@@ -1,8 +1,11 @@
 # apps/reports/services.py
+import logging
 import os
 import math
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from io import BytesIO
 from PIL import Image
 
@@ -22,9 +25,24 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.template import Template, Context
 
-from .models import InspectionReport, ReportImage, ERPCalculation
+from .models import InspectionReport, ReportImage, ERPCalculation, ComplianceSummary, ReportViolation
+from .blobs import ImageBlobStore
+from .photo_metadata import distance_m, photo_check_settings, read_file_metadata, site_position
+from .similarity import HammingIndex, dhash_file, hamming, near_duplicate_distance
+from .thumbnails import ThumbnailCache
+from .transcoding import TRANSCODE_TYPES
+from .upload_handlers import MAX_IMAGE_UPLOAD_SIZE, fingerprint
+from apps.inspections.models import Inspection
+from apps.equipment.services import TypeApprovalRegistry
+from apps.inspections.services import ChannelERPService
+
+logger = logging.getLogger(__name__)
 
 class DocumentGenerationService:
     """Main service for generating inspection reports"""
@@ -58,8 +76,7 @@ class DocumentGenerationService:
             return results
             
         except Exception as e:
-            # Log error and update status
-            print(f"Document generation failed: {str(e)}")
+            logger.exception("Document generation failed for report %s", self.report.pk)
             self.report.status = 'draft'
             self.report.save()
             raise
@@ -431,7 +448,7 @@ ERP=10log {calc.forward_power_w}(W) + {calc.antenna_gain_dbd} dBd - {calc.losses
         """Create PDF image element"""
         try:
             # Open and resize image
-            img_path = report_image.image.path
+            img_path = report_image.image.storage.path(report_image.document_name)
             pil_img = Image.open(img_path)
             
             # Calculate size (maintain aspect ratio)
@@ -450,7 +467,7 @@ ERP=10log {calc.forward_power_w}(W) + {calc.antenna_gain_dbd} dBd - {calc.losses
             return rl_img
             
         except Exception as e:
-            print(f"Error creating PDF image: {e}")
+            logger.warning("Error creating PDF image: %s", e)
             return None
     
     # Word Document Generation Methods
@@ -569,7 +586,7 @@ The transmit station was inspected by MIRC officer {self.inspection.inspector.ge
             # Calculate image size
             max_width = Inches(5)
             run = paragraph.add_run()
-            run.add_picture(report_image.image.path, width=max_width)
+            run.add_picture(report_image.image.storage.path(report_image.document_name), width=max_width)
             
             # Add caption
             if report_image.caption:
@@ -579,7 +596,7 @@ The transmit station was inspected by MIRC officer {self.inspection.inspector.ge
                 caption_run.italic = True
                 
         except Exception as e:
-            print(f"Error adding image to Word doc: {e}")
+            logger.warning("Error adding image to Word doc: %s", e)
     
     # Helper Methods
     def _get_transmitter_table_data(self) -> List[List[str]]:
@@ -626,42 +643,36 @@ The transmit station was inspected by MIRC officer {self.inspection.inspector.ge
     
     def _generate_auto_conclusions(self) -> str:
         """Generate automatic conclusions based on violations"""
-        violations = self.report.violations_found
+        violation_types = ReportViolationService.types_for(self.report)
         
-        if not violations:
+        if not violation_types:
             return "The station is operating in compliance with the authorized parameters."
         
-        # Check for ERP violations
-        erp_violations = [v for v in violations if 'ERP' in v.get('type', '')]
-        type_approval_violations = [v for v in violations if 'type approval' in v.get('type', '')]
-        
         conclusions = []
         
-        if erp_violations:
+        if 'ERP_VIOLATION' in violation_types:
             conclusions.append("The licensee is operating above the maximum authorized ERP limit.")
         
-        if type_approval_violations:
+        if 'TYPE_APPROVAL_VIOLATION' in violation_types:
             conclusions.append("The licensee is operating non-type approved transmitters.")
         
         return " ".join(conclusions)
     
     def _generate_auto_recommendations(self) -> str:
         """Generate automatic recommendations based on violations"""
-        violations = self.report.violations_found
+        violation_types = ReportViolationService.types_for(self.report)
         
-        if not violations:
+        if not violation_types:
             return "Continue operating within authorized parameters and maintain equipment in good condition."
         
         recommendations = []
         
         # Check for ERP violations
-        erp_violations = [v for v in violations if 'ERP' in v.get('type', '')]
-        if erp_violations:
+        if 'ERP_VIOLATION' in violation_types:
             recommendations.append("The licensee to be issued with a notice of violation for exceeding authorized ERP limit.")
         
         # Check for type approval violations
-        type_approval_violations = [v for v in violations if 'type approval' in v.get('type', '')]
-        if type_approval_violations:
+        if 'TYPE_APPROVAL_VIOLATION' in violation_types:
             recommendations.append("The licensee to be issued with a notice of violation for operating non-type approved transmitters.")
         
         return " ".join(recommendations)
@@ -739,40 +750,40 @@ class ViolationDetectionService:
         except (ValueError, TypeError):
             pass
         
+        # Multi-channel sites: one vectorized pass over all channels
+        for row in ChannelERPService.compute(self.inspection.channels.all()):
+            if row['is_compliant'] is False:
+                channel = row['channel']
+                violations.append({
+                    'type': 'ERP_VIOLATION',
+                    'severity': 'major',
+                    'description': f"{channel.channel_number}: operating above authorized ERP limit by {row['excess_kw']} kW",
+                    'channel': channel.channel_number,
+                    'measured_value': row['erp_kw'],
+                    'authorized_value': row['authorized_kw'],
+                    'excess': row['excess_kw']
+                })
+        
         return violations
     
     def _check_type_approval_violations(self) -> List[Dict[str, Any]]:
-        """Check for type approval violations"""
+        """Check for type approval violations against the type-approval register"""
         violations = []
+        statuses = TypeApprovalRegistry.statuses()
         
-        # List of known non-approved equipment (this would be from a database)
-        non_approved_equipment = [
-            'MAXIVA GATEAIR XTE',
-            'NEC HPB-1210',
-            # Add more as needed
-        ]
-        
-        # Check exciter
-        exciter_model = f"{self.inspection.exciter_manufacturer or ''} {self.inspection.exciter_model_number or ''}".strip()
-        if exciter_model in non_approved_equipment:
-            violations.append({
-                'type': 'TYPE_APPROVAL_VIOLATION',
-                'severity': 'major',
-                'description': f"Operating non-type approved exciter: {exciter_model}",
-                'equipment_type': 'exciter',
-                'equipment_model': exciter_model
-            })
-        
-        # Check amplifier
-        amplifier_model = f"{self.inspection.amplifier_manufacturer or ''} {self.inspection.amplifier_model_number or ''}".strip()
-        if amplifier_model in non_approved_equipment:
-            violations.append({
-                'type': 'TYPE_APPROVAL_VIOLATION',
-                'severity': 'major',
-                'description': f"Operating non-type approved amplifier: {amplifier_model}",
-                'equipment_type': 'amplifier',
-                'equipment_model': amplifier_model
-            })
+        for equipment_type in ('exciter', 'amplifier'):
+            manufacturer = getattr(self.inspection, f'{equipment_type}_manufacturer')
+            model_number = getattr(self.inspection, f'{equipment_type}_model_number')
+            
+            if TypeApprovalRegistry.is_non_approved(manufacturer, model_number, statuses):
+                equipment_model = f"{manufacturer or ''} {model_number or ''}".strip()
+                violations.append({
+                    'type': 'TYPE_APPROVAL_VIOLATION',
+                    'severity': 'major',
+                    'description': f"Operating non-type approved {equipment_type}: {equipment_model}",
+                    'equipment_type': equipment_type,
+                    'equipment_model': equipment_model
+                })
         
         return violations
     
@@ -808,4 +819,619 @@ class ViolationDetectionService:
                 'safety_category': 'aviation_warning'
             })
         
-        return violations
\ No newline at end of file
+        return violations
+
+
+class ReportViolationService:
+    """Writes violations to the ReportViolation table and keeps violations_found as its projection"""
+
+    @staticmethod
+    def compliance_status_for(violations) -> str:
+        if not violations:
+            return 'compliant'
+        if any(v.get('severity') == 'major' for v in violations):
+            return 'major_violations'
+        return 'minor_violations'
+
+    @staticmethod
+    def _as_float(value) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def build_row(cls, report, order: int, violation: Dict[str, Any]) -> ReportViolation:
+        return ReportViolation(
+            report=report,
+            violation_type=str(violation.get('type') or 'UNKNOWN')[:50],
+            severity=str(violation.get('severity') or 'minor')[:10],
+            category=str(violation.get('safety_category') or violation.get('equipment_type') or '')[:50],
+            description=violation.get('description') or '',
+            channel=str(violation.get('channel') or '')[:50],
+            measured_value=cls._as_float(violation.get('measured_value')),
+            authorized_value=cls._as_float(violation.get('authorized_value')),
+            details=violation,
+            order=order,
+        )
+
+    @classmethod
+    def store(cls, report: InspectionReport, violations: List[Dict[str, Any]], save: bool = True) -> InspectionReport:
+        """Replace a report's violations and refresh the JSON projection and compliance status"""
+        violations = [v for v in violations or [] if isinstance(v, dict)]
+        with transaction.atomic():
+            report.violations_found = violations
+            report.compliance_status = cls.compliance_status_for(violations)
+            if save:
+                report.save()
+            cls.write_rows(report, violations)
+        return report
+
+    @classmethod
+    def write_rows(cls, report: InspectionReport, violations: List[Dict[str, Any]]):
+        """Bulk replace the indexed rows for a report"""
+        with transaction.atomic():
+            ReportViolation.objects.filter(report=report).delete()
+            ReportViolation.objects.bulk_create([
+                cls.build_row(report, order, violation)
+                for order, violation in enumerate(violations or [])
+                if isinstance(violation, dict)
+            ])
+
+    @staticmethod
+    def summary_rows():
+        """Just the columns summary needs, for Prefetch('violations', summary_rows(), to_attr=...)"""
+        return ReportViolation.objects.only('id', 'report_id', 'violation_type', 'severity').order_by()
+
+    @classmethod
+    def summary(cls, report: InspectionReport) -> Dict[str, Any]:
+        """Totals by severity and the distinct types, from one grouped query or rows prefetched as violation_rows"""
+        rows = getattr(report, 'violation_rows', None)
+        if rows is not None:
+            counts = Counter((row.violation_type, row.severity) for row in rows)
+            return cls._summarize(
+                {'violation_type': violation_type, 'severity': severity, 'count': count}
+                for (violation_type, severity), count in sorted(counts.items())
+            )
+        return cls._summarize(ReportViolation.objects.filter(report=report).values(
+            'violation_type', 'severity'
+        ).annotate(count=Count('id')).order_by('violation_type'))
+
+    @staticmethod
+    def _summarize(grouped) -> Dict[str, Any]:
+        summary = {'total': 0, 'major': 0, 'minor': 0, 'types': []}
+        for row in grouped:
+            summary['total'] += row['count']
+            if row['severity'] in ('major', 'minor'):
+                summary[row['severity']] += row['count']
+            if row['violation_type'] not in summary['types']:
+                summary['types'].append(row['violation_type'])
+        return summary
+
+    @staticmethod
+    def types_for(report: InspectionReport) -> set:
+        return set(
+            ReportViolation.objects.filter(report=report).values_list('violation_type', flat=True).distinct()
+        )
+
+class ReportImageSummaryService:
+    """A report's images fetched in one query and grouped by category in Python"""
+
+    @staticmethod
+    def by_type(report: InspectionReport) -> Dict[str, List[Dict[str, Any]]]:
+        """{image_type: [image rows]} for every category in IMAGE_TYPES order, empty ones included"""
+        grouped = {image_type: [] for image_type, _ in ReportImage.IMAGE_TYPES}
+        rows = ReportImage.objects.filter(report=report).values(
+            'id', 'image', 'caption', 'image_type', 'blob_id', uploaded_at=F('created_at')
+        )
+        for row in ThumbnailCache.add_urls(rows):
+            grouped.setdefault(row['image_type'], []).append(row)
+        return grouped
+
+    @classmethod
+    def status(cls, report: InspectionReport, image_types) -> Dict[str, Dict[str, Any]]:
+        """{image_type: {'count', 'images'}} for the requested categories"""
+        grouped = cls.by_type(report)
+        return {
+            image_type: {
+                'count': len(grouped.get(image_type, [])),
+                'images': [
+                    {key: value for key, value in row.items() if key != 'image_type'}
+                    for row in grouped.get(image_type, [])
+                ],
+            }
+            for image_type in image_types
+        }
+
+    @classmethod
+    def by_category(cls, report: InspectionReport) -> Dict[str, List[Dict[str, Any]]]:
+        """Only the categories that have images"""
+        return {image_type: images for image_type, images in cls.by_type(report).items() if images}
+
+class NearDuplicateService:
+    """Report images that are near-duplicates by perceptual hash, within the report and across the site's history"""
+
+    @staticmethod
+    def _groups(rows: List[Dict[str, Any]], index: HammingIndex, max_distance: int) -> List[List[int]]:
+        """Positions of rows linked by any chain of matches, each group in document order"""
+        parent = list(range(len(rows)))
+
+        def root(position):
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+
+        for position, row in enumerate(rows):
+            for other, _ in index.search(row['dhash'], max_distance):
+                first, second = root(position), root(other)
+                if first != second:
+                    parent[max(first, second)] = min(first, second)
+        members = defaultdict(list)
+        for position in range(len(rows)):
+            members[root(position)].append(position)
+        return [group for group in members.values() if len(group) > 1]
+
+    @staticmethod
+    def _image(row: Dict[str, Any], **extra) -> Dict[str, Any]:
+        return {
+            'id': row['id'],
+            'caption': row['caption'],
+            'image_type': row['image_type'],
+            'thumbnail_url': ThumbnailCache.url(row['blob_id']),
+            **extra,
+        }
+
+    @classmethod
+    def find(cls, report: InspectionReport, max_distance: Optional[int] = None,
+             include_history: bool = True) -> Dict[str, Any]:
+        """Candidates to drop before generating the report; two queries whatever the image count
+
+        In each group the first image in document order is kept and the
+        others are listed with their distance to it. Images from other
+        reports of the same transmitting site are matched as well, so a
+        photo reused from last year's inspection is flagged.
+        """
+        max_distance = near_duplicate_distance() if max_distance is None else max_distance
+        rows = list(ReportImage.objects.filter(report=report).values(
+            'id', 'caption', 'image_type', 'dhash', 'blob_id', size=F('blob__size')
+        ))
+        hashed = [row for row in rows if row['dhash'] is not None]
+        index = HammingIndex(enumerate(row['dhash'] for row in hashed))
+
+        groups = []
+        redundant_bytes = 0
+        for positions in cls._groups(hashed, index, max_distance):
+            kept, *others = [hashed[position] for position in positions]
+            duplicates = []
+            for row in others:
+                duplicates.append(cls._image(row, distance=hamming(kept['dhash'], row['dhash'])))
+                # Byte-identical files already share one blob
+                if row['blob_id'] != kept['blob_id']:
+                    redundant_bytes += row['size'] or 0
+            groups.append({'keep': cls._image(kept), 'duplicates': duplicates})
+
+        history = []
+        site_name = (report.inspection.transmitting_site_name or '').strip()
+        if include_history and site_name and hashed:
+            earlier = ReportImage.objects.filter(
+                report__inspection__transmitting_site_name__iexact=site_name, dhash__isnull=False
+            ).exclude(report=report).values(
+                'id', 'caption', 'image_type', 'dhash', 'blob_id', 'report_id',
+                reference_number=F('report__reference_number'),
+                inspection_date=F('report__inspection__inspection_date'),
+            )
+            earlier = {row['id']: row for row in earlier}
+            earlier_index = HammingIndex((pk, row['dhash']) for pk, row in earlier.items())
+            for row in hashed:
+                matches = [
+                    cls._image(earlier[pk], distance=distance, report_id=earlier[pk]['report_id'],
+                               reference_number=earlier[pk]['reference_number'],
+                               inspection_date=earlier[pk]['inspection_date'])
+                    for pk, distance in earlier_index.search(row['dhash'], max_distance)
+                ]
+                if matches:
+                    history.append({'image': cls._image(row), 'matches': matches})
+
+        return {
+            'max_distance': max_distance,
+            'hashed_images': len(hashed),
+            'unhashed_images': len(rows) - len(hashed),
+            'groups': groups,
+            'redundant_images': sum(len(group['duplicates']) for group in groups),
+            'redundant_bytes': redundant_bytes,
+            'site_history': history,
+        }
+
+class PhotoEvidenceService:
+    """Photos whose EXIF puts them away from the inspected site or on another day"""
+
+    @staticmethod
+    def check(report: InspectionReport) -> Dict[str, Any]:
+        """Per-image findings from stored EXIF, one query for the images
+
+        Flags: 'far_from_site' beyond PHOTO_MAX_SITE_DISTANCE_M of the
+        inspection's coordinates, 'different_date' more than
+        PHOTO_DATE_TOLERANCE_DAYS from inspection_date, and 'no_location'
+        / 'no_capture_time' when EXIF lacks them. Images not read yet are
+        counted as pending rather than flagged.
+        """
+        config = photo_check_settings()
+        inspection = report.inspection
+        site = site_position(inspection)
+        rows = ReportImage.objects.filter(report=report).values(
+            'id', 'caption', 'image_type', 'blob_id', 'captured_at', 'gps_latitude', 'gps_longitude', 'exif_extracted'
+        )
+        images = []
+        pending = 0
+        counts = Counter()
+        for row in rows:
+            if not row.pop('exif_extracted'):
+                pending += 1
+                continue
+            flags = []
+            distance = None
+            if row['gps_latitude'] is None or row['gps_longitude'] is None:
+                flags.append('no_location')
+            elif site is not None:
+                distance = round(distance_m(site, (row['gps_latitude'], row['gps_longitude'])))
+                if distance > config['max_distance_m']:
+                    flags.append('far_from_site')
+            if row['captured_at'] is None:
+                flags.append('no_capture_time')
+            elif abs((timezone.localdate(row['captured_at']) - inspection.inspection_date).days) \
+                    > config['date_tolerance_days']:
+                flags.append('different_date')
+            counts.update(flags)
+            row['thumbnail_url'] = ThumbnailCache.url(row.pop('blob_id'))
+            images.append({**row, 'distance_m': distance, 'flags': flags})
+        return {
+            'site_position': {'latitude': site[0], 'longitude': site[1]} if site else None,
+            'inspection_date': inspection.inspection_date,
+            'max_distance_m': config['max_distance_m'],
+            'date_tolerance_days': config['date_tolerance_days'],
+            'checked_images': len(images),
+            'pending_images': pending,
+            'flag_counts': dict(counts),
+            'flagged': [image for image in images if image['flags']],
+        }
+
+class ReportImageUploadService:
+    """Validates a batch of uploaded images, writes the files in parallel and inserts the rows in bulk"""
+
+    VALID_TYPES = {choice for choice, _ in ReportImage.IMAGE_TYPES}
+    # HEIC/HEIF originals are kept and transcoded in the background (transcoding.py)
+    ALLOWED_CONTENT_TYPES = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif'] + TRANSCODE_TYPES
+    ALLOWED_FORMATS = 'JPEG, PNG, GIF' + (' and HEIC' if TRANSCODE_TYPES else '')
+    MAX_FILE_SIZE = MAX_IMAGE_UPLOAD_SIZE
+
+    @staticmethod
+    def _form_value(data, name: str, index: int, default: str) -> str:
+        """Metadata for the index-th file under a form key; a single value applies to all of them"""
+        values = data.getlist(name) if hasattr(data, 'getlist') else ([data[name]] if name in data else [])
+        if not values:
+            return default
+        return values[index] if index < len(values) else values[-1]
+
+    @classmethod
+    def entries(cls, files, data) -> List[Dict[str, Any]]:
+        """One entry per uploaded file in form order, including several files sent under one key"""
+        entries = []
+        for key, key_files in files.lists():
+            for index, file in enumerate(key_files):
+                entries.append({
+                    'field': key,
+                    'file': file,
+                    'filename': file.name,
+                    'image_type': cls._form_value(data, f'{key}_type', index, 'other_equipment'),
+                    'caption': cls._form_value(data, f'{key}_caption', index, file.name.split('.')[0]),
+                    'position': cls._form_value(data, f'{key}_position', index, 'equipment_section'),
+                })
+        return entries
+
+    @classmethod
+    def validation_error(cls, entry: Dict[str, Any]) -> Optional[str]:
+        file = entry['file']
+        if entry['image_type'] not in cls.VALID_TYPES:
+            return f'Invalid image type: {entry["image_type"]}'
+        if file.size > cls.MAX_FILE_SIZE:
+            return 'File size exceeds 10MB limit'
+        if getattr(file, 'content_type', None) and file.content_type not in cls.ALLOWED_CONTENT_TYPES:
+            return f'Invalid file type. Only {cls.ALLOWED_FORMATS} are allowed'
+        # The declared type is the client's word; the sniffed one is what gets stored
+        if entry.get('mime_type') and entry['mime_type'] not in cls.ALLOWED_CONTENT_TYPES:
+            return f'Invalid file contents (detected {entry["mime_type"]}). Only {cls.ALLOWED_FORMATS} are allowed'
+        return None
+
+    @staticmethod
+    def next_orders(report: InspectionReport, image_types) -> Dict[str, int]:
+        """Highest order_in_section per category, from one grouped query"""
+        orders = {image_type: 0 for image_type in image_types}
+        orders.update(
+            ReportImage.objects.filter(report=report, image_type__in=list(orders)).order_by().values_list(
+                'image_type'
+            ).annotate(highest=Max('order_in_section'))
+        )
+        return {image_type: highest or 0 for image_type, highest in orders.items()}
+
+    @staticmethod
+    def store_files(images: List[ReportImage], files: List[Any]) -> List[Optional[Exception]]:
+        """Write each file to blob storage on a thread pool; returns the error per image, None when stored
+
+        Images need sha256 and mime_type set. Contents already stored are
+        not written again, so re-uploads cost one existence check. The
+        perceptual hash and EXIF are read here too, on the same threads;
+        HEIC gets its hash when transcoded.
+        """
+        def store(image, file):
+            try:
+                if image.dhash is None and image.mime_type not in TRANSCODE_TYPES:
+                    image.dhash = dhash_file(file)
+                if not image.exif_extracted:
+                    for field, value in read_file_metadata(file).items():
+                        setattr(image, field, value)
+                image.image.name, _ = ImageBlobStore.write(image.sha256, image.mime_type, file)
+                image.blob_id = image.sha256
+                return None
+            except Exception as e:
+                return e
+
+        workers = getattr(settings, 'REPORT_SETTINGS', {}).get('UPLOAD_WORKERS', 4)
+        if workers <= 1 or len(images) <= 1:
+            return [store(image, file) for image, file in zip(images, files)]
+        with ThreadPoolExecutor(max_workers=min(workers, len(images))) as pool:
+            return list(pool.map(store, images, files))
+
+    @classmethod
+    def upload(cls, report: InspectionReport, user, files, data, rejected=()) -> List[Dict[str, Any]]:
+        """Per-file results in form order: the entry plus either 'image' or 'error'
+
+        `rejected` are the files ImageUploadHandler skipped while parsing;
+        they are reported after the parsed ones.
+        """
+        results = cls.entries(files, data)
+        valid = []
+        for entry in results:
+            if entry['file'].size <= cls.MAX_FILE_SIZE:
+                entry['sha256'], entry['mime_type'] = fingerprint(entry['file'])
+            error = cls.validation_error(entry)
+            if error:
+                entry['error'] = error
+            else:
+                valid.append(entry)
+
+        orders = cls.next_orders(report, {entry['image_type'] for entry in valid})
+        for entry in valid:
+            orders[entry['image_type']] += 1
+            entry['image'] = ReportImage(
+                report=report,
+                image_type=entry['image_type'],
+                caption=entry['caption'],
+                position_in_report=entry['position'],
+                order_in_section=orders[entry['image_type']],
+                uploaded_by=user,
+                sha256=entry['sha256'],
+                mime_type=entry['mime_type'],
+            )
+
+        errors = cls.store_files([entry['image'] for entry in valid], [entry['file'] for entry in valid])
+        stored = []
+        for entry, error in zip(valid, errors):
+            if error is None:
+                stored.append(entry)
+            else:
+                logger.warning("Storing %s for report %s failed: %s", entry['file'].name, report.pk, error)
+                entry['error'] = str(error)
+                del entry['image']
+
+        try:
+            with transaction.atomic():
+                ImageBlobStore.link(
+                    (entry['sha256'], entry['image'].image.name, entry['file'].size, entry['mime_type'])
+                    for entry in stored
+                )
+                ReportImage.objects.bulk_create([entry['image'] for entry in stored])
+        except Exception as e:
+            # No rows were written; do not leave newly stored files behind
+            logger.exception("Inserting %d images for report %s failed", len(stored), report.pk)
+            ImageBlobStore.discard_unreferenced(entry['image'].image.name for entry in stored)
+            for entry in stored:
+                entry['error'] = str(e)
+                del entry['image']
+        results.extend(dict(entry) for entry in rejected)
+        return results
+
+# (broadcaster_id, station_type, month, compliance_status, violation_type) -> [reports, violations]
+SummaryKey = Tuple[Optional[int], str, Any, str, str]
+
+class ComplianceDashboardService:
+    """Maintains the materialized ComplianceSummary table and reads the dashboard from it"""
+
+    INSPECTION_DIM_FIELDS = ['broadcaster_id', 'station_type', 'inspection_date']
+
+    # ---------- contributions ----------
+
+    @staticmethod
+    def month_of(value):
+        """First day of the month for a date (or ISO date string assigned but not yet reloaded); None if invalid"""
+        if isinstance(value, str):
+            try:
+                value = parse_date(value[:10])
+            except ValueError:
+                # Well formed but impossible, e.g. 2026-13-01
+                return None
+        return value.replace(day=1) if value else None
+
+    @staticmethod
+    def summary_dims(broadcaster_id, station_type, inspection_date) -> Tuple[Optional[int], str, Any]:
+        return (broadcaster_id, station_type or '', ComplianceDashboardService.month_of(inspection_date))
+
+    @staticmethod
+    def violation_counts(violations) -> Counter:
+        """Violation type -> number of violations in a report's violations_found"""
+        counts = Counter()
+        for violation in violations or []:
+            vtype = violation.get('type') if isinstance(violation, dict) else None
+            counts[str(vtype or 'UNKNOWN')[:50]] += 1
+        return counts
+
+    @staticmethod
+    def inspection_dims(inspection_ids) -> Dict[int, Tuple[Optional[int], str, Any]]:
+        """Inspection id -> (broadcaster_id, station_type, month) in one query"""
+        rows = Inspection.objects.filter(pk__in=[pk for pk in inspection_ids if pk]).values_list(
+            'pk', *ComplianceDashboardService.INSPECTION_DIM_FIELDS
+        )
+        return {pk: ComplianceDashboardService.summary_dims(*dims) for pk, *dims in rows}
+
+    @staticmethod
+    def contribution(dims, compliance_status, counts: Counter) -> Dict[SummaryKey, List[int]]:
+        """Summary rows a single report adds to"""
+        if dims is None:
+            return {}
+        base = tuple(dims) + (compliance_status or '',)
+        rows = {base + ('',): [1, 0]}
+        for vtype, count in counts.items():
+            rows[base + (vtype,)] = [1, count]
+        return rows
+
+    # ---------- incremental maintenance ----------
+
+    @classmethod
+    def apply(cls, before: Dict[SummaryKey, List[int]], after: Dict[SummaryKey, List[int]]):
+        """Apply the difference between two contributions to the summary table"""
+        deltas = {}
+        for key in set(before) | set(after):
+            old = before.get(key, [0, 0])
+            new = after.get(key, [0, 0])
+            delta = (new[0] - old[0], new[1] - old[1])
+            if delta != (0, 0):
+                deltas[key] = delta
+        if not deltas:
+            return
+
+        emptied = Q()
+        with transaction.atomic():
+            for key, (reports, violations) in deltas.items():
+                lookup = cls._lookup(key)
+                updated = ComplianceSummary.objects.filter(**lookup).update(
+                    report_count=F('report_count') + reports,
+                    violation_count=F('violation_count') + violations
+                )
+                if not updated and reports > 0:
+                    try:
+                        with transaction.atomic():
+                            ComplianceSummary.objects.create(
+                                report_count=reports, violation_count=max(violations, 0), **lookup
+                            )
+                    except IntegrityError:
+                        # Created concurrently; fold our delta into that row
+                        ComplianceSummary.objects.filter(**lookup).update(
+                            report_count=F('report_count') + reports,
+                            violation_count=F('violation_count') + violations
+                        )
+                elif reports < 0:
+                    emptied |= Q(**lookup)
+
+            if emptied:
+                ComplianceSummary.objects.filter(emptied, report_count=0).delete()
+
+    @staticmethod
+    def _lookup(key: SummaryKey) -> Dict[str, Any]:
+        broadcaster_id, station_type, month, compliance_status, violation_type = key
+        return {
+            'broadcaster_id': broadcaster_id,
+            'station_type': station_type,
+            'month': month,
+            'compliance_status': compliance_status,
+            'violation_type': violation_type,
+        }
+
+    @classmethod
+    def rebuild(cls, batch_size: int = 1000) -> int:
+        """Recompute the whole summary from the reports table; returns the row count"""
+        totals: Dict[SummaryKey, List[int]] = {}
+        reports = InspectionReport.objects.values_list(
+            'inspection__broadcaster_id', 'inspection__station_type', 'inspection__inspection_date',
+            'compliance_status', 'violations_found'
+        ).order_by().iterator(chunk_size=batch_size)
+
+        for broadcaster_id, station_type, inspection_date, compliance_status, violations in reports:
+            dims = cls.summary_dims(broadcaster_id, station_type, inspection_date)
+            for key, (report_count, violation_count) in cls.contribution(
+                dims, compliance_status, cls.violation_counts(violations)
+            ).items():
+                row = totals.setdefault(key, [0, 0])
+                row[0] += report_count
+                row[1] += violation_count
+
+        with transaction.atomic():
+            ComplianceSummary.objects.all().delete()
+            ComplianceSummary.objects.bulk_create(
+                [
+                    ComplianceSummary(report_count=report_count, violation_count=violation_count, **cls._lookup(key))
+                    for key, (report_count, violation_count) in totals.items()
+                ],
+                batch_size=batch_size
+            )
+        return len(totals)
+
+    # ---------- dashboard ----------
+
+    @staticmethod
+    def dashboard(broadcaster_id=None, station_type=None, month_from=None, month_to=None) -> Dict[str, Any]:
+        """Aggregate the summary rows; cost depends on the summary size, not on report volume"""
+        rows = ComplianceSummary.objects.all()
+        if broadcaster_id:
+            rows = rows.filter(broadcaster_id=broadcaster_id)
+        if station_type:
+            rows = rows.filter(station_type=station_type)
+        if month_from:
+            rows = rows.filter(month__gte=month_from)
+        if month_to:
+            rows = rows.filter(month__lte=month_to)
+
+        total_reports = 0
+        by_status = Counter()
+        by_violation_type: Dict[str, Dict[str, int]] = {}
+        by_month: Dict[str, Counter] = {}
+        by_broadcaster: Dict[Any, Dict[str, Any]] = {}
+
+        for (broadcaster_id_, broadcaster_name, month, compliance_status,
+             violation_type, report_count, violation_count) in rows.values_list(
+                'broadcaster_id', 'broadcaster__name', 'month', 'compliance_status',
+                'violation_type', 'report_count', 'violation_count'
+        ).order_by():
+            if violation_type:
+                entry = by_violation_type.setdefault(violation_type, {'reports': 0, 'violations': 0})
+                entry['reports'] += report_count
+                entry['violations'] += violation_count
+                continue
+
+            total_reports += report_count
+            by_status[compliance_status] += report_count
+            month_key = month.strftime('%Y-%m') if month else 'unknown'
+            by_month.setdefault(month_key, Counter())[compliance_status] += report_count
+            broadcaster = by_broadcaster.setdefault(broadcaster_id_, {
+                'broadcaster_id': broadcaster_id_,
+                'broadcaster_name': broadcaster_name or 'Unknown',
+                'total_reports': 0,
+                'by_status': Counter(),
+            })
+            broadcaster['total_reports'] += report_count
+            broadcaster['by_status'][compliance_status] += report_count
+
+        compliant = by_status.get('compliant', 0)
+        return {
+            'total_reports': total_reports,
+            'compliance_rate': round(compliant / total_reports * 100, 1) if total_reports else None,
+            'by_status': dict(by_status),
+            'by_violation_type': by_violation_type,
+            'by_month': [
+                {'month': month_key, 'total_reports': sum(counts.values()), 'by_status': dict(counts)}
+                for month_key, counts in sorted(by_month.items())
+            ],
+            'by_broadcaster': sorted(
+                ({**entry, 'by_status': dict(entry['by_status'])} for entry in by_broadcaster.values()),
+                key=lambda entry: -entry['total_reports']
+            ),
+        }
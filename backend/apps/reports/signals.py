@@ -1,15 +1,18 @@
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from .models import Report, ReportImage
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 @receiver(post_save, sender=Report)
 def report_post_save(sender, instance, created, **kwargs):
     """Handle report post-save actions"""
     if created:
         # Log report creation
-        print(f"New report created: {instance.reference_number}")
+        logger.debug("New report created: %s", instance.reference_number)
         
         # Auto-populate subject if empty
         if not instance.subject and instance.inspection:
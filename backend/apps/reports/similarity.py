@@ -0,0 +1,92 @@
+# apps/reports/similarity.py
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+MASK = (1 << HASH_BITS) - 1
+
+# Hashes split into BANDS bands: two hashes within BANDS - 1 bits of each other share at least one band
+BANDS = 8
+BAND_BITS = HASH_BITS // BANDS
+
+def near_duplicate_distance() -> int:
+    return getattr(settings, 'REPORT_SETTINGS', {}).get('NEAR_DUPLICATE_DISTANCE', 6)
+
+def dhash_image(image: Image.Image) -> int:
+    """64-bit difference hash, stored signed to fit a BigIntegerField
+
+    One bit per horizontally adjacent pair in a 9x8 greyscale copy: set
+    where the left pixel is brighter. Survives rescaling, recompression
+    and small exposure changes, which is what separates burst shots.
+    """
+    # JPEG decoders scale down while decoding; a full decode is wasted on 72 pixels
+    image.draft('L', (72, 64))
+    grey = ImageOps.exif_transpose(image).convert('L').resize((9, 8), Image.LANCZOS)
+    pixels = list(grey.getdata())
+    value = 0
+    for row in range(8):
+        for column in range(8):
+            value = (value << 1) | (pixels[row * 9 + column] > pixels[row * 9 + column + 1])
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+def dhash_file(file) -> Optional[int]:
+    """dhash of an uploaded or stored file, None when Pillow cannot decode it"""
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            return dhash_image(image)
+    except Exception as e:
+        logger.warning("Could not hash image %s: %s", getattr(file, 'name', file), e)
+        return None
+    finally:
+        file.seek(0)
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & MASK).count('1')
+
+class HammingIndex:
+    """Hashes searchable by Hamming distance, indexed by exact band values
+
+    A search within fewer than BANDS bits only compares hashes that share
+    a band with the query (multi-index hashing); wider searches scan all.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Hashable, int]] = ()):
+        self._hashes: Dict[Hashable, int] = {}
+        self._bands = [defaultdict(set) for _ in range(BANDS)]
+        for key, value in entries:
+            self.add(key, value)
+
+    def __len__(self):
+        return len(self._hashes)
+
+    @staticmethod
+    def _band_values(value: int) -> List[int]:
+        unsigned = value & MASK
+        return [(unsigned >> (band * BAND_BITS)) & ((1 << BAND_BITS) - 1) for band in range(BANDS)]
+
+    def add(self, key: Hashable, value: int):
+        self._hashes[key] = value
+        for band, band_value in enumerate(self._band_values(value)):
+            self._bands[band][band_value].add(key)
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[Any, int]]:
+        """(key, distance) of every hash within max_distance bits, nearest first"""
+        if max_distance >= BANDS:
+            candidates = self._hashes.keys()
+        else:
+            candidates = set()
+            for band, band_value in enumerate(self._band_values(value)):
+                candidates |= self._bands[band].get(band_value, set())
+        matches = []
+        for key in candidates:
+            distance = hamming(value, self._hashes[key])
+            if distance <= max_distance:
+                matches.append((key, distance))
+        return sorted(matches, key=lambda match: match[1])
@@ -0,0 +1,252 @@
+# apps/reports/template_engine.py
+import copy
+import logging
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from django.core.cache import cache
+from django.template import Context, Template, TemplateSyntaxError
+from docx.document import Document as DocxDocument
+from docx.shared import Pt
+
+from . import docx_templates
+from .docx_templates import ReportTemplateLibrary
+from .models import ReportImage, ReportTemplate
+
+logger = logging.getLogger(__name__)
+
+# Section kinds ProfessionalDocumentGenerator can build
+SECTION_KINDS = {
+    'header', 'findings_heading', 'site', 'tower', 'transmitter', 'antenna', 'filter', 'stl',
+    'erp', 'observations', 'conclusions', 'recommendations', 'signature', 'text',
+}
+
+# Layout used when a report type has no active ReportTemplate row; also seeded by migration 0005
+DEFAULT_SECTIONS = [
+    {'kind': 'header'},
+    {'kind': 'findings_heading'},
+    {'kind': 'site', 'heading': 'A. SITE', 'images': 'site_overview'},
+    {'kind': 'tower', 'heading': 'B. MAST', 'images': 'tower_mast'},
+    {'kind': 'transmitter', 'heading': 'C. TRANSMITTER', 'images': 'transmitter_equipment'},
+    {'kind': 'antenna', 'heading': 'D. ANTENNA SYSTEM', 'images': 'antenna'},
+    {'kind': 'filter', 'heading': 'E. FILTER', 'images': 'filter_equipment', 'optional': True},
+    {'kind': 'stl', 'heading': 'F. STUDIO TO TRANSMITTER LINK', 'images': 'studio_transmitter_link', 'optional': True},
+    {'kind': 'erp', 'heading': 'G. ERP CALCULATION'},
+    {'kind': 'observations', 'heading': 'H. OBSERVATION', 'optional': True},
+    {'kind': 'conclusions', 'heading': 'I. CONCLUSION'},
+    {'kind': 'recommendations', 'heading': 'J. RECOMMENDATION'},
+    {'kind': 'signature'},
+]
+
+# Descriptive section names get_report_templates lists, as before layouts were configurable
+SECTION_TITLES = {
+    'site': 'Site Information',
+    'tower': 'Tower/Mast Details',
+    'transmitter': 'Transmitter Equipment',
+    'antenna': 'Antenna System',
+    'filter': 'Filter',
+    'stl': 'Studio to Transmitter Link',
+    'erp': 'ERP Information',
+    'observations': 'Observations',
+    'conclusions': 'Conclusions',
+    'recommendations': 'Recommendations',
+}
+SECTION_TITLES_BY_TYPE = {
+    'tv_broadcast': {
+        'transmitter': 'Multi-Channel Transmitters',
+        'antenna': 'Antenna Systems',
+        'erp': 'ERP Information (Multiple Channels)',
+    },
+}
+
+# ReportTemplate text fields compiled as Django templates
+TEXT_FIELDS = (
+    'header_template', 'findings_template', 'calculations_template',
+    'conclusions_template', 'recommendations_template',
+)
+
+IMAGE_TYPES = {choice for choice, _ in ReportImage.IMAGE_TYPES}
+
+class TemplateStructureError(ValueError):
+    pass
+
+class PlanStep:
+    """One section of a compiled plan"""
+
+    __slots__ = ('kind', 'heading', 'images', 'optional', 'template')
+
+    def __init__(self, kind: str, heading: str = '', images: Optional[str] = None,
+                 optional: bool = False, template: Optional[Template] = None):
+        self.kind = kind
+        self.heading = heading
+        self.images = images
+        self.optional = optional
+        self.template = template
+
+    def __str__(self):
+        return self.kind
+
+def compile_text(source: str, label: str) -> Template:
+    try:
+        return Template(source)
+    except TemplateSyntaxError as e:
+        raise TemplateStructureError(f'{label}: {e}')
+
+def compile_sections(structure: Any) -> List[PlanStep]:
+    """Validate template_structure ({"sections": [...]} or a bare list) into plan steps"""
+    sections = structure.get('sections') if isinstance(structure, dict) else structure
+    if not sections:
+        return compile_sections(DEFAULT_SECTIONS)
+    if not isinstance(sections, list):
+        raise TemplateStructureError('template_structure sections must be a list')
+
+    steps = []
+    for position, section in enumerate(sections, 1):
+        if isinstance(section, str):
+            section = {'kind': section}
+        if not isinstance(section, dict):
+            raise TemplateStructureError(f'Section {position} must be an object or a section kind')
+        kind = section.get('kind')
+        if kind not in SECTION_KINDS:
+            raise TemplateStructureError(f'Section {position}: unknown kind {kind!r}')
+        images = section.get('images')
+        if images is not None and images not in IMAGE_TYPES:
+            raise TemplateStructureError(f'Section {position}: unknown image type {images!r}')
+        template = None
+        if kind == 'text':
+            template = compile_text(section.get('template', ''), f'Section {position} template')
+        steps.append(PlanStep(
+            kind, heading=section.get('heading', ''), images=images,
+            optional=bool(section.get('optional')), template=template,
+        ))
+    return steps
+
+class CompiledReportTemplate:
+    """An executable section plan with its text templates parsed and its styled skeleton built"""
+
+    def __init__(self, report_type: str, structure: Any = None, texts: Optional[Dict[str, str]] = None,
+                 page_margins: Optional[Dict[str, Any]] = None, font_settings: Optional[Dict[str, Any]] = None,
+                 template_id: Optional[int] = None, name: str = '', description: str = ''):
+        self.report_type = report_type
+        self.template_id = template_id
+        self.name = name
+        self.description = description
+        self.page_margins = page_margins or {}
+        self.font_settings = font_settings or {}
+        self.steps = compile_sections(structure)
+        self.texts = {
+            field: compile_text(source, field)
+            for field, source in (texts or {}).items() if source and source.strip()
+        }
+        self.skeleton = self._build_skeleton()
+        self.style_ids = ReportTemplateLibrary.style_ids(report_type)
+
+    @classmethod
+    def from_model(cls, template: ReportTemplate) -> 'CompiledReportTemplate':
+        structure = template.template_structure
+        return cls(
+            template.report_type, structure,
+            texts={field: getattr(template, field) for field in TEXT_FIELDS},
+            page_margins=template.page_margins,
+            font_settings=template.font_settings,
+            template_id=template.pk,
+            name=template.name,
+            description=structure.get('description', '') if isinstance(structure, dict) else '',
+        )
+
+    def _build_skeleton(self) -> DocxDocument:
+        doc = ReportTemplateLibrary.new_document(self.report_type)
+        try:
+            self._apply_page_settings(doc)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise TemplateStructureError(f'page_margins/font_settings: {e}')
+        return doc
+
+    def _apply_page_settings(self, doc: DocxDocument):
+        # Margins are in points, as in the default_settings get_report_templates reports
+        for side in ('top', 'bottom', 'left', 'right'):
+            if self.page_margins.get(side) is not None:
+                for section in doc.sections:
+                    setattr(section, f'{side}_margin', Pt(float(self.page_margins[side])))
+
+        fonts = self.font_settings
+        normal = doc.styles['Normal'].font
+        if fonts.get('body_font'):
+            normal.name = fonts['body_font']
+        if fonts.get('body_size'):
+            normal.size = Pt(float(fonts['body_size']))
+        if fonts.get('heading_font'):
+            for name in (docx_templates.REFERENCE, docx_templates.SUBJECT,
+                         docx_templates.FINDINGS_HEADING, docx_templates.SECTION_HEADING):
+                doc.styles[name].font.name = fonts['heading_font']
+        if fonts.get('heading_size'):
+            doc.styles[docx_templates.SECTION_HEADING].font.size = Pt(float(fonts['heading_size']))
+
+    def new_document(self) -> DocxDocument:
+        return copy.deepcopy(self.skeleton)
+
+    def render(self, field: str, context: Dict[str, Any]) -> Optional[str]:
+        """Rendered text for a ReportTemplate text field, or None when the field is blank"""
+        template = self.texts.get(field)
+        return template.render(Context(context)) if template else None
+
+    def section_titles(self) -> List[str]:
+        """Descriptive names of the content sections, e.g. 'Site Information'; text sections by heading"""
+        titles = {**SECTION_TITLES, **SECTION_TITLES_BY_TYPE.get(self.report_type, {})}
+        return [
+            titles.get(step.kind) or step.heading
+            for step in self.steps if step.kind in titles or (step.kind == 'text' and step.heading)
+        ]
+
+    def headings(self) -> List[str]:
+        """Section headings as printed, e.g. 'A. SITE'"""
+        return [step.heading for step in self.steps if step.heading]
+
+class ReportTemplateRegistry:
+    """Compiled plans per report type, per process, recompiled when the cached version stamp changes"""
+
+    CACHE_VERSION_KEY = 'reports:report_template_version'
+
+    _lock = threading.Lock()
+    _plans: Dict[str, CompiledReportTemplate] = {}
+    _version: Optional[str] = None
+
+    @classmethod
+    def bump_version(cls):
+        """Invalidate every process's compiled plans"""
+        cache.set(cls.CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+    @classmethod
+    def plan_for(cls, report_type: str) -> CompiledReportTemplate:
+        """Plan for the newest active template of a report type; one cache read when already compiled"""
+        version = cache.get(cls.CACHE_VERSION_KEY)
+        if version is not None and version == cls._version:
+            plan = cls._plans.get(report_type)
+            if plan is not None:
+                return plan
+
+        with cls._lock:
+            if version is None:
+                version = uuid.uuid4().hex
+                cache.add(cls.CACHE_VERSION_KEY, version, None)
+                version = cache.get(cls.CACHE_VERSION_KEY, version)
+            if version != cls._version:
+                cls._plans = {}
+                cls._version = version
+            plan = cls._plans.get(report_type)
+            if plan is None:
+                template = ReportTemplate.objects.filter(
+                    report_type=report_type, is_active=True
+                ).order_by('-updated_at').first()
+                plan = None
+                if template is not None:
+                    try:
+                        plan = CompiledReportTemplate.from_model(template)
+                    except TemplateStructureError:
+                        # Rows saved outside ReportTemplate.clean(); keep generating with the default layout
+                        logger.exception("Report template %s does not compile, using the default layout", template.pk)
+                if plan is None:
+                    plan = CompiledReportTemplate(report_type)
+                cls._plans[report_type] = plan
+        return plan
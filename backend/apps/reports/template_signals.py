@@ -0,0 +1,17 @@
+# apps/reports/template_signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from .models import ReportTemplate
+from .template_engine import ReportTemplateRegistry
+
+def report_template_changed(sender, **kwargs):
+    """Stamp a new template version so every process recompiles its plans
+
+    After the commit, like TypeApprovalRegistry: a process reading before
+    then would otherwise compile the old row under the new stamp.
+    """
+    transaction.on_commit(ReportTemplateRegistry.bump_version)
+
+post_save.connect(report_template_changed, sender=ReportTemplate, dispatch_uid='reports_template_saved')
+post_delete.connect(report_template_changed, sender=ReportTemplate, dispatch_uid='reports_template_deleted')
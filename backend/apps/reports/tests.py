@@ -1,3 +1,912 @@
-from django.test import TestCase
+# apps/reports/tests.py
+import hashlib
+import os
+import random
+import shutil
+import tempfile
+from datetime import date
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.conf import settings
+from django.template import Context
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Inches, Pt
+from PIL import Image
+from rest_framework.test import APIClient
+
+from apps.broadcasters.models import Broadcaster
+from apps.inspections.models import Inspection
+from . import docx_templates
+from .benchmarks import synthetic_jpeg
+from .document_generator import ProfessionalDocumentGenerator
+from .docx_tables import add_table
+from .docx_templates import ReportTemplateLibrary
+from .models import ComplianceSummary, ImageBlob, ImageUploadSession, InspectionReport, ReportImage, ReportTemplate
+from .profiling import GenerationProfiler, profiled
+from .services import ComplianceDashboardService, PhotoEvidenceService, ReportImageSummaryService, ReportViolationService
+from .template_engine import DEFAULT_SECTIONS, ReportTemplateRegistry, TemplateStructureError, compile_sections
+from .thumbnails import ThumbnailCache
+from .uploads import ResumableUploadService
+
+IMAGE_TYPES = [choice for choice, _ in ReportImage.IMAGE_TYPES]
+
+class ReportImageSummaryTestCase(TestCase):
+    """A report with images in some categories; files are never opened, so names are enough"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username='summary-tests', password='unused', employee_id='SUMMARY-1', department='Testing'
+        )
+        inspection = Inspection.objects.create(
+            form_number='SUMMARY-0001', inspection_date=timezone.localdate(), inspector=cls.user, station_type='FM'
+        )
+        cls.report = InspectionReport.objects.create(
+            inspection=inspection, report_type='fm_radio', reference_number='SUMMARY/0001',
+            created_by=cls.user, last_modified_by=cls.user,
+        )
+
+    @classmethod
+    def add_images(cls, image_types):
+        ReportImage.objects.bulk_create([
+            ReportImage(
+                report=cls.report, image_type=image_type, image=f'report_images/summary_{order}.jpg',
+                caption=f'{image_type} {order}', order_in_section=order, uploaded_by=cls.user,
+            )
+            for order, image_type in enumerate(image_types, 1)
+        ])
+
+class MediaTestCase(ReportImageSummaryTestCase):
+    """An authenticated API client and a throwaway MEDIA_ROOT per test
+
+    media_settings maps REPORT_SETTINGS keys to directories to create
+    under that MEDIA_ROOT, for tests of code with its own storage dirs.
+    """
+
+    media_settings = {}
+
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(self.user)
+        self.media_root = tempfile.mkdtemp(prefix='report_media_tests_')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        overrides = {'MEDIA_ROOT': self.media_root}
+        if self.media_settings:
+            overrides['REPORT_SETTINGS'] = {
+                **settings.REPORT_SETTINGS,
+                **{key: os.path.join(self.media_root, name) for key, name in self.media_settings.items()},
+            }
+        settings_override = override_settings(**overrides)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, data):
+        response = self.client.post(
+            '/api/reports/images/bulk_upload/', {'report_id': str(self.report.pk), **data},
+            format='multipart', secure=True
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+class ReportImageSummaryServiceTests(ReportImageSummaryTestCase):
+
+    def test_by_type_groups_every_category_from_one_query(self):
+        self.add_images(['antenna', 'tower_mast', 'antenna'])
+        with self.assertNumQueries(1):
+            grouped = ReportImageSummaryService.by_type(self.report)
+        self.assertEqual(list(grouped), IMAGE_TYPES)
+        self.assertEqual([row['caption'] for row in grouped['antenna']], ['antenna 1', 'antenna 3'])
+        self.assertEqual(len(grouped['tower_mast']), 1)
+        self.assertEqual(grouped['site_overview'], [])
+        self.assertIn('uploaded_at', grouped['antenna'][0])
+
+    def test_status_counts_requested_categories(self):
+        self.add_images(['antenna', 'antenna', 'filter_equipment'])
+        with self.assertNumQueries(1):
+            status = ReportImageSummaryService.status(self.report, ['antenna', 'site_overview'])
+        self.assertEqual(list(status), ['antenna', 'site_overview'])
+        self.assertEqual(status['antenna']['count'], 2)
+        self.assertEqual(set(status['antenna']['images'][0]), {'id', 'caption', 'image', 'uploaded_at', 'thumbnail_url'})
+        self.assertEqual(status['site_overview'], {'count': 0, 'images': []})
+
+    def test_by_category_skips_empty_categories(self):
+        self.add_images(['other_equipment', 'site_overview'])
+        with self.assertNumQueries(1):
+            categories = ReportImageSummaryService.by_category(self.report)
+        self.assertEqual(list(categories), ['site_overview', 'other_equipment'])
+
+class ReportImageEndpointQueryTests(ReportImageSummaryTestCase):
+    """Query counts must not depend on how many categories have images"""
+
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(self.user)
+
+    def get(self, action):
+        response = self.client.get(f'/api/reports/reports/{self.report.pk}/{action}/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_image_requirements(self):
+        self.add_images(IMAGE_TYPES * 2)
+        # The report with its inspection, then every image
+        with self.assertNumQueries(2):
+            data = self.get('image_requirements')
+        self.assertEqual(data['current_status']['antenna']['count'], 2)
+        self.assertEqual(data['total_completed'], data['total_required'])
+
+    def test_enhanced_preview_data(self):
+        self.add_images(IMAGE_TYPES * 2)
+        # Load the per-process type approval map outside the measured request
+        self.get('enhanced_preview_data')
+        # The report, its channels for violation detection, every image, the inspector
+        with self.assertNumQueries(4):
+            data = self.get('enhanced_preview_data')
+        self.assertEqual(list(data['images_by_category']), IMAGE_TYPES)
+        self.assertEqual(len(data['images_by_category']['tower_mast']), 2)
+
+class ReportListQueryTests(ReportImageSummaryTestCase):
+
+    def test_list_query_count_does_not_grow_with_reports(self):
+        self.add_images(['antenna', 'tower_mast'])
+        ReportViolationService.write_rows(self.report, [
+            {'type': 'ERP_EXCEEDED', 'severity': 'major'}, {'type': 'NO_TYPE_APPROVAL', 'severity': 'minor'},
+        ])
+        for number in range(2, 5):
+            InspectionReport.objects.create(
+                inspection=Inspection.objects.create(form_number=f'SUMMARY-000{number}', inspector=self.user,
+                                                     inspection_date=timezone.localdate(), station_type='FM'),
+                report_type='fm_radio', reference_number=f'SUMMARY/000{number}',
+                created_by=self.user, last_modified_by=self.user,
+            )
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.user)
+        # Page count, reports, then their images, ERP rows and violations
+        with self.assertNumQueries(5):
+            response = client.get('/api/reports/reports/', secure=True)
+        rows = response.json()['results']
+        summary = next(row for row in rows if row['id'] == str(self.report.pk))
+        self.assertEqual(summary['total_images'], 2)
+        self.assertEqual(summary['violation_summary'], {
+            'total': 2, 'major': 1, 'minor': 1, 'types': ['ERP_EXCEEDED', 'NO_TYPE_APPROVAL'],
+        })
+
+class ReportViolationFilterTests(ReportImageSummaryTestCase):
+
+    def test_filters_are_validated(self):
+        ReportViolationService.write_rows(self.report, [{'type': 'ERP_EXCEEDED'}, {'type': 'FREQUENCY'}])
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.user)
+        for params in ({'report': 'abc'}, {'broadcaster': 'abc'}, {'date_from': '2024-02-30'}, {'date_to': 'soon'}):
+            response = client.get('/api/reports/violations/', params, secure=True)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(next(iter(params)), response.json())
+        response = client.get('/api/reports/violations/summary/', {
+            'report': str(self.report.pk), 'date_from': '2024-02-29', 'type': 'FREQUENCY',
+        }, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 1)
+
+class ComplianceDashboardTests(ReportImageSummaryTestCase):
+
+    def test_impossible_month_is_a_bad_request(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.user)
+        for month in ('2026-13', 'soon'):
+            response = client.get('/api/reports/dashboard/', {'month_from': month}, secure=True)
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(client.get('/api/reports/dashboard/', {'month_from': '2026-01'}, secure=True).status_code, 200)
+        self.assertEqual(client.get('/api/reports/dashboard/', {'broadcaster': 'abc'}, secure=True).status_code, 400)
+
+    def assert_summary_matches_rebuild(self):
+        def rows():
+            return sorted(ComplianceSummary.objects.values_list(
+                'broadcaster_id', 'station_type', 'month', 'compliance_status', 'violation_type',
+                'report_count', 'violation_count'
+            ), key=repr)
+
+        maintained = rows()
+        ComplianceDashboardService.rebuild()
+        self.assertEqual(maintained, rows())
+
+    def test_incremental_summary_matches_a_full_rebuild(self):
+        broadcaster = Broadcaster.objects.create(name='Parity FM')
+        inspection = Inspection.objects.create(
+            form_number='PARITY-0001', inspection_date=date(2026, 3, 14), inspector=self.user,
+            station_type='FM', broadcaster=broadcaster,
+        )
+        report = InspectionReport.objects.create(
+            inspection=inspection, report_type='fm_radio', reference_number='PARITY/0001',
+            created_by=self.user, last_modified_by=self.user, compliance_status='major_violations',
+            violations_found=[{'type': 'ERP_EXCEEDED'}, {'type': 'ERP_EXCEEDED'}, {'type': 'FREQUENCY'}],
+        )
+        self.assert_summary_matches_rebuild()
+
+        report = InspectionReport.objects.get(pk=report.pk)
+        report.violations_found.append({'type': 'FREQUENCY'})
+        report.compliance_status = 'non_compliant'
+        report.save()
+        self.assert_summary_matches_rebuild()
+
+        # Saved through a deferred instance, then moved to another month and station type
+        report = InspectionReport.objects.only('pk', 'compliance_status').get(pk=report.pk)
+        report.compliance_status = 'minor_violations'
+        report.save()
+        inspection = Inspection.objects.get(pk=inspection.pk)
+        inspection.inspection_date = date(2026, 4, 2)
+        inspection.station_type = 'TV'
+        inspection.save()
+        self.assert_summary_matches_rebuild()
+
+        report.delete()
+        self.assert_summary_matches_rebuild()
+        inspection.delete()
+        self.report.delete()
+        self.assert_summary_matches_rebuild()
+        self.assertFalse(ComplianceSummary.objects.exists())
+
+class BulkUploadTests(MediaTestCase):
+
+    @staticmethod
+    def jpeg(name, index=0):
+        return SimpleUploadedFile(name, synthetic_jpeg(index, 32), content_type='image/jpeg')
+
+    def test_files_sharing_a_key_are_all_uploaded_after_existing_orders(self):
+        self.add_images(['antenna'])
+        data = self.upload({
+            'photos': [self.jpeg('one.jpg'), self.jpeg('two.jpg', 1)],
+            'photos_type': 'antenna',
+            'other': self.jpeg('three.jpg', 2),
+            'other_type': 'not_a_category',
+        })
+        self.assertEqual([(result['filename'], result['status']) for result in data['results']], [
+            ('one.jpg', 'uploaded'), ('two.jpg', 'uploaded'), ('three.jpg', 'error'),
+        ])
+        self.assertEqual([image['order'] for image in data['uploaded_images']], [2, 3])
+        stored = ReportImage.objects.filter(report=self.report, image_type='antenna').exclude(image__startswith='report_images/')
+        self.assertEqual(stored.count(), 2)
+        for image in stored:
+            self.assertTrue(image.image.storage.exists(image.image.name))
+
+    def test_query_count_does_not_grow_with_files(self):
+        # The report, the starting orders, then in a savepoint: blob rows, blob reference counts, images
+        files = {f'image_{index}': self.jpeg(f'{index}.jpg', index) for index in range(len(IMAGE_TYPES) * 2)}
+        types = {f'image_{index}_type': IMAGE_TYPES[index % len(IMAGE_TYPES)] for index in range(len(files))}
+        with self.assertNumQueries(7):
+            data = self.upload({**files, **types})
+        self.assertEqual(data['total_uploaded'], len(files))
+
+    def test_contents_decide_the_type_and_are_fingerprinted(self):
+        contents = synthetic_jpeg(0, 32)
+        photo = SimpleUploadedFile('site.jpg', contents, content_type='image/jpeg')
+        disguised = SimpleUploadedFile('notes.jpg', b'%PDF-1.4\n' + b'0' * 4096, content_type='image/jpeg')
+        data = self.upload({'good': photo, 'bad': disguised})
+        self.assertEqual([(result['filename'], result['status']) for result in data['results']], [
+            ('site.jpg', 'uploaded'), ('notes.jpg', 'error'),
+        ])
+        self.assertIn('application/pdf', data['errors'][0]['error'])
+        image = ReportImage.objects.get(pk=data['uploaded_images'][0]['id'])
+        self.assertEqual(image.sha256, hashlib.sha256(contents).hexdigest())
+        self.assertEqual(image.mime_type, 'image/jpeg')
+
+    def test_identical_contents_share_one_file_until_the_last_image_goes(self):
+        contents = synthetic_jpeg(3, 32)
+
+        def photo(name):
+            return SimpleUploadedFile(name, contents, content_type='image/jpeg')
+
+        self.upload({'first': photo('a.jpg'), 'again': photo('b.jpg')})
+        self.upload({'retry': photo('c.jpg')})
+
+        images = list(ReportImage.objects.filter(report=self.report, blob__isnull=False))
+        blob = ImageBlob.objects.get()
+        self.assertEqual((len(images), blob.ref_count), (3, 3))
+        self.assertEqual({image.image.name for image in images}, {blob.name})
+        storage = images[0].image.storage
+        self.assertEqual(len(storage.listdir(os.path.dirname(blob.name))[1]), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            images[0].delete()
+            images[1].delete()
+        self.assertEqual(ImageBlob.objects.get().ref_count, 1)
+        self.assertTrue(storage.exists(blob.name))
+        with self.captureOnCommitCallbacks(execute=True):
+            images[2].delete()
+        self.assertFalse(ImageBlob.objects.exists())
+        self.assertFalse(storage.exists(blob.name))
+
+    def test_replacing_a_file_with_the_same_contents_keeps_one_reference(self):
+        contents = synthetic_jpeg(5, 32)
+        data = self.upload({'photo': SimpleUploadedFile('a.jpg', contents, content_type='image/jpeg')})
+        image_id = data['uploaded_images'][0]['id']
+        replacement = SimpleUploadedFile('b.jpg', contents, content_type='image/jpeg')
+        response = self.client.patch(
+            f'/api/reports/images/{image_id}/', {'image': replacement}, format='multipart', secure=True
+        )
+        self.assertEqual(response.status_code, 200)
+        blob = ImageBlob.objects.get()
+        self.assertEqual(blob.ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            ReportImage.objects.get(pk=image_id).delete()
+        self.assertFalse(ImageBlob.objects.exists())
+        self.assertFalse(ReportImage._meta.get_field('image').storage.exists(blob.name))
+
+    @override_settings(REPORT_SETTINGS={**settings.REPORT_SETTINGS, 'TRANSCODE_MODE': 'sync'})
+    def test_heic_original_is_kept_and_transcoded_after_commit(self):
+        buffer = BytesIO()
+        Image.open(BytesIO(synthetic_jpeg(4, 48))).save(buffer, format='HEIF')
+        heic = SimpleUploadedFile('IMG_0001.HEIC', buffer.getvalue(), content_type='image/heic')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            data = self.upload({'phone': heic})
+        self.assertEqual(data['results'][0]['status'], 'uploaded')
+        image = ReportImage.objects.select_related('blob').get(pk=data['uploaded_images'][0]['id'])
+        # Transcoding waits for the commit, so the response never includes it
+        self.assertEqual((image.mime_type, image.blob.transcode_status), ('image/heic', 'pending'))
+        self.assertIsNone(image.document_name)
+
+        for callback in callbacks:
+            callback()
+        image = ReportImage.objects.select_related('blob').get(pk=image.pk)
+        self.assertEqual(image.blob.transcode_status, 'done')
+        storage = image.image.storage
+        self.assertTrue(storage.exists(image.image.name))
+        with storage.open(image.document_name) as handle, Image.open(handle) as rendition:
+            self.assertEqual((rendition.format, rendition.size), ('JPEG', (48, 48)))
+        with storage.open(image.web_name) as handle, Image.open(handle) as rendition:
+            self.assertEqual(rendition.format, 'WEBP')
+
+class ThumbnailTests(MediaTestCase):
+    media_settings = {'THUMBNAIL_CACHE_DIR': 'thumbnails'}
+
+    def setUp(self):
+        super().setUp()
+        ThumbnailCache._size = None
+        result = self.upload({
+            'photo': SimpleUploadedFile('mast.jpg', synthetic_jpeg(7, 800), content_type='image/jpeg'),
+        })
+        self.image = ReportImage.objects.get(pk=result['uploaded_images'][0]['id'])
+
+    def fetch(self, query='', **headers):
+        # No credentials: thumbnails are loaded by <img> tags
+        return APIClient(SERVER_NAME='localhost').get(
+            f'/api/reports/thumbnails/{self.image.sha256}/{query}', secure=True, **headers
+        )
+
+    def test_thumbnail_is_resized_negotiated_and_immutable(self):
+        response = self.fetch('?w=300', HTTP_ACCEPT='image/avif,image/webp,*/*')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('Accept', response['Vary'])
+        self.assertIn('immutable', response['Cache-Control'])
+        with Image.open(BytesIO(b''.join(response.streaming_content))) as thumbnail:
+            self.assertEqual(thumbnail.size, (320, 320))
+
+        self.assertEqual(self.fetch('?w=300', HTTP_IF_NONE_MATCH=response['ETag'],
+                                    HTTP_ACCEPT='image/webp').status_code, 304)
+        self.assertEqual(self.fetch('?format=jpeg')['Content-Type'], 'image/jpeg')
+        self.assertEqual(self.client.get(f'/api/reports/images/{self.image.pk}/', secure=True).json()['thumbnail_url'],
+                         f'https://localhost/api/reports/thumbnails/{self.image.sha256}/?w=320')
+
+    def test_least_recently_used_thumbnails_are_evicted(self):
+        for width in (160, 320, 640):
+            self.fetch(f'?w={width}&format=jpeg')
+        paths = {width: ThumbnailCache.path(self.image.sha256, width, 'jpeg') for width in (160, 320, 640)}
+        os.utime(paths[160], (1, 1))
+        os.utime(paths[640], (2, 2))
+        self.fetch('?w=160&format=jpeg')
+        # A hit makes 160 the most recent; shrinking the budget keeps only it
+        result = ThumbnailCache.evict(max_bytes=paths[160].stat().st_size * 2)
+        self.assertEqual(result['removed'], 2)
+        self.assertEqual([width for width, path in paths.items() if path.exists()], [160])
+
+    def test_thumbnails_go_with_their_blob(self):
+        self.assertEqual(self.fetch('?w=160&format=jpeg').status_code, 200)
+        self.assertEqual(self.fetch('?w=320&format=webp').status_code, 200)
+        thumbnails = list(ThumbnailCache.path(self.image.sha256, 160, 'jpeg').parent.glob(f'{self.image.sha256}_*'))
+        self.assertEqual(len(thumbnails), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.image.delete()
+        self.assertFalse(any(path.exists() for path in thumbnails))
+        self.assertEqual(self.fetch('?w=160&format=jpeg').status_code, 404)
+
+    def test_thumbnail_evicted_before_it_is_opened_is_generated_again(self):
+        self.fetch('?w=160&format=jpeg')
+        get = ThumbnailCache.get.__func__
+        calls = []
+
+        def evicting_get(cls, *args):
+            path = get(cls, *args)
+            if not calls:
+                path.unlink()
+            calls.append(path)
+            return path
+
+        with mock.patch.object(ThumbnailCache, 'get', classmethod(evicting_get)):
+            response = self.fetch('?w=160&format=jpeg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+        with Image.open(BytesIO(b''.join(response.streaming_content))) as thumbnail:
+            self.assertEqual(thumbnail.size, (160, 160))
+
+class NearDuplicateTests(MediaTestCase):
+
+    @staticmethod
+    def scene(seed: int) -> bytes:
+        # Random colour blocks: synthetic_jpeg's gradients hash too much alike to tell scenes apart
+        rng = random.Random(seed)
+        blocks = Image.new('RGB', (12, 12))
+        blocks.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(144)])
+        buffer = BytesIO()
+        blocks.resize((640, 640), Image.BICUBIC).save(buffer, format='JPEG', quality=90)
+        return buffer.getvalue()
+
+    @staticmethod
+    def variant(data: bytes, transform) -> bytes:
+        with Image.open(BytesIO(data)) as image:
+            changed = transform(image.convert('RGB'))
+        buffer = BytesIO()
+        changed.save(buffer, format='JPEG', quality=70)
+        return buffer.getvalue()
+
+    def test_reshot_images_are_grouped_and_matched_against_site_history(self):
+        original = self.scene(3)
+        brighter = self.variant(original, lambda image: image.point(lambda value: min(255, value + 12)))
+        self.upload({
+            'photo': [SimpleUploadedFile(f'{name}.jpg', data, content_type='image/jpeg')
+                      for name, data in (('first', original), ('again', brighter), ('other', self.scene(4)))],
+        })
+        first, again, other = ReportImage.objects.filter(report=self.report).order_by('order_in_section')
+        self.assertIsNotNone(other.dhash)
+
+        inspection = self.report.inspection
+        Inspection.objects.filter(pk=inspection.pk).update(transmitting_site_name='Limuru')
+        last_year = InspectionReport.objects.create(
+            inspection=Inspection.objects.create(
+                form_number='SUMMARY-0002', inspection_date=inspection.inspection_date, inspector=self.user,
+                station_type='FM', transmitting_site_name='LIMURU',
+            ),
+            report_type='fm_radio', reference_number='SUMMARY/0002', created_by=self.user, last_modified_by=self.user,
+        )
+        earlier = ReportImage.objects.create(report=last_year, image_type='antenna', image='report_images/old.jpg',
+                                             caption='old', dhash=first.dhash, uploaded_by=self.user)
+
+        with self.assertNumQueries(3):  # report, its images, the site's earlier images
+            response = self.client.get(f'/api/reports/reports/{self.report.pk}/near_duplicates/', secure=True)
+        result = response.json()
+        self.assertEqual(len(result['groups']), 1)
+        self.assertEqual(result['groups'][0]['keep']['id'], first.pk)
+        self.assertEqual([image['id'] for image in result['groups'][0]['duplicates']], [again.pk])
+        self.assertEqual(result['redundant_bytes'], len(brighter))
+        self.assertEqual({match['image']['id'] for match in result['site_history']}, {first.pk, again.pk})
+        self.assertEqual(result['site_history'][0]['matches'][0]['id'], earlier.pk)
+
+        self.assertEqual(self.client.get(f'/api/reports/reports/{self.report.pk}/near_duplicates/?distance=99',
+                                         secure=True).status_code, 400)
+
+class PhotoEvidenceTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        Inspection.objects.filter(pk=self.report.inspection_id).update(
+            latitude='01 17 32 S', longitude='36 49 12 E', inspection_date=date(2026, 10, 19)
+        )
+
+    @staticmethod
+    def photo(seed: int, latitude=None, longitude=None, taken=None) -> bytes:
+        exif = Image.Exif()
+        if latitude is not None:
+            exif[0x8825] = {1: 'S', 2: latitude, 3: 'E', 4: longitude}
+        if taken:
+            exif[0x8769] = {0x9003: taken}
+        buffer = BytesIO()
+        Image.open(BytesIO(synthetic_jpeg(seed, 64))).save(buffer, format='JPEG', exif=exif.tobytes())
+        return buffer.getvalue()
+
+    def test_photos_away_from_site_or_on_another_day_are_flagged(self):
+        photos = {
+            'site': self.photo(1, (1.0, 17.0, 33.0), (36.0, 49.0, 12.0), '2026:10:19 10:30:00'),
+            'elsewhere': self.photo(2, (1.0, 28.0, 0.0), (36.0, 49.0, 12.0), '2026:10:12 09:00:00'),
+            'bare': self.photo(3),
+        }
+        self.upload({
+            'photo': [SimpleUploadedFile(f'{name}.jpg', data, content_type='image/jpeg')
+                      for name, data in photos.items()],
+        })
+        site, elsewhere, bare = ReportImage.objects.filter(report=self.report).order_by('order_in_section')
+        self.assertAlmostEqual(site.gps_latitude, -(1 + 17 / 60 + 33 / 3600))
+        self.assertEqual(timezone.localtime(site.captured_at).hour, 10)
+
+        with self.assertNumQueries(2):
+            result = self.client.get(f'/api/reports/reports/{self.report.pk}/photo_checks/', secure=True).json()
+        flags = {image['id']: image['flags'] for image in result['flagged']}
+        self.assertNotIn(site.pk, flags)
+        self.assertEqual(flags[elsewhere.pk], ['far_from_site', 'different_date'])
+        self.assertEqual(flags[bare.pk], ['no_location', 'no_capture_time'])
+
+    def test_backfill_reads_images_stored_before_extraction(self):
+        self.upload({
+            'photo': SimpleUploadedFile('site.jpg', self.photo(4, (1.0, 17.0, 32.0), (36.0, 49.0, 12.0)),
+                                        content_type='image/jpeg'),
+        })
+        ReportImage.objects.update(exif_extracted=False, gps_latitude=None, gps_longitude=None)
+        self.assertEqual(PhotoEvidenceService.check(self.report)['pending_images'], 1)
+        call_command('extract_image_metadata', stdout=StringIO())
+        self.assertAlmostEqual(ReportImage.objects.get().gps_longitude, 36 + 49 / 60 + 12 / 3600)
+
+class ResumableUploadTests(MediaTestCase):
+    CHUNK = 64 * 1024
+    media_settings = {'UPLOAD_SESSION_DIR': 'uploads'}
+
+    def setUp(self):
+        super().setUp()
+        jpeg = synthetic_jpeg(0, 32)
+        self.payload = jpeg + os.urandom(self.CHUNK * 2 + 100 - len(jpeg))
+        response = self.client.post('/api/reports/uploads/', {
+            'report_id': str(self.report.pk), 'filename': 'mast.jpg', 'total_size': len(self.payload),
+            'chunk_size': self.CHUNK, 'image_type': 'tower_mast',
+            'sha256': hashlib.sha256(self.payload).hexdigest(),
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.upload_id = response.json()['upload_id']
+
+    def put_chunk(self, index, sha256=None):
+        data = self.payload[index * self.CHUNK:(index + 1) * self.CHUNK]
+        return self.client.put(
+            f'/api/reports/uploads/{self.upload_id}/chunks/{index}/', data=data,
+            content_type='application/octet-stream', secure=True,
+            HTTP_X_CHUNK_SHA256=sha256 or hashlib.sha256(data).hexdigest(),
+        )
+
+    def test_out_of_order_chunks_resume_and_complete(self):
+        self.assertEqual(self.put_chunk(2).status_code, 200)
+        progress = self.client.get(f'/api/reports/uploads/{self.upload_id}/', secure=True).json()
+        self.assertEqual(progress['missing_chunks'], [0, 1])
+        self.assertEqual(progress['received_ranges'], [[self.CHUNK * 2, len(self.payload)]])
+        self.assertEqual(progress['next_offset'], 0)
+
+        self.assertEqual(self.client.post(f'/api/reports/uploads/{self.upload_id}/complete/', secure=True).status_code, 409)
+        self.put_chunk(0)
+        self.put_chunk(1)
+        response = self.client.post(f'/api/reports/uploads/{self.upload_id}/complete/', secure=True)
+        self.assertEqual(response.status_code, 200)
+        image = ReportImage.objects.get(pk=response.json()['image']['id'])
+        self.assertEqual(image.image_type, 'tower_mast')
+        with image.image.open('rb') as handle:
+            self.assertEqual(handle.read(), self.payload)
+        session = ImageUploadSession.objects.get(pk=self.upload_id)
+        self.assertEqual(session.status, 'completed')
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'uploads', self.upload_id)))
+
+    def test_concurrent_completions_register_one_image(self):
+        for index in range(3):
+            self.put_chunk(index)
+        first = ImageUploadSession.objects.get(pk=self.upload_id)
+        retry = ImageUploadSession.objects.get(pk=self.upload_id)
+        # Keep the chunks, as if the retry assembled them before the first completion cleaned up
+        with mock.patch('apps.reports.uploads.shutil.rmtree'):
+            image = ResumableUploadService.complete(first)
+        self.assertEqual(ResumableUploadService.complete(retry), image)
+        # A retry arriving after the cleanup finds the session completed
+        stale = ImageUploadSession.objects.get(pk=self.upload_id)
+        stale.status = 'open'
+        ResumableUploadService.discard_files(stale)
+        self.assertEqual(ResumableUploadService.complete(stale), image)
+        self.assertEqual(ReportImage.objects.filter(report=self.report, sha256=image.sha256).count(), 1)
+        self.assertEqual(ImageBlob.objects.get().ref_count, 1)
+        with image.image.open('rb') as handle:
+            self.assertEqual(handle.read(), self.payload)
+
+    def test_session_for_malformed_report_id_is_rejected(self):
+        response = self.client.post('/api/reports/uploads/', {
+            'report_id': 'not-a-uuid', 'filename': 'mast.jpg', 'total_size': 10,
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+
+    def test_chunk_with_wrong_checksum_is_rejected(self):
+        self.assertEqual(self.put_chunk(0, sha256='0' * 64).status_code, 422)
+        progress = self.client.get(f'/api/reports/uploads/{self.upload_id}/', secure=True).json()
+        self.assertEqual(progress['received_chunks'], [])
+
+    def test_contents_already_stored_complete_without_chunks(self):
+        for index in range(3):
+            self.put_chunk(index)
+        self.client.post(f'/api/reports/uploads/{self.upload_id}/complete/', secure=True)
+        response = self.client.post('/api/reports/uploads/', {
+            'report_id': str(self.report.pk), 'filename': 'again.jpg', 'total_size': len(self.payload),
+            'chunk_size': self.CHUNK, 'sha256': hashlib.sha256(self.payload).hexdigest(),
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()['status'], response.json()['missing_chunks']), ('completed', []))
+        self.assertEqual(ImageBlob.objects.get().ref_count, 2)
+
+    def test_first_chunk_that_is_not_an_image_is_refused(self):
+        self.payload = b'MZ' + os.urandom(len(self.payload) - 2)
+        self.assertEqual(self.put_chunk(0).status_code, 415)
+        self.assertEqual(self.put_chunk(1).status_code, 200)
+
+class ReportTemplateTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_sections_compile_into_plan_steps(self):
+        default = compile_sections({})
+        self.assertEqual([str(step) for step in default], [section['kind'] for section in DEFAULT_SECTIONS])
+        text, site = compile_sections({'sections': [
+            {'kind': 'text', 'heading': 'K. NOTES', 'template': 'Seen by {{ inspector_name }}'}, 'site',
+        ]})
+        self.assertEqual((text.heading, site.kind, site.heading), ('K. NOTES', 'site', ''))
+        self.assertEqual(text.template.render(Context({'inspector_name': 'Jane'})), 'Seen by Jane')
+        for sections in ([{'kind': 'gallery'}], [{'kind': 'site', 'images': 'selfies'}], [42], {'sections': 'site'},
+                         [{'kind': 'text', 'template': '{% if %}'}]):
+            with self.assertRaises(TemplateStructureError):
+                compile_sections(sections)
+
+    def test_clean_rejects_templates_that_do_not_compile(self):
+        template = ReportTemplate(name='Broken', report_type='fm_radio', template_structure={'sections': ['site']})
+        template.clean()
+        template.conclusions_template = '{% for %}'
+        with self.assertRaises(ValidationError):
+            template.clean()
+        template.conclusions_template = ''
+        template.template_structure = {'sections': [{'kind': 'site', 'images': 'selfies'}]}
+        with self.assertRaises(ValidationError):
+            template.clean()
+
+    def test_saving_a_template_recompiles_plans_after_commit(self):
+        plan = ReportTemplateRegistry.plan_for('am_radio')
+        with self.assertNumQueries(0):
+            self.assertIs(ReportTemplateRegistry.plan_for('am_radio'), plan)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReportTemplate.objects.create(
+                name='Short AM', report_type='am_radio',
+                template_structure={'sections': ['header', {'kind': 'erp', 'heading': 'A. ERP'}, 'signature']},
+            )
+        plan = ReportTemplateRegistry.plan_for('am_radio')
+        self.assertEqual(plan.name, 'Short AM')
+        self.assertEqual((plan.headings(), plan.section_titles()), (['A. ERP'], ['ERP Information']))
+
+class DocumentGenerationTests(MediaTestCase):
+
+    # Paragraphs (style, text) of the FM report the fixed layout produced before plans were configurable
+    FM_PARAGRAPHS = [
+        ('CA Reference', 'R/FM'),
+        ('Normal', '3rd March 2025'),
+        ('Normal', ''),
+        ('CA Strong', 'TO: D/MIRC'),
+        ('CA Strong', "THRO': PO/NR/MIRC"),
+        ('Normal', ''),
+        ('CA Subject', 'RE: T'),
+        ('Normal', ''),
+        ('Normal', 'The above subject matter refers.\n\nReference is made to the above subject.'),
+        ('Normal', 'The transmit station was inspected by MIRC officer Jane Doe on 3rd March 2025 in the presence of their representative Bob.'),
+        ('Normal', ''),
+        ('CA Findings Heading', 'FINDINGS'),
+        ('CA Section Heading', 'A. SITE'),
+        ('Normal', ''),
+        ('CA Section Heading', 'B. MAST'),
+        ('Normal', ''),
+        ('CA Section Heading', 'C. TRANSMITTER'),
+        ('CA Strong', 'EXCITER'),
+        ('Normal', ''),
+        ('CA Strong', 'AMPLIFIER'),
+        ('Normal', ''),
+        ('CA Strong', 'Frequency: Not Specified'),
+        ('Normal', ''),
+        ('CA Section Heading', 'D. ANTENNA SYSTEM'),
+        ('Normal', ''),
+        ('CA Section Heading', 'E. FILTER'),
+        ('Normal', ''),
+        ('CA Section Heading', 'G. ERP CALCULATION'),
+        ('CA Strong', 'CH.1 (Unknown MHz)'),
+        ('Normal', 'ERP calculation not available - insufficient equipment data'),
+        ('Normal', ''),
+        ('CA Strong', 'Authorized ERP: 10000 W (10 kW)'),
+        ('Normal', ''),
+        ('CA Section Heading', 'H. OBSERVATION'),
+        ('List Bullet', 'Rusty mast'),
+        ('List Bullet', 'No fence'),
+        ('Normal', ''),
+        ('CA Section Heading', 'I. CONCLUSION'),
+        ('List Bullet', '• The station is operating within authorized parameters.'),
+        ('Normal', ''),
+        ('CA Section Heading', 'J. RECOMMENDATION'),
+        ('List Bullet', '• The licensee should address tower rust protection issues.'),
+        ('Normal', ''),
+        ('Normal', ''),
+        ('CA Strong', 'Jane Doe'),
+        ('CA Strong', 'AO/MIRC/NR'),
+    ]
+
+    def test_default_plan_matches_the_fixed_layout(self):
+        cache.clear()
+        inspector = get_user_model().objects.create_user(
+            username='generator-tests', password='unused', employee_id='GENERATE-1', department='Testing',
+            first_name='Jane', last_name='Doe',
+        )
+        inspection = Inspection.objects.create(
+            form_number='GENERATE-0001', inspection_date=date(2025, 3, 3), inspector=inspector, station_type='FM',
+            transmitting_site_name='Limuru', contact_name='Bob', exciter_manufacturer='Acme',
+            amplifier_manufacturer='Acme', filter_manufacturer='Kathrein', other_observations='Rusty mast\nNo fence',
+        )
+        report = InspectionReport.objects.create(
+            inspection=inspection, report_type='fm_radio', reference_number='R/FM', title='T',
+            created_by=inspector, last_modified_by=inspector,
+        )
+        path = ProfessionalDocumentGenerator(report).generate_professional_docx()
+        paragraphs = [(paragraph.style.name, paragraph.text) for paragraph in Document(path).paragraphs]
+        self.assertEqual(paragraphs, self.FM_PARAGRAPHS)
+
+class DocxTableTests(TestCase):
+
+    def setUp(self):
+        self.doc = ReportTemplateLibrary.new_document('fm_radio')
+        self.style_ids = ReportTemplateLibrary.style_ids('fm_radio')
+
+    def texts(self, table):
+        return [[cell.text for cell in row.cells] for row in table.rows]
+
+    def test_cell_text_is_escaped_and_stripped_of_control_characters(self):
+        add_table(self.doc, [['A & B', '<b>not bold</b>'], ['tab\there\r\nnext\x07line\x00', '"quoted"']])
+        buffer = BytesIO()
+        self.doc.save(buffer)
+        # Parsed back from the saved file, so the XML written must be well formed
+        table = Document(BytesIO(buffer.getvalue())).tables[-1]
+        self.assertEqual(self.texts(table), [['A & B', '<b>not bold</b>'], ['tab\there\nnextline', '"quoted"']])
+
+    def test_short_rows_are_padded_and_none_is_empty(self):
+        table = add_table(self.doc, [['Channel', 'Frequency', 'Power'], ['CH.1', None], [None, 7, 0]])
+        self.assertEqual(self.texts(table), [['Channel', 'Frequency', 'Power'], ['CH.1', '', ''], ['', '7', '0']])
+        self.assertEqual(len(table.columns), 3)
+
+    def test_table_style_is_set_by_id(self):
+        table = add_table(self.doc, [['Label', 'Value']], style_id=self.style_ids[docx_templates.CHANNEL_TABLE])
+        self.assertEqual(table.style.name, docx_templates.CHANNEL_TABLE)
+        self.assertNotEqual(add_table(self.doc, [['Label', 'Value']]).style.name, docx_templates.CHANNEL_TABLE)
+
+class ReportTemplateLibraryTests(MediaTestCase):
+    media_settings = {'TEMPLATE_DIR': 'templates'}
+
+    def setUp(self):
+        super().setUp()
+        ReportTemplateLibrary.clear()
+        self.addCleanup(ReportTemplateLibrary.clear)
+
+    def test_designer_template_keeps_its_styles_but_not_its_sample_body(self):
+        designer = Document()
+        designer.styles.add_style(docx_templates.SUBJECT, WD_STYLE_TYPE.PARAGRAPH).font.size = Pt(20)
+        designer.add_paragraph('Sample subject', style=docx_templates.SUBJECT)
+        designer.add_table(rows=2, cols=2)
+        designer.sections[0].left_margin = Inches(1.5)
+        os.makedirs(settings.REPORT_SETTINGS['TEMPLATE_DIR'])
+        designer.save(ReportTemplateLibrary.template_path('fm_radio'))
+
+        doc = ReportTemplateLibrary.new_document('fm_radio')
+        self.assertEqual(doc.paragraphs, [])
+        self.assertEqual(doc.tables, [])
+        self.assertEqual(doc.sections[0].left_margin, Inches(1.5))
+        self.assertEqual(doc.styles[docx_templates.SUBJECT].font.size, Pt(20))
+        # Styles the designer left out are added
+        self.assertIn(docx_templates.CHANNEL_TABLE, ReportTemplateLibrary.style_ids('fm_radio'))
+        self.assertEqual(len(ReportTemplateLibrary.new_document('tv_broadcast').sections), 1)
+
+    def test_cached_skeleton_is_not_written_to_by_generation(self):
+        skeleton, _ = ReportTemplateLibrary._template('fm_radio')
+        before = (skeleton.element.xml, skeleton.styles.element.xml)
+        for _ in range(2):
+            path = ProfessionalDocumentGenerator(self.report).generate_professional_docx()
+            self.assertTrue(Document(path).paragraphs)
+        self.assertIs(ReportTemplateLibrary._template('fm_radio')[0], skeleton)
+        self.assertEqual((skeleton.element.xml, skeleton.styles.element.xml), before)
+
+class GenerationProfilerTests(TestCase):
+
+    class Builder:
+        def __init__(self, profiler):
+            self.profiler = profiler
+
+        @profiled('section', detail_arg=1)
+        def section(self, doc, name):
+            doc.add_paragraph(name)
+            self.table(doc)
+
+        @profiled('table')
+        def table(self, doc):
+            add_table(doc, [['Label', 'Value']])
+            return get_user_model().objects.count()
+
+    def setUp(self):
+        self.now = 0.0
+        clock = mock.patch('apps.reports.profiling.time.perf_counter', lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def tick(self, ms):
+        self.now += ms / 1000
+
+    def test_nested_sections_record_self_time_and_queries(self):
+        profiler = GenerationProfiler(measure_bytes=False)
+        with profiler.run():
+            with profiler.section('header'):
+                self.tick(10)
+                with profiler.section('table'):
+                    self.tick(4)
+                    get_user_model().objects.count()
+                with profiler.section('table'):
+                    self.tick(2)
+            self.tick(1)
+        sections = {entry['path']: entry for entry in profiler.summary()['sections']}
+        self.assertEqual(list(sections), ['generate_docx;header', 'generate_docx;header;table'])
+        header, table = sections['generate_docx;header'], sections['generate_docx;header;table']
+        self.assertEqual((header['time_ms'], header['self_time_ms'], header['queries']), (16, 10, 1))
+        self.assertEqual((table['calls'], table['time_ms'], table['self_time_ms'], table['queries']), (2, 6, 6, 1))
+        self.assertEqual(profiler.summary()['total_ms'], 17)
+        self.assertEqual(profiler.collapsed_stacks(),
+                         'generate_docx 1000\ngenerate_docx;header 10000\ngenerate_docx;header;table 6000\n')
+
+    def test_sections_outside_a_run_are_not_recorded(self):
+        profiler = GenerationProfiler()
+        with profiler.section('header'):
+            pass
+        self.assertEqual(profiler.sections, {})
+
+    def test_profiled_methods_nest_by_call(self):
+        profiler = GenerationProfiler()
+        doc = Document()
+        with profiler.run():
+            self.Builder(profiler).section(doc, 'site')
+        sections = {entry['path']: entry for entry in profiler.summary()['sections']}
+        self.assertEqual(list(sections), ['generate_docx;section:site', 'generate_docx;section:site;table'])
+        self.assertEqual(sections['generate_docx;section:site;table']['queries'], 1)
+        self.assertGreater(sections['generate_docx;section:site;table']['bytes_added'], 0)
+        self.assertGreater(sections['generate_docx;section:site']['bytes_added'],
+                           sections['generate_docx;section:site;table']['bytes_added'])
+        # Without a profiler the methods run undecorated
+        self.assertEqual(self.Builder(None).table(doc), get_user_model().objects.count())
+
+class ProfileFileTests(MediaTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.profile_dir = tempfile.mkdtemp(prefix='report_profile_tests_')
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        settings_override = override_settings(REPORT_SETTINGS={**settings.REPORT_SETTINGS, 'PROFILE_DIR': self.profile_dir})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.staff = get_user_model().objects.create_user(
+            username='profile-tests', password='unused', employee_id='PROFILE-1', department='Testing', is_staff=True
+        )
+
+    def test_profiles_are_kept_out_of_media_and_served_to_staff_only(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.post(f'/api/reports/reports/{self.report.pk}/generate_documents/', {
+            'profile': True, 'profile_output': ['collapsed', 'pstats'],
+        }, format='json', secure=True)
+        self.assertEqual(response.status_code, 200)
+        files = response.json()['profile']['files']
+        self.assertEqual(set(files), {'collapsed', 'pstats'})
+        self.assertEqual(sorted(os.listdir(self.profile_dir)), sorted(url.rsplit('/', 1)[1] for url in files.values()))
+        for directory, _, names in os.walk(self.media_root):
+            self.assertFalse([name for name in names if name.endswith(('.prof', '.folded'))], directory)
+
+        url = files['collapsed']
+        self.assertTrue(url.startswith('https://localhost/api/reports/profiles/SUMMARY_0001_'))
+        response = self.client.get(url, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'generate_docx '))
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url, secure=True).status_code, 403)
+        self.client.force_authenticate(self.staff)
+        self.assertEqual(self.client.get('/api/reports/profiles/missing_20250101-000000.prof', secure=True).status_code, 404)
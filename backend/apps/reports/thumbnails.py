@@ -0,0 +1,220 @@
+# apps/reports/thumbnails.py
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+from .models import ImageBlob, ReportImage
+# Registers the HEIF opener, so originals without renditions still decode
+from .transcoding import TRANSCODE_TYPES  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+def thumbnail_settings() -> Dict[str, Any]:
+    report_settings = getattr(settings, 'REPORT_SETTINGS', {})
+    return {
+        'dir': Path(report_settings.get('THUMBNAIL_CACHE_DIR', Path(settings.MEDIA_ROOT) / 'cache' / 'thumbnails')),
+        'max_bytes': report_settings.get('THUMBNAIL_CACHE_MAX_BYTES', 512 * 1024 * 1024),
+        'widths': report_settings.get('THUMBNAIL_WIDTHS', [160, 320, 640, 1280]),
+        'default_width': report_settings.get('THUMBNAIL_DEFAULT_WIDTH', 320),
+    }
+
+class ThumbnailNotReady(Exception):
+    """The blob is a HEIC original whose renditions are still being written"""
+
+class ThumbnailCache:
+    """Resized copies of image blobs, generated on first request and kept on local disk
+
+    Entries are keyed by blob SHA-256, width and format, so they never go
+    stale and can be cached by browsers for good. Widths snap up to the
+    configured steps to bound the number of variants. A hit refreshes the
+    file's mtime; once the directory outgrows THUMBNAIL_CACHE_MAX_BYTES the
+    least recently used entries are deleted down to 80% of it.
+    """
+
+    LOW_WATER = 0.8
+
+    _lock = threading.Lock()
+    # Bytes in the cache directory as this process last saw it; None until first scanned
+    _size: Optional[int] = None
+
+    @staticmethod
+    def snap_width(width: Optional[int]) -> int:
+        config = thumbnail_settings()
+        widths = sorted(config['widths'])
+        if not width:
+            return config['default_width']
+        return next((step for step in widths if step >= width), widths[-1])
+
+    @staticmethod
+    def path(sha256: str, width: int, fmt: str) -> Path:
+        return thumbnail_settings()['dir'] / sha256[:2] / f'{sha256}_{width}.{fmt}'
+
+    @staticmethod
+    def source_name(blob: ImageBlob) -> str:
+        """Smallest stored file that still covers every thumbnail width"""
+        if blob.transcode_status == 'done':
+            return blob.web_name or blob.print_name
+        if blob.transcode_status:
+            raise ThumbnailNotReady(blob.sha256)
+        return blob.name
+
+    @classmethod
+    def get(cls, sha256: str, width: int, fmt: str) -> Optional[Path]:
+        """Path of the cached thumbnail, generating it on a miss; None when the blob does not exist"""
+        target = cls.path(sha256, width, fmt)
+        try:
+            os.utime(target)
+            return target
+        except FileNotFoundError:
+            pass
+
+        blob = ImageBlob.objects.filter(pk=sha256).first()
+        if blob is None:
+            return None
+        pil_format, _, options = FORMATS[fmt]
+        storage = ReportImage._meta.get_field('image').storage
+        with storage.open(cls.source_name(blob), 'rb') as handle:
+            with Image.open(handle) as image:
+                # JPEG decoders can scale down while decoding, far cheaper than a full-size decode
+                image.draft('RGB', (width, width))
+                thumbnail = ImageOps.exif_transpose(image).convert('RGB')
+        thumbnail.thumbnail((width, width), Image.LANCZOS)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f'{target.name}.{uuid.uuid4().hex}.tmp')
+        try:
+            thumbnail.save(partial, format=pil_format, **options)
+            os.replace(partial, target)
+        finally:
+            if partial.exists():
+                partial.unlink()
+        cls._added(target.stat().st_size)
+        return target
+
+    @classmethod
+    def open_file(cls, sha256: str, width: int, fmt: str):
+        """The cached thumbnail opened for reading, or None when the blob does not exist"""
+        for _ in range(2):
+            path = cls.get(sha256, width, fmt)
+            if path is None:
+                return None
+            try:
+                return open(path, 'rb')
+            except FileNotFoundError:
+                # Evicted, or its blob released, between get() and here; generate it again
+                continue
+        raise FileNotFoundError(path)
+
+    @classmethod
+    def discard(cls, sha256s: Iterable[str]) -> int:
+        """Delete every cached thumbnail of blobs that are gone; returns the number deleted"""
+        root = thumbnail_settings()['dir']
+        removed = freed = 0
+        for sha256 in set(sha256s):
+            for path in (root / sha256[:2]).glob(f'{sha256}_*'):
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += size
+        if freed:
+            with cls._lock:
+                if cls._size is not None:
+                    cls._size = max(cls._size - freed, 0)
+        return removed
+
+    @classmethod
+    def _added(cls, size: int):
+        with cls._lock:
+            if cls._size is None:
+                cls._size = cls.usage()
+            else:
+                cls._size += size
+            over = cls._size > thumbnail_settings()['max_bytes']
+        if over:
+            cls.evict()
+
+    @staticmethod
+    def _entries() -> List[Tuple[str, os.stat_result]]:
+        entries = []
+        root = thumbnail_settings()['dir']
+        if not root.is_dir():
+            return entries
+        for shard in os.scandir(root):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if not entry.name.endswith('.tmp'):
+                        try:
+                            entries.append((entry.path, entry.stat()))
+                        except FileNotFoundError:
+                            pass
+        return entries
+
+    @classmethod
+    def usage(cls) -> int:
+        return sum(stat.st_size for _, stat in cls._entries())
+
+    @classmethod
+    def evict(cls, max_bytes: Optional[int] = None) -> Dict[str, int]:
+        """Delete least recently used entries until the cache is below the low-water mark"""
+        limit = thumbnail_settings()['max_bytes'] if max_bytes is None else max_bytes
+        entries = sorted(cls._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        target = limit * cls.LOW_WATER
+        removed = freed = 0
+        for path, stat in entries:
+            if total - freed <= target:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+                freed += stat.st_size
+            except FileNotFoundError:
+                pass
+        with cls._lock:
+            cls._size = total - freed
+        if removed:
+            logger.info("Evicted %d thumbnails (%d bytes)", removed, freed)
+        return {'removed': removed, 'freed_bytes': freed, 'remaining_bytes': total - freed}
+
+    # ---------- URLs ----------
+
+    @staticmethod
+    def url(sha256: Optional[str], width: Optional[int] = None) -> Optional[str]:
+        """Thumbnail URL for a blob; the format follows the browser's Accept header unless given"""
+        if not sha256:
+            return None
+        return f'{reverse("report-image-thumbnail", args=[sha256])}?w={ThumbnailCache.snap_width(width)}'
+
+    @classmethod
+    def srcset(cls, sha256: Optional[str], request=None) -> Optional[str]:
+        """`srcset` value over every width step, absolute when a request is given"""
+        if not sha256:
+            return None
+        entries = []
+        for width in sorted(thumbnail_settings()['widths']):
+            url = cls.url(sha256, width)
+            entries.append(f'{request.build_absolute_uri(url) if request else url} {width}w')
+        return ', '.join(entries)
+
+    @classmethod
+    def add_urls(cls, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replace 'blob_id' in image value rows with thumbnail_url"""
+        rows = list(rows)
+        for row in rows:
+            row['thumbnail_url'] = cls.url(row.pop('blob_id'))
+        return rows
@@ -0,0 +1,176 @@
+# apps/reports/transcoding.py
+import logging
+import os
+import queue
+import threading
+from io import BytesIO
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+from PIL import Image, ImageOps
+
+try:
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ImportError:  # without pillow-heif HEIC uploads are refused rather than stored untranscodable
+    register_heif_opener = None
+
+from .models import ImageBlob, ReportImage
+from .similarity import dhash_image
+
+logger = logging.getLogger(__name__)
+
+# Sniffed types stored as originals and transcoded in the background
+TRANSCODE_TYPES = ['image/heic', 'image/heif'] if register_heif_opener is not None else []
+
+def transcode_settings() -> Dict:
+    report_settings = getattr(settings, 'REPORT_SETTINGS', {})
+    return {
+        'mode': report_settings.get('TRANSCODE_MODE', 'thread'),
+        'print_max_edge': report_settings.get('PRINT_IMAGE_MAX_EDGE', 2400),
+        'print_quality': report_settings.get('PRINT_IMAGE_QUALITY', 85),
+        'web_max_edge': report_settings.get('WEB_IMAGE_MAX_EDGE', 1600),
+        'web_quality': report_settings.get('WEB_IMAGE_QUALITY', 80),
+    }
+
+class ImageTranscoder:
+    """Print JPEG and web WebP renditions of blobs whose originals documents and browsers cannot use
+
+    Renditions sit next to the original as `<sha256>.print.jpg` and
+    `<sha256>.web.webp`, so each distinct original is transcoded once
+    however many images share it, and the files go with the blob.
+    """
+
+    _worker: Optional['TranscodeWorker'] = None
+    _worker_lock = threading.Lock()
+
+    @staticmethod
+    def rendition_name(blob_name: str, suffix: str) -> str:
+        return f'{os.path.splitext(blob_name)[0]}.{suffix}'
+
+    @staticmethod
+    def _encode(image: Image.Image, max_edge: int, **save_options) -> ContentFile:
+        rendition = image.copy()
+        rendition.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        buffer = BytesIO()
+        rendition.save(buffer, **save_options)
+        return ContentFile(buffer.getvalue())
+
+    @classmethod
+    def transcode(cls, sha256: str) -> bool:
+        """Write the renditions of one pending blob; returns whether it was transcoded now"""
+        blob = ImageBlob.objects.filter(pk=sha256, transcode_status='pending').first()
+        if blob is None:
+            return False
+        config = transcode_settings()
+        storage = ReportImage._meta.get_field('image').storage
+        print_name = cls.rendition_name(blob.name, 'print.jpg')
+        web_name = cls.rendition_name(blob.name, 'web.webp')
+        try:
+            with storage.open(blob.name, 'rb') as handle:
+                with Image.open(handle) as original:
+                    # Phones store the sensor orientation in EXIF; bake it in, as the renditions carry no EXIF
+                    image = ImageOps.exif_transpose(original).convert('RGB')
+            dhash = dhash_image(image)
+            renditions = {
+                print_name: cls._encode(image, config['print_max_edge'], format='JPEG',
+                                        quality=config['print_quality'], optimize=True, progressive=True),
+                web_name: cls._encode(image, config['web_max_edge'], format='WEBP',
+                                      quality=config['web_quality'], method=4),
+            }
+            for name, content in renditions.items():
+                if storage.exists(name):
+                    storage.delete(name)
+                storage.save(name, content)
+        except Exception as e:
+            logger.warning("Transcoding image blob %s failed: %s", sha256, e, exc_info=True)
+            ImageBlob.objects.filter(pk=sha256, transcode_status='pending').update(transcode_status='failed')
+            return False
+        updated = ImageBlob.objects.filter(pk=sha256, transcode_status='pending').update(
+            transcode_status='done', print_name=print_name, web_name=web_name
+        )
+        ReportImage.objects.filter(blob_id=sha256, dhash__isnull=True).update(dhash=dhash)
+        if not updated:
+            # The blob lost its last reference meanwhile
+            for name in renditions:
+                storage.delete(name)
+        return bool(updated)
+
+    @classmethod
+    def transcode_pending(cls, limit: Optional[int] = None, retry_failed: bool = False) -> Dict[str, int]:
+        """Transcode blobs still waiting, e.g. queued by a process that exited; returns counts"""
+        statuses = ['pending', 'failed'] if retry_failed else ['pending']
+        pending = ImageBlob.objects.filter(transcode_status__in=statuses).order_by('created_at')
+        if retry_failed:
+            pending.filter(transcode_status='failed').update(transcode_status='pending')
+        sha256s = list(pending.values_list('sha256', flat=True)[:limit])
+        done = sum(cls.transcode(sha256) for sha256 in sha256s)
+        return {'transcoded': done, 'failed': len(sha256s) - done}
+
+    @classmethod
+    def schedule(cls, sha256s: Iterable[str]):
+        """Transcode blobs after the upload has answered; call once their rows are committed
+
+        TRANSCODE_MODE 'thread' hands them to a background thread, 'sync'
+        transcodes in the caller and 'off' leaves them to the
+        transcode_images command.
+        """
+        sha256s = list(sha256s)
+        mode = transcode_settings()['mode']
+        if not sha256s or mode == 'off':
+            return
+        if mode == 'sync':
+            for sha256 in sha256s:
+                cls.transcode(sha256)
+            return
+        cls.worker().put_many(sha256s)
+
+    @classmethod
+    def worker(cls) -> 'TranscodeWorker':
+        if cls._worker is None:
+            with cls._worker_lock:
+                if cls._worker is None:
+                    cls._worker = TranscodeWorker()
+        return cls._worker
+
+class TranscodeWorker:
+    """One daemon thread draining a queue of blob sha256s"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def put_many(self, sha256s: Iterable[str]):
+        for sha256 in sha256s:
+            self._queue.put(sha256)
+        self._ensure_thread()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def join(self):
+        """Block until everything queued so far is transcoded"""
+        self._queue.join()
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='image-transcoder', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            sha256 = self._queue.get()
+            try:
+                ImageTranscoder.transcode(sha256)
+            except Exception:
+                logger.exception("Image transcoder failed on blob %s", sha256)
+            finally:
+                self._queue.task_done()
+                # The worker owns a connection of its own; don't let it go stale
+                close_old_connections()
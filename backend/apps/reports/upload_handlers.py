@@ -0,0 +1,131 @@
+# apps/reports/upload_handlers.py
+import hashlib
+import logging
+from typing import Optional, Tuple
+
+try:
+    import magic
+except ImportError:  # python-magic needs libmagic; the signature table below covers the image formats
+    magic = None
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopFutureHandlers
+
+logger = logging.getLogger(__name__)
+
+MAX_IMAGE_UPLOAD_SIZE = 10 * 1024 * 1024
+
+# Leading bytes handed to libmagic; enough for every image container it knows
+SNIFF_BYTES = 2048
+
+# (offset, signature, mime type) used when libmagic is unavailable
+SIGNATURES = [
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'BM', 'image/bmp'),
+    (8, b'WEBP', 'image/webp'),
+    (4, b'ftypheic', 'image/heic'),
+    (4, b'ftypheix', 'image/heic'),
+    (4, b'ftypmif1', 'image/heif'),
+]
+
+def sniff_mime_type(head: bytes) -> str:
+    """MIME type from a file's first bytes, never from its name or the client's Content-Type"""
+    if not head:
+        return 'application/x-empty'
+    if magic is not None:
+        try:
+            return magic.from_buffer(head[:SNIFF_BYTES], mime=True)
+        except Exception:
+            logger.warning("libmagic failed, falling back to built-in image signatures", exc_info=True)
+    for offset, signature, mime_type in SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime_type
+    return 'application/octet-stream'
+
+def fingerprint(file) -> Tuple[str, str]:
+    """(sha256 hex, sniffed mime type) of an uploaded file
+
+    Files received through ImageUploadHandler carry both already; others
+    are read once in chunks.
+    """
+    if getattr(file, 'sha256', None) and getattr(file, 'mime_type', None):
+        return file.sha256, file.mime_type
+    digest = hashlib.sha256()
+    head = b''
+    file.seek(0)
+    for chunk in file.chunks():
+        if len(head) < SNIFF_BYTES:
+            head += chunk[:SNIFF_BYTES - len(head)]
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest(), sniff_mime_type(head)
+
+class ImageUploadHandler(FileUploadHandler):
+    """Streams each uploaded file to a temporary file, hashing and sniffing it on the way
+
+    Nothing is buffered in memory beyond the parser's chunk. A file whose
+    first bytes are not an image, or that grows past `max_size`, is
+    skipped as soon as that is known and the rest of it is discarded
+    without being written to disk. Skipped files are listed in `request.rejected_uploads`
+    as {'field', 'filename', 'error'}; accepted files get `sha256` and
+    `mime_type`, and their `content_type` is the sniffed type.
+    """
+
+    def __init__(self, request=None, max_size: int = MAX_IMAGE_UPLOAD_SIZE):
+        super().__init__(request)
+        self.max_size = max_size
+        if request is not None and not hasattr(request, 'rejected_uploads'):
+            request.rejected_uploads = []
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.file = TemporaryUploadedFile(file_name, content_type, 0, charset, content_type_extra)
+        self.digest = hashlib.sha256()
+        self.head = b''
+        self.mime_type: Optional[str] = None
+        self.size = 0
+        raise StopFutureHandlers()
+
+    def _reject(self, error: str):
+        logger.info("Rejected upload %s (%s): %s", self.file_name, self.field_name, error)
+        if self.request is not None:
+            self.request.rejected_uploads.append({'field': self.field_name, 'filename': self.file_name, 'error': error})
+
+    def _sniff(self) -> bool:
+        self.mime_type = sniff_mime_type(self.head)
+        if not self.mime_type.startswith('image/'):
+            self._reject(f'Not an image (detected {self.mime_type})')
+            return False
+        return True
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self._reject(f'File size exceeds {self.max_size // (1024 * 1024)}MB limit')
+            raise SkipFile()
+        if self.mime_type is None:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES and not self._sniff():
+                raise SkipFile()
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.mime_type is None and not self._sniff():
+            self.file.close()
+            return None
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        self.file.mime_type = self.mime_type
+        self.file.client_content_type = self.file.content_type
+        self.file.content_type = self.mime_type
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
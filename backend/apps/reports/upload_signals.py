@@ -0,0 +1,19 @@
+# apps/reports/upload_signals.py
+from django.db.models.signals import post_delete
+
+from .blobs import ImageBlobStore
+from .models import ImageUploadSession, ReportImage
+from .uploads import ResumableUploadService
+
+def upload_session_deleted(sender, instance, **kwargs):
+    """Remove the chunks of aborted, collected or cascaded sessions"""
+    ResumableUploadService.discard_files(instance)
+
+post_delete.connect(upload_session_deleted, sender=ImageUploadSession, dispatch_uid='reports_upload_session_deleted')
+
+def report_image_deleted(sender, instance, **kwargs):
+    """Drop the image's reference on its blob; the file goes with the last one"""
+    if instance.blob_id:
+        ImageBlobStore.release([instance.blob_id])
+
+post_delete.connect(report_image_deleted, sender=ReportImage, dispatch_uid='reports_report_image_deleted')
@@ -0,0 +1,366 @@
+# apps/reports/uploads.py
+import hashlib
+import logging
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .blobs import ImageBlobStore
+from .models import ImageBlob, ImageUploadSession, InspectionReport, ReportImage
+from .photo_metadata import METADATA_FIELDS
+from .services import ReportImageUploadService
+from .upload_handlers import SNIFF_BYTES, sniff_mime_type
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the request or a chunk file at a time; bounds memory whatever the file size
+BLOCK_SIZE = 64 * 1024
+
+SHA256_HEX = re.compile(r'^[0-9a-f]{64}$')
+
+class UploadSessionError(ValueError):
+    """A request the upload protocol rejects; `status_code` is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+def upload_settings() -> Dict[str, Any]:
+    report_settings = getattr(settings, 'REPORT_SETTINGS', {})
+    return {
+        'dir': Path(report_settings.get('UPLOAD_SESSION_DIR', Path(settings.MEDIA_ROOT) / 'temp' / 'uploads')),
+        'chunk_size': report_settings.get('UPLOAD_CHUNK_SIZE', 1024 * 1024),
+        'max_chunk_size': report_settings.get('UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024),
+        'max_size': report_settings.get('MAX_UPLOAD_SIZE', 50 * 1024 * 1024),
+        'ttl': timedelta(hours=report_settings.get('UPLOAD_SESSION_TTL_HOURS', 24)),
+    }
+
+class ResumableUploadService:
+    """Create a session, PUT numbered chunks, ask what arrived, then complete into a ReportImage
+
+    Chunks are streamed to `<UPLOAD_SESSION_DIR>/<session id>/<index>.part`
+    and each is checked against the SHA-256 the client sends with it. The
+    directory listing is the record of what arrived, so concurrent and
+    repeated PUTs need no locking: a chunk file only appears once complete.
+    A session created with the SHA-256 of contents already in the blob
+    store is completed on the spot.
+    """
+
+    MIN_CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def session_dir(session: ImageUploadSession) -> Path:
+        return upload_settings()['dir'] / str(session.pk)
+
+    @classmethod
+    def chunk_path(cls, session: ImageUploadSession, index: int) -> Path:
+        return cls.session_dir(session) / f'{index:06d}.part'
+
+    @classmethod
+    def create(cls, report: InspectionReport, user, data) -> ImageUploadSession:
+        config = upload_settings()
+        filename = os.path.basename(str(data.get('filename') or '')).strip()
+        if not filename:
+            raise UploadSessionError('filename required')
+        try:
+            total_size = int(data.get('total_size'))
+            chunk_size = int(data.get('chunk_size') or config['chunk_size'])
+        except (TypeError, ValueError):
+            raise UploadSessionError('total_size and chunk_size must be integers')
+        if not 0 < total_size <= config['max_size']:
+            raise UploadSessionError(f'total_size must be between 1 and {config["max_size"]} bytes')
+        if not cls.MIN_CHUNK_SIZE <= chunk_size <= config['max_chunk_size']:
+            raise UploadSessionError(
+                f'chunk_size must be between {cls.MIN_CHUNK_SIZE} and {config["max_chunk_size"]} bytes'
+            )
+
+        image_type = data.get('image_type') or 'other_equipment'
+        if image_type not in ReportImageUploadService.VALID_TYPES:
+            raise UploadSessionError(f'Invalid image type: {image_type}')
+        content_type = data.get('content_type') or ''
+        if content_type and content_type not in ReportImageUploadService.ALLOWED_CONTENT_TYPES:
+            raise UploadSessionError(f'Invalid file type. Only {ReportImageUploadService.ALLOWED_FORMATS} are allowed')
+        sha256 = (data.get('sha256') or '').lower()
+        if sha256 and not SHA256_HEX.match(sha256):
+            raise UploadSessionError('sha256 must be a hex SHA-256 digest')
+
+        session = ImageUploadSession.objects.create(
+            report=report,
+            uploaded_by=user,
+            filename=filename,
+            content_type=content_type,
+            total_size=total_size,
+            chunk_size=chunk_size,
+            sha256=sha256,
+            image_type=image_type,
+            caption=data.get('caption') or filename.rsplit('.', 1)[0],
+            position_in_report=data.get('position') or 'equipment_section',
+        )
+        # Same bytes already stored: nothing to send, the session completes right away
+        blob = ImageBlob.objects.filter(pk=sha256, size=total_size).first() if sha256 else None
+        if blob is not None and blob.mime_type in ReportImageUploadService.ALLOWED_CONTENT_TYPES:
+            cls.complete_from_blob(session, blob)
+            return session
+        cls.session_dir(session).mkdir(parents=True, exist_ok=True)
+        return session
+
+    @classmethod
+    def received_chunks(cls, session: ImageUploadSession) -> List[int]:
+        directory = cls.session_dir(session)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            int(entry.name[:-5]) for entry in os.scandir(directory)
+            if entry.name.endswith('.part') and entry.name[:-5].isdigit()
+        )
+
+    @classmethod
+    def status(cls, session: ImageUploadSession) -> Dict[str, Any]:
+        """Session state, including the byte ranges already received so clients can resume"""
+        received = cls.received_chunks(session) if session.status == 'open' else list(range(session.total_chunks))
+        received_set = set(received)
+        missing = [index for index in range(session.total_chunks) if index not in received_set]
+
+        ranges: List[List[int]] = []
+        for index in received:
+            start = index * session.chunk_size
+            end = start + session.chunk_length(index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+
+        return {
+            'upload_id': str(session.pk),
+            'report_id': str(session.report_id),
+            'filename': session.filename,
+            'status': session.status,
+            'total_size': session.total_size,
+            'chunk_size': session.chunk_size,
+            'total_chunks': session.total_chunks,
+            'received_chunks': received,
+            'missing_chunks': missing,
+            'received_ranges': ranges,
+            'received_bytes': sum(end - start for start, end in ranges),
+            'next_offset': missing[0] * session.chunk_size if missing else session.total_size,
+            'image_id': session.image_id,
+            'expires_at': (session.updated_at + upload_settings()['ttl']).isoformat(),
+        }
+
+    @classmethod
+    def write_chunk(cls, session: ImageUploadSession, index: int, stream, sha256: str) -> Tuple[int, bool]:
+        """Stream one chunk to disk and verify its length and digest; returns (bytes, already received)"""
+        if session.status != 'open':
+            raise UploadSessionError('Upload is already completed', status_code=409)
+        if not 0 <= index < session.total_chunks:
+            raise UploadSessionError(f'Chunk index must be between 0 and {session.total_chunks - 1}')
+        sha256 = (sha256 or '').lower()
+        if not SHA256_HEX.match(sha256):
+            raise UploadSessionError('X-Chunk-SHA256 header with the hex SHA-256 of the chunk required')
+
+        expected = session.chunk_length(index)
+        target = cls.chunk_path(session, index)
+        already = target.exists()
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f'{target.name}.{uuid.uuid4().hex}.tmp')
+        digest = hashlib.sha256()
+        size = 0
+        head = b''
+        try:
+            with open(partial, 'wb') as handle:
+                while size <= expected:
+                    block = stream.read(BLOCK_SIZE) if stream is not None else b''
+                    if not block:
+                        break
+                    if len(head) < SNIFF_BYTES:
+                        head += block[:SNIFF_BYTES - len(head)]
+                    size += len(block)
+                    digest.update(block)
+                    handle.write(block)
+            if size != expected:
+                raise UploadSessionError(f'Chunk {index} must be {expected} bytes, received {size}')
+            if digest.hexdigest() != sha256:
+                raise UploadSessionError(f'Chunk {index} checksum mismatch', status_code=422)
+            if index == 0:
+                # The first chunk decides the format; refuse the rest of a non-image now, not at completion
+                mime_type = sniff_mime_type(head)
+                if mime_type not in ReportImageUploadService.ALLOWED_CONTENT_TYPES:
+                    raise UploadSessionError(
+                        f'Not a {ReportImageUploadService.ALLOWED_FORMATS} image (detected {mime_type})',
+                        status_code=415,
+                    )
+            os.replace(partial, target)
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+        # Keeps an active session from being collected as stale
+        ImageUploadSession.objects.filter(pk=session.pk).update(updated_at=timezone.now())
+        return size, already
+
+    @classmethod
+    def completed_image(cls, session: ImageUploadSession) -> ReportImage:
+        """The image a completed session registered"""
+        if session.image is None:
+            raise UploadSessionError('The image of this upload was deleted', status_code=410)
+        return session.image
+
+    @classmethod
+    def complete(cls, session: ImageUploadSession) -> ReportImage:
+        """Assemble the chunks, verify the whole file and register it as a ReportImage
+
+        Completing again, or retrying while another completion is under
+        way, returns the image the session already registered.
+        """
+        if session.status == 'completed':
+            return cls.completed_image(session)
+        missing = cls.status(session)['missing_chunks']
+        if missing:
+            # A concurrent completion removes the chunks once it registered the image
+            session.refresh_from_db(fields=['status', 'image'])
+            if session.status == 'completed':
+                return cls.completed_image(session)
+            raise UploadSessionError(f'{len(missing)} chunks missing, first is {missing[0]}', status_code=409)
+
+        directory = cls.session_dir(session)
+        # Per request, so a retry racing this completion never writes into the same file
+        assembled = directory / f'assembled.{uuid.uuid4().hex}.tmp'
+        try:
+            try:
+                digest, head = cls._assemble(session, assembled)
+            except FileNotFoundError:
+                session.refresh_from_db(fields=['status', 'image'])
+                if session.status == 'completed':
+                    return cls.completed_image(session)
+                raise
+            if session.sha256 and digest != session.sha256:
+                raise UploadSessionError('File checksum mismatch', status_code=422)
+
+            image = ReportImage(
+                report=session.report,
+                image_type=session.image_type,
+                caption=session.caption,
+                position_in_report=session.position_in_report,
+                uploaded_by=session.uploaded_by,
+                sha256=digest,
+                mime_type=sniff_mime_type(head),
+            )
+            with open(assembled, 'rb') as handle:
+                error, = ReportImageUploadService.store_files([image], [File(handle, name=session.filename)])
+            if error is not None:
+                raise UploadSessionError(f'Storing {session.filename} failed: {error}', status_code=500)
+
+            try:
+                registered = cls._register(session, image)
+            except Exception:
+                ImageBlobStore.discard_unreferenced([image.image.name])
+                raise
+        finally:
+            if assembled.exists():
+                assembled.unlink()
+        if registered is not image:
+            # Another request completed the session first; the blob is kept while its image refers to it
+            ImageBlobStore.discard_unreferenced([image.image.name])
+            return registered
+        shutil.rmtree(directory, ignore_errors=True)
+        return image
+
+    @classmethod
+    def _assemble(cls, session: ImageUploadSession, target_path) -> Tuple[str, bytes]:
+        """Concatenate the chunks into target_path; returns (hex SHA-256, leading bytes)"""
+        digest = hashlib.sha256()
+        head = b''
+        with open(target_path, 'wb') as target:
+            for index in range(session.total_chunks):
+                with open(cls.chunk_path(session, index), 'rb') as chunk:
+                    while True:
+                        block = chunk.read(BLOCK_SIZE)
+                        if not block:
+                            break
+                        if len(head) < SNIFF_BYTES:
+                            head += block[:SNIFF_BYTES - len(head)]
+                        digest.update(block)
+                        target.write(block)
+        return digest.hexdigest(), head
+
+    @classmethod
+    def _register(cls, session: ImageUploadSession, image: ReportImage) -> ReportImage:
+        """Save the stored image with a reference on its blob and close the session
+
+        The session row is locked first, so of two completions only one
+        saves an image; the other gets that image back.
+        """
+        with transaction.atomic():
+            locked = ImageUploadSession.objects.select_for_update().get(pk=session.pk)
+            if locked.status == 'completed':
+                session.status, session.image_id = locked.status, locked.image_id
+                return cls.completed_image(session)
+            ImageBlobStore.link([(image.sha256, image.image.name, session.total_size, image.mime_type)])
+            image.order_in_section = ReportImageUploadService.next_orders(
+                session.report, [session.image_type]
+            )[session.image_type] + 1
+            image.save()
+            session.status = 'completed'
+            session.image = image
+            session.save(update_fields=['status', 'image', 'updated_at'])
+        return image
+
+    @classmethod
+    def complete_from_blob(cls, session: ImageUploadSession, blob: ImageBlob) -> ReportImage:
+        """Complete a session whose contents are already stored, without receiving any chunk"""
+        # Same bytes, same hash and EXIF: take them from an image already holding the blob
+        known = ReportImage.objects.filter(blob=blob).order_by(F('dhash').asc(nulls_last=True)).values(
+            'dhash', *METADATA_FIELDS
+        ).first() or {}
+        image = ReportImage(
+            report=session.report,
+            image_type=session.image_type,
+            caption=session.caption,
+            position_in_report=session.position_in_report,
+            uploaded_by=session.uploaded_by,
+            sha256=blob.sha256,
+            mime_type=blob.mime_type,
+            blob=blob,
+            **known,
+        )
+        image.image.name = blob.name
+        registered = cls._register(session, image)
+        cls.discard_files(session)
+        return registered
+
+    @classmethod
+    def discard_files(cls, session: ImageUploadSession):
+        shutil.rmtree(cls.session_dir(session), ignore_errors=True)
+
+    @classmethod
+    def cleanup(cls, now=None, dry_run: bool = False) -> Dict[str, int]:
+        """Delete sessions idle for longer than the TTL and chunk directories without a session"""
+        config = upload_settings()
+        cutoff = (now or timezone.now()) - config['ttl']
+        stale = ImageUploadSession.objects.filter(updated_at__lt=cutoff)
+        counts = {'sessions': stale.count(), 'orphan_dirs': 0}
+        if not dry_run:
+            # Row deletion removes the chunk directory (upload_signals)
+            stale.delete()
+
+        if config['dir'].is_dir():
+            known = {str(pk) for pk in ImageUploadSession.objects.values_list('pk', flat=True)}
+            for entry in os.scandir(config['dir']):
+                if entry.is_dir() and entry.name not in known:
+                    modified = datetime.fromtimestamp(entry.stat().st_mtime, tz=dt_timezone.utc)
+                    # A session created a moment ago may not be visible yet; only old directories go
+                    if modified < cutoff:
+                        counts['orphan_dirs'] += 1
+                        if not dry_run:
+                            shutil.rmtree(entry.path, ignore_errors=True)
+        return counts
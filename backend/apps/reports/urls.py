@@ -1,11 +1,13 @@
 # apps/reports/urls.py - UPDATED FOR DOCX ONLY & REMOVED ERP ENDPOINTS
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
 router.register(r'reports', views.InspectionReportViewSet)
 router.register(r'images', views.ReportImageViewSet)
+router.register(r'violations', views.ReportViolationViewSet)
+router.register(r'uploads', views.ImageUploadSessionViewSet)
 # REMOVED: ERP calculations router registration
 
 urlpatterns = [
@@ -21,11 +23,21 @@ urlpatterns = [
          views.ReportImageViewSet.as_view({'post': 'bulk_upload'}), 
          name='bulk-upload-images'),
     
+    # Resized images for grids and previews, by blob SHA-256
+    re_path(r'^thumbnails/(?P<sha256>[0-9a-f]{64})/$',
+            views.report_image_thumbnail,
+            name='report-image-thumbnail'),
+    
     # Professional document generation - DOCX ONLY
     path('reports/<uuid:pk>/generate_documents/',
          views.InspectionReportViewSet.as_view({'post': 'generate_documents'}),
          name='generate-documents'),
     
+    # Generation profiles, for staff; never under /media/
+    re_path(r'^profiles/(?P<filename>[\w.-]+\.(?:prof|folded))$',
+            views.report_profile_file,
+            name='report-profile-file'),
+    
     # Document downloads - DOCX ONLY
     path('reports/<uuid:pk>/download_docx/',
          views.InspectionReportViewSet.as_view({'get': 'download_docx'}),
@@ -55,6 +67,10 @@ urlpatterns = [
          views.get_report_templates, 
          name='report-templates'),
     
+    path('dashboard/', 
+         views.compliance_dashboard, 
+         name='compliance-dashboard'),
+    
     path('validate/', 
          views.validate_report_data, 
          name='validate-report-data'),
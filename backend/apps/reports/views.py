@@ -1,27 +1,50 @@
 # apps/reports/views.py - UPDATED FOR DOCX ONLY & ERP FETCHING
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.http import HttpResponse, Http404, FileResponse
+from django.conf import settings
+from django.http import HttpResponse, Http404, FileResponse, HttpResponseNotModified, JsonResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.core.files.base import ContentFile
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Prefetch
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET
 import json
+import logging
 import mimetypes
 import os
 import re
+import uuid
 
-from .models import InspectionReport, ReportImage, ERPCalculation
+from .models import InspectionReport, ReportImage, ERPCalculation, ReportViolation, ImageUploadSession
 from .serializers import (
     InspectionReportSerializer, ReportImageSerializer, 
-    ERPCalculationSerializer, ReportGenerationSerializer
+    ERPCalculationSerializer, ReportGenerationSerializer, ReportViolationSerializer
+)
+from .services import (
+    ViolationDetectionService, ComplianceDashboardService, ReportViolationService,
+    ReportImageSummaryService, ReportImageUploadService, NearDuplicateService,
+    PhotoEvidenceService,
 )
-from .services import ViolationDetectionService
 from .renderers import DOCXRenderer  # REMOVED: PDFRenderer
+from .photo_metadata import read_file_metadata
+from .profiling import profile_path
+from .similarity import dhash_file
+from .template_engine import ReportTemplateRegistry
+from .thumbnails import FORMATS as THUMBNAIL_FORMATS, ThumbnailCache, ThumbnailNotReady
+from .transcoding import TRANSCODE_TYPES
+from .blobs import ImageBlobStore
+from .upload_handlers import ImageUploadHandler, fingerprint
+from .uploads import ResumableUploadService, UploadSessionError
 from apps.inspections.models import Inspection
 
+logger = logging.getLogger(__name__)
+
 def parse_numeric_value(value, default=0.0):
     """
     Parse numeric values that might contain units or text
@@ -77,7 +100,15 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
         if broadcaster:
             queryset = queryset.filter(inspection__broadcaster__name__icontains=broadcaster)
         
-        return queryset.select_related('inspection', 'inspection__broadcaster', 'created_by')
+        queryset = queryset.select_related('inspection', 'inspection__broadcaster', 'created_by')
+        if self.action in ('list', 'retrieve'):
+            # Everything the serializer reads per report, in a fixed number of queries
+            queryset = queryset.select_related('inspection__inspector').prefetch_related(
+                Prefetch('images', ReportImage.objects.select_related('blob', 'uploaded_by')),
+                'erp_details',
+                Prefetch('violations', ReportViolationService.summary_rows(), to_attr='violation_rows'),
+            )
+        return queryset
     
     def perform_create(self, serializer):
         """Create report with automatic analysis"""
@@ -87,25 +118,26 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
         violation_service = ViolationDetectionService(inspection)
         violations = violation_service.detect_violations()
         
-        # Determine compliance status
-        if not violations:
-            compliance_status = 'compliant'
-        elif any(v['severity'] == 'major' for v in violations):
-            compliance_status = 'major_violations'
-        else:
-            compliance_status = 'minor_violations'
-        
-        # Save report
-        report = serializer.save(
-            created_by=self.request.user,
-            last_modified_by=self.request.user,
-            violations_found=violations,
-            compliance_status=compliance_status
-        )
+        # Save report with its violation rows
+        with transaction.atomic():
+            report = serializer.save(
+                created_by=self.request.user,
+                last_modified_by=self.request.user,
+                violations_found=violations,
+                compliance_status=ReportViolationService.compliance_status_for(violations)
+            )
+            ReportViolationService.write_rows(report, violations)
         
         # REMOVED: ERP calculation creation since we fetch from inspection
         
         return report
+    
+    def perform_update(self, serializer):
+        """Keep violation rows in step when violations_found is edited directly"""
+        with transaction.atomic():
+            report = serializer.save()
+            if 'violations_found' in serializer.validated_data:
+                ReportViolationService.store(report, report.violations_found)
 
     @action(detail=True, methods=['post'])
     def generate_documents(self, request, pk=None):
@@ -115,6 +147,7 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             
             # Import the enhanced document generator
             from .document_generator import ProfessionalDocumentGenerator
+            from .profiling import GenerationProfiler, dump_profile
             
             # Get generation parameters
             formats = request.data.get('formats', ['docx'])
@@ -122,6 +155,11 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             custom_observations = request.data.get('custom_observations', '')
             custom_conclusions = request.data.get('custom_conclusions', '')
             custom_recommendations = request.data.get('custom_recommendations', '')
+            # Opt-in per-section timing; profile files (pstats, collapsed) are written for staff only
+            profile = str(request.data.get('profile', '')).lower() in ('1', 'true', 'yes')
+            profile_outputs = request.data.get('profile_output', []) if request.user.is_staff else []
+            if isinstance(profile_outputs, str):
+                profile_outputs = [profile_outputs]
             
             # UPDATED: Only allow DOCX format
             valid_formats = ['docx']
@@ -143,7 +181,8 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             report.save()
             
             # Generate documents using professional generator
-            doc_generator = ProfessionalDocumentGenerator(report)
+            profiler = GenerationProfiler(use_cprofile='pstats' in profile_outputs) if profile else None
+            doc_generator = ProfessionalDocumentGenerator(report, profiler=profiler)
             generated_files = doc_generator.generate_documents(formats)
             
             # Prepare response with file URLs
@@ -152,7 +191,7 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
                 if format_type == 'docx' and report.generated_docx:
                     file_urls['docx'] = request.build_absolute_uri(report.generated_docx.url)
             
-            return Response({
+            response_data = {
                 'success': True,
                 'message': 'Professional document generated successfully',
                 'files': file_urls,
@@ -164,13 +203,20 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
                     'total_images': report.images.count(),
                     'generated_at': report.date_completed.isoformat() if report.date_completed else None
                 }
-            }, status=status.HTTP_200_OK)
+            }
+            if profiler:
+                response_data['profile'] = profiler.summary()
+                profile_files = dump_profile(profiler, report.reference_number.replace('/', '_'), profile_outputs)
+                if profile_files:
+                    response_data['profile']['files'] = {
+                        kind: request.build_absolute_uri(reverse('report-profile-file', args=[filename]))
+                        for kind, filename in profile_files.items()
+                    }
+            
+            return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            # Log the error for debugging
-            import traceback
-            print(f"Document generation error: {str(e)}")
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Document generation error for report %s", pk)
             
             return Response({
                 'success': False,
@@ -214,7 +260,7 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             return response
             
         except Exception as e:
-            print(f"DOCX download error: {str(e)}")
+            logger.exception("DOCX download error for report %s", pk)
             return Response({
                 'error': f'Failed to download Word document: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -289,8 +335,8 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             },
             'erp_data': erp_data,  # UPDATED: Use erp_data instead of erp_calculations
             'violations': violations,
-            'images': list(report.images.all().values(
-                'id', 'image_type', 'caption', 'position_in_report', 'image'
+            'images': ThumbnailCache.add_urls(report.images.all().values(
+                'id', 'image_type', 'caption', 'position_in_report', 'image', 'blob_id'
             )),
             'compliance_status': report.compliance_status,
         }
@@ -319,14 +365,7 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             base_requirements['filter_equipment']['required'] = True  # TV usually has combiners
         
         # Check current status
-        current_images = {}
-        for image_type in base_requirements.keys():
-            current_images[image_type] = {
-                'count': report.images.filter(image_type=image_type).count(),
-                'images': list(report.images.filter(image_type=image_type).values(
-                    'id', 'caption', 'image', 'uploaded_at'
-                ))
-            }
+        current_images = ReportImageSummaryService.status(report, base_requirements.keys())
         
         return Response({
             'requirements': base_requirements,
@@ -339,6 +378,27 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             ])
         })
 
+    @action(detail=True, methods=['get'])
+    def near_duplicates(self, request, pk=None):
+        """Near-duplicate images to review before generation; ?distance=<bits>&history=false"""
+        report = self.get_object()
+        distance = request.query_params.get('distance')
+        if distance is not None:
+            try:
+                distance = int(distance)
+            except ValueError:
+                distance = -1
+            if not 0 <= distance <= 32:
+                return Response({'error': 'distance must be a whole number of bits from 0 to 32'},
+                                status=status.HTTP_400_BAD_REQUEST)
+        include_history = request.query_params.get('history', 'true').lower() not in ('0', 'false', 'no')
+        return Response(NearDuplicateService.find(report, distance, include_history))
+
+    @action(detail=True, methods=['get'])
+    def photo_checks(self, request, pk=None):
+        """Photos whose EXIF location or date disagrees with the inspection"""
+        return Response(PhotoEvidenceService.check(self.get_object()))
+
     @action(detail=True, methods=['get'])
     def enhanced_preview_data(self, request, pk=None):
         """Get enhanced preview data for report generation"""
@@ -366,14 +426,7 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
             })
         
         # Get images organized by category - UPDATED CATEGORIES
-        images_by_category = {}
-        for image_type in ['site_overview', 'tower_mast', 'transmitter_equipment', 'antenna', 
-                          'studio_transmitter_link', 'filter_equipment', 'other_equipment']:
-            images = list(report.images.filter(image_type=image_type).values(
-                'id', 'image', 'caption', 'image_type', 'uploaded_at'
-            ))
-            if images:
-                images_by_category[image_type] = images
+        images_by_category = ReportImageSummaryService.by_category(report)
         
         # Enhanced preview data
         preview_data = {
@@ -476,25 +529,78 @@ class InspectionReportViewSet(viewsets.ModelViewSet):
         violation_service = ViolationDetectionService(inspection)
         violations = violation_service.detect_violations()
         
-        # Update report
-        report.violations_found = violations
-        
-        # Update compliance status
-        if not violations:
-            report.compliance_status = 'compliant'
-        elif any(v['severity'] == 'major' for v in violations):
-            report.compliance_status = 'major_violations'
-        else:
-            report.compliance_status = 'minor_violations'
-        
-        report.save()
+        # Update report, its violation rows and compliance status
+        ReportViolationService.store(report, violations)
+        summary = ReportViolationService.summary(report)
         
         return Response({
             'violations': violations,
             'compliance_status': report.compliance_status,
-            'total_violations': len(violations),
-            'major_violations': len([v for v in violations if v['severity'] == 'major']),
-            'minor_violations': len([v for v in violations if v['severity'] == 'minor']),
+            'total_violations': summary['total'],
+            'major_violations': summary['major'],
+            'minor_violations': summary['minor'],
+        })
+
+class ReportViolationViewSet(viewsets.ReadOnlyModelViewSet):
+    """Indexed violation rows, e.g. all ERP violations this quarter"""
+    queryset = ReportViolation.objects.all()
+    serializer_class = ReportViolationSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def _param(self, name, parse, expected):
+        """A query param converted by `parse`; None when absent, a 400 when malformed"""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse(value)
+        except (TypeError, ValueError):
+            # parse_date raises on well formed but impossible dates such as 2024-02-30
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: f'Invalid {name}, expected {expected}'})
+        return parsed
+    
+    def get_queryset(self):
+        """Filter violations on the indexed columns"""
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        
+        for param, field in (
+            ('type', 'violation_type'),
+            ('severity', 'severity'),
+            ('category', 'category'),
+        ):
+            value = params.get(param)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        
+        report_id = self._param('report', uuid.UUID, 'a report id')
+        if report_id:
+            queryset = queryset.filter(report_id=report_id)
+        date_from = self._param('date_from', parse_date, 'YYYY-MM-DD')
+        if date_from:
+            queryset = queryset.filter(created_at__date__gte=date_from)
+        date_to = self._param('date_to', parse_date, 'YYYY-MM-DD')
+        if date_to:
+            queryset = queryset.filter(created_at__date__lte=date_to)
+        
+        broadcaster_id = self._param('broadcaster', int, 'a broadcaster id')
+        if broadcaster_id:
+            queryset = queryset.filter(report__inspection__broadcaster_id=broadcaster_id)
+        
+        return queryset.select_related('report')
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """Violation counts by type and severity for the filtered rows"""
+        rows = self.filter_queryset(self.get_queryset()).order_by().values(
+            'violation_type', 'severity'
+        ).annotate(count=Count('id'), reports=Count('report', distinct=True))
+        
+        return Response({
+            'total': sum(row['count'] for row in rows),
+            'by_type': list(rows)
         })
 
 # REMOVED: ERPCalculationViewSet - no longer needed since we fetch from inspection
@@ -506,6 +612,11 @@ class ReportImageViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
     
+    def initialize_request(self, request, *args, **kwargs):
+        """Stream uploads through ImageUploadHandler; must happen before anything parses the body"""
+        request.upload_handlers = [ImageUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+    
     def get_queryset(self):
         """Filter images by report"""
         queryset = super().get_queryset()
@@ -514,123 +625,99 @@ class ReportImageViewSet(viewsets.ModelViewSet):
         if report_id:
             queryset = queryset.filter(report_id=report_id)
         
-        return queryset.select_related('report', 'uploaded_by')
+        return queryset.select_related('report', 'uploaded_by', 'blob')
+    
+    def create(self, request, *args, **kwargs):
+        # Say why the handler skipped the file instead of the serializer's "No file was submitted"
+        if 'image' not in request.FILES:
+            for rejected in request.rejected_uploads:
+                if rejected['field'] == 'image':
+                    return Response({'error': rejected['error'], 'filename': rejected['filename']},
+                                    status=status.HTTP_400_BAD_REQUEST)
+        return super().create(request, *args, **kwargs)
+    
+    def _save_with_blob(self, serializer, **kwargs):
+        """Save through the blob store when a file was sent; returns the blob the image held before"""
+        previous = serializer.instance.blob_id if serializer.instance else None
+        file = serializer.validated_data.get('image')
+        if file is None:
+            serializer.save(**kwargs)
+            return None
+        sha256, mime_type = fingerprint(file)
+        dhash = dhash_file(file) if mime_type not in TRANSCODE_TYPES else None
+        metadata = read_file_metadata(file)
+        name, _ = ImageBlobStore.write(sha256, mime_type, file)
+        try:
+            with transaction.atomic():
+                ImageBlobStore.link([(sha256, name, file.size, mime_type)])
+                serializer.save(image=name, sha256=sha256, mime_type=mime_type, blob_id=sha256, dhash=dhash,
+                                **metadata, **kwargs)
+        except Exception:
+            ImageBlobStore.discard_unreferenced([name])
+            raise
+        return previous
     
     def perform_create(self, serializer):
         """Upload image with metadata"""
-        serializer.save(uploaded_by=self.request.user)
+        self._save_with_blob(serializer, uploaded_by=self.request.user)
+    
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            previous = self._save_with_blob(serializer)
+            # The new file took its own reference, even on the same blob, so the old one always goes
+            if previous:
+                ImageBlobStore.release([previous])
     
     @action(detail=False, methods=['post'])
     def bulk_upload(self, request):
         """Enhanced bulk upload with category-based image handling"""
-        print(f"📸 BULK UPLOAD called with {len(request.FILES)} files")
-        
         report_id = request.data.get('report_id')
         if not report_id:
-            print("❌ No report_id provided")
             return Response({
                 'error': 'Report ID required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        print(f"📋 Report ID: {report_id}")
+        logger.debug("Bulk upload of %d files to report %s", len(request.FILES), report_id)
         
         try:
             report = get_object_or_404(InspectionReport, id=report_id)
-            print(f"✅ Found report: {report.reference_number}")
         except Exception as e:
-            print(f"❌ Report not found: {str(e)}")
             return Response({
                 'error': f'Report not found: {str(e)}'
             }, status=status.HTTP_404_NOT_FOUND)
         
+        results = ReportImageUploadService.upload(
+            report, request.user, request.FILES, request.data,
+            rejected=request.rejected_uploads,
+        )
+        
         uploaded_images = []
         errors = []
-        
-        # UPDATED: Process files with correct image type validation
-        for key, file in request.FILES.items():
-            print(f"📷 Processing file: {key} - {file.name}")
-            
-            try:
-                # Extract metadata from form data
-                image_type = request.data.get(f'{key}_type', 'other_equipment')
-                caption = request.data.get(f'{key}_caption', file.name.split('.')[0])
-                position = request.data.get(f'{key}_position', 'equipment_section')
-                
-                print(f"   Type: {image_type}, Caption: {caption}, Position: {position}")
-                
-                # UPDATED: Validate image type with correct categories
-                valid_types = [
-                    'site_overview', 'tower_mast', 'transmitter_equipment', 'antenna',
-                    'studio_transmitter_link', 'filter_equipment', 'other_equipment'
-                ]
-                
-                if image_type not in valid_types:
-                    error_msg = f'Invalid image type: {image_type}'
-                    print(f"   ❌ {error_msg}")
-                    errors.append({
-                        'filename': file.name,
-                        'error': error_msg
-                    })
-                    continue
-                
-                # Validate file size (max 10MB)
-                max_size = 10 * 1024 * 1024  # 10MB
-                if file.size > max_size:
-                    error_msg = 'File size exceeds 10MB limit'
-                    print(f"   ❌ {error_msg}")
-                    errors.append({
-                        'filename': file.name,
-                        'error': error_msg
-                    })
-                    continue
-                
-                # Validate file type
-                allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif']
-                if hasattr(file, 'content_type') and file.content_type not in allowed_types:
-                    error_msg = 'Invalid file type. Only JPEG, PNG, and GIF are allowed'
-                    print(f"   ❌ {error_msg}")
-                    errors.append({
-                        'filename': file.name,
-                        'error': error_msg
-                    })
-                    continue
-                
-                # Create image record with enhanced positioning
-                image = ReportImage.objects.create(
-                    report=report,
-                    image=file,
-                    image_type=image_type,
-                    caption=caption,
-                    position_in_report=position,
-                    uploaded_by=request.user,
-                    # Set order based on image type for consistent layout
-                    order_in_section=ReportImage.objects.filter(
-                        report=report, 
-                        image_type=image_type
-                    ).count() + 1
-                )
-                
-                print(f"   ✅ Image created with ID: {image.id}")
-                
-                uploaded_images.append({
-                    'id': image.id,
-                    'filename': file.name,
-                    'type': image_type,
-                    'caption': caption,
-                    'position': position,
-                    'file_size': file.size,
-                    'url': request.build_absolute_uri(image.image.url) if image.image else None
-                })
-                
-            except Exception as e:
-                error_msg = str(e)
-                print(f"   ❌ Error processing {file.name}: {error_msg}")
-                errors.append({
-                    'filename': file.name,
-                    'error': error_msg
+        file_results = []
+        for entry in results:
+            if 'error' in entry:
+                errors.append({'filename': entry['filename'], 'error': entry['error']})
+                file_results.append({
+                    'field': entry['field'], 'filename': entry['filename'], 'status': 'error', 'error': entry['error']
                 })
+                continue
+            image = entry['image']
+            uploaded = {
+                'id': image.id,
+                'filename': entry['filename'],
+                'type': entry['image_type'],
+                'caption': entry['caption'],
+                'position': entry['position'],
+                'order': image.order_in_section,
+                'file_size': entry['file'].size,
+                'sha256': image.sha256,
+                'mime_type': image.mime_type,
+                'url': request.build_absolute_uri(image.image.url) if image.image else None
+            }
+            uploaded_images.append(uploaded)
+            file_results.append({'field': entry['field'], 'status': 'uploaded', **uploaded})
         
-        print(f"📊 Upload complete: {len(uploaded_images)} uploaded, {len(errors)} errors")
+        logger.debug("Bulk upload to report %s: %d uploaded, %d errors", report_id, len(uploaded_images), len(errors))
         
         return Response({
             'success': True,
@@ -638,6 +725,7 @@ class ReportImageViewSet(viewsets.ModelViewSet):
             'errors': errors,
             'total_uploaded': len(uploaded_images),
             'total_errors': len(errors),
+            'results': file_results,
             'report_id': str(report.id)
         })
     
@@ -663,23 +751,150 @@ class ReportImageViewSet(viewsets.ModelViewSet):
             'error': 'Position required'
         }, status=status.HTTP_400_BAD_REQUEST)
 
+class ImageUploadSessionViewSet(viewsets.GenericViewSet):
+    """Resumable image uploads: create a session, PUT chunks, check progress, complete
+
+    POST   uploads/                      {report_id, filename, total_size, image_type, ...}
+    PUT    uploads/<id>/chunks/<index>/  raw chunk bytes, X-Chunk-SHA256 header
+    GET    uploads/<id>/                 received chunks and byte ranges
+    POST   uploads/<id>/complete/        assemble and register the ReportImage
+    DELETE uploads/<id>/                 abort
+    """
+    queryset = ImageUploadSession.objects.all()
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('report', 'uploaded_by', 'image')
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(uploaded_by=self.request.user)
+        return queryset
+    
+    def create(self, request):
+        report_id = request.data.get('report_id')
+        if not report_id:
+            return Response({'error': 'Report ID required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            report_id = uuid.UUID(str(report_id))
+        except ValueError:
+            return Response({'error': 'Invalid report ID'}, status=status.HTTP_400_BAD_REQUEST)
+        report = get_object_or_404(InspectionReport, id=report_id)
+        try:
+            session = ResumableUploadService.create(report, request.user, request.data)
+        except UploadSessionError as e:
+            return Response({'error': str(e)}, status=e.status_code)
+        return Response(ResumableUploadService.status(session), status=status.HTTP_201_CREATED)
+    
+    def retrieve(self, request, pk=None):
+        return Response(ResumableUploadService.status(self.get_object()))
+    
+    def destroy(self, request, pk=None):
+        self.get_object().delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        """Store one chunk; the body is streamed to disk, never parsed or buffered whole"""
+        session = self.get_object()
+        try:
+            size, already = ResumableUploadService.write_chunk(
+                session, int(index), request.stream, request.headers.get('X-Chunk-SHA256')
+            )
+        except UploadSessionError as e:
+            return Response({'error': str(e)}, status=e.status_code)
+        progress = ResumableUploadService.status(session)
+        return Response({
+            'index': int(index),
+            'size': size,
+            'replaced': already,
+            'received_bytes': progress['received_bytes'],
+            'missing_chunks': progress['missing_chunks'],
+        })
+    
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        session = self.get_object()
+        try:
+            image = ResumableUploadService.complete(session)
+        except UploadSessionError as e:
+            return Response({'error': str(e)}, status=e.status_code)
+        return Response({
+            **ResumableUploadService.status(session),
+            'image': {
+                'id': image.id,
+                'filename': session.filename,
+                'type': image.image_type,
+                'caption': image.caption,
+                'position': image.position_in_report,
+                'order': image.order_in_section,
+                'file_size': session.total_size,
+                'url': request.build_absolute_uri(image.image.url) if image.image else None,
+            },
+        })
+
+@require_GET
+def report_image_thumbnail(request, sha256):
+    """Resized copy of an image blob (?w=<px>&format=webp|jpeg|auto)
+
+    Public like /media/: the URL names the contents, which is what makes
+    it safe to cache forever, and <img> tags cannot send the API token.
+    """
+    fmt = request.GET.get('format', 'auto')
+    if fmt == 'auto':
+        fmt = 'webp' if 'image/webp' in request.META.get('HTTP_ACCEPT', '') else 'jpeg'
+    if fmt not in THUMBNAIL_FORMATS:
+        return JsonResponse({'error': f'format must be one of auto, {", ".join(THUMBNAIL_FORMATS)}'}, status=400)
+    try:
+        width = ThumbnailCache.snap_width(int(request.GET.get('w') or 0))
+    except ValueError:
+        return JsonResponse({'error': 'w must be an integer'}, status=400)
+
+    headers = {
+        'Cache-Control': 'public, max-age=31536000, immutable',
+        'ETag': f'"{sha256}-{width}-{fmt}"',
+    }
+    if request.GET.get('format', 'auto') == 'auto':
+        headers['Vary'] = 'Accept'
+    if headers['ETag'] in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            handle = ThumbnailCache.open_file(sha256, width, fmt)
+        except ThumbnailNotReady:
+            response = JsonResponse({'error': 'Image is still being processed'}, status=503)
+            response['Retry-After'] = '5'
+            response['Cache-Control'] = 'no-store'
+            return response
+        except (OSError, ValueError) as e:
+            logger.warning("Thumbnail of blob %s failed: %s", sha256, e)
+            raise Http404('Image cannot be read')
+        if handle is None:
+            raise Http404('Image not found')
+        response = FileResponse(handle, content_type=THUMBNAIL_FORMATS[fmt][1])
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def report_profile_file(request, filename):
+    """A pstats or collapsed-stack file written by generate_documents with profile_output"""
+    path = profile_path(filename)
+    if path is None:
+        raise Http404('Profile not found')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=filename,
+                        content_type='application/octet-stream')
+
 # Additional utility views
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_report_from_inspection(request, inspection_id):
     """Create a new report from an existing inspection"""
-    import traceback
-    
     try:
-        print(f"=== CREATING REPORT FOR INSPECTION {inspection_id} ===")
-        
         inspection = get_object_or_404(Inspection, id=inspection_id)
-        print(f"✅ Found inspection: {inspection}")
         
         # Check if report already exists for this inspection
         existing_report = InspectionReport.objects.filter(inspection=inspection).first()
         if existing_report:
-            print(f"ℹ️ Report already exists: {existing_report.id}")
             return Response({
                 'success': True,
                 'report_id': str(existing_report.id),
@@ -689,7 +904,6 @@ def create_report_from_inspection(request, inspection_id):
         
         # Determine report type from inspection
         station_type = inspection.station_type
-        print(f"📻 Station type: {station_type}")
         
         if station_type == 'FM':
             report_type = 'fm_radio'
@@ -700,11 +914,7 @@ def create_report_from_inspection(request, inspection_id):
         else:
             report_type = 'fm_radio'  # Default
         
-        print(f"📋 Report type determined: {report_type}")
-        
         # Create new report with retry mechanism for reference number conflicts
-        print("🔨 Creating new report...")
-        
         max_retries = 5
         for attempt in range(max_retries):
             try:
@@ -718,12 +928,12 @@ def create_report_from_inspection(request, inspection_id):
                 
                 # Save the report (this will auto-generate reference_number)
                 report.save()
-                print(f"✅ Report created with ID: {report.id} and reference: {report.reference_number}")
+                logger.debug("Report %s (%s) created for inspection %s", report.id, report.reference_number, inspection_id)
                 break
                 
             except IntegrityError as ie:
                 if 'reference_number' in str(ie) and attempt < max_retries - 1:
-                    print(f"⚠️ Reference number collision, retry {attempt + 1}/{max_retries}")
+                    logger.debug("Reference number collision, retry %d/%d", attempt + 1, max_retries)
                     continue
                 else:
                     raise
@@ -732,43 +942,22 @@ def create_report_from_inspection(request, inspection_id):
             raise Exception(f"Failed to create report after {max_retries} attempts due to reference number conflicts")
         
         # Auto-analyze violations
-        print("🔍 Starting violation detection...")
-        
         try:
             violation_service = ViolationDetectionService(inspection)
-            print("✅ ViolationDetectionService created")
-            
-            print("🔍 Calling detect_violations()...")
             violations = violation_service.detect_violations()
-            print(f"✅ Violations detected: {len(violations)}")
             
         except Exception as violation_error:
-            print(f"❌ VIOLATION DETECTION FAILED: {str(violation_error)}")
-            print(f"❌ Error type: {type(violation_error).__name__}")
-            traceback.print_exc()
+            logger.exception("Violation detection failed for inspection %s", inspection_id)
             
             # Set empty violations to continue
             violations = []
         
-        # Update compliance status
-        if not violations:
-            compliance_status = 'compliant'
-        elif any(v['severity'] == 'major' for v in violations):
-            compliance_status = 'major_violations'
-        else:
-            compliance_status = 'minor_violations'
-        
-        print(f"📊 Compliance status: {compliance_status}")
-        
-        report.violations_found = violations
-        report.compliance_status = compliance_status
-        report.save()
-        print("✅ Report updated with violations")
+        # Update compliance status and violation rows
+        ReportViolationService.store(report, violations)
+        compliance_status = report.compliance_status
+        logger.debug("Report %s: %d violations, %s", report.id, len(violations), compliance_status)
         
         # REMOVED: ERP calculation creation since we fetch from inspection
-        print("ℹ️ ERP data will be fetched from inspection record when generating document")
-        
-        print("🎉 SUCCESS: Report creation completed")
         
         return Response({
             'success': True,
@@ -779,10 +968,7 @@ def create_report_from_inspection(request, inspection_id):
         })
         
     except Exception as e:
-        print(f"❌ CRITICAL ERROR in create_report_from_inspection: {str(e)}")
-        print(f"❌ Error type: {type(e).__name__}")
-        print("❌ Full traceback:")
-        traceback.print_exc()
+        logger.exception("Report creation failed for inspection %s", inspection_id)
         
         return Response({
             'success': False,
@@ -792,57 +978,21 @@ def create_report_from_inspection(request, inspection_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_report_templates(request):
-    """Get available report templates"""
-    templates = [
-        {
-            'id': 'fm_radio',
-            'name': 'FM Radio Inspection Report',
-            'description': 'Standard template for FM radio station inspections',
-            'sections': [
-                'Site Information',
-                'Tower/Mast Details',
-                'Transmitter Equipment',
-                'Antenna System',
-                'ERP Information',
-                'Observations',
-                'Conclusions',
-                'Recommendations'
-            ],
-            'format': 'DOCX'  # UPDATED: Only DOCX
-        },
-        {
-            'id': 'tv_broadcast',
-            'name': 'TV Broadcast Inspection Report',
-            'description': 'Template for television broadcast station inspections',
-            'sections': [
-                'Site Information',
-                'Tower/Mast Details',
-                'Multi-Channel Transmitters',
-                'Antenna Systems',
-                'ERP Information (Multiple Channels)',
-                'Observations',
-                'Conclusions',
-                'Recommendations'
-            ],
-            'format': 'DOCX'  # UPDATED: Only DOCX
-        },
-        {
-            'id': 'am_radio',
-            'name': 'AM Radio Inspection Report',
-            'description': 'Template for AM radio station inspections',
-            'sections': [
-                'Site Information',
-                'Antenna Array',
-                'Transmitter Equipment',
-                'Ground System',
-                'Power Information',
-                'Observations',
-                'Conclusions',
-                'Recommendations'
-            ],
-            'format': 'DOCX'  # UPDATED: Only DOCX
-        }
-    ]
+    """Active report template per report type, as compiled for document generation"""
+    templates = []
+    for report_type, label in InspectionReport.REPORT_TYPES:
+        plan = ReportTemplateRegistry.plan_for(report_type)
+        templates.append({
+            'id': report_type,
+            'template_id': plan.template_id,
+            'name': plan.name or f'{label} Report',
+            'description': plan.description,
+            'sections': plan.section_titles(),
+            'headings': plan.headings(),
+            'page_margins': plan.page_margins,
+            'font_settings': plan.font_settings,
+            'format': 'DOCX'
+        })
     
     return Response({
         'templates': templates,
@@ -863,6 +1013,35 @@ def get_report_templates(request):
         }
     })
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def compliance_dashboard(request):
+    """Compliance aggregates read from the materialized summary table"""
+    months = {}
+    for param in ('month_from', 'month_to'):
+        value = request.query_params.get(param)
+        if value:
+            month = ComplianceDashboardService.month_of(f"{value}-01" if len(value) == 7 else value)
+            if month is None:
+                return Response(
+                    {'error': f'Invalid {param}, expected YYYY-MM'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            months[param] = month
+    
+    broadcaster_id = request.query_params.get('broadcaster') or None
+    if broadcaster_id is not None:
+        try:
+            broadcaster_id = int(broadcaster_id)
+        except ValueError:
+            return Response({'error': 'Invalid broadcaster, expected an id'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response(ComplianceDashboardService.dashboard(
+        broadcaster_id=broadcaster_id,
+        station_type=request.query_params.get('station_type'),
+        **months
+    ))
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def validate_report_data(request):
@@ -8,8 +8,10 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from .models import Tower
 from django.contrib.auth import get_user_model
+import logging
 
 User = get_user_model()
+logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -49,7 +51,7 @@ class TowerViewSet(viewsets.ModelViewSet):
         return SimpleTowerSerializer
     
     def create(self, request, *args, **kwargs):
-        print(f"🔍 [Towers] CREATE request data: {request.data}")
+        logger.debug("Tower create payload: %s", request.data)
         
         # Ensure we have required data
         data = request.data.copy()
@@ -57,25 +59,23 @@ class TowerViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=data)
         if serializer.is_valid():
             tower = serializer.save()
-            print(f"✅ [Towers] Tower created: {tower.id}")
+            logger.debug("Tower %s created", tower.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         else:
-            print(f"❌ [Towers] CREATE Validation errors: {serializer.errors}")
+            logger.debug("Tower create validation errors: %s", serializer.errors)
             return Response({
                 'errors': serializer.errors,
                 'message': 'Validation failed on CREATE'
             }, status=status.HTTP_400_BAD_REQUEST)
     
     def update(self, request, *args, **kwargs):
-        print(f"🔍 [Towers] UPDATE request data: {request.data}")
-        print(f"🔍 [Towers] UPDATE kwargs: {kwargs}")
+        logger.debug("Tower %s update payload: %s", kwargs.get('pk'), request.data)
         
         # Get the instance
         try:
             instance = self.get_object()
-            print(f"📝 [Towers] Found tower to update: {instance.id}")
         except Exception as e:
-            print(f"❌ [Towers] Failed to get tower object: {e}")
+            logger.debug("Tower %s not found for update: %s", kwargs.get('pk'), e)
             return Response({
                 'error': f'Tower not found: {e}',
                 'pk': kwargs.get('pk')
@@ -83,16 +83,15 @@ class TowerViewSet(viewsets.ModelViewSet):
         
         # Prepare data for update
         data = request.data.copy()
-        print(f"📝 [Towers] Prepared update data: {data}")
         
         # Use partial update
         serializer = self.get_serializer(instance, data=data, partial=True)
         if serializer.is_valid():
             updated_tower = serializer.save()
-            print(f"✅ [Towers] Tower updated: {updated_tower.id}")
+            logger.debug("Tower %s updated", updated_tower.id)
             return Response(serializer.data)
         else:
-            print(f"❌ [Towers] UPDATE Validation errors: {serializer.errors}")
+            logger.debug("Tower %s update validation errors: %s", instance.id, serializer.errors)
             return Response({
                 'errors': serializer.errors,
                 'message': 'Validation failed on UPDATE',
@@ -100,5 +99,4 @@ class TowerViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
     
     def list(self, request, *args, **kwargs):
-        print(f"🔍 [Towers] LIST request")
         return super().list(request, *args, **kwargs)
\ No newline at end of file
@@ -56,12 +56,15 @@ LOCAL_APPS = [
     'apps.inspections',
     'apps.audit',
     'apps.reports',
+    'apps.equipment',
+    'apps.monitoring',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 # SMART MIDDLEWARE - Adapts to environment
 MIDDLEWARE = [
+    'apps.monitoring.middleware.RequestMetricsMiddleware',  # Outermost so it times everything below
     'corsheaders.middleware.CorsMiddleware',  # Always include for flexibility
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -76,6 +79,7 @@ MIDDLEWARE.extend([
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.audit.middleware.AuditContextMiddleware',
 ])
 
 ROOT_URLCONF = 'config.urls'
@@ -348,11 +352,38 @@ REPORT_SETTINGS = {
     ],
     'IMAGE_QUALITY': 85,
     'MAX_IMAGE_DIMENSIONS': (2048, 2048),
+    # Threads writing bulk_upload files to storage; 1 writes them one by one
+    'UPLOAD_WORKERS': config('REPORT_UPLOAD_WORKERS', default=4, cast=int),
+    # Resumable uploads keep chunks on local disk until completed; idle sessions expire
+    'UPLOAD_SESSION_DIR': BASE_DIR / 'media' / 'temp' / 'uploads',
+    'UPLOAD_CHUNK_SIZE': 1024 * 1024,
+    'UPLOAD_MAX_CHUNK_SIZE': 8 * 1024 * 1024,
+    'MAX_UPLOAD_SIZE': config('REPORT_MAX_UPLOAD_SIZE', default=50 * 1024 * 1024, cast=int),
+    'UPLOAD_SESSION_TTL_HOURS': config('REPORT_UPLOAD_SESSION_TTL_HOURS', default=24, cast=int),
+    # HEIC/HEIF originals get a print JPEG and a web WebP: 'thread' in a background thread,
+    # 'sync' before the upload answers, 'off' only through the transcode_images command
+    'TRANSCODE_MODE': config('REPORT_TRANSCODE_MODE', default='thread'),
+    'PRINT_IMAGE_MAX_EDGE': 2400,
+    'PRINT_IMAGE_QUALITY': 85,
+    'WEB_IMAGE_MAX_EDGE': 1600,
+    'WEB_IMAGE_QUALITY': 80,
+    # On-demand thumbnails, cached on local disk with least-recently-used eviction
+    'THUMBNAIL_CACHE_DIR': BASE_DIR / 'media' / 'cache' / 'thumbnails',
+    'THUMBNAIL_CACHE_MAX_BYTES': config('REPORT_THUMBNAIL_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int),
+    'THUMBNAIL_WIDTHS': [160, 320, 640, 1280],
+    'THUMBNAIL_DEFAULT_WIDTH': 320,
+    # Images whose 64-bit perceptual hashes differ in at most this many bits count as near-duplicates
+    'NEAR_DUPLICATE_DISTANCE': config('REPORT_NEAR_DUPLICATE_DISTANCE', default=6, cast=int),
+    # Photos whose EXIF GPS fix or date is further than this from the inspection's are flagged
+    'PHOTO_MAX_SITE_DISTANCE_M': config('REPORT_PHOTO_MAX_SITE_DISTANCE_M', default=1000, cast=int),
+    'PHOTO_DATE_TOLERANCE_DAYS': config('REPORT_PHOTO_DATE_TOLERANCE_DAYS', default=0, cast=int),
     
     # Document generation paths
     'TEMPLATE_DIR': BASE_DIR / 'media' / 'templates',
     'GENERATED_REPORTS_DIR': BASE_DIR / 'media' / 'reports' / 'generated',
     'TEMP_DIR': BASE_DIR / 'media' / 'temp',
+    # Generation profiles (pstats / collapsed stacks); kept out of MEDIA_ROOT and served to staff only
+    'PROFILE_DIR': BASE_DIR / 'profiles',
     
     # ERP settings
     'ERP_AUTHORIZED_LIMIT_KW': 10.0,
@@ -371,6 +402,35 @@ REPORT_SETTINGS = {
     'SAVE_TEMP_FILES': DEBUG,
 }
 
+# Audit logging - change records are buffered and written in batches
+AUDIT_SETTINGS = {
+    'ENABLED': config('AUDIT_ENABLED', default=True, cast=bool),
+    # 'thread': background flusher, 'request': flush when the request ends, 'sync': write on commit
+    'MODE': config('AUDIT_MODE', default='thread'),
+    'QUEUE_SIZE': config('AUDIT_QUEUE_SIZE', default=10000, cast=int),
+    'BATCH_SIZE': config('AUDIT_BATCH_SIZE', default=500, cast=int),
+    'FLUSH_INTERVAL': config('AUDIT_FLUSH_INTERVAL', default=2.0, cast=float),
+    # Flush whatever is still buffered when the process exits
+    'FLUSH_ON_EXIT': config('AUDIT_FLUSH_ON_EXIT', default=True, cast=bool),
+    'IGNORED_FIELDS': ['created_at', 'updated_at', 'last_saved'],
+    # Form revisions: full snapshot every N revisions, JSON patches in between
+    'REVISIONS_ENABLED': config('AUDIT_REVISIONS_ENABLED', default=True, cast=bool),
+    'REVISION_CHECKPOINT_INTERVAL': config('AUDIT_REVISION_CHECKPOINT_INTERVAL', default=20, cast=int),
+    # Months kept in the database; older months are archived under MEDIA_ROOT/ARCHIVE_DIR
+    'RETENTION_MONTHS': config('AUDIT_RETENTION_MONTHS', default=12, cast=int),
+    'ARCHIVE_DIR': 'audit_archive',
+}
+
+# Request metrics - Server-Timing headers and the admin-only /api/metrics/ endpoint
+METRICS_SETTINGS = {
+    'ENABLED': config('METRICS_ENABLED', default=True, cast=bool),
+    # Timing headers reveal backend detail; on by default only in development
+    'SERVER_TIMING': config('METRICS_SERVER_TIMING', default=DEBUG, cast=bool),
+    # Recent requests per endpoint used for the latency quantiles
+    'WINDOW': config('METRICS_WINDOW', default=500, cast=int),
+    'EXCLUDE_PATHS': ['/static/', '/media/', '/api/metrics/'],
+}
+
 # Create required directories
 for directory in [
     MEDIA_ROOT,
@@ -390,11 +450,13 @@ LOGGING = {
     'disable_existing_loggers': False,
     'formatters': {
         'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
+            '()': 'apps.monitoring.log_handlers.StructuredFormatter',
+            'format': '{levelname} {asctime} {name} {process:d} {thread:d} {message}',
             'style': '{',
         },
         'simple': {
-            'format': '{levelname} {message}',
+            '()': 'apps.monitoring.log_handlers.StructuredFormatter',
+            'format': '{levelname} {name} {message}',
             'style': '{',
         },
     },
@@ -407,21 +469,29 @@ LOGGING = {
             'class': 'logging.FileHandler',
             'filename': log_file,
             'formatter': 'verbose',
+            'delay': True,
+        },
+        # Non-blocking front for the handlers above; writes happen on a listener thread
+        'queue': {
+            '()': 'apps.monitoring.log_handlers.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'] if DEBUG else ['cfg://handlers.console', 'cfg://handlers.file'],
+            'queue_size': config('LOG_QUEUE_SIZE', default=10000, cast=int),
         },
     },
     'root': {
-        'handlers': ['console'],
+        'handlers': ['queue'],
         'level': log_level,
     },
     'loggers': {
         'django': {
-            'handlers': ['console', 'file'] if not DEBUG else ['console'],
+            'handlers': ['queue'],
             'level': log_level,
             'propagate': False,
         },
-        'apps.reports': {
-            'handlers': ['console'],
-            'level': 'DEBUG',
+        # Request payload dumps are logged at DEBUG; production runs at INFO so they are never formatted
+        'apps': {
+            'handlers': ['queue'],
+            'level': config('APP_LOG_LEVEL', default=log_level),
             'propagate': False,
         },
     },
@@ -13,6 +13,8 @@ urlpatterns = [
     path('api/inspections/', include('apps.inspections.urls')),
     path('api/audit/', include('apps.audit.urls')),
     path('api/reports/', include('apps.reports.urls')),  # Add this line
+    path('api/equipment/', include('apps.equipment.urls')),
+    path('api/metrics/', include('apps.monitoring.urls')),
 ]
 
 if settings.DEBUG:
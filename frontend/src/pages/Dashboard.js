@@ -14,7 +14,7 @@ import {
 } from 'lucide-react';
 
 import { useAuthStore } from '../store';
-import { inspectionsAPI, broadcastersAPI } from '../services/api';
+import { inspectionsAPI } from '../services/api';
 import LoadingSpinner from '../components/LoadingSpinner';
 import { formatDistanceToNow, format } from 'date-fns';
 
@@ -27,31 +27,12 @@ const Dashboard = () => {
     queryFn: () => inspectionsAPI.getAll().then(res => res.data.results || res.data),
   });
 
-  // Fetch broadcasters count
-  const { data: broadcasters = [], isLoading: broadcastersLoading } = useQuery({
-    queryKey: ['broadcasters'],
-    queryFn: () => broadcastersAPI.getAll().then(res => res.data.results || res.data),
+  // Counters are aggregated server-side; the list above is only the first page
+  const { data: stats = {}, isLoading: statsLoading } = useQuery({
+    queryKey: ['inspections', 'stats'],
+    queryFn: () => inspectionsAPI.getStats().then(res => res.data),
   });
 
-  // Calculate stats
-  const stats = React.useMemo(() => {
-    const totalInspections = inspections.length;
-    const draftInspections = inspections.filter(i => i.status === 'draft').length;
-    const completedInspections = inspections.filter(i => i.status === 'completed').length;
-    const todayInspections = inspections.filter(i => {
-      const today = new Date().toISOString().split('T')[0];
-      return i.inspection_date === today || i.created_at?.split('T')[0] === today;
-    }).length;
-
-    return {
-      total: totalInspections,
-      drafts: draftInspections,
-      completed: completedInspections,
-      today: todayInspections,
-      broadcasters: broadcasters.length,
-    };
-  }, [inspections, broadcasters]);
-
   const recentInspections = inspections.slice(0, 5);
 
   return (
@@ -90,7 +71,7 @@ const Dashboard = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Total Inspections</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {inspectionsLoading ? '...' : stats.total}
+                  {statsLoading ? '...' : stats.total_inspections}
                 </p>
               </div>
             </div>
@@ -106,7 +87,7 @@ const Dashboard = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Draft Inspections</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {inspectionsLoading ? '...' : stats.drafts}
+                  {statsLoading ? '...' : stats.by_status?.draft}
                 </p>
               </div>
             </div>
@@ -122,7 +103,7 @@ const Dashboard = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Completed</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {inspectionsLoading ? '...' : stats.completed}
+                  {statsLoading ? '...' : stats.by_status?.completed}
                 </p>
               </div>
             </div>
@@ -138,7 +119,7 @@ const Dashboard = () => {
               <div className="ml-4">
                 <p className="text-sm font-medium text-gray-500">Broadcasters</p>
                 <p className="text-2xl font-semibold text-gray-900">
-                  {broadcastersLoading ? '...' : stats.broadcasters}
+                  {statsLoading ? '...' : stats.broadcasters}
                 </p>
               </div>
             </div>
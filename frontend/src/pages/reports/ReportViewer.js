@@ -661,7 +661,10 @@ const ReportViewer = () => {
                 <Card key={index}>
                   <Card.Body className="p-0">
                     <img
-                      src={image.image_url}
+                      src={image.thumbnail_url || image.web_url || image.image_url}
+                      srcSet={image.thumbnail_srcset || undefined}
+                      sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
+                      loading="lazy"
                       alt={image.caption}
                       className="w-full h-48 object-cover rounded-t-lg"
                     />
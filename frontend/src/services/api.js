@@ -178,6 +178,7 @@ export const antennasAPI = {
 // Inspections API
 export const inspectionsAPI = {
   getAll: () => api.get('/inspections/inspections/'),
+  getStats: () => api.get('/inspections/stats/'),
   getById: (id) => api.get(`/inspections/inspections/${id}/`),
   create: (data) => api.post('/inspections/inspections/', data),
   update: (id, data) => api.put(`/inspections/inspections/${id}/`, data),
@@ -280,6 +281,24 @@ export const reportsAPI = {
   deleteImage: (imageId) => 
     api.delete(`/reports/images/${imageId}/`),
   
+  // Resumable chunked uploads for poor connections
+  createUploadSession: (data) => 
+    api.post('/reports/uploads/', data),
+  
+  getUploadSession: (uploadId) => 
+    api.get(`/reports/uploads/${uploadId}/`),
+  
+  uploadChunk: (uploadId, index, blob, sha256) => 
+    api.put(`/reports/uploads/${uploadId}/chunks/${index}/`, blob, {
+      headers: { 'Content-Type': 'application/octet-stream', 'X-Chunk-SHA256': sha256 },
+    }),
+  
+  completeUpload: (uploadId) => 
+    api.post(`/reports/uploads/${uploadId}/complete/`),
+  
+  abortUpload: (uploadId) => 
+    api.delete(`/reports/uploads/${uploadId}/`),
+  
   // REMOVED: All ERP calculation endpoints
   // - calculateERP
   // - bulkCalculateERP
@@ -489,10 +508,12 @@ export const apiHelpers = {
   
   // Validate image file
   validateImageFile: (file, maxSize = 10 * 1024 * 1024) => {
-    const allowedTypes = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif'];
+    const allowedTypes = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/heic', 'image/heif'];
+    // Some browsers report no type for iPhone photos; the server checks the contents anyway
+    const isHeic = !file.type && /\.(heic|heif)$/i.test(file.name);
     
-    if (!allowedTypes.includes(file.type)) {
-      return { valid: false, error: 'Invalid file type. Only JPEG, PNG, and GIF are allowed.' };
+    if (!allowedTypes.includes(file.type) && !isHeic) {
+      return { valid: false, error: 'Invalid file type. Only JPEG, PNG, GIF and HEIC are allowed.' };
     }
     
     if (file.size > maxSize) {
@@ -519,6 +540,40 @@ export const apiHelpers = {
     });
     
     return formData;
+  },
+  
+  // Hex SHA-256 of a Blob, as the upload endpoints expect
+  sha256Hex: async (blob) => {
+    const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+  },
+  
+  // Upload one file in chunks, sending only what the server is missing; pass uploadId to resume
+  uploadResumable: async (reportId, file, { type, caption, position, uploadId, onProgress } = {}) => {
+    const session = uploadId
+      ? (await reportsAPI.getUploadSession(uploadId)).data
+      : (await reportsAPI.createUploadSession({
+          report_id: reportId,
+          filename: file.name,
+          total_size: file.size,
+          content_type: file.type,
+          // Lets the server complete at once when the same photo was uploaded before
+          sha256: await apiHelpers.sha256Hex(file),
+          image_type: type,
+          caption,
+          position,
+        })).data;
+    
+    for (const index of session.missing_chunks) {
+      const start = index * session.chunk_size;
+      const chunk = file.slice(start, Math.min(start + session.chunk_size, file.size));
+      const { data } = await reportsAPI.uploadChunk(session.upload_id, index, chunk, await apiHelpers.sha256Hex(chunk));
+      if (onProgress) {
+        onProgress({ uploadId: session.upload_id, percent: Math.round((data.received_bytes * 100) / file.size) });
+      }
+    }
+    
+    return (await reportsAPI.completeUpload(session.upload_id)).data;
   }
 };
 